@@ -9,6 +9,7 @@ from collections import defaultdict
 from datetime import date, datetime, timedelta
 from typing import Any, Dict, List, Optional
 
+from copilot_quant.backtest.round_trips import EPSILON, match_fill_records, match_round_trips, round_trip_stats
 from copilot_quant.brokers.trade_database import TradeDatabase
 
 logger = logging.getLogger(__name__)
@@ -63,7 +64,7 @@ class AttributionAnalyzer:
             if end_date:
                 query = query.filter(FillModel.timestamp <= datetime.combine(end_date, datetime.max.time()))
 
-            fills = query.all()
+            fills = query.order_by(FillModel.timestamp, FillModel.id).all()
 
             # Group fills by symbol (used as proxy for strategy)
             # In a real implementation, orders would have a strategy_id field
@@ -123,7 +124,7 @@ class AttributionAnalyzer:
             if end_date:
                 query = query.filter(FillModel.timestamp <= datetime.combine(end_date, datetime.max.time()))
 
-            fills = query.all()
+            fills = query.order_by(FillModel.timestamp, FillModel.id).all()
 
             # Group fills by symbol
             symbol_fills = defaultdict(list)
@@ -185,7 +186,7 @@ class AttributionAnalyzer:
             if end_date:
                 query = query.filter(FillModel.timestamp <= datetime.combine(end_date, datetime.max.time()))
 
-            fills = query.order_by(FillModel.timestamp).all()
+            fills = query.order_by(FillModel.timestamp, FillModel.id).all()
 
             # Group fills by time period
             period_fills = defaultdict(list)
@@ -224,82 +225,29 @@ class AttributionAnalyzer:
             return attribution
 
     def _calculate_strategy_pnl(self, fills: List) -> float:
-        """Calculate total PnL from a list of fills using FIFO"""
-        positions = []  # [(quantity, price), ...]
-        realized_pnl = 0.0
-
+        """Calculate total PnL (FIFO realized + open lots at each symbol's last fill price), net of commissions"""
+        if not fills:
+            return 0.0
+
+        # Close the open position of each symbol at its last fill price, so the
+        # FIFO matcher also prices the open lots
+        net_quantity: Dict[str, float] = defaultdict(float)
+        last_price: Dict[str, float] = {}
         for fill in fills:
-            quantity = fill.quantity
-            price = fill.price
-
-            if quantity > 0:  # Buy
-                positions.append((quantity, price))
-            else:  # Sell
-                sell_qty = abs(quantity)
-                remaining_sell = sell_qty
-
-                while remaining_sell > 0 and positions:
-                    buy_qty, buy_price = positions[0]
-
-                    if buy_qty <= remaining_sell:
-                        # Close entire buy position
-                        realized_pnl += buy_qty * (price - buy_price)
-                        remaining_sell -= buy_qty
-                        positions.pop(0)
-                    else:
-                        # Partial close
-                        realized_pnl += remaining_sell * (price - buy_price)
-                        positions[0] = (buy_qty - remaining_sell, buy_price)
-                        remaining_sell = 0
-
-        # Add unrealized PnL from open positions
-        unrealized_pnl = 0.0
-        if positions and fills:
-            last_price = fills[-1].price
-            for qty, cost in positions:
-                unrealized_pnl += qty * (last_price - cost)
-
-        return realized_pnl + unrealized_pnl
+            net_quantity[fill.symbol] += fill.quantity
+            last_price[fill.symbol] = fill.price
+        open_symbols = [symbol for symbol, quantity in net_quantity.items() if abs(quantity) > EPSILON]
+
+        round_trips = match_round_trips(
+            timestamps=[fill.timestamp for fill in fills] + [fills[-1].timestamp] * len(open_symbols),
+            symbols=[fill.symbol for fill in fills] + open_symbols,
+            quantities=[fill.quantity for fill in fills] + [-net_quantity[symbol] for symbol in open_symbols],
+            prices=[fill.price for fill in fills] + [last_price[symbol] for symbol in open_symbols],
+            commissions=[fill.commission or 0.0 for fill in fills] + [0.0] * len(open_symbols),
+        )
+        return float(round_trips["pnl"].sum())
 
     def _calculate_strategy_trades(self, fills: List) -> Dict[str, Any]:
-        """Calculate trade statistics from fills"""
-        positions = []
-        trades_pnl = []
-
-        for fill in fills:
-            quantity = fill.quantity
-            price = fill.price
-
-            if quantity > 0:  # Buy
-                positions.append((quantity, price))
-            else:  # Sell
-                sell_qty = abs(quantity)
-                remaining_sell = sell_qty
-
-                while remaining_sell > 0 and positions:
-                    buy_qty, buy_price = positions[0]
-
-                    if buy_qty <= remaining_sell:
-                        pnl = buy_qty * (price - buy_price)
-                        trades_pnl.append(pnl)
-                        remaining_sell -= buy_qty
-                        positions.pop(0)
-                    else:
-                        pnl = remaining_sell * (price - buy_price)
-                        trades_pnl.append(pnl)
-                        positions[0] = (buy_qty - remaining_sell, buy_price)
-                        remaining_sell = 0
-
-        if not trades_pnl:
-            return {"num_trades": 0, "win_rate": 0.0, "profit_factor": 0.0}
-
-        winning_trades = [t for t in trades_pnl if t > 0]
-        losing_trades = [t for t in trades_pnl if t < 0]
-
-        win_rate = len(winning_trades) / len(trades_pnl)
-
-        gross_profit = sum(winning_trades) if winning_trades else 0.0
-        gross_loss = abs(sum(losing_trades)) if losing_trades else 0.0
-        profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0.0
-
-        return {"num_trades": len(trades_pnl), "win_rate": win_rate, "profit_factor": profit_factor}
+        """Calculate trade statistics from FIFO round trips"""
+        stats = round_trip_stats(match_fill_records(fills)["pnl"])
+        return {key: stats[key] for key in ("num_trades", "win_rate", "profit_factor")}
@@ -13,6 +13,7 @@ from typing import Any, Dict, List, Optional
 import numpy as np
 import pandas as pd
 
+from copilot_quant.backtest.round_trips import match_fill_records, round_trip_stats
 from copilot_quant.brokers.trade_database import TradeDatabase
 
 logger = logging.getLogger(__name__)
@@ -96,8 +97,9 @@ class PerformanceEngine:
             positions_value += position_value
             unrealized_pnl += qty * (current_price - avg_cost)
 
-        # Get realized PnL from trades
-        realized_pnl = self._calculate_realized_pnl()
+        # Get realized PnL from trades (matched once, shared with trade statistics)
+        round_trips = self._load_round_trips()
+        realized_pnl = self._calculate_realized_pnl(round_trips)
 
         # Portfolio metrics
         portfolio_value = current_cash + positions_value
@@ -113,7 +115,7 @@ class PerformanceEngine:
         max_dd, current_dd = self._calculate_drawdown_metrics(equity_curve)
 
         # Trade statistics
-        trade_stats = self._calculate_trade_statistics()
+        trade_stats = self._calculate_trade_statistics(round_trips)
 
         return PerformanceSnapshot(
             timestamp=datetime.now(),
@@ -193,50 +195,19 @@ class PerformanceEngine:
         else:
             raise ValueError(f"Invalid format: {format}")
 
-    def _calculate_realized_pnl(self) -> float:
-        """Calculate total realized PnL from closed positions"""
-        # Get all fills from database
+    def _load_round_trips(self) -> pd.DataFrame:
+        """Match all stored fills into FIFO round trips"""
         with self.trade_db.get_session() as session:
             from copilot_quant.brokers.trade_database import FillModel
 
-            fills = session.query(FillModel).all()
+            fills = session.query(FillModel).order_by(FillModel.timestamp, FillModel.id).all()
+            return match_fill_records(fills)
 
-            # Match buys with sells using FIFO
-            positions = {}  # {symbol: [(quantity, price), ...]}
-            realized_pnl = 0.0
-
-            for fill in fills:
-                symbol = fill.symbol
-                quantity = fill.quantity
-                price = fill.price
-
-                if symbol not in positions:
-                    positions[symbol] = []
-
-                # Determine if this is a buy or sell based on existing position
-                sum(q for q, p in positions[symbol])
-
-                if quantity > 0:  # Buy
-                    positions[symbol].append((quantity, price))
-                else:  # Sell (quantity is negative)
-                    sell_qty = abs(quantity)
-                    remaining_sell = sell_qty
-
-                    while remaining_sell > 0 and positions[symbol]:
-                        buy_qty, buy_price = positions[symbol][0]
-
-                        if buy_qty <= remaining_sell:
-                            # Close entire buy position
-                            realized_pnl += buy_qty * (price - buy_price)
-                            remaining_sell -= buy_qty
-                            positions[symbol].pop(0)
-                        else:
-                            # Partial close
-                            realized_pnl += remaining_sell * (price - buy_price)
-                            positions[symbol][0] = (buy_qty - remaining_sell, buy_price)
-                            remaining_sell = 0
-
-            return realized_pnl
+    def _calculate_realized_pnl(self, round_trips: Optional[pd.DataFrame] = None) -> float:
+        """Calculate total realized PnL (net of commission) from closed positions"""
+        if round_trips is None:
+            round_trips = self._load_round_trips()
+        return float(round_trips["pnl"].sum())
 
     def _build_equity_curve(self, current_positions: Dict[str, Dict[str, float]], current_cash: float) -> pd.Series:
         """Build equity curve from historical trade data"""
@@ -372,66 +343,13 @@ class PerformanceEngine:
 
         return max_drawdown, current_drawdown
 
-    def _calculate_trade_statistics(self) -> Dict[str, Any]:
-        """Calculate trade win rate and profit factor"""
-        # Get all closed trades (matched buy/sell pairs)
-        with self.trade_db.get_session() as session:
-            from copilot_quant.brokers.trade_database import FillModel
-
-            fills = session.query(FillModel).order_by(FillModel.timestamp).all()
-
-            # Match buys with sells
-            positions = {}  # {symbol: [(quantity, price), ...]}
-            trades_pnl = []
+    def _calculate_trade_statistics(self, round_trips: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+        """Calculate trade win rate and profit factor from FIFO round trips"""
+        if round_trips is None:
+            round_trips = self._load_round_trips()
 
-            for fill in fills:
-                symbol = fill.symbol
-                quantity = fill.quantity
-                price = fill.price
-
-                if symbol not in positions:
-                    positions[symbol] = []
-
-                if quantity > 0:  # Buy
-                    positions[symbol].append((quantity, price))
-                else:  # Sell
-                    sell_qty = abs(quantity)
-                    remaining_sell = sell_qty
-
-                    while remaining_sell > 0 and positions[symbol]:
-                        buy_qty, buy_price = positions[symbol][0]
-
-                        if buy_qty <= remaining_sell:
-                            pnl = buy_qty * (price - buy_price)
-                            trades_pnl.append(pnl)
-                            remaining_sell -= buy_qty
-                            positions[symbol].pop(0)
-                        else:
-                            pnl = remaining_sell * (price - buy_price)
-                            trades_pnl.append(pnl)
-                            positions[symbol][0] = (buy_qty - remaining_sell, buy_price)
-                            remaining_sell = 0
-
-            # Calculate statistics
-            if not trades_pnl:
-                return {"num_trades": 0, "num_winning": 0, "num_losing": 0, "win_rate": 0.0, "profit_factor": 0.0}
-
-            winning_trades = [t for t in trades_pnl if t > 0]
-            losing_trades = [t for t in trades_pnl if t < 0]
-
-            win_rate = len(winning_trades) / len(trades_pnl) if trades_pnl else 0.0
-
-            gross_profit = sum(winning_trades) if winning_trades else 0.0
-            gross_loss = abs(sum(losing_trades)) if losing_trades else 0.0
-            profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0.0
-
-            return {
-                "num_trades": len(trades_pnl),
-                "num_winning": len(winning_trades),
-                "num_losing": len(losing_trades),
-                "win_rate": win_rate,
-                "profit_factor": profit_factor,
-            }
+        stats = round_trip_stats(round_trips["pnl"])
+        return {key: stats[key] for key in ("num_trades", "num_winning", "num_losing", "win_rate", "profit_factor")}
 
     def _build_historical_snapshot(self, snapshot_date: date) -> Optional[Dict[str, Any]]:
         """Build performance snapshot for a historical date"""
@@ -20,7 +20,20 @@ __all__ = [
     "Fill",
     "Position",
     "BacktestResult",
+    "summarize_many",
     "PerformanceAnalyzer",
+    "OnlinePerformance",
+    "RobustnessAnalyzer",
+    "FeatureStore",
+    "BarWindow",
+    "MarketDataCursor",
+    "PortfolioHistory",
+    "ParameterSweep",
+    "ParameterGrid",
+    "RandomSearch",
+    "WalkForwardOptimizer",
+    "UniverseRunner",
+    "VectorizedBacktester",
     # Interface definitions
     "IDataFeed",
     "IBroker",
@@ -43,6 +56,46 @@ def __getattr__(name):
         from copilot_quant.backtest.metrics import PerformanceAnalyzer
 
         return PerformanceAnalyzer
+    elif name == "OnlinePerformance":
+        from copilot_quant.backtest.online import OnlinePerformance
+
+        return OnlinePerformance
+    elif name == "RobustnessAnalyzer":
+        from copilot_quant.backtest.robustness import RobustnessAnalyzer
+
+        return RobustnessAnalyzer
+    elif name == "FeatureStore":
+        from copilot_quant.backtest.features import FeatureStore
+
+        return FeatureStore
+    elif name == "BarWindow":
+        from copilot_quant.backtest.data_view import BarWindow
+
+        return BarWindow
+    elif name == "MarketDataCursor":
+        from copilot_quant.backtest.data_view import MarketDataCursor
+
+        return MarketDataCursor
+    elif name == "PortfolioHistory":
+        from copilot_quant.backtest.history import PortfolioHistory
+
+        return PortfolioHistory
+    elif name in ("ParameterSweep", "ParameterGrid", "RandomSearch"):
+        from copilot_quant.backtest import sweep
+
+        return getattr(sweep, name)
+    elif name == "WalkForwardOptimizer":
+        from copilot_quant.backtest.walk_forward import WalkForwardOptimizer
+
+        return WalkForwardOptimizer
+    elif name == "UniverseRunner":
+        from copilot_quant.backtest.universe import UniverseRunner
+
+        return UniverseRunner
+    elif name == "VectorizedBacktester":
+        from copilot_quant.backtest.vectorized import VectorizedBacktester
+
+        return VectorizedBacktester
     elif name == "MultiStrategyEngine":
         from copilot_quant.backtest.multi_strategy import MultiStrategyEngine
 
@@ -67,6 +120,10 @@ def __getattr__(name):
         from copilot_quant.backtest.results import BacktestResult
 
         return BacktestResult
+    elif name == "summarize_many":
+        from copilot_quant.backtest.results import summarize_many
+
+        return summarize_many
     elif name == "SignalBasedStrategy":
         from copilot_quant.backtest.signals import SignalBasedStrategy
 
@@ -0,0 +1,419 @@
+"""
+Incremental market data views for backtesting.
+
+This module provides a forward-only cursor over pre-sorted historical data and
+lightweight, read-only windows that strategies can consume without the engine
+rebuilding a growing DataFrame slice on every timestamp.
+"""
+
+from typing import Dict, Hashable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Supported values for Strategy.data_mode
+DATA_MODES = ("frame", "window")
+
+
+class MarketDataCursor:
+    """
+    Forward-only cursor over chronologically sorted market data.
+
+    The cursor sorts the data once, precomputes the row boundary of every
+    timestamp and converts columns to NumPy arrays on first access. Advancing
+    the cursor is O(1), so replaying N bars costs O(N) instead of the O(N²)
+    incurred by slicing ``data.loc[:timestamp]`` at every step.
+
+    Example:
+        >>> cursor = MarketDataCursor(data)
+        >>> window = cursor.window(lookback=20)
+        >>> for bar, timestamp in enumerate(cursor.timestamps):
+        ...     cursor.seek(bar)
+        ...     closes = window["Close"]  # last 20 bars, read-only
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        """
+        Initialize cursor.
+
+        Args:
+            data: Historical market data indexed by timestamp. Multiple rows may
+                  share a timestamp (long format with a ``Symbol`` column).
+        """
+        if not data.index.is_monotonic_increasing:
+            # Stable sort keeps the per-symbol row order of long-format data
+            data = data.sort_index(kind="mergesort")
+
+        self.data = data
+        self.timestamps = data.index.unique()
+        self._bar_ends = data.index.searchsorted(self.timestamps, side="right")
+        self._arrays: Dict[Hashable, np.ndarray] = {}
+        self.bar = -1
+
+    def __len__(self) -> int:
+        """Number of distinct timestamps (bars)."""
+        return len(self.timestamps)
+
+    def seek(self, bar: int) -> None:
+        """
+        Move the cursor to a bar.
+
+        Args:
+            bar: Zero-based index into ``timestamps``
+
+        Raises:
+            ValueError: If the bar is out of range or before the current position
+        """
+        if bar < self.bar:
+            raise ValueError(f"Cursor is forward-only: cannot move from bar {self.bar} to {bar}")
+        if bar >= len(self.timestamps):
+            raise ValueError(f"Bar {bar} out of range for {len(self.timestamps)} timestamps")
+        self.bar = bar
+
+    def row_bounds(self, lookback: Optional[int] = None) -> tuple:
+        """
+        Get the [start, end) row range visible at the current bar.
+
+        Args:
+            lookback: Maximum number of bars to include (None for full history)
+
+        Returns:
+            Tuple of (start_row, end_row)
+        """
+        if self.bar < 0:
+            return 0, 0
+
+        end = int(self._bar_ends[self.bar])
+        if lookback is None or lookback > self.bar:
+            return 0, end
+        return int(self._bar_ends[self.bar - lookback]), end
+
+    def frame(self, lookback: Optional[int] = None) -> pd.DataFrame:
+        """
+        Get data up to the current bar as a DataFrame.
+
+        Positional slicing of the pre-sorted frame avoids the label search and
+        copy of ``data.loc[:timestamp]``.
+
+        Args:
+            lookback: Maximum number of bars to include (None for full history)
+
+        Returns:
+            DataFrame slice of the visible rows
+        """
+        start, end = self.row_bounds(lookback)
+        return self.data.iloc[start:end]
+
+    def window(self, lookback: Optional[int] = None) -> "BarWindow":
+        """
+        Create a window that follows the cursor as it advances.
+
+        Args:
+            lookback: Maximum number of bars exposed by the window
+                      (None for full history)
+
+        Returns:
+            BarWindow bound to this cursor
+        """
+        return BarWindow(self, lookback)
+
+    def array(self, key: Hashable) -> np.ndarray:
+        """
+        Get the full read-only NumPy array for a column.
+
+        Args:
+            key: Column label (e.g. 'Close' or ('Close', 'AAPL'))
+
+        Returns:
+            Read-only array covering every row of the data
+
+        Raises:
+            KeyError: If the column does not exist
+        """
+        arr = self._arrays.get(key)
+        if arr is None:
+            column = self.data[key]
+            if isinstance(column, pd.DataFrame):
+                raise KeyError(f"Column {key!r} is not unique; use the full column label")
+            arr = column.to_numpy().view()
+            arr.flags.writeable = False
+            self._arrays[key] = arr
+        return arr
+
+
+class BarWindow:
+    """
+    Read-only, append-only view of market data up to the current bar.
+
+    The window is bound to a MarketDataCursor and grows as the engine advances
+    the cursor, optionally keeping only the most recent ``lookback`` bars.
+    Column access returns read-only NumPy views, so reading from the window
+    never copies data.
+
+    Strategies opt in by setting ``data_mode = "window"``; strategies that need
+    a DataFrame can call ``to_frame()``.
+
+    Example:
+        >>> class Momentum(Strategy):
+        ...     data_mode = "window"
+        ...     max_lookback = 20
+        ...
+        ...     def on_data(self, timestamp, data):
+        ...         closes = data["Close"]
+        ...         if len(closes) == 20 and closes[-1] > closes.mean():
+        ...             return [Order('SPY', 10, 'market', 'buy')]
+        ...         return []
+    """
+
+    def __init__(self, cursor: MarketDataCursor, lookback: Optional[int] = None):
+        """
+        Initialize window.
+
+        Args:
+            cursor: Cursor that drives the window
+            lookback: Maximum number of bars to expose (None for full history)
+        """
+        if lookback is not None and lookback <= 0:
+            raise ValueError(f"Invalid lookback: {lookback}. Must be positive")
+
+        self._cursor = cursor
+        self.lookback = lookback
+
+    def __len__(self) -> int:
+        """Number of rows currently visible."""
+        start, end = self._cursor.row_bounds(self.lookback)
+        return end - start
+
+    def __getitem__(self, key: Hashable) -> np.ndarray:
+        """Get the visible values of a column as a read-only array."""
+        start, end = self._cursor.row_bounds(self.lookback)
+        return self._cursor.array(key)[start:end]
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Check whether a column exists."""
+        return key in self._cursor.data.columns
+
+    @property
+    def columns(self) -> pd.Index:
+        """Column labels of the underlying data."""
+        return self._cursor.data.columns
+
+    @property
+    def index(self) -> pd.Index:
+        """Timestamps of the visible rows."""
+        start, end = self._cursor.row_bounds(self.lookback)
+        return self._cursor.data.index[start:end]
+
+    @property
+    def empty(self) -> bool:
+        """True if no rows are visible."""
+        return len(self) == 0
+
+    @property
+    def num_bars(self) -> int:
+        """Number of distinct timestamps currently visible."""
+        visible = self._cursor.bar + 1
+        if self.lookback is None:
+            return visible
+        return min(visible, self.lookback)
+
+    @property
+    def timestamp(self) -> Optional[pd.Timestamp]:
+        """Timestamp of the current bar, or None before the first bar."""
+        if self._cursor.bar < 0:
+            return None
+        return self._cursor.timestamps[self._cursor.bar]
+
+    def last(self, key: Hashable):
+        """
+        Get the most recent value of a column.
+
+        Args:
+            key: Column label
+
+        Returns:
+            Latest value, or None if the window is empty
+        """
+        values = self[key]
+        if len(values) == 0:
+            return None
+        return values[-1]
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Materialize the visible rows as a DataFrame.
+
+        Returns:
+            DataFrame slice equivalent to what legacy strategies receive
+        """
+        return self._cursor.frame(self.lookback)
+
+    def symbols(self) -> List[str]:
+        """
+        Get the symbols present in the data.
+
+        Returns:
+            List of symbols from a ``Symbol`` column or the second level of
+            multi-level columns, empty if neither is present
+        """
+        data = self._cursor.data
+        if isinstance(data.columns, pd.MultiIndex):
+            return list(data.columns.get_level_values(-1).unique())
+        if "Symbol" in data.columns:
+            return list(pd.unique(self._cursor.array("Symbol")))
+        return []
+
+    def __repr__(self) -> str:
+        """String representation of the window."""
+        return f"BarWindow(bars={self.num_bars}, rows={len(self)}, lookback={self.lookback})"
+
+
+class PriceMatrix:
+    """
+    Dense timestamp × symbol matrix of close prices.
+
+    Built once per backtest, the matrix turns every price lookup into O(1)
+    array indexing and lets the engine mark all positions to market with a
+    single vectorized operation per bar. Prices are forward-filled, so a
+    lookup returns the last known close at or before the bar, matching the
+    semantics of scanning the history for the latest non-missing value.
+
+    Supports the three data layouts produced by the engine's data fetch:
+    - Multi-level columns (Metric, Symbol)
+    - Long format with a ``Symbol`` column
+    - A single series without a ``Symbol`` column, where every symbol
+      resolves to the same prices
+
+    Example:
+        >>> prices = PriceMatrix(data, cursor.timestamps, symbols=['AAPL', 'MSFT'])
+        >>> prices.price(bar=10, symbol='AAPL')
+        >>> prices.row(bar=10)  # all symbols at once, aligned with prices.symbols
+    """
+
+    def __init__(
+        self,
+        data: pd.DataFrame,
+        timestamps: pd.Index,
+        symbols: Optional[List[str]] = None,
+        price_field: str = "Close",
+    ):
+        """
+        Initialize price matrix.
+
+        Args:
+            data: Historical market data in any supported layout
+            timestamps: Sorted unique timestamps defining the matrix rows
+            symbols: Symbols requested for the backtest (used to label single-series data)
+            price_field: Column holding the price to look up (default: 'Close')
+        """
+        self.timestamps = timestamps
+        self.price_field = price_field
+        self._single_series = False
+
+        if isinstance(data.columns, pd.MultiIndex):
+            values, columns = self._from_multiindex(data)
+        elif "Symbol" in data.columns:
+            values, columns = self._from_long_format(data)
+        else:
+            values, columns = self._from_single_series(data, symbols)
+            self._single_series = True
+
+        self.values = pd.DataFrame(values).ffill().to_numpy(dtype=float)
+        self.symbols: List[str] = list(columns)
+        self._symbol_ids: Dict[str, int] = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+    def _from_multiindex(self, data: pd.DataFrame) -> tuple:
+        """Extract prices from (Metric, Symbol) columns."""
+        if self.price_field not in data.columns.get_level_values(0):
+            return np.full((len(self.timestamps), 0), np.nan), []
+
+        prices = data[self.price_field]
+        if not prices.index.is_unique:
+            prices = prices.groupby(level=0).last()
+        prices = prices.reindex(self.timestamps)
+        return prices.to_numpy(dtype=float), [str(c) for c in prices.columns]
+
+    def _from_long_format(self, data: pd.DataFrame) -> tuple:
+        """Scatter long-format rows into the matrix, keeping the last row per (timestamp, symbol)."""
+        if self.price_field not in data.columns:
+            return np.full((len(self.timestamps), 0), np.nan), []
+
+        row_ids = self.timestamps.get_indexer(data.index)
+        symbol_ids, columns = pd.factorize(data["Symbol"])
+        closes = pd.to_numeric(data[self.price_field], errors="coerce").to_numpy(dtype=float)
+
+        keys = pd.Series(row_ids.astype(np.int64) * max(len(columns), 1) + symbol_ids)
+        keep = ~keys.duplicated(keep="last").to_numpy() & (row_ids >= 0) & (symbol_ids >= 0)
+
+        values = np.full((len(self.timestamps), len(columns)), np.nan)
+        values[row_ids[keep], symbol_ids[keep]] = closes[keep]
+        return values, [str(c) for c in columns]
+
+    def _from_single_series(self, data: pd.DataFrame, symbols: Optional[List[str]]) -> tuple:
+        """Use the only price column for every symbol."""
+        label = symbols[0] if symbols and len(symbols) == 1 else "__series__"
+        if self.price_field not in data.columns:
+            return np.full((len(self.timestamps), 0), np.nan), []
+
+        prices = data[self.price_field]
+        if not prices.index.is_unique:
+            prices = prices.groupby(level=0).last()
+        prices = pd.to_numeric(prices.reindex(self.timestamps), errors="coerce")
+        return prices.to_numpy(dtype=float).reshape(-1, 1), [label]
+
+    @property
+    def num_symbols(self) -> int:
+        """Number of symbol columns."""
+        return len(self.symbols)
+
+    def symbol_id(self, symbol: str) -> Optional[int]:
+        """
+        Get the column index for a symbol.
+
+        Single-series data registers unknown symbols as aliases of the only
+        price column, so each symbol still gets its own column.
+
+        Args:
+            symbol: Ticker symbol
+
+        Returns:
+            Column index, or None if the symbol has no prices
+        """
+        sid = self._symbol_ids.get(symbol)
+        if sid is None and self._single_series and self.num_symbols > 0:
+            self.values = np.column_stack([self.values, self.values[:, 0]])
+            self.symbols.append(symbol)
+            sid = self._symbol_ids[symbol] = self.num_symbols - 1
+        return sid
+
+    def price(self, bar: int, symbol: str) -> Optional[float]:
+        """
+        Get the last known price of a symbol at a bar.
+
+        Args:
+            bar: Row index into ``timestamps``
+            symbol: Ticker symbol
+
+        Returns:
+            Price, or None if the symbol has not traded yet
+        """
+        sid = self.symbol_id(symbol)
+        if sid is None or bar < 0:
+            return None
+
+        value = self.values[bar, sid]
+        if np.isnan(value):
+            return None
+        return float(value)
+
+    def row(self, bar: int) -> np.ndarray:
+        """
+        Get prices of all symbols at a bar.
+
+        Args:
+            bar: Row index into ``timestamps``
+
+        Returns:
+            Array aligned with ``symbols`` (NaN where no price is known yet)
+        """
+        return self.values[bar]
@@ -6,12 +6,17 @@ against historical market data.
 """
 
 import logging
-import uuid
 from datetime import datetime
 from typing import Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 
+from copilot_quant.backtest.data_view import DATA_MODES, BarWindow, MarketDataCursor, PriceMatrix
+from copilot_quant.backtest.features import FeatureStore
+from copilot_quant.backtest.history import PortfolioHistory
+from copilot_quant.backtest.ledger import TradeLedger
+from copilot_quant.backtest.online import OnlinePerformance
 from copilot_quant.backtest.orders import Fill, Order, Position
 from copilot_quant.backtest.results import BacktestResult
 from copilot_quant.backtest.strategy import Strategy
@@ -66,8 +71,19 @@ class BacktestEngine:
         self.strategy: Optional[Strategy] = None
         self.cash: float = initial_capital
         self.positions: Dict[str, Position] = {}
-        self.fills: List[Fill] = []
-        self.portfolio_history: List[dict] = []
+        self.ledger = TradeLedger()
+        self.history = PortfolioHistory(symbols=[])
+        self.performance = OnlinePerformance()
+        self.features = FeatureStore()
+
+        # Market data built once per run for O(1) price lookups
+        self._cursor: Optional[MarketDataCursor] = None
+        self._price_matrix: Optional[PriceMatrix] = None
+
+        # Per-symbol position state indexed by price matrix symbol id
+        self._quantities = np.zeros(0)
+        self._entry_prices = np.zeros(0)
+        self._unrealized = np.zeros(0)
 
         logger.info(
             f"Initialized BacktestEngine with ${initial_capital:,.2f} capital, "
@@ -80,11 +96,22 @@ class BacktestEngine:
 
         Args:
             strategy: Strategy instance to backtest
+
+        Raises:
+            ValueError: If the strategy requests an unknown data_mode
         """
+        self._validate_data_mode(strategy)
         self.strategy = strategy
         logger.info(f"Added strategy: {strategy.name}")
 
-    def run(self, start_date: datetime, end_date: datetime, symbols: List[str]) -> BacktestResult:
+    def run(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        symbols: List[str],
+        close_positions: bool = False,
+        warmup_bars: int = 0,
+    ) -> BacktestResult:
         """
         Execute backtest over date range.
 
@@ -92,15 +119,23 @@ class BacktestEngine:
             start_date: Start date for backtest
             end_date: End date for backtest
             symbols: List of symbols to trade
+            close_positions: Close every open position at the last bar with
+                             market orders, recorded in the ledger; the last
+                             bar of the portfolio history shows the flat book
+            warmup_bars: Leading bars of the fetched data that only build
+                         strategy history; strategies are first called and
+                         the portfolio first recorded at the bar after them
 
         Returns:
             BacktestResult with performance metrics and trade history
 
         Raises:
-            ValueError: If no strategy is registered
+            ValueError: If no strategy is registered or warmup_bars is negative
         """
         if self.strategy is None:
             raise ValueError("No strategy registered. Call add_strategy() first.")
+        if warmup_bars < 0:
+            raise ValueError(f"Invalid warmup_bars: {warmup_bars}. Must be non-negative")
 
         logger.info(f"Starting backtest: {start_date.date()} to {end_date.date()}, symbols={symbols}")
 
@@ -118,7 +153,9 @@ class BacktestEngine:
             return self._create_empty_result(start_date, end_date)
 
         # Run backtest loop
-        self._run_backtest_loop(data, symbols)
+        self._run_backtest_loop(data, symbols, warmup_bars)
+        if close_positions:
+            self._close_positions()
 
         # Finalize strategy
         self.strategy.finalize()
@@ -128,7 +165,7 @@ class BacktestEngine:
         total_return = (final_value - self.initial_capital) / self.initial_capital
 
         logger.info(
-            f"Backtest complete: Final value=${final_value:,.2f}, Return={total_return:.2%}, Trades={len(self.fills)}"
+            f"Backtest complete: Final value=${final_value:,.2f}, Return={total_return:.2%}, Trades={len(self.ledger)}"
         )
 
         # Create result object
@@ -139,8 +176,8 @@ class BacktestEngine:
             initial_capital=self.initial_capital,
             final_capital=final_value,
             total_return=total_return,
-            trades=self.fills.copy(),
-            portfolio_history=pd.DataFrame(self.portfolio_history),
+            history=self.history,
+            ledger=self.ledger,
         )
 
         return result
@@ -164,12 +201,31 @@ class BacktestEngine:
         """
         return self.positions.copy()
 
+    def get_performance(self) -> Dict:
+        """
+        Get running performance metrics for the bars recorded so far.
+
+        Updated in O(1) per bar, so strategies can read Sharpe, Sortino,
+        volatility and drawdown mid-run without rescanning the history.
+
+        Returns:
+            Dictionary from OnlinePerformance.snapshot()
+        """
+        return self.performance.snapshot()
+
     def _reset_state(self) -> None:
         """Reset engine state for new backtest."""
         self.cash = self.initial_capital
         self.positions = {}
-        self.fills = []
-        self.portfolio_history = []
+        self.ledger = TradeLedger()
+        self.history = PortfolioHistory(symbols=[])
+        self.performance = OnlinePerformance()
+        self.features = FeatureStore()
+        self._cursor = None
+        self._price_matrix = None
+        self._quantities = np.zeros(0)
+        self._entry_prices = np.zeros(0)
+        self._unrealized = np.zeros(0)
 
     def _fetch_data(self, symbols: List[str], start_date: datetime, end_date: datetime) -> pd.DataFrame:
         """Fetch historical data for symbols."""
@@ -189,102 +245,145 @@ class BacktestEngine:
             logger.error(f"Error fetching data: {e}")
             return pd.DataFrame()
 
-    def _run_backtest_loop(self, data: pd.DataFrame, symbols: List[str]) -> None:
+    def _run_backtest_loop(self, data: pd.DataFrame, symbols: List[str], warmup_bars: int = 0) -> None:
         """
         Main backtest loop - iterate through data chronologically.
 
         Args:
             data: Historical market data
             symbols: List of symbols being traded
+            warmup_bars: Leading bars added to the feature store and cursor
+                         history without calling the strategy
         """
-        # Get sorted timestamps
-        timestamps = sorted(data.index.unique())
-
-        for timestamp in timestamps:
-            # Get data for current timestamp
-            current_data = self._get_current_data(data, timestamp, symbols)
+        cursor = self._prepare_market_data(data, symbols)
+        window = self._create_strategy_window(cursor, self.strategy)
+        self.strategy.features = self.features
+
+        for bar, timestamp in enumerate(cursor.timestamps):
+            cursor.seek(bar)
+            self.features.append(timestamp, self._price_matrix.row(bar))
+            if bar < warmup_bars:
+                continue
 
             # Update unrealized PnL for all positions
-            self._update_positions_pnl(current_data)
+            self._update_positions_pnl()
 
             # Record portfolio value
             self._record_portfolio_state(timestamp)
 
             # Call strategy to get orders
             try:
-                orders = self.strategy.on_data(timestamp, current_data)
+                strategy_data = self._get_strategy_data(cursor, self.strategy, window)
+                orders = self.strategy.on_data(timestamp, strategy_data)
 
                 if orders is None:
                     orders = []
 
                 # Execute orders
                 for order in orders:
-                    self._execute_order(order, timestamp, current_data)
+                    self._execute_order(order, timestamp)
 
             except Exception as e:
                 logger.error(f"Strategy error at {timestamp}: {e}")
                 continue
 
-    def _get_current_data(self, data: pd.DataFrame, timestamp: datetime, symbols: List[str]) -> pd.DataFrame:
+    def _close_positions(self) -> None:
+        """Flatten every open position at the current bar's close."""
+        if self._cursor is None or self._cursor.bar < 0:
+            return
+
+        timestamp = self._cursor.timestamps[self._cursor.bar]
+        for symbol, position in list(self.positions.items()):
+            side = "sell" if position.quantity > 0 else "buy"
+            self._execute_order(
+                Order(symbol=symbol, quantity=abs(position.quantity), order_type="market", side=side), timestamp
+            )
+
+        # The bar was recorded before the closing fills; include their costs
+        if len(self.history):
+            values = self._entry_prices * np.abs(self._quantities) + self._unrealized
+            self.history.amend_last(cash=self.cash, quantities=self._quantities, values=values)
+
+    def _prepare_market_data(self, data: pd.DataFrame, symbols: List[str]) -> MarketDataCursor:
+        """
+        Build the per-run market data structures.
+
+        Sorts the data once behind a cursor (so the loop advances instead of
+        re-slicing at every timestamp) and builds the close-price matrix used
+        for all price lookups and mark-to-market.
+
+        Args:
+            data: Historical market data
+            symbols: List of symbols being traded
+
+        Returns:
+            Cursor positioned before the first bar
+        """
+        self._cursor = MarketDataCursor(data)
+        self._price_matrix = PriceMatrix(self._cursor.data, self._cursor.timestamps, symbols)
+        num_symbols = self._price_matrix.num_symbols
+        self._quantities = np.zeros(num_symbols)
+        self._entry_prices = np.zeros(num_symbols)
+        self._unrealized = np.zeros(num_symbols)
+        self.history = PortfolioHistory(symbols=self._price_matrix.symbols, capacity=len(self._cursor))
+        self.ledger = TradeLedger(symbols=self._price_matrix.symbols)
+        self.features = FeatureStore(symbols=self._price_matrix.symbols, capacity=len(self._cursor))
+        return self._cursor
+
+    def _validate_data_mode(self, strategy: Strategy) -> None:
+        """Ensure a strategy requests a supported data delivery mode."""
+        data_mode = getattr(strategy, "data_mode", "frame")
+        if data_mode not in DATA_MODES:
+            raise ValueError(f"Invalid data_mode: {data_mode}. Must be one of {DATA_MODES}")
+
+    def _create_strategy_window(self, cursor: MarketDataCursor, strategy: Strategy) -> Optional[BarWindow]:
+        """Create a BarWindow for strategies using the "window" data mode."""
+        if getattr(strategy, "data_mode", "frame") != "window":
+            return None
+        return cursor.window(lookback=getattr(strategy, "max_lookback", None))
+
+    def _get_strategy_data(self, cursor: MarketDataCursor, strategy: Strategy, window: Optional[BarWindow]):
         """
-        Get data available at current timestamp.
+        Get the market data passed to a strategy at the current bar.
 
-        Returns data up to and including current timestamp to avoid look-ahead bias.
+        Window-mode strategies receive their BarWindow; all others receive a
+        DataFrame bounded by the strategy's max_lookback.
         """
-        # Return all data up to current timestamp
-        available_data = data.loc[:timestamp]
-        return available_data
+        if window is not None:
+            return window
+        return cursor.frame(lookback=getattr(strategy, "max_lookback", None))
 
-    def _update_positions_pnl(self, current_data: pd.DataFrame) -> None:
+    def _update_positions_pnl(self) -> None:
         """Update unrealized PnL for all positions based on current prices."""
-        if current_data.empty:
+        if not self.positions or self._price_matrix is None:
             return
 
-        # Get latest prices for each symbol
-        for symbol, position in self.positions.items():
-            if position.quantity == 0:
-                continue
+        # Mark every symbol to market in one vectorized step
+        unrealized = (self._price_matrix.row(self._cursor.bar) - self._entry_prices) * self._quantities
+        np.copyto(self._unrealized, unrealized, where=~np.isnan(unrealized))
 
-            current_price = self._get_current_price(current_data, symbol)
-            if current_price is not None:
-                position.update_unrealized_pnl(current_price)
+        for symbol, position in self.positions.items():
+            sid = self._price_matrix.symbol_id(symbol)
+            # Positions without a known price keep their previous unrealized PnL
+            if sid is not None and not np.isnan(unrealized[sid]):
+                position.unrealized_pnl = float(unrealized[sid])
 
-    def _get_current_price(self, data: pd.DataFrame, symbol: str) -> Optional[float]:
+    def _get_current_price(self, symbol: str) -> Optional[float]:
         """Get current close price for a symbol."""
-        try:
-            # Handle different data structures
-            # Check for multi-level columns first
-            if isinstance(data.columns, pd.MultiIndex):
-                # Multi-symbol data with multi-level columns
-                if ("Close", symbol) in data.columns:
-                    prices = data[("Close", symbol)].dropna()
-                    if not prices.empty:
-                        return float(prices.iloc[-1])
-            elif "Symbol" in data.columns:
-                # Single symbol with Symbol column
-                symbol_data = data[data["Symbol"] == symbol]
-                if not symbol_data.empty:
-                    return float(symbol_data.iloc[-1]["Close"])
-            elif "Close" in data.columns:
-                # Single symbol without Symbol column
-                if not data.empty:
-                    return float(data.iloc[-1]["Close"])
-
-            return None
-        except (KeyError, IndexError, ValueError):
+        if self._price_matrix is None or self._cursor is None:
             return None
+        return self._price_matrix.price(self._cursor.bar, symbol)
 
-    def _execute_order(self, order: Order, timestamp: datetime, current_data: pd.DataFrame) -> None:
+    def _execute_order(self, order: Order, timestamp: datetime) -> None:
         """
         Execute an order with simulated fills.
 
         Args:
             order: Order to execute
             timestamp: Current timestamp
-            current_data: Current market data
         """
         # Get current price for the symbol
-        current_price = self._get_current_price(current_data, order.symbol)
+        current_price = self._get_current_price(order.symbol)
 
         if current_price is None:
             logger.warning(f"Cannot execute order - no price data for {order.symbol}")
@@ -318,14 +417,14 @@ class BacktestEngine:
             fill_quantity=order.quantity,
             commission=commission,
             timestamp=timestamp,
-            fill_id=str(uuid.uuid4()),
+            fill_id=len(self.ledger),
         )
 
         # Update cash and positions
         self._process_fill(fill, current_price)
 
-        # Record fill
-        self.fills.append(fill)
+        # Record fill (the Fill object itself is not retained)
+        self.ledger.append_fill(fill)
 
         # Notify strategy
         self.strategy.on_fill(fill)
@@ -394,24 +493,39 @@ class BacktestEngine:
         if self.positions[symbol].quantity == 0:
             del self.positions[symbol]
 
-    def _record_portfolio_state(self, timestamp: datetime) -> None:
-        """Record current portfolio state for history."""
-        portfolio_value = self.get_portfolio_value()
-
-        state = {
-            "timestamp": timestamp,
-            "portfolio_value": portfolio_value,
-            "cash": self.cash,
-            "positions_value": portfolio_value - self.cash,
-            "num_positions": len(self.positions),
-        }
-
-        # Add individual position values
-        for symbol, position in self.positions.items():
-            state[f"position_{symbol}"] = position.quantity
-            state[f"value_{symbol}"] = position.market_value
+        self._sync_position_arrays(symbol)
 
-        self.portfolio_history.append(state)
+    def _sync_position_arrays(self, symbol: str) -> None:
+        """Mirror a symbol's position into the arrays used for vectorized mark-to-market."""
+        if self._price_matrix is None:
+            return
+
+        sid = self._price_matrix.symbol_id(symbol)
+        if sid is None:
+            return
+
+        if sid >= len(self._quantities):
+            self._grow_position_arrays()
+
+        position = self.positions.get(symbol)
+        self._quantities[sid] = position.quantity if position is not None else 0.0
+        self._entry_prices[sid] = position.avg_entry_price if position is not None else 0.0
+        self._unrealized[sid] = position.unrealized_pnl if position is not None else 0.0
+
+    def _grow_position_arrays(self) -> None:
+        """Add columns for symbol aliases registered mid-run by single-series data."""
+        extra = self._price_matrix.num_symbols - len(self._quantities)
+        self._quantities = np.concatenate([self._quantities, np.zeros(extra)])
+        self._entry_prices = np.concatenate([self._entry_prices, np.zeros(extra)])
+        self._unrealized = np.concatenate([self._unrealized, np.zeros(extra)])
+        self.history.add_symbols(self._price_matrix.symbols[len(self.history.symbols) :])
+        self.features.add_symbols(self._price_matrix.symbols[len(self.features.symbols) :])
+
+    def _record_portfolio_state(self, timestamp: datetime) -> None:
+        """Record current portfolio state for history and running performance metrics."""
+        values = self._entry_prices * np.abs(self._quantities) + self._unrealized
+        portfolio_value = self.history.record(timestamp, cash=self.cash, quantities=self._quantities, values=values)
+        self.performance.update(portfolio_value, timestamp)
 
     def _create_empty_result(self, start_date: datetime, end_date: datetime) -> BacktestResult:
         """Create an empty result when no data is available."""
@@ -423,5 +537,4 @@ class BacktestEngine:
             final_capital=self.initial_capital,
             total_return=0.0,
             trades=[],
-            portfolio_history=pd.DataFrame(),
         )
@@ -0,0 +1,594 @@
+"""
+Shared rolling indicator cache for strategies.
+
+Strategies running side by side, or one strategy evaluating many pairs,
+tend to recompute the same rolling means, standard deviations and z-scores
+over the same windows at every bar. FeatureStore is owned by the engine,
+receives one row of prices per bar, and computes each (symbol, indicator,
+window) once: every requested window keeps running sums that are updated
+in O(1) per tracked column as a bar enters and an old bar leaves. Results
+are memoized for the whole run and returned as read-only NumPy views, so
+any number of strategies can read them without recomputation.
+"""
+
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Supported indicators for FeatureStore.panel
+INDICATORS = ("mean", "std", "zscore")
+
+# Variances below this fraction of the window's mean square are rounding noise
+VARIANCE_NOISE_FLOOR = 1e-12
+
+
+def _readonly(arr: np.ndarray) -> np.ndarray:
+    """Return a read-only view of an array."""
+    view = arr.view()
+    view.flags.writeable = False
+    return view
+
+
+class _RollingWindow:
+    """
+    Running sums for one window length.
+
+    Columns are pairs of symbol ids: the diagonal pair (i, i) of every symbol
+    gives its mean and variance, and cross pairs registered on demand give
+    covariances. Sums are kept over prices centered on each symbol's first
+    price, and recomputed exactly once per window length, so rounding error
+    cannot build up over long runs.
+    """
+
+    def __init__(self, store: "FeatureStore", window: int):
+        """Create sums for every symbol and backfill the bars already stored."""
+        num_symbols = len(store.symbols)
+        capacity = store.capacity
+
+        self.window = window
+        self.left = np.arange(num_symbols)
+        self.right = np.arange(num_symbols)
+        self.diag = np.arange(num_symbols)
+        self.pair_ids: Dict[Tuple[int, int], int] = {(i, i): i for i in range(num_symbols)}
+
+        self.count = np.zeros(num_symbols, dtype=np.int64)
+        self.sum_x = np.zeros(num_symbols)
+        self.sum_y = np.zeros(num_symbols)
+        self.sum_xy = np.zeros(num_symbols)
+
+        self.mean = np.full((capacity, num_symbols), np.nan)
+        self.std = np.full((capacity, num_symbols), np.nan)
+        self.zscore = np.full((capacity, num_symbols), np.nan)
+        self.cov = np.full((capacity, num_symbols), np.nan)
+
+        self._backfill(store, np.arange(num_symbols))
+        self._resync(store)
+
+    @property
+    def num_pairs(self) -> int:
+        """Number of tracked columns."""
+        return len(self.left)
+
+    def add_symbols(self, first_id: int, last_id: int) -> None:
+        """Track new symbols; they have no history before they are added."""
+        new_ids = np.arange(first_id, last_id)
+        pair_ids = np.arange(self.num_pairs, self.num_pairs + len(new_ids))
+        self.pair_ids.update({(int(sid), int(sid)): int(pid) for sid, pid in zip(new_ids, pair_ids, strict=True)})
+        self.diag = np.concatenate([self.diag, pair_ids])
+        self._add_columns(new_ids, new_ids)
+
+        extra = np.full((len(self.mean), len(new_ids)), np.nan)
+        self.mean = np.hstack([self.mean, extra])
+        self.std = np.hstack([self.std, extra.copy()])
+        self.zscore = np.hstack([self.zscore, extra.copy()])
+
+    def add_pair(self, store: "FeatureStore", i: int, j: int) -> int:
+        """Track the covariance of two symbols and backfill its history."""
+        pair_id = self.num_pairs
+        self._add_columns(np.array([i]), np.array([j]))
+        self._backfill(store, np.array([pair_id]))
+        self._resync(store)
+        # Publish last: FeatureStore.rolling_cov reads pair_ids without the lock
+        self.pair_ids[(i, j)] = self.pair_ids[(j, i)] = pair_id
+        return pair_id
+
+    def grow(self, capacity: int) -> None:
+        """Extend the output arrays to a new row capacity."""
+        extra = capacity - len(self.mean)
+        self.mean = np.vstack([self.mean, np.full((extra, self.mean.shape[1]), np.nan)])
+        self.std = np.vstack([self.std, np.full((extra, self.std.shape[1]), np.nan)])
+        self.zscore = np.vstack([self.zscore, np.full((extra, self.zscore.shape[1]), np.nan)])
+        self.cov = np.vstack([self.cov, np.full((extra, self.num_pairs), np.nan)])
+
+    def update(self, store: "FeatureStore") -> None:
+        """Slide the window onto the newest row and write its outputs."""
+        row = len(store) - 1
+        if (row + 1) % self.window == 0:
+            self._resync(store)
+        else:
+            entering = store._centered(row)
+            self._apply(entering[self.left], entering[self.right], +1)
+            if row >= self.window:
+                leaving = store._centered(row - self.window)
+                self._apply(leaving[self.left], leaving[self.right], -1)
+        self._write(store, row)
+
+    def replace_last(self, store: "FeatureStore", previous: np.ndarray) -> None:
+        """Swap the newest row's previous centered values for its current ones."""
+        row = len(store) - 1
+        if (row + 1) % self.window == 0:
+            self._resync(store)
+        else:
+            current = store._centered(row)
+            self._apply(previous[self.left], previous[self.right], -1)
+            self._apply(current[self.left], current[self.right], +1)
+        self._write(store, row)
+
+    def _add_columns(self, left: np.ndarray, right: np.ndarray) -> None:
+        """Append pair columns with empty sums."""
+        count = len(left)
+        self.left = np.concatenate([self.left, left])
+        self.right = np.concatenate([self.right, right])
+        self.count = np.concatenate([self.count, np.zeros(count, dtype=np.int64)])
+        self.sum_x = np.concatenate([self.sum_x, np.zeros(count)])
+        self.sum_y = np.concatenate([self.sum_y, np.zeros(count)])
+        self.sum_xy = np.concatenate([self.sum_xy, np.zeros(count)])
+        self.cov = np.hstack([self.cov, np.full((len(self.cov), count), np.nan)])
+
+    def _apply(self, x: np.ndarray, y: np.ndarray, sign: int) -> None:
+        """Add (+1) or remove (-1) one row of centered values from the sums."""
+        valid = ~(np.isnan(x) | np.isnan(y))
+        x, y = np.where(valid, x, 0.0), np.where(valid, y, 0.0)
+        self.count += sign * valid
+        self.sum_x += sign * x
+        self.sum_y += sign * y
+        self.sum_xy += sign * x * y
+
+    def _resync(self, store: "FeatureStore") -> None:
+        """Recompute the sums exactly from the rows inside the window."""
+        start = max(len(store) - self.window, 0)
+        centered = store._centered(slice(start, len(store)))
+        x, y = centered[:, self.left], centered[:, self.right]
+        valid = ~(np.isnan(x) | np.isnan(y))
+        x, y = np.where(valid, x, 0.0), np.where(valid, y, 0.0)
+        self.count = valid.sum(axis=0)
+        self.sum_x = x.sum(axis=0)
+        self.sum_y = y.sum(axis=0)
+        self.sum_xy = (x * y).sum(axis=0)
+
+    def _write(self, store: "FeatureStore", row: int) -> None:
+        """Write mean, std, z-score and covariance for a row."""
+        w = self.window
+        full = self.count == w
+        comoment = self.sum_xy - self.sum_x * self.sum_y / w
+        self.cov[row] = np.where(full, comoment / (w - 1), np.nan)
+
+        diag = self.diag
+        variance = self.cov[row, diag]
+        variance[variance < VARIANCE_NOISE_FLOOR * self.sum_xy[diag] / w] = 0.0
+        self.cov[row, diag] = variance
+
+        mean = self.sum_x[diag] / w + store._reference
+        self.mean[row] = np.where(full[diag], mean, np.nan)
+        self.std[row] = np.sqrt(variance)
+        self.zscore[row] = self._zscore(store._prices[row], self.mean[row], self.std[row])
+
+    def _backfill(self, store: "FeatureStore", pair_ids: np.ndarray) -> None:
+        """Compute outputs for stored rows with pandas rolling windows."""
+        size = len(store)
+        if size == 0:
+            return
+
+        prices = pd.DataFrame(store._prices[:size])
+        diag = pair_ids[self.left[pair_ids] == self.right[pair_ids]]
+        if len(diag):
+            symbol_ids = self.left[diag]
+            rolling = prices[symbol_ids].rolling(self.window)
+            mean, std = rolling.mean().to_numpy(), rolling.std().to_numpy()
+            self.mean[:size, symbol_ids] = mean
+            self.std[:size, symbol_ids] = std
+            self.zscore[:size, symbol_ids] = self._zscore(store._prices[:size, symbol_ids], mean, std)
+            self.cov[:size, diag] = std**2
+
+        for pair_id in pair_ids[self.left[pair_ids] != self.right[pair_ids]]:
+            i, j = self.left[pair_id], self.right[pair_id]
+            self.cov[:size, pair_id] = prices[i].rolling(self.window).cov(prices[j]).to_numpy()
+
+    @staticmethod
+    def _zscore(prices: np.ndarray, mean: np.ndarray, std: np.ndarray) -> np.ndarray:
+        """Z-score of prices, NaN where the standard deviation is zero or unknown."""
+        return np.divide(prices - mean, std, out=np.full(np.shape(prices), np.nan), where=std > 0)
+
+
+class FeatureStore:
+    """
+    Incrementally updated rolling indicators shared across strategies.
+
+    The engine appends one row of prices (aligned with ``symbols``) per bar.
+    The first request for a window backfills it over the bars already
+    stored; from then on every append updates it in O(1) per symbol. Every
+    indicator for that window is computed for all symbols at once and kept
+    for the whole run, so a second strategy asking for the same window reads
+    the cached arrays.
+
+    Missing prices are forward-filled. Indicators are NaN until a symbol has
+    ``window`` prices, and standard deviations use ``ddof=1``, matching
+    ``pandas.Series.rolling(window)``.
+
+    The stored prices double as a wide (bars × symbols) panel that grows by
+    one row per bar. ``price_panel`` and ``price_frame`` expose it with
+    ``symbol_index`` for column lookup, so strategies fed long-format data
+    never need to pivot or filter it by symbol.
+
+    Example:
+        >>> class MeanReversion(Strategy):
+        ...     def on_data(self, timestamp, data):
+        ...         zscore = self.features.zscore('AAPL', 20)  # read-only view
+        ...         if len(zscore) and zscore[-1] < -2:
+        ...             return [Order('AAPL', 10, 'market', 'buy')]
+        ...         return []
+    """
+
+    def __init__(self, symbols: Sequence[str] = (), capacity: int = 0, chunk_size: int = 1024):
+        """
+        Initialize store.
+
+        Args:
+            symbols: Symbols in column order (e.g. PriceMatrix.symbols)
+            capacity: Number of bars to preallocate
+            chunk_size: Number of rows added each time capacity is exhausted
+
+        Raises:
+            ValueError: If chunk_size is not positive
+        """
+        if chunk_size <= 0:
+            raise ValueError(f"Invalid chunk_size: {chunk_size}. Must be positive")
+
+        self.symbols: List[str] = list(symbols)
+        self.chunk_size = chunk_size
+        self._symbol_ids: Dict[str, int] = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._size = 0
+
+        capacity = max(capacity, 0)
+        self._timestamps = np.empty(capacity, dtype=object)
+        self._prices = np.full((capacity, len(self.symbols)), np.nan)
+        self._reference = np.full(len(self.symbols), np.nan)
+        self._windows: Dict[int, _RollingWindow] = {}
+        # Guards lazy window and pair creation when strategies run on threads
+        self._lock = threading.RLock()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        """Number of stored bars."""
+        return self._size
+
+    def __contains__(self, symbol: str) -> bool:
+        """Check whether a symbol has a column."""
+        return symbol in self._symbol_ids
+
+    @property
+    def capacity(self) -> int:
+        """Number of rows currently allocated."""
+        return len(self._timestamps)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Timestamps of the stored bars."""
+        return _readonly(self._timestamps[: self._size])
+
+    @property
+    def last_timestamp(self) -> Optional[datetime]:
+        """Timestamp of the newest bar, or None when empty."""
+        return self._timestamps[self._size - 1] if self._size else None
+
+    @property
+    def windows(self) -> List[int]:
+        """Window lengths computed so far."""
+        return sorted(self._windows)
+
+    def add_symbols(self, symbols: Sequence[str]) -> None:
+        """
+        Append symbol columns (e.g. aliases registered mid-run).
+
+        Symbols added after the first bar have no earlier history.
+
+        Args:
+            symbols: New symbols, appended in column order
+        """
+        symbols = [symbol for symbol in symbols if symbol not in self._symbol_ids]
+        if not symbols:
+            return
+
+        first_id = len(self.symbols)
+        for symbol in symbols:
+            self._symbol_ids[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+
+        extra = np.full((self.capacity, len(symbols)), np.nan)
+        self._prices = np.hstack([self._prices, extra])
+        self._reference = np.concatenate([self._reference, np.full(len(symbols), np.nan)])
+        for rolling in self._windows.values():
+            rolling.add_symbols(first_id, len(self.symbols))
+
+    def append(self, timestamp: datetime, prices: Sequence[float]) -> None:
+        """
+        Add one bar and update every computed window.
+
+        Args:
+            timestamp: Bar timestamp
+            prices: Price per symbol in column order; may be shorter than
+                    ``symbols`` (missing trailing values are treated as NaN)
+
+        Raises:
+            ValueError: If more prices than symbols are given
+        """
+        values = np.asarray(prices, dtype=float)
+        if len(values) > len(self.symbols):
+            raise ValueError(f"Invalid prices: got {len(values)} values for {len(self.symbols)} symbols")
+
+        if self._size == self.capacity:
+            self._grow()
+
+        row = self._size
+        self._prices[row, : len(values)] = values
+        if row > 0:
+            missing = np.isnan(self._prices[row])
+            self._prices[row, missing] = self._prices[row - 1, missing]
+
+        first_seen = np.isnan(self._reference) & ~np.isnan(self._prices[row])
+        self._reference[first_seen] = self._prices[row, first_seen]
+        self._timestamps[row] = timestamp
+        self._size += 1
+
+        for rolling in self._windows.values():
+            rolling.update(self)
+
+    def update_last(self, prices: Sequence[float]) -> None:
+        """
+        Revise the newest bar in place (e.g. intrabar ticks of a live bar).
+
+        Args:
+            prices: Price per symbol in column order; may be shorter than
+                    ``symbols`` (missing values keep the bar's current price)
+
+        Raises:
+            ValueError: If the store is empty or more prices than symbols are given
+        """
+        values = np.asarray(prices, dtype=float)
+        if not self._size:
+            raise ValueError("Cannot update the last bar of an empty feature store")
+        if len(values) > len(self.symbols):
+            raise ValueError(f"Invalid prices: got {len(values)} values for {len(self.symbols)} symbols")
+
+        row = self._size - 1
+        previous = self._centered(row)
+        given = ~np.isnan(values)
+        self._prices[row, : len(values)][given] = values[given]
+
+        first_seen = np.isnan(self._reference) & ~np.isnan(self._prices[row])
+        self._reference[first_seen] = self._prices[row, first_seen]
+
+        for rolling in self._windows.values():
+            rolling.replace_last(self, previous)
+
+    def extend(self, prices: pd.DataFrame) -> None:
+        """
+        Append bars from a wide price frame (one column per symbol).
+
+        Columns for unknown symbols are ignored.
+
+        Args:
+            prices: Prices indexed by timestamp, in chronological order
+        """
+        values = prices.reindex(columns=self.symbols).to_numpy(dtype=float)
+        for timestamp, row in zip(prices.index, values, strict=True):
+            self.append(timestamp, row)
+
+    def prices(self, symbol: str) -> np.ndarray:
+        """
+        Get the stored (forward-filled) prices of a symbol.
+
+        Args:
+            symbol: Ticker symbol
+
+        Returns:
+            Read-only view with one value per stored bar
+
+        Raises:
+            KeyError: If the symbol is unknown
+        """
+        return _readonly(self._prices[: self._size, self._symbol_id(symbol)])
+
+    def symbol_index(self, symbol: str) -> int:
+        """
+        Get the panel column of a symbol.
+
+        Args:
+            symbol: Ticker symbol
+
+        Returns:
+            Column index into ``price_panel`` and the indicator panels
+
+        Raises:
+            KeyError: If the symbol is unknown
+        """
+        return self._symbol_id(symbol)
+
+    def price_panel(self, lookback: Optional[int] = None) -> np.ndarray:
+        """
+        Get the stored (forward-filled) prices of every symbol.
+
+        Args:
+            lookback: Maximum number of most recent bars (None for all bars)
+
+        Returns:
+            Read-only (bars × symbols) view aligned with ``symbols``
+
+        Raises:
+            ValueError: If lookback is not positive
+        """
+        return _readonly(self._prices[self._rows(lookback)])
+
+    def price_frame(self, lookback: Optional[int] = None) -> pd.DataFrame:
+        """
+        Get the stored prices as a wide DataFrame without pivoting.
+
+        The frame wraps the panel without copying it, so it is equivalent to
+        ``pivot_table(columns='Symbol', values='Close')`` on the long data
+        followed by a forward fill.
+
+        Args:
+            lookback: Maximum number of most recent bars (None for all bars)
+
+        Returns:
+            DataFrame indexed by timestamp with one column per symbol
+
+        Raises:
+            ValueError: If lookback is not positive
+        """
+        rows = self._rows(lookback)
+        return pd.DataFrame(
+            _readonly(self._prices[rows]),
+            index=pd.Index(self._timestamps[rows]),
+            columns=self.symbols,
+            copy=False,
+        )
+
+    def rolling_mean(self, symbol: str, window: int) -> np.ndarray:
+        """
+        Get the rolling mean of a symbol's prices.
+
+        Args:
+            symbol: Ticker symbol
+            window: Window length in bars (at least 2)
+
+        Returns:
+            Read-only view with one value per stored bar (NaN during warm-up)
+        """
+        return _readonly(self._rolling(window).mean[: self._size, self._symbol_id(symbol)])
+
+    def rolling_std(self, symbol: str, window: int) -> np.ndarray:
+        """
+        Get the rolling sample standard deviation of a symbol's prices.
+
+        Args:
+            symbol: Ticker symbol
+            window: Window length in bars (at least 2)
+
+        Returns:
+            Read-only view with one value per stored bar (NaN during warm-up)
+        """
+        return _readonly(self._rolling(window).std[: self._size, self._symbol_id(symbol)])
+
+    def zscore(self, symbol: str, window: int) -> np.ndarray:
+        """
+        Get the rolling z-score of a symbol's price against its rolling mean.
+
+        Args:
+            symbol: Ticker symbol
+            window: Window length in bars (at least 2)
+
+        Returns:
+            Read-only view with one value per stored bar (NaN during warm-up
+            or when the window has no variance)
+        """
+        return _readonly(self._rolling(window).zscore[: self._size, self._symbol_id(symbol)])
+
+    def rolling_cov(self, symbol1: str, symbol2: str, window: int) -> np.ndarray:
+        """
+        Get the rolling sample covariance of two symbols' prices.
+
+        The first request for a pair backfills it; later bars update it in
+        O(1). Passing the same symbol twice gives its rolling variance.
+
+        Args:
+            symbol1: First ticker symbol
+            symbol2: Second ticker symbol
+            window: Window length in bars (at least 2)
+
+        Returns:
+            Read-only view with one value per stored bar (NaN during warm-up)
+        """
+        rolling = self._rolling(window)
+        key = (self._symbol_id(symbol1), self._symbol_id(symbol2))
+        pair_id = rolling.pair_ids.get(key)
+        if pair_id is None:
+            with self._lock:
+                pair_id = rolling.pair_ids.get(key)
+                if pair_id is None:
+                    pair_id = rolling.add_pair(self, *key)
+        return _readonly(rolling.cov[: self._size, pair_id])
+
+    def panel(self, indicator: str, window: int) -> np.ndarray:
+        """
+        Get an indicator for all symbols at once.
+
+        Args:
+            indicator: One of 'mean', 'std', 'zscore'
+            window: Window length in bars (at least 2)
+
+        Returns:
+            Read-only (bars × symbols) view aligned with ``symbols``
+
+        Raises:
+            ValueError: If the indicator is not supported
+        """
+        if indicator not in INDICATORS:
+            raise ValueError(f"Invalid indicator: {indicator}. Must be one of {INDICATORS}")
+        return _readonly(getattr(self._rolling(window), indicator)[: self._size])
+
+    def _rolling(self, window: int) -> _RollingWindow:
+        """Get the sums for a window, creating and backfilling them on first use."""
+        rolling = self._windows.get(window)
+        if rolling is not None:
+            return rolling
+        if int(window) != window or window < 2:
+            raise ValueError(f"Invalid window: {window}. Must be an integer of at least 2")
+
+        with self._lock:
+            rolling = self._windows.get(window)
+            if rolling is None:
+                rolling = self._windows[window] = _RollingWindow(self, int(window))
+                logger.debug(f"Feature store computing window {window} for {len(self.symbols)} symbols")
+        return rolling
+
+    def _symbol_id(self, symbol: str) -> int:
+        """Get the column of a symbol."""
+        sid = self._symbol_ids.get(symbol)
+        if sid is None:
+            raise KeyError(f"Unknown symbol: {symbol}")
+        return sid
+
+    def _rows(self, lookback: Optional[int]) -> slice:
+        """Slice of the most recent ``lookback`` stored rows."""
+        if lookback is None:
+            return slice(0, self._size)
+        if lookback <= 0:
+            raise ValueError(f"Invalid lookback: {lookback}. Must be positive")
+        return slice(max(self._size - lookback, 0), self._size)
+
+    def _centered(self, rows) -> np.ndarray:
+        """Prices minus each symbol's first price, for numerically stable sums."""
+        return self._prices[rows] - self._reference
+
+    def _grow(self) -> None:
+        """Extend all arrays by one chunk."""
+        new_capacity = self.capacity + self.chunk_size
+        self._timestamps = np.resize(self._timestamps, new_capacity)
+        self._prices = np.vstack([self._prices, np.full((self.chunk_size, len(self.symbols)), np.nan)])
+        for rolling in self._windows.values():
+            rolling.grow(new_capacity)
@@ -0,0 +1,296 @@
+"""
+Columnar portfolio history recording for backtesting.
+
+This module provides a NumPy-backed recorder for per-bar portfolio state.
+Instead of appending one dictionary per bar (with a key per held symbol),
+the recorder writes into preallocated dense arrays indexed by bar and
+symbol id, and only builds the wide DataFrame when it is requested.
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class PortfolioHistory:
+    """
+    Preallocated, chunk-growing store of portfolio state per bar.
+
+    Scalar series (cash, portfolio value, positions value, number of positions)
+    are stored in 1-D arrays; per-symbol quantity and market value are stored
+    in dense (bars × symbols) arrays where NaN marks "no position". Capacity
+    grows by ``chunk_size`` rows whenever it is exhausted.
+
+    Example:
+        >>> history = PortfolioHistory(symbols=['AAPL', 'MSFT'], capacity=252)
+        >>> history.record(timestamp, cash=90000.0, quantities=qty, values=val)
+        >>> history.to_frame()  # same layout as the legacy per-bar dict records
+    """
+
+    def __init__(self, symbols: List[str], capacity: int = 0, chunk_size: int = 1024):
+        """
+        Initialize recorder.
+
+        Args:
+            symbols: Symbols in symbol-id order (e.g. PriceMatrix.symbols)
+            capacity: Number of bars to preallocate (e.g. the number of timestamps)
+            chunk_size: Number of rows added each time capacity is exhausted
+        """
+        if chunk_size <= 0:
+            raise ValueError(f"Invalid chunk_size: {chunk_size}. Must be positive")
+
+        self.symbols = list(symbols)
+        self.chunk_size = chunk_size
+        self._size = 0
+
+        capacity = max(capacity, 0)
+        self._timestamps = np.empty(capacity, dtype=object)
+        self._cash = np.empty(capacity)
+        self._portfolio_value = np.empty(capacity)
+        self._positions_value = np.empty(capacity)
+        self._num_positions = np.empty(capacity, dtype=np.int64)
+        self._quantities = np.full((capacity, len(self.symbols)), np.nan)
+        self._values = np.full((capacity, len(self.symbols)), np.nan)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        timestamps: np.ndarray,
+        symbols: List[str],
+        cash: np.ndarray,
+        quantities: np.ndarray,
+        values: np.ndarray,
+    ) -> "PortfolioHistory":
+        """
+        Build a history from complete per-bar arrays in one step.
+
+        Used by vectorized backtests, which compute every bar at once instead
+        of recording them one by one.
+
+        Args:
+            timestamps: Timestamp per bar
+            symbols: Symbols in column order
+            cash: Cash balance per bar
+            quantities: Position quantity per bar and symbol (0 for flat)
+            values: Position market value per bar and symbol
+
+        Returns:
+            PortfolioHistory with one row per bar
+        """
+        history = cls(symbols=symbols, capacity=0)
+        held = quantities != 0
+        positions_value = np.where(held, values, 0.0).sum(axis=1)
+
+        history._timestamps = np.asarray(timestamps, dtype=object)
+        history._cash = np.asarray(cash, dtype=float)
+        history._positions_value = positions_value
+        history._portfolio_value = history._cash + positions_value
+        history._num_positions = held.sum(axis=1).astype(np.int64)
+        history._quantities = np.where(held, quantities, np.nan)
+        history._values = np.where(held, values, np.nan)
+        history._size = len(history._cash)
+        return history
+
+    def __len__(self) -> int:
+        """Number of recorded bars."""
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        """Number of rows currently allocated."""
+        return len(self._cash)
+
+    def add_symbols(self, symbols: List[str]) -> None:
+        """
+        Append symbol columns (e.g. aliases registered mid-run).
+
+        Args:
+            symbols: New symbols, appended in symbol-id order
+        """
+        if not symbols:
+            return
+
+        extra = np.full((self.capacity, len(symbols)), np.nan)
+        self._quantities = np.hstack([self._quantities, extra])
+        self._values = np.hstack([self._values, extra.copy()])
+        self.symbols.extend(symbols)
+
+    def record(
+        self,
+        timestamp: datetime,
+        cash: float,
+        quantities: np.ndarray,
+        values: np.ndarray,
+    ) -> float:
+        """
+        Record portfolio state for one bar.
+
+        Args:
+            timestamp: Bar timestamp
+            cash: Cash balance
+            quantities: Position quantity per symbol id (0 for flat)
+            values: Position market value per symbol id
+
+        Returns:
+            Recorded portfolio value
+        """
+        if self._size == self.capacity:
+            self._grow()
+
+        portfolio_value = self._write(self._size, timestamp, cash, quantities, values)
+        self._size += 1
+        return portfolio_value
+
+    def amend_last(self, cash: float, quantities: np.ndarray, values: np.ndarray) -> float:
+        """
+        Overwrite the state of the newest bar (e.g. after trading at its close).
+
+        Args:
+            cash: Cash balance
+            quantities: Position quantity per symbol id (0 for flat)
+            values: Position market value per symbol id
+
+        Returns:
+            Recorded portfolio value
+
+        Raises:
+            ValueError: If no bar has been recorded
+        """
+        if not self._size:
+            raise ValueError("Cannot amend an empty portfolio history")
+        row = self._size - 1
+        return self._write(row, self._timestamps[row], cash, quantities, values)
+
+    def _write(self, row: int, timestamp: datetime, cash: float, quantities: np.ndarray, values: np.ndarray) -> float:
+        """Write one bar's state into a row and return its portfolio value."""
+        held = quantities != 0
+        positions_value = float(values[held].sum())
+
+        self._timestamps[row] = timestamp
+        self._cash[row] = cash
+        self._positions_value[row] = positions_value
+        portfolio_value = cash + positions_value
+        self._portfolio_value[row] = portfolio_value
+        self._num_positions[row] = int(held.sum())
+
+        n = len(quantities)
+        self._quantities[row, :n] = np.where(held, quantities, np.nan)
+        self._values[row, :n] = np.where(held, values, np.nan)
+        return portfolio_value
+
+    def _grow(self) -> None:
+        """Extend all arrays by one chunk."""
+        new_capacity = self.capacity + self.chunk_size
+
+        self._timestamps = np.resize(self._timestamps, new_capacity)
+        self._cash = np.resize(self._cash, new_capacity)
+        self._portfolio_value = np.resize(self._portfolio_value, new_capacity)
+        self._positions_value = np.resize(self._positions_value, new_capacity)
+        self._num_positions = np.resize(self._num_positions, new_capacity)
+
+        extra = np.full((self.chunk_size, len(self.symbols)), np.nan)
+        self._quantities = np.vstack([self._quantities, extra])
+        self._values = np.vstack([self._values, extra.copy()])
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Recorded timestamps."""
+        return self._timestamps[: self._size]
+
+    @property
+    def cash(self) -> np.ndarray:
+        """Cash balance per bar."""
+        return self._cash[: self._size]
+
+    @property
+    def portfolio_value(self) -> np.ndarray:
+        """Total portfolio value per bar."""
+        return self._portfolio_value[: self._size]
+
+    @property
+    def positions_value(self) -> np.ndarray:
+        """Total positions value per bar."""
+        return self._positions_value[: self._size]
+
+    @property
+    def num_positions(self) -> np.ndarray:
+        """Number of open positions per bar."""
+        return self._num_positions[: self._size]
+
+    @property
+    def quantities(self) -> np.ndarray:
+        """Position quantity per bar and symbol id (NaN when flat)."""
+        return self._quantities[: self._size]
+
+    @property
+    def values(self) -> np.ndarray:
+        """Position market value per bar and symbol id (NaN when flat)."""
+        return self._values[: self._size]
+
+    def get_equity_curve(self) -> pd.Series:
+        """
+        Get portfolio value per bar.
+
+        Returns:
+            Series of portfolio values
+        """
+        return pd.Series(self.portfolio_value.copy(), name="portfolio_value")
+
+    def to_frame(self, symbols: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Materialize the history as a wide DataFrame.
+
+        The layout matches the legacy per-bar records: timestamp, portfolio_value,
+        cash, positions_value, num_positions, followed by ``position_{symbol}``
+        and ``value_{symbol}`` columns for every symbol held at some point,
+        ordered by first holding.
+
+        Args:
+            symbols: Optional subset of symbols to include
+
+        Returns:
+            DataFrame with one row per recorded bar
+        """
+        if self._size == 0:
+            return pd.DataFrame()
+
+        columns = {
+            "timestamp": self.timestamps.copy(),
+            "portfolio_value": self.portfolio_value.copy(),
+            "cash": self.cash.copy(),
+            "positions_value": self.positions_value.copy(),
+            "num_positions": self.num_positions.copy(),
+        }
+
+        quantities = self.quantities
+        held = ~np.isnan(quantities)
+        ever_held = np.flatnonzero(held.any(axis=0))
+        first_held = held[:, ever_held].argmax(axis=0)
+        wanted = set(symbols) if symbols is not None else None
+
+        for sid in ever_held[np.argsort(first_held, kind="stable")]:
+            symbol = self.symbols[sid]
+            if wanted is not None and symbol not in wanted:
+                continue
+            columns[f"position_{symbol}"] = quantities[:, sid].copy()
+            columns[f"value_{symbol}"] = self.values[:, sid].copy()
+
+        return pd.DataFrame(columns)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes allocated by the recorder's arrays."""
+        return sum(
+            arr.nbytes
+            for arr in (
+                self._timestamps,
+                self._cash,
+                self._portfolio_value,
+                self._positions_value,
+                self._num_positions,
+                self._quantities,
+                self._values,
+            )
+        )
@@ -0,0 +1,524 @@
+"""
+Columnar trade ledger for backtesting.
+
+This module provides TradeLedger, a NumPy structured-array log of fills.
+Engines append one row per execution instead of keeping a Fill object (and
+its Order) alive for the whole run; trade logs and trade statistics read
+the columns directly, and Fill objects are only rebuilt on request.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from copilot_quant.backtest.orders import Fill, Order
+from copilot_quant.backtest.round_trips import match_round_trips
+
+BUY = 1
+SELL = -1
+
+ORDER_TYPES = ("market", "limit")
+
+TRADE_DTYPE = np.dtype(
+    [
+        ("timestamp", "datetime64[ns]"),
+        ("symbol_id", np.int32),
+        ("side", np.int8),
+        ("order_type", np.int8),
+        ("quantity", np.float64),
+        ("price", np.float64),
+        ("commission", np.float64),
+        ("limit_price", np.float64),
+        ("order_timestamp", "datetime64[ns]"),
+        ("order_id", np.int32),
+    ]
+)
+
+TRADE_LOG_COLUMNS = ["timestamp", "symbol", "side", "quantity", "price", "commission", "total_cost"]
+
+
+class TradeLedger:
+    """
+    Chunk-growing structured array of fills.
+
+    Each row stores the fill timestamp, a symbol id, the side (+1 buy,
+    -1 sell), the order type, quantity, fill price, commission and limit
+    price (NaN for market orders), plus the order's own timestamp (NaT when
+    unset) and an index into ``order_ids`` (-1 when unset). The row number
+    is the fill id. Tz-aware timestamps are stored in UTC and converted
+    back on read.
+
+    Example:
+        >>> ledger = TradeLedger()
+        >>> fill_id = ledger.append(timestamp, 'AAPL', 'buy', 10, 150.0, 1.5)
+        >>> ledger.to_frame()        # trade log DataFrame
+        >>> ledger.fill(fill_id)     # Fill object rebuilt from the row
+    """
+
+    def __init__(self, symbols: Optional[Sequence[str]] = None, capacity: int = 0, chunk_size: int = 1024):
+        """
+        Initialize ledger.
+
+        Args:
+            symbols: Symbols to pre-register, in symbol-id order
+            capacity: Number of rows to preallocate
+            chunk_size: Number of rows added each time capacity is exhausted
+
+        Raises:
+            ValueError: If chunk_size is not positive
+        """
+        if chunk_size <= 0:
+            raise ValueError(f"Invalid chunk_size: {chunk_size}. Must be positive")
+
+        self.chunk_size = chunk_size
+        self.symbols: List[str] = []
+        self.order_ids: List[str] = []
+        self.tz = None
+        self._symbol_ids: Dict[str, int] = {}
+        self._order_keys: Dict[str, int] = {}
+        self._rows = np.zeros(max(capacity, 0), dtype=TRADE_DTYPE)
+        self._size = 0
+
+        for symbol in symbols or []:
+            self.symbol_id(symbol)
+
+    def __len__(self) -> int:
+        """Number of recorded fills."""
+        return self._size
+
+    def __iter__(self) -> Iterator[Fill]:
+        """Iterate over fills rebuilt from the rows."""
+        return iter(self.to_fills())
+
+    def __getstate__(self) -> dict:
+        # Trim unused capacity before pickling (e.g. results returned by sweep workers)
+        state = self.__dict__.copy()
+        state["_rows"] = self.records.copy()
+        return state
+
+    @property
+    def capacity(self) -> int:
+        """Number of rows currently allocated."""
+        return len(self._rows)
+
+    def symbol_id(self, symbol: str) -> int:
+        """
+        Get the id of a symbol, registering it if needed.
+
+        Args:
+            symbol: Ticker symbol
+
+        Returns:
+            Integer symbol id
+        """
+        sid = self._symbol_ids.get(symbol)
+        if sid is None:
+            sid = len(self.symbols)
+            self._symbol_ids[symbol] = sid
+            self.symbols.append(symbol)
+        return sid
+
+    def _order_key(self, order_id: Optional[str]) -> int:
+        """Get the index of an order id in ``order_ids`` (-1 for None), registering it if needed."""
+        if order_id is None:
+            return -1
+        key = self._order_keys.get(order_id)
+        if key is None:
+            key = len(self.order_ids)
+            self._order_keys[order_id] = key
+            self.order_ids.append(order_id)
+        return key
+
+    def append(
+        self,
+        timestamp: datetime,
+        symbol: str,
+        side: str,
+        quantity: float,
+        price: float,
+        commission: float,
+        order_type: str = "market",
+        limit_price: Optional[float] = None,
+        order_timestamp: Optional[datetime] = None,
+        order_id: Optional[str] = None,
+    ) -> int:
+        """
+        Record one fill.
+
+        Args:
+            timestamp: Fill timestamp
+            symbol: Ticker symbol
+            side: 'buy' or 'sell'
+            quantity: Filled quantity (positive)
+            price: Fill price
+            commission: Commission paid
+            order_type: 'market' or 'limit'
+            limit_price: Limit price for limit orders
+            order_timestamp: Time the order was created
+            order_id: Identifier of the order
+
+        Returns:
+            Fill id (the row number)
+        """
+        if self._size == self.capacity:
+            self._grow(1)
+
+        fill_id = self._size
+        self._rows[fill_id] = (
+            self._to_datetime64(timestamp),
+            self.symbol_id(symbol),
+            BUY if side == "buy" else SELL,
+            ORDER_TYPES.index(order_type),
+            quantity,
+            price,
+            commission,
+            np.nan if limit_price is None else limit_price,
+            self._to_datetime64(order_timestamp),
+            self._order_key(order_id),
+        )
+        self._size += 1
+        return fill_id
+
+    def append_fill(self, fill: Fill) -> int:
+        """
+        Record a Fill object.
+
+        Args:
+            fill: Fill to record
+
+        Returns:
+            Fill id (the row number)
+        """
+        order = fill.order
+        return self.append(
+            fill.timestamp,
+            order.symbol,
+            order.side,
+            fill.fill_quantity,
+            fill.fill_price,
+            fill.commission,
+            order_type=order.order_type,
+            limit_price=order.limit_price,
+            order_timestamp=order.timestamp,
+            order_id=order.order_id,
+        )
+
+    def extend(
+        self,
+        timestamps: Union[pd.DatetimeIndex, np.ndarray],
+        symbol_ids: np.ndarray,
+        sides: np.ndarray,
+        quantities: np.ndarray,
+        prices: np.ndarray,
+        commissions: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Record many market-order fills at once.
+
+        Args:
+            timestamps: Fill timestamps
+            symbol_ids: Ids of already registered symbols
+            sides: +1 for buys, -1 for sells
+            quantities: Filled quantities (positive)
+            prices: Fill prices
+            commissions: Commissions paid
+
+        Returns:
+            Fill ids of the new rows
+        """
+        count = len(symbol_ids)
+        if self._size + count > self.capacity:
+            self._grow(self._size + count - self.capacity)
+
+        rows = self._rows[self._size : self._size + count]
+        rows["timestamp"] = self._to_datetime64_array(timestamps)
+        rows["symbol_id"] = symbol_ids
+        rows["side"] = sides
+        rows["order_type"] = 0
+        rows["quantity"] = quantities
+        rows["price"] = prices
+        rows["commission"] = commissions
+        rows["limit_price"] = np.nan
+        rows["order_timestamp"] = np.datetime64("NaT", "ns")
+        rows["order_id"] = -1
+
+        fill_ids = np.arange(self._size, self._size + count)
+        self._size += count
+        return fill_ids
+
+    @classmethod
+    def from_fills(cls, fills: Iterable[Fill]) -> "TradeLedger":
+        """
+        Build a ledger from Fill objects.
+
+        Args:
+            fills: Fills in execution order
+
+        Returns:
+            TradeLedger with one row per fill
+        """
+        if isinstance(fills, TradeLedger):
+            return fills
+
+        ledger = cls()
+        for fill in fills:
+            ledger.append_fill(fill)
+        return ledger
+
+    @classmethod
+    def concat(cls, ledgers: Sequence["TradeLedger"], scales: Optional[Sequence[float]] = None) -> "TradeLedger":
+        """
+        Concatenate ledgers, remapping symbol ids.
+
+        Args:
+            ledgers: Ledgers in chronological order
+            scales: Optional factor per ledger applied to its quantities and
+                    commissions (e.g. to compound results run on equal capital)
+
+        Returns:
+            TradeLedger holding every row
+        """
+        combined = cls()
+        parts = []
+        scales = [1.0] * len(ledgers) if scales is None else scales
+        for ledger, scale in zip(ledgers, scales, strict=True):
+            if combined.tz is None:
+                combined.tz = ledger.tz
+            remap = np.array([combined.symbol_id(symbol) for symbol in ledger.symbols], dtype=np.int32)
+            # Trailing -1 keeps rows without an order id unset
+            order_remap = np.array([*(combined._order_key(oid) for oid in ledger.order_ids), -1], dtype=np.int32)
+            rows = ledger.records.copy()
+            if len(rows):
+                rows["symbol_id"] = remap[rows["symbol_id"]]
+                rows["order_id"] = order_remap[rows["order_id"]]
+                rows["quantity"] *= scale
+                rows["commission"] *= scale
+            parts.append(rows)
+
+        if parts:
+            combined._rows = np.concatenate(parts)
+            combined._size = len(combined._rows)
+        return combined
+
+    def _grow(self, needed: int) -> None:
+        """Extend the row array by whole chunks."""
+        chunks = -(-needed // self.chunk_size)
+        extra = np.zeros(chunks * self.chunk_size, dtype=TRADE_DTYPE)
+        self._rows = np.concatenate([self._rows, extra])
+
+    def _to_datetime64(self, timestamp) -> np.datetime64:
+        if timestamp is None:
+            return np.datetime64("NaT", "ns")
+        timestamp = pd.Timestamp(timestamp)
+        if timestamp.tzinfo is not None:
+            if self.tz is None:
+                self.tz = timestamp.tzinfo
+            timestamp = timestamp.tz_convert(None)
+        return timestamp.to_datetime64()
+
+    def _to_index(self, values: np.ndarray) -> pd.DatetimeIndex:
+        """Stored datetime64 values as timestamps in the recorded time zone."""
+        index = pd.DatetimeIndex(values)
+        return index.tz_localize("UTC").tz_convert(self.tz) if self.tz is not None else index
+
+    def _to_datetime64_array(self, timestamps) -> np.ndarray:
+        index = pd.DatetimeIndex(timestamps)
+        if index.tz is not None:
+            if self.tz is None:
+                self.tz = index.tz
+            index = index.tz_convert(None)
+        return index.to_numpy(dtype="datetime64[ns]")
+
+    # ------------------------------------------------------------------
+    # Columns
+    # ------------------------------------------------------------------
+
+    @property
+    def records(self) -> np.ndarray:
+        """Structured array of the recorded rows (a view)."""
+        return self._rows[: self._size]
+
+    @property
+    def timestamps(self) -> pd.DatetimeIndex:
+        """Fill timestamps (in the recorded time zone)."""
+        return self._to_index(self.records["timestamp"])
+
+    @property
+    def symbol_ids(self) -> np.ndarray:
+        """Symbol id per fill."""
+        return self.records["symbol_id"]
+
+    @property
+    def sides(self) -> np.ndarray:
+        """Side per fill: +1 buy, -1 sell."""
+        return self.records["side"]
+
+    @property
+    def quantities(self) -> np.ndarray:
+        """Filled quantity per fill."""
+        return self.records["quantity"]
+
+    @property
+    def prices(self) -> np.ndarray:
+        """Fill price per fill."""
+        return self.records["price"]
+
+    @property
+    def commissions(self) -> np.ndarray:
+        """Commission per fill."""
+        return self.records["commission"]
+
+    @property
+    def symbol_names(self) -> np.ndarray:
+        """Symbol per fill."""
+        return np.asarray(self.symbols, dtype=object)[self.symbol_ids] if self.symbols else np.empty(0, dtype=object)
+
+    @property
+    def total_cost(self) -> np.ndarray:
+        """Notional plus commission for buys, minus commission for sells."""
+        return self.prices * self.quantities + self.sides * self.commissions
+
+    @property
+    def net_proceeds(self) -> np.ndarray:
+        """Cash flow per fill (negative for buys, positive for sells)."""
+        return -self.sides * self.prices * self.quantities - self.commissions
+
+    # ------------------------------------------------------------------
+    # Materialization
+    # ------------------------------------------------------------------
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Build the trade log DataFrame.
+
+        Returns:
+            DataFrame indexed by timestamp with columns symbol, side,
+            quantity, price, commission and total_cost
+        """
+        if self._size == 0:
+            return pd.DataFrame(columns=TRADE_LOG_COLUMNS)
+
+        frame = pd.DataFrame(
+            {
+                "timestamp": self.timestamps,
+                "symbol": self.symbol_names,
+                "side": np.where(self.sides == BUY, "buy", "sell").astype(object),
+                "quantity": self.quantities.copy(),
+                "price": self.prices.copy(),
+                "commission": self.commissions.copy(),
+                "total_cost": self.total_cost,
+            }
+        )
+        return frame.set_index("timestamp")
+
+    def round_trips(self) -> pd.DataFrame:
+        """
+        Match fills into FIFO round trips.
+
+        Returns:
+            Round-trip table from match_round_trips, one row per matched lot
+        """
+        trips = match_round_trips(
+            self.timestamps, self.symbol_ids, self.sides * self.quantities, self.prices, self.commissions
+        )
+        trips["symbol"] = np.asarray(self.symbols, dtype=object)[trips["symbol"].to_numpy(dtype=np.intp)]
+        return trips
+
+    def fill(self, fill_id: int) -> Fill:
+        """
+        Rebuild one Fill from its row.
+
+        Args:
+            fill_id: Row number
+
+        Returns:
+            Fill with an Order carrying symbol, side, type, quantity,
+            timestamp and id
+        """
+        if not 0 <= fill_id < self._size:
+            raise IndexError(f"Invalid fill_id: {fill_id}. Ledger has {self._size} fills")
+
+        row = self._rows[fill_id]
+        timestamp, order_timestamp = self._to_index(np.array([row["timestamp"], row["order_timestamp"]]))
+        order_type = ORDER_TYPES[row["order_type"]]
+        quantity = float(row["quantity"])
+        order = Order(
+            symbol=self.symbols[row["symbol_id"]],
+            quantity=quantity,
+            order_type=order_type,
+            side="buy" if row["side"] == BUY else "sell",
+            limit_price=float(row["limit_price"]) if order_type == "limit" else None,
+            timestamp=None if order_timestamp is pd.NaT else order_timestamp,
+            order_id=self.order_ids[row["order_id"]] if row["order_id"] >= 0 else None,
+        )
+        return Fill(
+            order=order,
+            fill_price=float(row["price"]),
+            fill_quantity=quantity,
+            commission=float(row["commission"]),
+            timestamp=timestamp,
+            fill_id=fill_id,
+        )
+
+    def to_fills(self) -> List[Fill]:
+        """
+        Rebuild all fills.
+
+        Returns:
+            List of Fill objects in execution order
+        """
+        if self._size == 0:
+            return []
+
+        timestamps = self.timestamps.tolist()
+        symbols = self.symbol_names.tolist()
+        sides = np.where(self.sides == BUY, "buy", "sell").tolist()
+        order_types = np.asarray(ORDER_TYPES, dtype=object)[self.records["order_type"]].tolist()
+        limit_prices = self.records["limit_price"].tolist()
+        order_timestamps = [None if ts is pd.NaT else ts for ts in self._to_index(self.records["order_timestamp"])]
+        order_ids = [self.order_ids[key] if key >= 0 else None for key in self.records["order_id"].tolist()]
+        columns = zip(
+            timestamps,
+            symbols,
+            sides,
+            order_types,
+            self.quantities.tolist(),
+            self.prices.tolist(),
+            self.commissions.tolist(),
+            limit_prices,
+            order_timestamps,
+            order_ids,
+            strict=True,
+        )
+
+        fills = []
+        for fill_id, (
+            timestamp,
+            symbol,
+            side,
+            order_type,
+            quantity,
+            price,
+            commission,
+            limit_price,
+            order_timestamp,
+            order_id,
+        ) in enumerate(columns):
+            order = Order(
+                symbol=symbol,
+                quantity=quantity,
+                order_type=order_type,
+                side=side,
+                limit_price=limit_price if order_type == "limit" else None,
+                timestamp=order_timestamp,
+                order_id=order_id,
+            )
+            fills.append(Fill(order, price, quantity, commission, timestamp, fill_id))
+        return fills
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes allocated by the row array."""
+        return self._rows.nbytes
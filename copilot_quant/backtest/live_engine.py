@@ -46,8 +46,10 @@ import time
 from datetime import datetime
 from typing import Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 
+from copilot_quant.backtest.features import FeatureStore
 from copilot_quant.backtest.orders import Fill, Order
 from copilot_quant.backtest.strategy import Strategy
 from copilot_quant.brokers.live_broker_adapter import LiveBrokerAdapter
@@ -55,6 +57,16 @@ from copilot_quant.brokers.live_data_adapter import LiveDataFeedAdapter
 
 logger = logging.getLogger(__name__)
 
+# pandas offsets that bar timestamps are floored to, per data interval
+BAR_FREQUENCIES = {
+    "1m": "1min",
+    "5m": "5min",
+    "15m": "15min",
+    "30m": "30min",
+    "1h": "1h",
+    "1d": "1D",
+}
+
 
 class LiveStrategyEngine:
     """
@@ -145,6 +157,8 @@ class LiveStrategyEngine:
         # Data tracking
         self._historical_data: Dict[str, pd.DataFrame] = {}
         self._latest_data: Dict[str, pd.Series] = {}
+        self.data_interval = "1d"
+        self.features = FeatureStore()
 
         # Performance tracking
         self.fills: List[Fill] = []
@@ -231,11 +245,13 @@ class LiveStrategyEngine:
             return False
 
         self.symbols = symbols
+        self.data_interval = data_interval
         logger.info(f"Starting live engine with symbols: {symbols}")
 
         try:
             # Load historical data for context
             self._load_historical_data(symbols, lookback_days, data_interval)
+            self._build_feature_store()
 
             # Subscribe to real-time data
             results = self.data_feed.subscribe(symbols)
@@ -421,6 +437,52 @@ class LiveStrategyEngine:
             except Exception as e:
                 logger.error(f"Error updating data for {symbol}: {e}")
 
+        try:
+            self._update_feature_store()
+        except Exception as e:
+            logger.error(f"Error updating feature store: {e}")
+
+    def _build_feature_store(self) -> None:
+        """
+        Seed the shared feature store with the loaded historical closes.
+
+        Bar timestamps are normalized with ``_bar_timestamp`` here and for
+        every live update, so history and live bars share one clock.
+        """
+        closes = {symbol: df["Close"] for symbol, df in self._historical_data.items() if "Close" in df.columns}
+        prices = pd.DataFrame(closes) if closes else pd.DataFrame()
+        if closes:
+            prices.index = [_bar_timestamp(timestamp, self.data_interval) for timestamp in prices.index]
+            prices = prices.groupby(level=0).last()
+
+        self.features = FeatureStore(symbols=self.symbols, capacity=len(prices))
+        self.features.extend(prices)
+        self.strategy.features = self.features
+
+    def _update_feature_store(self) -> None:
+        """
+        Fold the latest closes into the feature store.
+
+        Ticks inside the newest stored bar's period revise that bar in
+        place; the first tick of a later period appends a new bar. Ticks
+        for earlier periods are ignored.
+        """
+        bars = [self._latest_data.get(symbol) for symbol in self.features.symbols]
+        timestamps = [_bar_timestamp(bar.name, self.data_interval) for bar in bars if bar is not None]
+        if not timestamps:
+            return
+
+        timestamp = max(timestamps)
+        last = self.features.last_timestamp
+        if last is not None and timestamp < last:
+            return
+
+        prices = [bar.get("Close", np.nan) if bar is not None else np.nan for bar in bars]
+        if timestamp == last:
+            self.features.update_last(prices)
+        else:
+            self.features.append(timestamp, prices)
+
     def _prepare_strategy_data(self) -> Optional[pd.DataFrame]:
         """
         Prepare data in format expected by strategy.
@@ -570,3 +632,20 @@ class LiveStrategyEngine:
         """Context manager exit"""
         self.disconnect()
         return False
+
+
+def _bar_timestamp(timestamp, interval: str) -> pd.Timestamp:
+    """
+    Start of the bar containing a timestamp, as a tz-naive UTC pandas Timestamp.
+
+    Weekly ("1w") and monthly ("1M") bars start on their calendar period;
+    unknown intervals leave the timestamp unfloored.
+    """
+    timestamp = pd.Timestamp(timestamp)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert(None)
+    if interval in BAR_FREQUENCIES:
+        return timestamp.floor(BAR_FREQUENCIES[interval])
+    if interval in ("1w", "1M"):
+        return timestamp.to_period("W" if interval == "1w" else "M").start_time
+    return timestamp
@@ -5,12 +5,16 @@ This module provides comprehensive performance metrics calculation including
 returns, risk metrics (Sharpe, Sortino), drawdown analysis, and trade statistics.
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence, Union
 
 import numpy as np
 import pandas as pd
 
+from copilot_quant.backtest.ledger import BUY, TradeLedger
 from copilot_quant.backtest.orders import Fill
+from copilot_quant.backtest.round_trips import round_trip_stats
+
+Trades = Union[List[Fill], TradeLedger]
 
 
 class PerformanceAnalyzer:
@@ -43,14 +47,28 @@ class PerformanceAnalyzer:
         """
         self.risk_free_rate = risk_free_rate
 
-    def calculate_metrics(self, equity_curve: pd.Series, trades: List[Fill], initial_capital: float) -> Dict:
+    def calculate_metrics(
+        self,
+        equity_curve: pd.Series,
+        trades: Trades,
+        initial_capital: float,
+        returns: Optional[pd.Series] = None,
+        max_drawdown: Optional[float] = None,
+        trade_stats: Optional[Dict] = None,
+    ) -> Dict:
         """
         Calculate all performance metrics.
 
+        The optional arguments let callers that cache intermediate results
+        (e.g. BacktestResult) skip recomputing them.
+
         Args:
             equity_curve: Time series of portfolio values
-            trades: List of all trade fills
+            trades: List of all trade fills, or a TradeLedger
             initial_capital: Starting capital
+            returns: Precomputed calculate_returns(equity_curve)
+            max_drawdown: Precomputed calculate_max_drawdown(equity_curve)
+            trade_stats: Precomputed trade statistics (see round_trip_stats)
 
         Returns:
             Dictionary containing all calculated metrics
@@ -59,7 +77,8 @@ class PerformanceAnalyzer:
             return self._empty_metrics()
 
         final_capital = equity_curve.iloc[-1]
-        returns = self.calculate_returns(equity_curve)
+        if returns is None:
+            returns = self.calculate_returns(equity_curve)
 
         # Time metrics
         days = len(equity_curve)
@@ -70,13 +89,14 @@ class PerformanceAnalyzer:
         annualized_return = self._annualize_return(total_return, years)
 
         # Risk metrics
-        max_dd = self.calculate_max_drawdown(equity_curve)
+        max_dd = self.calculate_max_drawdown(equity_curve) if max_drawdown is None else max_drawdown
         sharpe = self.calculate_sharpe_ratio(returns)
         sortino = self.calculate_sortino_ratio(returns)
         calmar = self._calculate_calmar_ratio(annualized_return, max_dd)
 
         # Trade statistics
-        trade_stats = self._calculate_trade_stats(trades)
+        if trade_stats is None:
+            trade_stats = self._calculate_trade_stats(trades)
 
         return {
             # Returns
@@ -106,6 +126,167 @@ class PerformanceAnalyzer:
             "trading_years": years,
         }
 
+    def calculate_metrics_many(
+        self,
+        equity_curves: Sequence[pd.Series],
+        trade_pnls: Sequence[np.ndarray],
+        num_trades: Sequence[int],
+        initial_capitals: Sequence[float],
+    ) -> pd.DataFrame:
+        """
+        Calculate calculate_metrics() for many equity curves at once.
+
+        Curves are stacked left-aligned into one (bars x curves) array,
+        padded with NaN, so returns, volatility, Sharpe, Sortino and drawdown
+        are computed with column-wise array operations instead of one pandas
+        pipeline per curve. Trade statistics are aggregated from the
+        concatenated round-trip P&Ls with bincount.
+
+        Args:
+            equity_curves: Portfolio value series, one per result
+            trade_pnls: Round-trip P&Ls per result (see round_trip_stats)
+            num_trades: Number of fills per result
+            initial_capitals: Starting capital per result
+
+        Returns:
+            DataFrame with one row per curve and the calculate_metrics() keys
+            as columns (empty curves get the empty-metrics values)
+        """
+        count = len(equity_curves)
+        lengths = np.array([len(curve) for curve in equity_curves], dtype=np.int64)
+        bars = int(lengths.max()) if count else 0
+        rows = np.arange(bars)[:, None]
+        valid = rows < lengths[None, :]
+
+        equity = np.full((bars, count), np.nan)
+        for i, curve in enumerate(equity_curves):
+            equity[: len(curve), i] = curve.to_numpy(dtype=float)
+
+        # Returns as in calculate_returns: first bar and missing values are 0
+        returns = np.zeros_like(equity)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns[1:] = equity[1:] / equity[:-1] - 1
+        returns = np.where(valid & ~np.isnan(returns), returns, 0.0)
+
+        mean = returns.sum(axis=0) / np.maximum(lengths, 1)
+        std = _masked_std(returns, valid, mean)
+        excess = mean - self.risk_free_rate / 252
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe = np.where(std == 0, 0.0, excess / std * np.sqrt(252))
+
+            downside = valid & (returns < 0)
+            downside_count = downside.sum(axis=0)
+            downside_mean = np.where(downside, returns, 0.0).sum(axis=0) / np.maximum(downside_count, 1)
+            downside_std = _masked_std(returns, downside, downside_mean)
+            no_downside = (downside_count == 0) | (downside_std == 0)
+            sortino = np.where(no_downside, np.where(mean > 0, np.inf, 0.0), excess / downside_std * np.sqrt(252))
+
+            running_max = np.fmax.accumulate(equity, axis=0)
+            drawdown = np.where(valid, (equity - running_max) / running_max, np.nan)
+        max_dd = np.full(count, np.nan)
+        has_drawdown = (~np.isnan(drawdown)).any(axis=0)
+        if has_drawdown.any():
+            max_dd[has_drawdown] = np.nanmin(drawdown[:, has_drawdown], axis=0)
+
+        initial = np.asarray(initial_capitals, dtype=float)
+        final = equity[np.maximum(lengths - 1, 0), np.arange(count)] if bars else np.full(count, np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            total_return = np.where(initial == 0, 0.0, (final - initial) / initial)
+            years = lengths / 252
+            annualized = np.where(years > 0, (1 + total_return) ** (1 / np.where(years > 0, years, 1)) - 1, 0.0)
+            calmar = np.where((max_dd == 0) | (max_dd >= 0), 0.0, annualized / np.abs(max_dd))
+        volatility = std * np.sqrt(252)
+
+        trade_stats = _round_trip_stats_many(trade_pnls)
+        frame = pd.DataFrame(
+            {
+                "total_return": total_return,
+                "total_return_pct": total_return * 100,
+                "annualized_return": annualized,
+                "annualized_return_pct": annualized * 100,
+                "cagr": annualized,
+                "volatility": volatility,
+                "volatility_pct": volatility * 100,
+                "max_drawdown": max_dd,
+                "max_drawdown_pct": max_dd * 100,
+                "sharpe_ratio": sharpe,
+                "sortino_ratio": sortino,
+                "calmar_ratio": calmar,
+                "total_trades": np.asarray(num_trades, dtype=np.int64),
+                "win_rate": trade_stats["win_rate"],
+                "win_rate_pct": trade_stats["win_rate"] * 100,
+                "profit_factor": trade_stats["profit_factor"],
+                "avg_win": trade_stats["avg_win"],
+                "avg_loss": trade_stats["avg_loss"],
+                "avg_trade": trade_stats["avg_trade"],
+                "trading_days": lengths,
+                "trading_years": years,
+            }
+        )
+
+        empty = lengths == 0
+        if empty.any():
+            frame.loc[empty, :] = pd.DataFrame([self._empty_metrics()] * int(empty.sum()), index=frame.index[empty])
+        return frame
+
+    def calculate_path_metrics(self, equity: np.ndarray, initial_capital: float) -> Dict[str, np.ndarray]:
+        """
+        Calculate return and risk metrics for many equal-length equity paths.
+
+        Uses the same definitions as calculate_metrics (first return 0,
+        sample standard deviation, 252 periods per year) on a (paths x bars)
+        array, so simulated or resampled paths are scored in one vectorized
+        pass instead of one pandas pipeline per path.
+
+        Args:
+            equity: Portfolio values, one row per path
+            initial_capital: Starting capital shared by every path
+
+        Returns:
+            Dictionary of arrays with one entry per path: total_return, cagr,
+            volatility, sharpe_ratio, sortino_ratio and max_drawdown
+        """
+        equity = np.atleast_2d(np.asarray(equity, dtype=float))
+        bars = equity.shape[1]
+
+        returns = np.zeros_like(equity)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns[:, 1:] = equity[:, 1:] / equity[:, :-1] - 1
+        returns = np.where(np.isnan(returns), 0.0, returns)
+
+        mean = returns.mean(axis=1)
+        std = returns.std(axis=1, ddof=1) if bars > 1 else np.full(len(equity), np.nan)
+        excess = mean - self.risk_free_rate / 252
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe = np.where(std == 0, 0.0, excess / std * np.sqrt(252))
+
+            downside = returns < 0
+            downside_count = downside.sum(axis=1)
+            downside_mean = np.where(downside, returns, 0.0).sum(axis=1) / np.maximum(downside_count, 1)
+            downside_std = _masked_std(returns.T, downside.T, downside_mean)
+            no_downside = (downside_count == 0) | (downside_std == 0)
+            sortino = np.where(no_downside, np.where(mean > 0, np.inf, 0.0), excess / downside_std * np.sqrt(252))
+
+            running_max = np.maximum.accumulate(equity, axis=1)
+            max_dd = ((equity - running_max) / running_max).min(axis=1)
+
+            total_return = (
+                (equity[:, -1] - initial_capital) / initial_capital if initial_capital else np.zeros(len(equity))
+            )
+            growth = 1 + total_return
+            cagr = np.where(growth > 0, np.abs(growth) ** (252 / bars) - 1, -1.0)
+
+        return {
+            "total_return": total_return,
+            "cagr": cagr,
+            "volatility": std * np.sqrt(252),
+            "sharpe_ratio": sharpe,
+            "sortino_ratio": sortino,
+            "max_drawdown": max_dd,
+        }
+
     def calculate_returns(self, equity_curve: pd.Series) -> pd.Series:
         """
         Calculate period-over-period returns.
@@ -233,74 +414,45 @@ class PerformanceAnalyzer:
         if len(equity_curve) == 0:
             return 0.0
 
+        # Return maximum drawdown (most negative value)
+        return self.calculate_drawdown(equity_curve).min()
+
+    def calculate_drawdown(self, equity_curve: pd.Series) -> pd.Series:
+        """
+        Calculate the drawdown series.
+
+        Args:
+            equity_curve: Time series of portfolio values
+
+        Returns:
+            Series of drawdowns from the running peak (0 at new highs, negative below)
+        """
         # Calculate running maximum (peak values)
         running_max = equity_curve.expanding().max()
 
         # Calculate drawdown at each point
-        drawdown = (equity_curve - running_max) / running_max
-
-        # Return maximum drawdown (most negative value)
-        return drawdown.min()
+        return (equity_curve - running_max) / running_max
 
-    def calculate_win_rate(self, trades: List[Fill]) -> float:
+    def calculate_win_rate(self, trades: Trades) -> float:
         """
         Calculate win rate from completed trades.
 
-        Win rate is the percentage of profitable round-trip trades
-        (buy-sell pairs). This requires matching buys with sells.
+        Win rate is the percentage of profitable round trips. Fills are
+        matched first in, first out, so each closed lot (long or short)
+        counts as one round trip.
 
         Args:
-            trades: List of all trade fills
+            trades: List of all trade fills, or a TradeLedger
 
         Returns:
             Win rate as decimal (e.g., 0.60 = 60% win rate)
         """
-        if not trades:
-            return 0.0
+        return round_trip_stats(self._round_trip_pnls(trades))["win_rate"]
 
-        # Group trades by symbol to track round trips
-        symbol_trades: Dict[str, List] = {}
-
-        for fill in trades:
-            symbol = fill.order.symbol
-            if symbol not in symbol_trades:
-                symbol_trades[symbol] = []
-            symbol_trades[symbol].append(fill)
-
-        # Analyze each symbol's trades
-        wins = 0
-        total_round_trips = 0
-
-        for _symbol, fills in symbol_trades.items():
-            position_qty = 0
-            entry_value = 0
-
-            for fill in fills:
-                if fill.order.side == "buy":
-                    # Opening or adding to position
-                    position_qty += fill.fill_quantity
-                    entry_value += fill.fill_price * fill.fill_quantity + fill.commission
-                else:  # sell
-                    # Closing or reducing position
-                    if position_qty > 0:
-                        # Calculate P&L for this round trip
-                        exit_value = fill.fill_price * fill.fill_quantity - fill.commission
-                        avg_entry = entry_value / position_qty if position_qty > 0 else 0
-                        pnl = exit_value - (avg_entry * fill.fill_quantity)
-
-                        if pnl > 0:
-                            wins += 1
-
-                        total_round_trips += 1
-
-                        # Update position
-                        position_qty -= fill.fill_quantity
-                        if position_qty > 0:
-                            entry_value = avg_entry * position_qty
-                        else:
-                            entry_value = 0
-
-        return wins / total_round_trips if total_round_trips > 0 else 0.0
+    @staticmethod
+    def _round_trip_pnls(trades: Trades) -> np.ndarray:
+        """P&L net of commission of each FIFO round trip."""
+        return TradeLedger.from_fills(trades).round_trips()["pnl"].to_numpy()
 
     def _annualize_return(self, total_return: float, years: float) -> float:
         """Annualize a total return."""
@@ -319,80 +471,10 @@ class PerformanceAnalyzer:
 
         return annualized_return / abs(max_drawdown)
 
-    def _calculate_trade_stats(self, trades: List[Fill]) -> Dict:
-        """Calculate detailed trade statistics."""
-        if not trades:
-            return {
-                "win_rate": 0.0,
-                "profit_factor": 0.0,
-                "avg_win": 0.0,
-                "avg_loss": 0.0,
-                "avg_trade": 0.0,
-            }
-
-        # Group trades by symbol for P&L calculation
-        symbol_trades: Dict[str, List] = {}
-
-        for fill in trades:
-            symbol = fill.order.symbol
-            if symbol not in symbol_trades:
-                symbol_trades[symbol] = []
-            symbol_trades[symbol].append(fill)
-
-        # Calculate P&L for each round trip
-        trade_pnls = []
-
-        for _symbol, fills in symbol_trades.items():
-            position_qty = 0
-            entry_value = 0
-
-            for fill in fills:
-                if fill.order.side == "buy":
-                    position_qty += fill.fill_quantity
-                    entry_value += fill.fill_price * fill.fill_quantity + fill.commission
-                else:  # sell
-                    if position_qty > 0:
-                        exit_value = fill.fill_price * fill.fill_quantity - fill.commission
-                        avg_entry = entry_value / position_qty if position_qty > 0 else 0
-                        pnl = exit_value - (avg_entry * fill.fill_quantity)
-                        trade_pnls.append(pnl)
-
-                        position_qty -= fill.fill_quantity
-                        if position_qty > 0:
-                            entry_value = avg_entry * position_qty
-                        else:
-                            entry_value = 0
-
-        if not trade_pnls:
-            return {
-                "win_rate": 0.0,
-                "profit_factor": 0.0,
-                "avg_win": 0.0,
-                "avg_loss": 0.0,
-                "avg_trade": 0.0,
-            }
-
-        # Calculate statistics
-        winning_trades = [p for p in trade_pnls if p > 0]
-        losing_trades = [p for p in trade_pnls if p < 0]
-
-        win_rate = len(winning_trades) / len(trade_pnls) if trade_pnls else 0.0
-        avg_win = np.mean(winning_trades) if winning_trades else 0.0
-        avg_loss = np.mean(losing_trades) if losing_trades else 0.0
-        avg_trade = np.mean(trade_pnls)
-
-        # Profit factor = Gross Profit / Gross Loss
-        gross_profit = sum(winning_trades) if winning_trades else 0.0
-        gross_loss = abs(sum(losing_trades)) if losing_trades else 0.0
-        profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0.0
-
-        return {
-            "win_rate": win_rate,
-            "profit_factor": profit_factor,
-            "avg_win": avg_win,
-            "avg_loss": avg_loss,
-            "avg_trade": avg_trade,
-        }
+    def _calculate_trade_stats(self, trades: Trades) -> Dict:
+        """Calculate detailed trade statistics from FIFO round trips."""
+        stats = round_trip_stats(self._round_trip_pnls(trades))
+        return {key: stats[key] for key in ("win_rate", "profit_factor", "avg_win", "avg_loss", "avg_trade")}
 
     def _empty_metrics(self) -> Dict:
         """Return empty metrics when no data available."""
@@ -522,7 +604,7 @@ class PerformanceAnalyzer:
             "positions_value": positions_value,
         }
 
-    def calculate_turnover(self, trades: List[Fill], avg_portfolio_value: float, period_days: int = 30) -> float:
+    def calculate_turnover(self, trades: Trades, avg_portfolio_value: float, period_days: int = 30) -> float:
         """
         Calculate portfolio turnover rate.
 
@@ -532,7 +614,7 @@ class PerformanceAnalyzer:
         Note: We only count sells to avoid double-counting round-trip trades.
 
         Args:
-            trades: List of all trade fills
+            trades: List of all trade fills, or a TradeLedger
             avg_portfolio_value: Average portfolio value over the period
             period_days: Number of days in the measurement period
 
@@ -543,9 +625,9 @@ class PerformanceAnalyzer:
             return 0.0
 
         # Calculate total trade value (sells only to avoid double-counting)
-        total_trade_value = sum(
-            abs(fill.fill_price * fill.fill_quantity) for fill in trades if fill.order.side == "sell"
-        )
+        ledger = TradeLedger.from_fills(trades)
+        sells = ledger.sides != BUY
+        total_trade_value = float(np.abs(ledger.prices[sells] * ledger.quantities[sells]).sum())
 
         # Annualize the turnover
         annualization_factor = 365.0 / period_days
@@ -728,3 +810,35 @@ class PerformanceAnalyzer:
             "portfolio_value": 0.0,
             "positions_value": 0.0,
         }
+
+
+def _masked_std(values: np.ndarray, mask: np.ndarray, mean: np.ndarray) -> np.ndarray:
+    """Column-wise sample standard deviation (ddof=1) over masked entries; NaN below two entries."""
+    count = mask.sum(axis=0)
+    deviations = np.where(mask, values - mean, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(count > 1, np.sqrt((deviations**2).sum(axis=0) / (count - 1)), np.nan)
+
+
+def _round_trip_stats_many(trade_pnls: Sequence[np.ndarray]) -> Dict[str, np.ndarray]:
+    """round_trip_stats() for many P&L arrays at once, as arrays with one entry per array."""
+    count = len(trade_pnls)
+    sizes = np.array([len(pnls) for pnls in trade_pnls], dtype=np.int64)
+    pnls = np.concatenate([np.asarray(p, dtype=float) for p in trade_pnls]) if count else np.empty(0)
+    owner = np.repeat(np.arange(count), sizes)
+
+    wins, losses = pnls > 0, pnls < 0
+    num_wins = np.bincount(owner[wins], minlength=count)
+    num_losses = np.bincount(owner[losses], minlength=count)
+    gross_profit = np.bincount(owner[wins], weights=pnls[wins], minlength=count)
+    gross_loss = -np.bincount(owner[losses], weights=pnls[losses], minlength=count)
+    total = np.bincount(owner, weights=pnls, minlength=count)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {
+            "win_rate": np.where(sizes > 0, num_wins / sizes, 0.0),
+            "profit_factor": np.where(gross_loss > 0, gross_profit / gross_loss, 0.0),
+            "avg_win": np.where(num_wins > 0, gross_profit / num_wins, 0.0),
+            "avg_loss": np.where(num_losses > 0, -gross_loss / num_losses, 0.0),
+            "avg_trade": np.where(sizes > 0, total / sizes, 0.0),
+        }
@@ -6,15 +6,23 @@ simultaneously with dynamic capital allocation based on signal quality.
 """
 
 import logging
-import uuid
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+from copilot_quant.backtest.data_view import BarWindow, MarketDataCursor
 from copilot_quant.backtest.engine import BacktestEngine
 from copilot_quant.backtest.orders import Fill, Order
 from copilot_quant.backtest.results import BacktestResult
+from copilot_quant.backtest.signal_executors import (
+    SIGNAL_EXECUTION_MODES,
+    SequentialSignalExecutor,
+    SignalExecutor,
+    StrategyTiming,
+    create_signal_executor,
+)
 from copilot_quant.backtest.signals import SignalBasedStrategy, TradingSignal
 from copilot_quant.data.providers import DataProvider
 
@@ -117,6 +125,7 @@ class MultiStrategyEngine(BacktestEngine):
     - Dynamic position sizing based on signal quality
     - Global risk limits (max position size, max deployment)
     - Per-strategy performance attribution
+    - Optional concurrent signal generation (``signal_execution``)
 
     Example:
         >>> from copilot_quant.data.providers import YFinanceProvider
@@ -144,6 +153,8 @@ class MultiStrategyEngine(BacktestEngine):
         slippage: float = 0.0005,
         max_position_pct: float = 0.025,  # 2.5% max per position
         max_deployed_pct: float = 0.80,  # 80% max deployed
+        signal_execution: str = "sequential",
+        max_workers: Optional[int] = None,
     ):
         """
         Initialize multi-strategy backtesting engine.
@@ -155,7 +166,20 @@ class MultiStrategyEngine(BacktestEngine):
             slippage: Slippage as a percentage (e.g., 0.0005 = 0.05%)
             max_position_pct: Maximum position size as percentage of cash (e.g., 0.025 = 2.5%)
             max_deployed_pct: Maximum deployed capital as percentage of total (e.g., 0.80 = 80%)
+            signal_execution: How strategies are evaluated at each bar: 'sequential',
+                'thread' (thread pool), 'process' (persistent worker processes) or
+                'precompute' (full signal streams generated in parallel before the run;
+                only for strategies whose signals do not depend on their fills)
+            max_workers: Threads or processes for parallel modes (None = CPU count)
+
+        Raises:
+            ValueError: If signal_execution or max_workers is invalid
         """
+        if signal_execution not in SIGNAL_EXECUTION_MODES:
+            raise ValueError(f"Invalid signal_execution: {signal_execution}. Must be one of {SIGNAL_EXECUTION_MODES}")
+        if max_workers is not None and max_workers <= 0:
+            raise ValueError(f"Invalid max_workers: {max_workers}. Must be positive")
+
         super().__init__(initial_capital, data_provider, commission, slippage)
 
         # Override strategy to support multiple strategies
@@ -172,6 +196,19 @@ class MultiStrategyEngine(BacktestEngine):
         # Track which strategy owns which position
         self.position_owners: Dict[str, str] = {}  # symbol -> strategy_name
 
+        # Running exposure totals, kept in step with fills and mark-to-market
+        self._strategy_ids: Dict[str, int] = {}  # strategy_name -> first index in strategies
+        self._owners = np.zeros(0, dtype=np.intp)  # owning strategy index per symbol column (-1 = none)
+        self._deployed_value = 0.0
+        self._strategy_exposure = np.zeros(0)
+        self._strategy_unrealized = np.zeros(0)
+
+        # Signal generation
+        self.signal_execution = signal_execution
+        self.max_workers = max_workers
+        self.strategy_timings: Dict[str, StrategyTiming] = {}
+        self._signal_executor: Optional[SignalExecutor] = None
+
         logger.info(
             f"Initialized MultiStrategyEngine with ${initial_capital:,.2f} capital, "
             f"max_position={max_position_pct:.1%}, max_deployed={max_deployed_pct:.1%}"
@@ -186,15 +223,26 @@ class MultiStrategyEngine(BacktestEngine):
 
         Raises:
             TypeError: If strategy is not a SignalBasedStrategy
+            ValueError: If the strategy requests an unknown data_mode
         """
         if not isinstance(strategy, SignalBasedStrategy):
             raise TypeError(f"MultiStrategyEngine requires SignalBasedStrategy, got {type(strategy)}")
+        self._validate_data_mode(strategy)
 
         self.strategies.append(strategy)
         self.attributions[strategy.name] = StrategyAttribution(strategy.name)
+        self.strategy_timings[strategy.name] = StrategyTiming()
+        self._strategy_ids.setdefault(strategy.name, len(self.strategies) - 1)
         logger.info(f"Added strategy: {strategy.name}")
 
-    def run(self, start_date: datetime, end_date: datetime, symbols: List[str]) -> BacktestResult:
+    def run(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        symbols: List[str],
+        close_positions: bool = False,
+        warmup_bars: int = 0,
+    ) -> BacktestResult:
         """
         Execute backtest over date range with multiple strategies.
 
@@ -202,15 +250,23 @@ class MultiStrategyEngine(BacktestEngine):
             start_date: Start date for backtest
             end_date: End date for backtest
             symbols: List of symbols to trade
+            close_positions: Close every open position at the last bar with
+                             market orders, recorded in the ledger; the last
+                             bar of the portfolio history shows the flat book
+            warmup_bars: Leading bars of the fetched data that only build
+                         strategy history; strategies are first called and
+                         the portfolio first recorded at the bar after them
 
         Returns:
             BacktestResult with performance metrics and trade history
 
         Raises:
-            ValueError: If no strategies are registered
+            ValueError: If no strategies are registered or warmup_bars is negative
         """
         if not self.strategies:
             raise ValueError("No strategies registered. Call add_strategy() first.")
+        if warmup_bars < 0:
+            raise ValueError(f"Invalid warmup_bars: {warmup_bars}. Must be non-negative")
 
         logger.info(
             f"Starting multi-strategy backtest: {start_date.date()} to {end_date.date()}, "
@@ -232,7 +288,9 @@ class MultiStrategyEngine(BacktestEngine):
             return self._create_empty_result(start_date, end_date)
 
         # Run backtest loop
-        self._run_multi_strategy_loop(data, symbols)
+        self._run_multi_strategy_loop(data, symbols, warmup_bars)
+        if close_positions:
+            self._close_positions()
 
         # Finalize all strategies
         for strategy in self.strategies:
@@ -244,7 +302,7 @@ class MultiStrategyEngine(BacktestEngine):
 
         logger.info(
             f"Backtest complete: Final value=${final_value:,.2f}, "
-            f"Return={total_return:.2%}, Total trades={len(self.fills)}"
+            f"Return={total_return:.2%}, Total trades={len(self.ledger)}"
         )
 
         # Log strategy attributions
@@ -262,12 +320,13 @@ class MultiStrategyEngine(BacktestEngine):
             initial_capital=self.initial_capital,
             final_capital=final_value,
             total_return=total_return,
-            trades=self.fills.copy(),
-            portfolio_history=pd.DataFrame(self.portfolio_history),
+            history=self.history,
+            ledger=self.ledger,
         )
 
-        # Add attribution data to result
+        # Add attribution and signal timing data to result
         result.strategy_attributions = {name: attr.to_dict() for name, attr in self.attributions.items()}
+        result.strategy_timings = {name: timing.to_dict() for name, timing in self.strategy_timings.items()}
 
         return result
 
@@ -276,8 +335,31 @@ class MultiStrategyEngine(BacktestEngine):
         super()._reset_state()
         self.attributions = {s.name: StrategyAttribution(s.name) for s in self.strategies}
         self.position_owners = {}
+        self.strategy_timings = {s.name: StrategyTiming() for s in self.strategies}
+        self._strategy_ids = {}
+        for index, strategy in enumerate(self.strategies):
+            self._strategy_ids.setdefault(strategy.name, index)
+        self._owners = np.zeros(0, dtype=np.intp)
+        self._deployed_value = 0.0
+        self._strategy_exposure = np.zeros(len(self.strategies))
+        self._strategy_unrealized = np.zeros(len(self.strategies))
+
+    def get_strategy_exposures(self) -> Dict[str, float]:
+        """
+        Get the market value of the positions owned by each strategy.
+
+        Returns:
+            Dictionary mapping strategy name to owned market value in dollars
+        """
+        return {name: float(self._strategy_exposure[i]) for name, i in self._strategy_ids.items()}
+
+    def _prepare_market_data(self, data: pd.DataFrame, symbols: List[str]) -> MarketDataCursor:
+        """Build the per-run market data structures and the per-symbol owner column."""
+        cursor = super()._prepare_market_data(data, symbols)
+        self._owners = np.full(self._price_matrix.num_symbols, -1, dtype=np.intp)
+        return cursor
 
-    def _run_multi_strategy_loop(self, data: pd.DataFrame, symbols: List[str]) -> None:
+    def _run_multi_strategy_loop(self, data: pd.DataFrame, symbols: List[str], warmup_bars: int = 0) -> None:
         """
         Main backtest loop for multiple strategies.
 
@@ -289,72 +371,83 @@ class MultiStrategyEngine(BacktestEngine):
         Args:
             data: Historical market data
             symbols: List of symbols being traded
+            warmup_bars: Leading bars added to the feature store and cursor
+                         history without collecting signals
         """
-        # Get sorted timestamps
-        timestamps = sorted(data.index.unique())
-
-        for timestamp in timestamps:
-            # Get data for current timestamp
-            current_data = self._get_current_data(data, timestamp, symbols)
-
-            # Update unrealized PnL for all positions
-            self._update_positions_pnl(current_data)
-
-            # Update strategy attribution unrealized P&L
-            self._update_attribution_unrealized_pnl()
-
-            # Record portfolio value
-            self._record_portfolio_state(timestamp)
-
-            # Collect signals from all strategies
-            all_signals = self._collect_signals(timestamp, current_data)
-
-            # Rank signals by quality and execute
-            self._execute_ranked_signals(all_signals, timestamp, current_data)
+        cursor = self._prepare_market_data(data, symbols)
+        windows = {id(s): self._create_strategy_window(cursor, s) for s in self.strategies}
+        for strategy in self.strategies:
+            strategy.features = self.features
 
-    def _collect_signals(self, timestamp: datetime, data: pd.DataFrame) -> List[TradingSignal]:
+        self._signal_executor = create_signal_executor(
+            self.signal_execution, self.strategies, data, symbols, self.max_workers, start_bar=warmup_bars
+        )
+        try:
+            for bar, timestamp in enumerate(cursor.timestamps):
+                cursor.seek(bar)
+                self.features.append(timestamp, self._price_matrix.row(bar))
+                if bar < warmup_bars:
+                    continue
+
+                # Update unrealized PnL for all positions
+                self._update_positions_pnl()
+
+                # Update strategy attribution unrealized P&L
+                self._update_attribution_unrealized_pnl()
+
+                # Record portfolio value
+                self._record_portfolio_state(timestamp)
+
+                # Collect signals from all strategies
+                all_signals = self._collect_signals(timestamp, cursor, windows)
+
+                # Rank signals by quality and execute
+                self._execute_ranked_signals(all_signals, timestamp)
+        finally:
+            self._signal_executor.close()
+            self._signal_executor = None
+
+    def _collect_signals(
+        self, timestamp: datetime, cursor: MarketDataCursor, windows: Dict[int, Optional[BarWindow]]
+    ) -> List[TradingSignal]:
         """
         Collect signals from all strategies.
 
+        Signals are returned in strategy registration order whichever
+        execution mode evaluated them, and each call is timed.
+
         Args:
             timestamp: Current timestamp
-            data: Market data available at this timestamp
+            cursor: Cursor positioned at the current timestamp
+            windows: BarWindow per strategy id for window-mode strategies
 
         Returns:
             List of all signals generated by all strategies
         """
-        all_signals = []
-
-        for strategy in self.strategies:
-            try:
-                signals = strategy.generate_signals(timestamp, data)
-
-                if signals is None:
-                    signals = []
-
-                # Ensure all signals have strategy name set
-                for signal in signals:
-                    if not signal.strategy_name:
-                        signal.strategy_name = strategy.name
-
-                all_signals.extend(signals)
+        executor = self._signal_executor or SequentialSignalExecutor(self.strategies)
+        results = executor.collect(
+            cursor.bar,
+            timestamp,
+            lambda i: self._get_strategy_data(cursor, self.strategies[i], windows.get(id(self.strategies[i]))),
+        )
 
-            except Exception as e:
-                logger.error(f"Error in strategy {strategy.name} at {timestamp}: {e}")
+        all_signals = []
+        for strategy, (signals, elapsed, error) in zip(self.strategies, results, strict=True):
+            self.strategy_timings.setdefault(strategy.name, StrategyTiming()).record(elapsed)
+            if error is not None:
+                logger.error(f"Error in strategy {strategy.name} at {timestamp}: {error}")
                 continue
+            all_signals.extend(signals)
 
         return all_signals
 
-    def _execute_ranked_signals(
-        self, signals: List[TradingSignal], timestamp: datetime, current_data: pd.DataFrame
-    ) -> None:
+    def _execute_ranked_signals(self, signals: List[TradingSignal], timestamp: datetime) -> None:
         """
         Rank signals by quality and execute until risk limits are hit.
 
         Args:
             signals: List of signals to execute
             timestamp: Current timestamp
-            current_data: Current market data
         """
         if not signals:
             return
@@ -368,8 +461,12 @@ class MultiStrategyEngine(BacktestEngine):
             if not self._can_execute_signal(signal):
                 continue
 
-            # Calculate position size based on signal quality
-            position_size = self._calculate_signal_position_size(signal)
+            if signal.quantity is not None:
+                # Explicitly sized signal (e.g. closing a position)
+                position_size = signal.quantity * signal.entry_price
+            else:
+                # Calculate position size based on signal quality
+                position_size = self._calculate_signal_position_size(signal)
 
             if position_size <= 0:
                 continue
@@ -378,7 +475,7 @@ class MultiStrategyEngine(BacktestEngine):
             order = self._signal_to_order(signal, position_size)
 
             # Execute order
-            self._execute_order(order, timestamp, current_data)
+            self._execute_order(order, timestamp)
 
     def _can_execute_signal(self, signal: TradingSignal) -> bool:
         """
@@ -390,10 +487,11 @@ class MultiStrategyEngine(BacktestEngine):
         Returns:
             True if signal can be executed, False otherwise
         """
-        portfolio_value = self.get_portfolio_value()
+        # Running total kept by fills and mark-to-market, so each check is O(1)
+        deployed_value = self._deployed_value
+        portfolio_value = self.cash + deployed_value
 
         # Check max deployed capital limit
-        deployed_value = sum(pos.market_value for pos in self.positions.values())
         deployed_pct = deployed_value / portfolio_value if portfolio_value > 0 else 0
 
         if signal.side == "buy" and deployed_pct >= self.max_deployed_pct:
@@ -438,7 +536,7 @@ class MultiStrategyEngine(BacktestEngine):
             Order object
         """
         # Calculate quantity based on position value and entry price
-        quantity = position_value / signal.entry_price
+        quantity = signal.quantity if signal.quantity is not None else position_value / signal.entry_price
 
         # Create order
         order = Order(
@@ -451,24 +549,24 @@ class MultiStrategyEngine(BacktestEngine):
         # Track which strategy owns this position
         if signal.side == "buy":
             self.position_owners[signal.symbol] = signal.strategy_name
+            self._set_owner(signal.symbol, signal.strategy_name)
 
         return order
 
-    def _execute_order(self, order: Order, timestamp: datetime, current_data: pd.DataFrame) -> None:
+    def _execute_order(self, order: Order, timestamp: datetime) -> None:
         """
         Execute an order and update strategy attribution.
 
         Args:
             order: Order to execute
             timestamp: Current timestamp
-            current_data: Current market data
         """
         # Get the strategy that owns this order
         strategy_name = self.position_owners.get(order.symbol, "Unknown")
 
         # Execute the order using parent logic but without calling strategy.on_fill
         # Get current price for the symbol
-        current_price = self._get_current_price(current_data, order.symbol)
+        current_price = self._get_current_price(order.symbol)
 
         if current_price is None:
             logger.warning(f"Cannot execute order - no price data for {order.symbol}")
@@ -502,24 +600,26 @@ class MultiStrategyEngine(BacktestEngine):
             fill_quantity=order.quantity,
             commission=commission,
             timestamp=timestamp,
-            fill_id=str(uuid.uuid4()),
+            fill_id=len(self.ledger),
         )
 
         # Update cash and positions
         self._process_fill(fill, current_price)
 
         # Record fill
-        self.fills.append(fill)
+        self.ledger.append_fill(fill)
 
         # Record fill in attribution
         if strategy_name in self.attributions:
             self.attributions[strategy_name].record_fill(fill)
 
-            # Notify the strategy
-            for strategy in self.strategies:
-                if strategy.name == strategy_name:
-                    strategy.on_fill(fill)
-                    break
+            # Notify the strategy (through its worker in process mode)
+            index = self._strategy_ids.get(strategy_name)
+            if index is not None:
+                if self._signal_executor is not None:
+                    self._signal_executor.on_fill(index, fill)
+                else:
+                    self.strategies[index].on_fill(fill)
 
         logger.debug(f"Executed: {order.side} {order.quantity} {order.symbol} @ ${fill_price:.2f}")
 
@@ -527,14 +627,76 @@ class MultiStrategyEngine(BacktestEngine):
         """
         Update unrealized P&L for each strategy's attribution.
 
-        Note: Currently simplified - unrealized P&L tracking per strategy
-        would require maintaining a mapping of which positions belong to which
-        strategy and tracking partial position updates. This is a potential
-        future enhancement.
+        Called after each bar's mark-to-market. Recomputes deployed capital,
+        per-strategy exposure and per-owner unrealized P&L from the position
+        arrays in one vectorized pass, which also clears any rounding drift
+        from the incremental updates applied on fills.
         """
-        # For now, unrealized P&L is tracked at the portfolio level
-        # Strategy attribution focuses on realized P&L from closed trades
-        pass
+        values = self._entry_prices * np.abs(self._quantities) + self._unrealized
+        self._deployed_value = float(values.sum())
+
+        owned = self._owners >= 0
+        owners = self._owners[owned]
+        num_strategies = len(self.strategies)
+        self._strategy_exposure = np.bincount(owners, weights=values[owned], minlength=num_strategies)
+        self._strategy_unrealized = np.bincount(owners, weights=self._unrealized[owned], minlength=num_strategies)
+
+        for name, index in self._strategy_ids.items():
+            self.attributions[name].update_unrealized_pnl(float(self._strategy_unrealized[index]))
+
+    def _sync_position_arrays(self, symbol: str) -> None:
+        """Mirror a fill into the position arrays and apply its change to the running exposure totals."""
+        sid = self._price_matrix.symbol_id(symbol) if self._price_matrix is not None else None
+        if sid is None:
+            super()._sync_position_arrays(symbol)
+            return
+
+        before_value, before_unrealized = self._position_value(sid)
+        super()._sync_position_arrays(symbol)
+        after_value, after_unrealized = self._position_value(sid)
+
+        self._deployed_value += after_value - before_value
+        owner = self._owners[sid]
+        if owner >= 0:
+            self._strategy_exposure[owner] += after_value - before_value
+            self._strategy_unrealized[owner] += after_unrealized - before_unrealized
+            name = self.strategies[owner].name
+            self.attributions[name].update_unrealized_pnl(float(self._strategy_unrealized[owner]))
+
+    def _grow_position_arrays(self) -> None:
+        """Add position and owner columns for symbol aliases registered mid-run."""
+        super()._grow_position_arrays()
+        extra = len(self._quantities) - len(self._owners)
+        self._owners = np.concatenate([self._owners, np.full(extra, -1, dtype=np.intp)])
+
+    def _position_value(self, sid: int) -> Tuple[float, float]:
+        """Market value and unrealized P&L of the position in a symbol column."""
+        if sid >= len(self._quantities):
+            return 0.0, 0.0
+        unrealized = float(self._unrealized[sid])
+        return float(self._entry_prices[sid] * abs(self._quantities[sid])) + unrealized, unrealized
+
+    def _set_owner(self, symbol: str, strategy_name: str) -> None:
+        """Move a symbol's exposure to the strategy that now owns it."""
+        sid = self._price_matrix.symbol_id(symbol) if self._price_matrix is not None else None
+        if sid is None:
+            return
+        if sid >= len(self._owners):
+            self._grow_position_arrays()
+
+        owner = self._strategy_ids.get(strategy_name, -1)
+        previous = self._owners[sid]
+        if owner == previous:
+            return
+
+        value, unrealized = self._position_value(sid)
+        if previous >= 0:
+            self._strategy_exposure[previous] -= value
+            self._strategy_unrealized[previous] -= unrealized
+        if owner >= 0:
+            self._strategy_exposure[owner] += value
+            self._strategy_unrealized[owner] += unrealized
+        self._owners[sid] = owner
 
     def _create_empty_result(self, start_date: datetime, end_date: datetime) -> BacktestResult:
         """Create an empty result when no data is available."""
@@ -546,9 +708,9 @@ class MultiStrategyEngine(BacktestEngine):
             final_capital=self.initial_capital,
             total_return=0.0,
             trades=[],
-            portfolio_history=pd.DataFrame(),
         )
 
         result.strategy_attributions = {name: attr.to_dict() for name, attr in self.attributions.items()}
+        result.strategy_timings = {name: timing.to_dict() for name, timing in self.strategy_timings.items()}
 
         return result
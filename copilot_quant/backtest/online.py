@@ -0,0 +1,380 @@
+"""
+Online performance accumulators.
+
+This module provides O(1)-per-update accumulators for risk and performance
+metrics, so engines can keep Sharpe, Sortino, volatility and drawdown
+current as each bar (or snapshot) arrives instead of rescanning the whole
+equity curve:
+
+- RunningMoments: Welford mean and sample variance
+- EWMoments: exponentially weighted mean and variance
+- DrawdownTracker: running peak, drawdown, trough and underwater durations
+- OnlinePerformance: all of the above fed from portfolio values
+
+With the default 252 periods per year, OnlinePerformance reports the same
+values PerformanceAnalyzer computes from the equity curve seen so far.
+"""
+
+import math
+from datetime import datetime
+from typing import Dict, Optional
+
+
+class RunningMoments:
+    """
+    Welford running mean and sample variance.
+
+    Example:
+        >>> moments = RunningMoments()
+        >>> for x in (0.01, -0.02, 0.005):
+        ...     moments.update(x)
+        >>> moments.mean, moments.std
+    """
+
+    __slots__ = ("count", "mean", "_m2")
+
+    def __init__(self):
+        """Initialize empty moments."""
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, value: float) -> None:
+        """
+        Add one observation.
+
+        Args:
+            value: Observation
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (ddof=1), NaN with fewer than two observations."""
+        return self._m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1), NaN with fewer than two observations."""
+        return math.sqrt(self.variance) if self.count > 1 else math.nan
+
+
+class EWMoments:
+    """
+    Exponentially weighted mean and variance.
+
+    Equivalent to pandas ``ewm(alpha=alpha, adjust=False)`` mean and
+    ``var(bias=True)``: each update moves the mean by ``alpha`` times the
+    surprise and decays the variance by ``1 - alpha``.
+    """
+
+    __slots__ = ("alpha", "count", "mean", "variance")
+
+    def __init__(self, halflife: Optional[float] = None, alpha: Optional[float] = None):
+        """
+        Initialize exponentially weighted moments.
+
+        Args:
+            halflife: Number of updates after which a weight halves
+            alpha: Smoothing factor in (0, 1]; used when halflife is not given
+
+        Raises:
+            ValueError: If neither or both of halflife and alpha are given,
+                        or the value is out of range
+        """
+        if (halflife is None) == (alpha is None):
+            raise ValueError("Provide exactly one of halflife or alpha")
+        if halflife is not None:
+            if halflife <= 0:
+                raise ValueError(f"Invalid halflife: {halflife}. Must be positive")
+            alpha = 1 - math.exp(-math.log(2) / halflife)
+        if not 0 < alpha <= 1:
+            raise ValueError(f"Invalid alpha: {alpha}. Must be in (0, 1]")
+
+        self.alpha = alpha
+        self.count = 0
+        self.mean = 0.0
+        self.variance = 0.0
+
+    def update(self, value: float) -> None:
+        """
+        Add one observation.
+
+        Args:
+            value: Observation
+        """
+        if self.count == 0:
+            self.mean = value
+        else:
+            diff = value - self.mean
+            increment = self.alpha * diff
+            self.mean += increment
+            self.variance = (1 - self.alpha) * (self.variance + diff * increment)
+        self.count += 1
+
+    @property
+    def std(self) -> float:
+        """Exponentially weighted standard deviation."""
+        return math.sqrt(self.variance)
+
+
+class DrawdownTracker:
+    """
+    Running peak-to-trough drawdown with underwater duration tracking.
+
+    A value strictly below the running peak is underwater. Durations are
+    counted in updates (bars or snapshots), as in
+    PerformanceAnalyzer.calculate_drawdown_duration.
+
+    Attributes:
+        peak: Highest value seen (None before the first update)
+        drawdown: Current drawdown from the peak (0 at a new high, negative below)
+        max_drawdown: Most negative drawdown seen
+        duration: Consecutive updates spent underwater so far
+        max_duration: Longest underwater stretch
+        underwater_periods: Number of underwater stretches (including the current one)
+    """
+
+    __slots__ = (
+        "peak",
+        "peak_time",
+        "trough",
+        "trough_time",
+        "drawdown",
+        "max_drawdown",
+        "max_drawdown_peak_time",
+        "max_drawdown_trough_time",
+        "duration",
+        "max_duration",
+        "underwater_periods",
+        "_underwater_total",
+    )
+
+    def __init__(self, peak: Optional[float] = None):
+        """
+        Initialize tracker.
+
+        Args:
+            peak: Peak carried over from earlier state (e.g. a persisted high-water mark)
+        """
+        self.peak = peak
+        self.peak_time: Optional[datetime] = None
+        self.trough = peak
+        self.trough_time: Optional[datetime] = None
+        self.drawdown = 0.0
+        self.max_drawdown = 0.0
+        self.max_drawdown_peak_time: Optional[datetime] = None
+        self.max_drawdown_trough_time: Optional[datetime] = None
+        self.duration = 0
+        self.max_duration = 0
+        self.underwater_periods = 0
+        self._underwater_total = 0
+
+    def update(self, value: float, timestamp: Optional[datetime] = None) -> None:
+        """
+        Add one portfolio value.
+
+        Args:
+            value: Portfolio value
+            timestamp: Time of the value (recorded for peaks and troughs)
+        """
+        if self.peak is None or value >= self.peak:
+            self.peak = self.trough = value
+            self.peak_time = self.trough_time = timestamp
+            self.drawdown = 0.0
+            self.duration = 0
+            return
+
+        if self.duration == 0:
+            self.underwater_periods += 1
+        self.duration += 1
+        self._underwater_total += 1
+        self.max_duration = max(self.max_duration, self.duration)
+
+        if value < self.trough:
+            self.trough, self.trough_time = value, timestamp
+
+        self.drawdown = (value - self.peak) / self.peak if self.peak > 0 else 0.0
+        if self.drawdown < self.max_drawdown:
+            self.max_drawdown = self.drawdown
+            self.max_drawdown_peak_time = self.peak_time
+            self.max_drawdown_trough_time = timestamp
+
+    @property
+    def avg_duration(self) -> float:
+        """Average length of underwater stretches (0 when never underwater)."""
+        return self._underwater_total / self.underwater_periods if self.underwater_periods else 0.0
+
+
+class OnlinePerformance:
+    """
+    Streaming performance metrics from a sequence of portfolio values.
+
+    Each update is O(1): the period return feeds Welford moments (all
+    returns and the negative ones, for Sharpe and Sortino), optional
+    exponentially weighted moments, and a drawdown tracker. The first
+    value contributes a zero return, matching PerformanceAnalyzer, so the
+    metrics equal a full recomputation over the values seen so far.
+
+    Example:
+        >>> performance = OnlinePerformance(risk_free_rate=0.02, halflife=20)
+        >>> for timestamp, value in equity_curve.items():
+        ...     performance.update(value, timestamp)
+        >>> performance.sharpe_ratio, performance.max_drawdown
+    """
+
+    def __init__(
+        self,
+        risk_free_rate: float = 0.02,
+        periods_per_year: float = 252,
+        halflife: Optional[float] = None,
+        peak: Optional[float] = None,
+    ):
+        """
+        Initialize accumulators.
+
+        Args:
+            risk_free_rate: Annual risk-free rate for Sharpe/Sortino (e.g., 0.02 = 2%)
+            periods_per_year: Updates per year used to annualize (252 for daily bars)
+            halflife: Half-life in updates for the exponentially weighted
+                      volatility and Sharpe ratio (None disables them)
+            peak: High-water mark carried over from earlier state
+
+        Raises:
+            ValueError: If periods_per_year is not positive
+        """
+        if periods_per_year <= 0:
+            raise ValueError(f"Invalid periods_per_year: {periods_per_year}. Must be positive")
+
+        self.risk_free_rate = risk_free_rate
+        self.periods_per_year = periods_per_year
+        self.returns = RunningMoments()
+        self.downside = RunningMoments()
+        self.ewm = EWMoments(halflife=halflife) if halflife is not None else None
+        self.drawdown = DrawdownTracker(peak=peak)
+        self.first_value: Optional[float] = None
+        self.last_value: Optional[float] = None
+        self.last_timestamp: Optional[datetime] = None
+
+    def update(self, value: float, timestamp: Optional[datetime] = None) -> None:
+        """
+        Add the portfolio value for the next period.
+
+        Args:
+            value: Portfolio value
+            timestamp: Time of the value
+
+        NaN values are ignored.
+        """
+        if value != value:
+            return
+
+        if self.last_value is None:
+            self.first_value = value
+            period_return = 0.0
+        else:
+            period_return = value / self.last_value - 1 if self.last_value != 0 else 0.0
+
+        self.returns.update(period_return)
+        if period_return < 0:
+            self.downside.update(period_return)
+        if self.ewm is not None:
+            self.ewm.update(period_return)
+        self.drawdown.update(value, timestamp)
+
+        self.last_value = value
+        self.last_timestamp = timestamp
+
+    @property
+    def count(self) -> int:
+        """Number of values seen."""
+        return self.returns.count
+
+    @property
+    def total_return(self) -> float:
+        """Return from the first value to the latest one."""
+        if not self.first_value:
+            return 0.0
+        return self.last_value / self.first_value - 1
+
+    @property
+    def volatility(self) -> float:
+        """Annualized volatility of period returns."""
+        return self.returns.std * math.sqrt(self.periods_per_year) if self.count else 0.0
+
+    @property
+    def sharpe_ratio(self) -> float:
+        """Annualized Sharpe ratio (NaN with fewer than two values, 0 with no volatility)."""
+        std = self.returns.std
+        if self.count == 0 or std == 0:
+            return 0.0
+        excess = self.returns.mean - self.risk_free_rate / self.periods_per_year
+        return excess / std * math.sqrt(self.periods_per_year)
+
+    @property
+    def sortino_ratio(self) -> float:
+        """Annualized Sortino ratio (inf with gains and no downside volatility)."""
+        if self.count == 0:
+            return 0.0
+        if self.downside.count == 0 or self.downside.std == 0:
+            return math.inf if self.returns.mean > 0 else 0.0
+        excess = self.returns.mean - self.risk_free_rate / self.periods_per_year
+        return excess / self.downside.std * math.sqrt(self.periods_per_year)
+
+    @property
+    def ewm_volatility(self) -> float:
+        """Annualized exponentially weighted volatility (NaN without a halflife)."""
+        if self.ewm is None:
+            return math.nan
+        return self.ewm.std * math.sqrt(self.periods_per_year)
+
+    @property
+    def ewm_sharpe_ratio(self) -> float:
+        """Annualized Sharpe ratio from the exponentially weighted moments (NaN without a halflife)."""
+        if self.ewm is None:
+            return math.nan
+        if self.ewm.std == 0:
+            return 0.0
+        excess = self.ewm.mean - self.risk_free_rate / self.periods_per_year
+        return excess / self.ewm.std * math.sqrt(self.periods_per_year)
+
+    @property
+    def max_drawdown(self) -> float:
+        """Most negative drawdown so far (e.g., -0.20 = -20%)."""
+        return self.drawdown.max_drawdown
+
+    @property
+    def current_drawdown(self) -> float:
+        """Drawdown of the latest value from the running peak."""
+        return self.drawdown.drawdown
+
+    def snapshot(self) -> Dict:
+        """
+        Current values of all metrics.
+
+        Returns:
+            Dictionary with count, last value and timestamp, total return,
+            volatility, Sharpe, Sortino, drawdown and duration metrics, and
+            the exponentially weighted volatility and Sharpe ratio
+        """
+        return {
+            "count": self.count,
+            "timestamp": self.last_timestamp,
+            "portfolio_value": self.last_value,
+            "total_return": self.total_return,
+            "volatility": self.volatility,
+            "sharpe_ratio": self.sharpe_ratio,
+            "sortino_ratio": self.sortino_ratio,
+            "ewm_volatility": self.ewm_volatility,
+            "ewm_sharpe_ratio": self.ewm_sharpe_ratio,
+            "max_drawdown": self.max_drawdown,
+            "current_drawdown": self.current_drawdown,
+            "peak_value": self.drawdown.peak,
+            "max_drawdown_duration": self.drawdown.max_duration,
+            "current_drawdown_duration": self.drawdown.duration,
+            "avg_drawdown_duration": self.drawdown.avg_duration,
+            "underwater_periods": self.drawdown.underwater_periods,
+        }
@@ -2,14 +2,16 @@
 Order management system for backtesting.
 
 This module defines order types, fills, and positions used in the backtesting engine.
+All three are slotted dataclasses: engines create one Order and Fill per
+execution, so they carry no per-instance ``__dict__``.
 """
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Union
 
 
-@dataclass
+@dataclass(slots=True)
 class Order:
     """
     Represents a trading order.
@@ -50,7 +52,7 @@ class Order:
             raise ValueError(f"Invalid limit_price: {self.limit_price}. Must be positive")
 
 
-@dataclass
+@dataclass(slots=True)
 class Fill:
     """
     Represents a filled order.
@@ -61,7 +63,8 @@ class Fill:
         fill_quantity: Quantity that was filled
         commission: Commission paid for this fill
         timestamp: Time when order was filled
-        fill_id: Unique identifier for the fill
+        fill_id: Identifier for the fill (backtest engines use the integer
+                 row of the fill in their TradeLedger)
     """
 
     order: Order
@@ -69,7 +72,7 @@ class Fill:
     fill_quantity: float
     commission: float
     timestamp: datetime
-    fill_id: Optional[str] = None
+    fill_id: Optional[Union[int, str]] = None
 
     def __post_init__(self):
         """Validate fill after initialization."""
@@ -100,7 +103,7 @@ class Fill:
             return self.fill_price * self.fill_quantity - self.commission
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """
     Represents a position in a security.
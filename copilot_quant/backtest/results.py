@@ -6,11 +6,38 @@ This module provides classes for storing and analyzing backtest results.
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 
+from copilot_quant.backtest.history import PortfolioHistory
+from copilot_quant.backtest.ledger import BUY, TradeLedger
 from copilot_quant.backtest.orders import Fill
+from copilot_quant.backtest.round_trips import match_round_trips, round_trip_stats
+
+
+class _DeferredField:
+    """
+    Dataclass field default that builds its value on first read.
+
+    Values passed to ``__init__`` or assigned later are kept in the private
+    ``storage`` attribute; None there defers to ``build(result)``. Reads go
+    through the descriptor, so ``dataclasses.replace`` carries the value over.
+    """
+
+    def __init__(self, storage: str, build: Callable[["BacktestResult"], Any]):
+        self.storage = storage
+        self.build = build
+
+    def __get__(self, obj: Optional["BacktestResult"], objtype: Optional[type] = None) -> Any:
+        if obj is None:
+            return None  # the field's default
+        value = getattr(obj, self.storage)
+        return value if value is not None else self.build(obj)
+
+    def __set__(self, obj: "BacktestResult", value: Any) -> None:
+        setattr(obj, self.storage, value)
 
 
 @dataclass
@@ -25,9 +52,15 @@ class BacktestResult:
         initial_capital: Starting capital
         final_capital: Ending capital (cash + positions)
         total_return: Total return as a decimal (e.g., 0.15 = 15%)
-        trades: List of all fills executed during backtest
-        portfolio_history: DataFrame with portfolio value over time
+        trades: List of all fills executed during backtest. When the result
+                is created from a ``ledger`` the Fill objects are rebuilt on
+                first access.
+        portfolio_history: DataFrame with portfolio value over time. When the
+                           result is created from a columnar ``history`` the
+                           DataFrame is built on first access.
         positions_history: DataFrame with position details over time
+        history: Columnar portfolio history recorded by the engine
+        ledger: Columnar trade ledger recorded by the engine
     """
 
     strategy_name: str
@@ -36,9 +69,61 @@ class BacktestResult:
     initial_capital: float
     final_capital: float
     total_return: float
-    trades: List[Fill] = field(default_factory=list)
-    portfolio_history: pd.DataFrame = field(default_factory=pd.DataFrame)
+    trades: Optional[List[Fill]] = _DeferredField("_trades", lambda result: result._fills_from_ledger())
+    portfolio_history: Optional[pd.DataFrame] = _DeferredField(
+        "_portfolio_history", lambda result: result._frame_from_history()
+    )
     positions_history: pd.DataFrame = field(default_factory=pd.DataFrame)
+    history: Optional[PortfolioHistory] = field(default=None, repr=False)
+    ledger: Optional[TradeLedger] = field(default=None, repr=False)
+
+    # Explicit values of trades/portfolio_history (None defers to ledger/history,
+    # set through the fields above) and lazily built or computed intermediates
+    _trades: Optional[List[Fill]] = field(init=False, repr=False, compare=False)
+    _portfolio_history: Optional[pd.DataFrame] = field(init=False, repr=False, compare=False)
+    _ledger_fills: Optional[List[Fill]] = field(default=None, init=False, repr=False, compare=False)
+    _trades_ledger: Optional[Tuple[List[Fill], TradeLedger]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _analysis: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    _metrics: Optional[Dict[float, Dict]] = field(default=None, init=False, repr=False, compare=False)
+
+    def _fills_from_ledger(self) -> List[Fill]:
+        """Fill objects rebuilt from the ledger, cached until it grows."""
+        if self.ledger is None:
+            self._trades = []
+            return self._trades
+        if self._ledger_fills is None or len(self._ledger_fills) != len(self.ledger):
+            self._ledger_fills = self.ledger.to_fills()
+        return self._ledger_fills
+
+    def _frame_from_history(self) -> pd.DataFrame:
+        """Portfolio history DataFrame built from the columnar history, cached."""
+        self._portfolio_history = self.history.to_frame() if self.history is not None else pd.DataFrame()
+        return self._portfolio_history
+
+    @property
+    def trade_ledger(self) -> TradeLedger:
+        """
+        Trades as a columnar ledger.
+
+        Returns:
+            The engine's ledger, or one built from ``trades`` when the result
+            was created from Fill objects
+        """
+        trades = self._trades
+        if trades is None:
+            return self.ledger if self.ledger is not None else TradeLedger()
+
+        cached = self._trades_ledger
+        if cached is None or cached[0] is not trades or len(cached[1]) != len(trades):
+            cached = self._trades_ledger = (trades, TradeLedger.from_fills(trades))
+        return cached[1]
+
+    @property
+    def num_trades(self) -> int:
+        """Number of fills, without rebuilding Fill objects."""
+        return len(self.trade_ledger)
 
     def get_trade_log(self) -> pd.DataFrame:
         """
@@ -54,28 +139,20 @@ class BacktestResult:
                 - commission: Commission paid
                 - total_cost: Total cost including commission
         """
-        if not self.trades:
-            return pd.DataFrame(
-                columns=["timestamp", "symbol", "side", "quantity", "price", "commission", "total_cost"]
-            )
+        return self.trade_ledger.to_frame()
 
-        trade_data = []
-        for fill in self.trades:
-            trade_data.append(
-                {
-                    "timestamp": fill.timestamp,
-                    "symbol": fill.order.symbol,
-                    "side": fill.order.side,
-                    "quantity": fill.fill_quantity,
-                    "price": fill.fill_price,
-                    "commission": fill.commission,
-                    "total_cost": fill.total_cost,
-                }
-            )
+    def get_round_trips(self) -> pd.DataFrame:
+        """
+        Return DataFrame of completed FIFO round trips.
 
-        df = pd.DataFrame(trade_data)
-        df = df.set_index("timestamp")
-        return df
+        The table is computed once and cached (see invalidate_metrics).
+
+        Returns:
+            DataFrame with one row per closed lot: symbol, direction, entry
+            and exit time and price, quantity, commission, pnl and
+            holding_period (see match_round_trips)
+        """
+        return self._cached("round_trips", lambda: self.trade_ledger.round_trips())
 
     def get_equity_curve(self) -> pd.Series:
         """
@@ -84,6 +161,12 @@ class BacktestResult:
         Returns:
             Series with DatetimeIndex and portfolio values
         """
+        if self._portfolio_history is None and self.history is not None:
+            # Read straight from the columnar history without building the wide frame
+            if len(self.history) == 0:
+                return pd.Series(dtype=float)
+            return self.history.get_equity_curve()
+
         if self.portfolio_history.empty:
             return pd.Series(dtype=float)
 
@@ -92,12 +175,55 @@ class BacktestResult:
 
         return pd.Series(dtype=float)
 
+    def get_bar_timestamps(self) -> pd.DatetimeIndex:
+        """
+        Return the timestamp of every bar in the equity curve.
+
+        Equity curves read from a columnar ``history`` have a positional
+        index, so their timestamps come from the history itself.
+
+        Returns:
+            DatetimeIndex aligned with get_equity_curve()
+        """
+        if self._portfolio_history is None and self.history is not None:
+            return pd.DatetimeIndex(self.history.timestamps)
+
+        if "timestamp" in self.portfolio_history.columns:
+            return pd.DatetimeIndex(self.portfolio_history["timestamp"])
+
+        return pd.DatetimeIndex(self.get_equity_curve().index)
+
+    def get_returns(self) -> pd.Series:
+        """
+        Return period-over-period returns of the equity curve (cached).
+
+        Returns:
+            Series of period returns, 0 for the first period
+        """
+        from copilot_quant.backtest.metrics import PerformanceAnalyzer
+
+        return self._cached("returns", lambda: PerformanceAnalyzer().calculate_returns(self._equity()))
+
+    def get_drawdown(self) -> pd.Series:
+        """
+        Return the drawdown series of the equity curve (cached).
+
+        Returns:
+            Series of drawdowns from the running peak (e.g., -0.10 = 10% below peak)
+        """
+        from copilot_quant.backtest.metrics import PerformanceAnalyzer
+
+        return self._cached("drawdown", lambda: PerformanceAnalyzer().calculate_drawdown(self._equity()))
+
     def get_summary_stats(self, risk_free_rate: float = 0.02) -> Dict:
         """
         Calculate comprehensive summary statistics for the backtest.
 
         This method computes all performance metrics including returns,
         risk metrics (Sharpe, Sortino, drawdown), and trade statistics.
+        Returns, drawdown and round trips are computed once per result and
+        the statistics are cached per ``risk_free_rate``; call
+        invalidate_metrics() after modifying the trades or history.
 
         Args:
             risk_free_rate: Annual risk-free rate for Sharpe/Sortino (default: 2%)
@@ -108,6 +234,41 @@ class BacktestResult:
                 - Risk metrics (Sharpe, Sortino, volatility, max drawdown)
                 - Trade statistics (count, win rate, profit factor)
         """
+        if self._metrics is None:
+            self._metrics = {}
+        cache = self._metrics
+        if risk_free_rate not in cache:
+            cache[risk_free_rate] = self._compute_summary_stats(risk_free_rate)
+        return dict(cache[risk_free_rate])
+
+    def get_metric(self, name: str, risk_free_rate: float = 0.02):
+        """
+        Return one summary statistic, computing the summary at most once per risk-free rate.
+
+        Args:
+            name: Key of get_summary_stats() (e.g. 'sharpe_ratio', 'max_drawdown')
+            risk_free_rate: Annual risk-free rate for Sharpe/Sortino (default: 2%)
+
+        Returns:
+            The metric value
+
+        Raises:
+            KeyError: If the result has no metric with that name
+        """
+        if self._metrics is None or risk_free_rate not in self._metrics:
+            self.get_summary_stats(risk_free_rate)
+        stats = self._metrics[risk_free_rate]
+        if name not in stats:
+            raise KeyError(f"Invalid metric: {name}. Available: {', '.join(stats)}")
+        return stats[name]
+
+    def invalidate_metrics(self) -> None:
+        """Drop cached returns, drawdown, round trips and summary statistics."""
+        self._analysis = None
+        self._metrics = None
+
+    def _compute_summary_stats(self, risk_free_rate: float) -> Dict:
+        """Build the summary statistics from the cached intermediates."""
         # Import here to avoid circular dependency
         from copilot_quant.backtest.metrics import PerformanceAnalyzer
 
@@ -121,22 +282,27 @@ class BacktestResult:
             "final_capital": self.final_capital,
             "total_return": self.total_return,
             "total_return_pct": self.total_return * 100,
-            "total_trades": len(self.trades),
+            "total_trades": self.num_trades,
         }
 
         # Calculate commission totals if we have trades
-        if self.trades:
-            trade_log = self.get_trade_log()
-            stats["total_commission"] = trade_log["commission"].sum()
-            stats["buy_trades"] = len(trade_log[trade_log["side"] == "buy"])
-            stats["sell_trades"] = len(trade_log[trade_log["side"] == "sell"])
+        if self.num_trades:
+            ledger = self.trade_ledger
+            stats["total_commission"] = float(ledger.commissions.sum())
+            stats["buy_trades"] = int((ledger.sides == BUY).sum())
+            stats["sell_trades"] = int((ledger.sides != BUY).sum())
 
         # Calculate advanced metrics using PerformanceAnalyzer
-        equity_curve = self.get_equity_curve()
+        equity_curve = self._equity()
         if not equity_curve.empty:
             analyzer = PerformanceAnalyzer(risk_free_rate=risk_free_rate)
             metrics = analyzer.calculate_metrics(
-                equity_curve=equity_curve, trades=self.trades, initial_capital=self.initial_capital
+                equity_curve=equity_curve,
+                trades=self.trade_ledger,
+                initial_capital=self.initial_capital,
+                returns=self.get_returns(),
+                max_drawdown=self.get_drawdown().min(),
+                trade_stats=self._trade_stats(),
             )
 
             # Merge advanced metrics into stats
@@ -144,6 +310,23 @@ class BacktestResult:
 
         return stats
 
+    def _trade_stats(self) -> Dict:
+        """Round-trip statistics (cached)."""
+        return self._cached("trade_stats", lambda: round_trip_stats(self.get_round_trips()["pnl"]))
+
+    def _equity(self) -> pd.Series:
+        """Equity curve (cached for the metrics)."""
+        return self._cached("equity_curve", self.get_equity_curve)
+
+    def _cached(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Return a cached intermediate, computing it on first use."""
+        if self._analysis is None:
+            self._analysis = {}
+        cache = self._analysis
+        if key not in cache:
+            cache[key] = compute()
+        return cache[key]
+
     def get_performance_metrics(self, risk_free_rate: float = 0.02) -> Dict:
         """
         Get detailed performance metrics.
@@ -164,6 +347,8 @@ class BacktestResult:
         """
         Get performance metrics as a property for convenience.
 
+        Computed once and cached; see invalidate_metrics().
+
         Returns:
             Dictionary with comprehensive performance metrics
         """
@@ -182,5 +367,93 @@ class BacktestResult:
     def __repr__(self) -> str:
         """String representation of backtest result."""
         return (
-            f"BacktestResult(strategy={self.strategy_name}, return={self.total_return:.2%}, trades={len(self.trades)})"
+            f"BacktestResult(strategy={self.strategy_name}, return={self.total_return:.2%}, trades={self.num_trades})"
         )
+
+
+def summarize_many(results: Sequence[BacktestResult], risk_free_rate: float = 0.02) -> pd.DataFrame:
+    """
+    Summary statistics for many results at once.
+
+    Equity curves are stacked into one array and the return, risk and
+    drawdown metrics are computed column-wise (see
+    PerformanceAnalyzer.calculate_metrics_many); trade statistics use each
+    result's cached round trips. Each row matches that result's
+    get_summary_stats(), with NaN for keys a result does not have.
+
+    Args:
+        results: Backtest results to summarize
+        risk_free_rate: Annual risk-free rate for Sharpe/Sortino (default: 2%)
+
+    Returns:
+        DataFrame with one row per result, in input order
+
+    Example:
+        >>> summary = summarize_many(sweep_results)
+        >>> summary.nlargest(10, 'sharpe_ratio')[['strategy_name', 'sharpe_ratio', 'max_drawdown']]
+    """
+    # Import here to avoid circular dependency
+    from copilot_quant.backtest.metrics import PerformanceAnalyzer
+
+    results = list(results)
+    ledgers = [result.trade_ledger for result in results]
+    num_trades = np.array([len(ledger) for ledger in ledgers], dtype=np.int64)
+
+    basic = pd.DataFrame(
+        {
+            "strategy_name": [result.strategy_name for result in results],
+            "start_date": [result.start_date for result in results],
+            "end_date": [result.end_date for result in results],
+            "duration_days": [(result.end_date - result.start_date).days for result in results],
+            "initial_capital": [result.initial_capital for result in results],
+            "final_capital": [result.final_capital for result in results],
+            "total_return": [result.total_return for result in results],
+            "total_trades": num_trades,
+            "total_commission": [float(ledger.commissions.sum()) for ledger in ledgers],
+            "buy_trades": [int((ledger.sides == BUY).sum()) for ledger in ledgers],
+            "sell_trades": [int((ledger.sides != BUY).sum()) for ledger in ledgers],
+        }
+    )
+    basic.insert(basic.columns.get_loc("total_return") + 1, "total_return_pct", basic["total_return"] * 100)
+    # get_summary_stats only reports trade totals for results with trades
+    basic.loc[num_trades == 0, ["total_commission", "buy_trades", "sell_trades"]] = np.nan
+
+    curves = [result._equity() for result in results]
+    has_curve = np.array([not curve.empty for curve in curves], dtype=bool)
+    analyzer = PerformanceAnalyzer(risk_free_rate=risk_free_rate)
+    metrics = analyzer.calculate_metrics_many(
+        equity_curves=curves,
+        trade_pnls=_round_trip_pnls_many(ledgers),
+        num_trades=num_trades,
+        initial_capitals=[result.initial_capital for result in results],
+    )
+    # As in get_summary_stats, curve-based metrics override the basic returns
+    # and results without an equity curve keep their basic stats only
+    metrics.loc[~has_curve, :] = np.nan
+    overlap = ["total_return", "total_return_pct"]
+    basic.loc[has_curve, overlap] = metrics.loc[has_curve, overlap]
+    return basic.join(metrics.drop(columns=[*overlap, "total_trades"]))
+
+
+def _round_trip_pnls_many(ledgers: Sequence[TradeLedger]) -> List[np.ndarray]:
+    """Round-trip P&Ls of many ledgers from a single match over (ledger, symbol) keys."""
+    sizes = np.array([len(ledger) for ledger in ledgers], dtype=np.int64)
+    if sizes.sum() == 0:
+        return [np.empty(0) for _ in ledgers]
+
+    owner = np.repeat(np.arange(len(ledgers)), sizes)
+    records = np.concatenate([ledger.records for ledger in ledgers])
+    stride = max(len(ledger.symbols) for ledger in ledgers) + 1
+    trips = match_round_trips(
+        timestamps=records["timestamp"],
+        symbols=owner * stride + records["symbol_id"],
+        quantities=records["side"] * records["quantity"],
+        prices=records["price"],
+        commissions=records["commission"],
+    )
+
+    # Split the P&Ls back per ledger, keeping each ledger's exit order
+    trip_owner = trips["symbol"].to_numpy(dtype=np.int64) // stride
+    order = np.argsort(trip_owner, kind="stable")
+    bounds = np.cumsum(np.bincount(trip_owner, minlength=len(ledgers)))[:-1]
+    return np.split(trips["pnl"].to_numpy()[order], bounds)
@@ -0,0 +1,370 @@
+"""
+Bootstrap and Monte Carlo robustness analysis for backtest results.
+
+A backtest produces one equity curve and therefore one Sharpe ratio, one
+CAGR and one maximum drawdown. RobustnessAnalyzer resamples the result
+thousands of times to show how much of that is luck:
+
+- ``block_bootstrap``: resample daily returns in contiguous blocks (circular
+  moving block bootstrap), keeping short-range autocorrelation
+- ``trade_shuffle``: replay the closed round trips in a random order, which
+  leaves total P&L unchanged but shows how path-dependent the drawdown is
+- ``entry_delay``: enter every round trip up to ``max_delay`` bars late,
+  repricing the entry from a close-price panel
+
+Resampling is vectorized: each batch draws a (paths x bars) matrix of
+equity paths and scores it with PerformanceAnalyzer.calculate_path_metrics.
+Batches are spread over worker processes and seeded from one SeedSequence,
+so results depend on ``seed`` but not on the number of workers.
+"""
+
+import logging
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from copilot_quant.backtest.metrics import PerformanceAnalyzer
+from copilot_quant.backtest.results import BacktestResult
+
+logger = logging.getLogger(__name__)
+
+# Supported resampling methods
+RESAMPLING_METHODS = ("block_bootstrap", "trade_shuffle", "entry_delay")
+
+# Metrics reported for every resampled path
+ROBUSTNESS_METRICS = ("sharpe_ratio", "cagr", "max_drawdown")
+
+
+@dataclass
+class RobustnessResult:
+    """
+    Outcome of a robustness analysis.
+
+    Attributes:
+        samples: One row per resampled path: method plus one column per metric
+        intervals: One row per (method, metric) with the point estimate of the
+                   original result and the mean, std and confidence interval
+                   of the resampled values
+        confidence: Two-sided confidence level of the intervals
+    """
+
+    samples: pd.DataFrame = field(default_factory=pd.DataFrame)
+    intervals: pd.DataFrame = field(default_factory=pd.DataFrame)
+    confidence: float = 0.95
+
+    def interval(self, metric: str, method: str = "block_bootstrap") -> Tuple[float, float]:
+        """
+        Get the confidence interval of one metric.
+
+        Args:
+            metric: Metric name (see ROBUSTNESS_METRICS)
+            method: Resampling method
+
+        Returns:
+            Tuple of (lower, upper) bounds
+
+        Raises:
+            KeyError: If the method or metric was not analyzed
+        """
+        rows = self.intervals[(self.intervals["method"] == method) & (self.intervals["metric"] == metric)]
+        if rows.empty:
+            raise KeyError(f"No interval for {metric} with {method}")
+        return float(rows["lower"].iloc[0]), float(rows["upper"].iloc[0])
+
+
+def _equity_from_returns(returns: np.ndarray, start_value: float) -> np.ndarray:
+    """Equity paths starting at start_value; the first column has no return."""
+    growth = np.cumprod(1 + returns, axis=1)
+    equity = np.empty((len(returns), returns.shape[1] + 1))
+    equity[:, 0] = start_value
+    equity[:, 1:] = start_value * growth
+    return equity
+
+
+def _closed_trade_equity(pnls: np.ndarray, exit_bars: np.ndarray, bars: int, start_value: float) -> np.ndarray:
+    """
+    Equity paths that move only when a round trip closes.
+
+    ``pnls`` holds one row per path with the P&L booked at each exit bar
+    (``exit_bars`` sorted ascending).
+    """
+    booked = np.cumsum(pnls, axis=1)
+    last_closed = np.searchsorted(exit_bars, np.arange(bars), side="right") - 1
+    equity = np.full((len(pnls), bars), float(start_value))
+    closed = last_closed >= 0
+    equity[:, closed] += booked[:, last_closed[closed]]
+    return equity
+
+
+def _resample_batch(inputs: Dict[str, Any], method: str, size: int, seed: np.random.SeedSequence) -> np.ndarray:
+    """
+    Draw and score one batch of resampled paths.
+
+    Returns:
+        (size x len(ROBUSTNESS_METRICS)) array of metric values
+    """
+    rng = np.random.default_rng(seed)
+
+    if method == "block_bootstrap":
+        returns = inputs["returns"]
+        n, block = len(returns), inputs["block_size"]
+        num_blocks = -(-n // block)
+        starts = rng.integers(0, n, size=(size, num_blocks))
+        index = (starts[:, :, None] + np.arange(block)) % n
+        equity = _equity_from_returns(returns[index.reshape(size, -1)[:, :n]], inputs["start_value"])
+    elif method == "trade_shuffle":
+        order = rng.permuted(np.tile(np.arange(len(inputs["pnl"])), (size, 1)), axis=1)
+        equity = _closed_trade_equity(inputs["pnl"][order], inputs["exit_bars"], inputs["bars"], inputs["start_value"])
+    else:
+        trades = np.arange(len(inputs["pnl"]))
+        delays = np.minimum(rng.integers(0, inputs["max_delay"] + 1, size=(size, len(trades))), inputs["room"])
+        entry = inputs["entry_price"] * inputs["delay_ratio"][trades, delays]
+        pnls = inputs["sign"] * inputs["quantity"] * (inputs["exit_price"] - entry) - inputs["commission"]
+        equity = _closed_trade_equity(pnls, inputs["exit_bars"], inputs["bars"], inputs["start_value"])
+
+    metrics = PerformanceAnalyzer(inputs["risk_free_rate"]).calculate_path_metrics(equity, inputs["initial_capital"])
+    return np.column_stack([metrics[name] for name in ROBUSTNESS_METRICS])
+
+
+# Resampling inputs installed in each worker process by _init_worker
+_WORKER_INPUTS: Dict[str, Any] = {}
+
+
+def _init_worker(inputs: Dict[str, Any]) -> None:
+    """Store the resampling inputs once per worker process."""
+    _WORKER_INPUTS.update(inputs)
+
+
+def _resample_in_worker(method: str, size: int, seed: np.random.SeedSequence) -> np.ndarray:
+    """Resample one batch using the worker's inputs."""
+    return _resample_batch(_WORKER_INPUTS, method, size, seed)
+
+
+class RobustnessAnalyzer:
+    """
+    Confidence intervals for backtest metrics from resampled equity paths.
+
+    Example:
+        >>> analyzer = RobustnessAnalyzer(num_samples=5000, seed=42)
+        >>> robustness = analyzer.run(result, prices=closes, max_workers=4)
+        >>> robustness.interval('sharpe_ratio')
+        (0.41, 1.87)
+        >>> robustness.intervals
+    """
+
+    def __init__(
+        self,
+        num_samples: int = 1000,
+        block_size: Optional[int] = None,
+        max_delay: int = 5,
+        confidence: float = 0.95,
+        risk_free_rate: float = 0.02,
+        batch_size: int = 250,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize analyzer.
+
+        Args:
+            num_samples: Resampled paths per method
+            block_size: Bootstrap block length in bars (None = cube root of the number of returns)
+            max_delay: Maximum entry delay in bars for 'entry_delay'
+            confidence: Two-sided confidence level (e.g., 0.95)
+            risk_free_rate: Annual risk-free rate for Sharpe ratios
+            batch_size: Paths drawn per vectorized batch
+            seed: Seed for reproducible resampling
+
+        Raises:
+            ValueError: If any argument is out of range
+        """
+        if num_samples <= 0:
+            raise ValueError(f"Invalid num_samples: {num_samples}. Must be positive")
+        if block_size is not None and block_size <= 0:
+            raise ValueError(f"Invalid block_size: {block_size}. Must be positive")
+        if max_delay < 0:
+            raise ValueError(f"Invalid max_delay: {max_delay}. Must be non-negative")
+        if not 0 < confidence < 1:
+            raise ValueError(f"Invalid confidence: {confidence}. Must be between 0 and 1")
+        if batch_size <= 0:
+            raise ValueError(f"Invalid batch_size: {batch_size}. Must be positive")
+
+        self.num_samples = num_samples
+        self.block_size = block_size
+        self.max_delay = int(max_delay)
+        self.confidence = confidence
+        self.risk_free_rate = risk_free_rate
+        self.batch_size = batch_size
+        self.seed = seed
+
+    def run(
+        self,
+        result: BacktestResult,
+        methods: Optional[Sequence[str]] = None,
+        prices: Optional[pd.DataFrame] = None,
+        max_workers: Optional[int] = None,
+    ) -> RobustnessResult:
+        """
+        Resample a backtest result and summarize the metric distributions.
+
+        Args:
+            result: Backtest to analyze
+            methods: Methods to run (default: every method the inputs allow;
+                     'entry_delay' needs ``prices``)
+            prices: Close prices (dates x symbols) used to reprice delayed entries
+            max_workers: Worker processes (None = CPU count, 1 = run in-process)
+
+        Returns:
+            RobustnessResult with every resampled path and the intervals
+
+        Raises:
+            ValueError: If a method is unknown, 'entry_delay' is requested without
+                        prices, max_workers is not positive, or the result has
+                        fewer than two bars
+        """
+        if max_workers is not None and max_workers <= 0:
+            raise ValueError(f"Invalid max_workers: {max_workers}. Must be positive")
+        if methods is None:
+            methods = [m for m in RESAMPLING_METHODS if m != "entry_delay" or prices is not None]
+        for method in methods:
+            if method not in RESAMPLING_METHODS:
+                raise ValueError(f"Invalid method: {method}. Must be one of {RESAMPLING_METHODS}")
+        if "entry_delay" in methods and prices is None:
+            raise ValueError("Invalid method: entry_delay. Requires a prices panel")
+
+        equity = result.get_equity_curve()
+        if len(equity) < 2:
+            raise ValueError(f"Invalid result: {len(equity)} bars. Must have at least two")
+
+        inputs = self._prepare_inputs(result, equity, prices if "entry_delay" in methods else None)
+        if len(inputs["pnl"]) == 0:
+            skipped = [m for m in methods if m != "block_bootstrap"]
+            if skipped:
+                logger.warning(f"No closed round trips; skipping {skipped}")
+            methods = [m for m in methods if m == "block_bootstrap"]
+
+        points = self._point_estimates(inputs, equity, methods)
+        samples = self._resample(inputs, methods, max_workers)
+        return RobustnessResult(samples=samples, intervals=self._intervals(samples, points), confidence=self.confidence)
+
+    def _prepare_inputs(self, result: BacktestResult, equity: pd.Series, prices: Optional[pd.DataFrame]) -> Dict:
+        """Collect the arrays every batch needs, reusing the result's cached returns and round trips."""
+        returns = result.get_returns().to_numpy(dtype=float)[1:]
+        round_trips = result.get_round_trips().sort_values("exit_time", kind="stable")
+        index = result.get_bar_timestamps()
+        bars = len(index)
+
+        entry_bars = np.clip(index.searchsorted(pd.DatetimeIndex(round_trips["entry_time"])), 0, bars - 1)
+        exit_bars = np.clip(index.searchsorted(pd.DatetimeIndex(round_trips["exit_time"])), 0, bars - 1)
+
+        inputs = {
+            "returns": returns,
+            "block_size": self.block_size or max(1, round(len(returns) ** (1 / 3))),
+            "start_value": float(equity.iloc[0]),
+            "initial_capital": float(result.initial_capital),
+            "bars": bars,
+            "risk_free_rate": self.risk_free_rate,
+            "max_delay": self.max_delay,
+            "pnl": round_trips["pnl"].to_numpy(dtype=float),
+            "exit_bars": exit_bars,
+            "sign": np.where(round_trips["direction"].to_numpy() == "long", 1.0, -1.0),
+            "quantity": round_trips["quantity"].to_numpy(dtype=float),
+            "entry_price": round_trips["entry_price"].to_numpy(dtype=float),
+            "exit_price": round_trips["exit_price"].to_numpy(dtype=float),
+            "commission": round_trips["commission"].to_numpy(dtype=float),
+            "room": np.minimum(exit_bars - entry_bars, self.max_delay),
+        }
+        if prices is not None:
+            inputs["delay_ratio"] = self._delay_ratios(prices, index, round_trips["symbol"], entry_bars)
+        return inputs
+
+    def _delay_ratios(
+        self, prices: pd.DataFrame, index: pd.DatetimeIndex, symbols: pd.Series, entry_bars: np.ndarray
+    ) -> np.ndarray:
+        """
+        Price of each trade's symbol ``d`` bars after entry relative to the entry bar.
+
+        Returns:
+            (trades x max_delay+1) array; 1.0 where no price is available
+        """
+        closes = prices.reindex(index).ffill()
+        missing = sorted(set(symbols) - set(closes.columns))
+        if missing:
+            logger.warning(f"No prices for {missing}; their entries are not delayed")
+
+        columns = closes.columns.get_indexer(symbols)
+        panel = closes.to_numpy(dtype=float)
+        rows = np.minimum(entry_bars[:, None] + np.arange(self.max_delay + 1), len(index) - 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            delayed = panel[rows, np.maximum(columns, 0)[:, None]]
+            ratio = delayed / delayed[:, :1]
+        ratio[(columns < 0)] = 1.0
+        return np.where(np.isfinite(ratio), ratio, 1.0)
+
+    def _point_estimates(self, inputs: Dict, equity: pd.Series, methods: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Metrics of the unresampled path each method perturbs."""
+        analyzer = PerformanceAnalyzer(self.risk_free_rate)
+        points = {}
+        for method in methods:
+            if method == "block_bootstrap":
+                path = equity.to_numpy(dtype=float)[None, :]
+            else:
+                path = _closed_trade_equity(
+                    inputs["pnl"][None, :], inputs["exit_bars"], inputs["bars"], inputs["start_value"]
+                )
+            metrics = analyzer.calculate_path_metrics(path, inputs["initial_capital"])
+            points[method] = np.array([metrics[name][0] for name in ROBUSTNESS_METRICS])
+        return points
+
+    def _resample(self, inputs: Dict, methods: Sequence[str], max_workers: Optional[int]) -> pd.DataFrame:
+        """Run every batch, in-process or across worker processes, in a fixed order."""
+        num_batches = math.ceil(self.num_samples / self.batch_size)
+        sizes = [min(self.batch_size, self.num_samples - b * self.batch_size) for b in range(num_batches)]
+        tasks = [(method, size) for method in methods for size in sizes]
+        seeds = np.random.SeedSequence(self.seed).spawn(len(tasks))
+
+        if max_workers == 1 or len(tasks) <= 1:
+            batches = [
+                _resample_batch(inputs, method, size, seed) for (method, size), seed in zip(tasks, seeds, strict=True)
+            ]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(inputs,)) as pool:
+                futures = [
+                    pool.submit(_resample_in_worker, method, size, seed)
+                    for (method, size), seed in zip(tasks, seeds, strict=True)
+                ]
+                batches = [future.result() for future in futures]
+
+        frames: List[pd.DataFrame] = []
+        for (method, _), values in zip(tasks, batches, strict=True):
+            frame = pd.DataFrame(values, columns=list(ROBUSTNESS_METRICS))
+            frame.insert(0, "method", method)
+            frames.append(frame)
+        if not frames:
+            return pd.DataFrame(columns=["method", *ROBUSTNESS_METRICS])
+        return pd.concat(frames, ignore_index=True)
+
+    def _intervals(self, samples: pd.DataFrame, points: Dict[str, np.ndarray]) -> pd.DataFrame:
+        """Percentile confidence intervals per method and metric."""
+        tail = (1 - self.confidence) / 2 * 100
+        rows = []
+        for method, point in points.items():
+            values = samples.loc[samples["method"] == method, list(ROBUSTNESS_METRICS)].to_numpy(dtype=float)
+            values = np.where(np.isfinite(values), values, np.nan)
+            lower, upper = np.nanpercentile(values, [tail, 100 - tail], axis=0)
+            for i, metric in enumerate(ROBUSTNESS_METRICS):
+                rows.append(
+                    {
+                        "method": method,
+                        "metric": metric,
+                        "point": point[i],
+                        "mean": np.nanmean(values[:, i]),
+                        "std": np.nanstd(values[:, i], ddof=1),
+                        "lower": lower[i],
+                        "upper": upper[i],
+                    }
+                )
+        return pd.DataFrame(rows, columns=["method", "metric", "point", "mean", "std", "lower", "upper"])
@@ -0,0 +1,288 @@
+"""
+FIFO round-trip matching.
+
+This module pairs opening fills with the fills that close them, first in
+first out, and returns one row per matched (opening lot, closing fill)
+pair. Matching runs on sorted NumPy arrays rather than per-symbol Python
+loops: the quantity each symbol opens and closes is laid out on a
+cumulative axis, and matched quantities are the overlaps of the opening
+and closing intervals. Partial closes, scaling in and out, short
+positions and fills that flip a position through zero are all supported.
+
+Backtest trade statistics (PerformanceAnalyzer) and live analytics
+(PerformanceEngine, AttributionAnalyzer) both consume this table.
+"""
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+ROUND_TRIP_COLUMNS = [
+    "symbol",
+    "direction",
+    "entry_time",
+    "exit_time",
+    "quantity",
+    "entry_price",
+    "exit_price",
+    "commission",
+    "pnl",
+    "holding_period",
+]
+
+# Quantities smaller than this are treated as zero (float drift from cumsums)
+EPSILON = 1e-9
+
+
+def match_round_trips(
+    timestamps: Sequence,
+    symbols: Sequence,
+    quantities: Sequence[float],
+    prices: Sequence[float],
+    commissions: Optional[Sequence[float]] = None,
+) -> pd.DataFrame:
+    """
+    Match fills into FIFO round trips.
+
+    Fills must be given in execution order. Each symbol is matched
+    independently: a fill that reduces the open position closes the oldest
+    open lots first, and any quantity beyond the open position opens a new
+    lot in the opposite direction.
+
+    Commissions are allocated pro rata to quantity, so a round trip carries
+    its share of both the opening and the closing fill's commission.
+
+    Args:
+        timestamps: Fill times
+        symbols: Symbol (or symbol id) of each fill
+        quantities: Signed fill quantities (positive = buy, negative = sell)
+        prices: Fill prices
+        commissions: Commission paid on each fill (default: none)
+
+    Returns:
+        DataFrame with one row per matched lot, ordered by exit fill, and columns:
+            - symbol: Symbol traded
+            - direction: 'long' or 'short'
+            - entry_time / exit_time: Times of the opening and closing fills
+            - quantity: Quantity matched (always positive)
+            - entry_price / exit_price: Fill prices
+            - commission: Allocated entry and exit commission
+            - pnl: Profit net of commission
+            - holding_period: exit_time - entry_time
+
+    Raises:
+        ValueError: If the input arrays have different lengths
+    """
+    timestamps = pd.DatetimeIndex(timestamps)
+    symbols = np.asarray(symbols)
+    quantities = np.asarray(quantities, dtype=float)
+    prices = np.asarray(prices, dtype=float)
+    commissions = np.zeros_like(quantities) if commissions is None else np.asarray(commissions, dtype=float)
+
+    lengths = {len(timestamps), len(symbols), len(quantities), len(prices), len(commissions)}
+    if len(lengths) != 1:
+        raise ValueError(f"Invalid fill arrays: lengths {sorted(lengths)}. Must all be equal")
+    if len(quantities) == 0:
+        return _empty_round_trips()
+
+    # Group fills by symbol, keeping execution order within each symbol
+    codes, labels = pd.factorize(symbols)
+    n = len(codes)
+    order = np.argsort(codes * n + np.arange(n))  # unique keys, so no stable sort needed
+    codes, quantities = codes[order], quantities[order]
+    prices, commissions = prices[order], commissions[order]
+
+    after = _snap(_grouped_cumsum(codes, quantities))
+    before = _snap(after - quantities)
+    size = np.abs(quantities)
+
+    # Split each fill into the part closing the open position and the part opening a new one
+    close_qty = np.where(before * quantities < 0, np.minimum(size, np.abs(before)), 0.0)
+    open_qty = _snap(size - close_qty)
+    close_share = np.divide(close_qty, size, out=np.zeros_like(size), where=size > 0)
+    close_commission = commissions * close_share
+    open_commission = commissions - close_commission
+
+    # Each symbol gets its own disjoint stretch of the cumulative axis
+    volume = np.bincount(codes, weights=size, minlength=len(labels))
+    offsets = np.concatenate([[0.0], np.cumsum(volume + 1.0)[:-1]])
+
+    matches = [
+        _match_direction(
+            codes,
+            offsets,
+            opens=np.flatnonzero((open_qty > 0) & (np.sign(quantities) == direction)),
+            closes=np.flatnonzero((close_qty > 0) & (np.sign(before) == direction)),
+            open_qty=open_qty,
+            close_qty=close_qty,
+            direction=direction,
+        )
+        for direction in (1, -1)
+    ]
+    open_rows = np.concatenate([m[0] for m in matches])
+    close_rows = np.concatenate([m[1] for m in matches])
+    matched = np.concatenate([m[2] for m in matches])
+    directions = np.concatenate([m[3] for m in matches])
+    if len(matched) == 0:
+        return _empty_round_trips()
+
+    # Report in the order the closing fills executed
+    sequence = np.argsort(order[close_rows] * n + order[open_rows])
+    open_rows, close_rows = open_rows[sequence], close_rows[sequence]
+    matched, directions = matched[sequence], directions[sequence]
+
+    entry_price, exit_price = prices[open_rows], prices[close_rows]
+    commission = (
+        open_commission[open_rows] * matched / open_qty[open_rows]
+        + close_commission[close_rows] * matched / close_qty[close_rows]
+    )
+    entry_time = timestamps.take(order[open_rows])
+    exit_time = timestamps.take(order[close_rows])
+
+    return pd.DataFrame(
+        {
+            "symbol": labels.take(codes[close_rows]),
+            "direction": np.where(directions > 0, "long", "short"),
+            "entry_time": entry_time,
+            "exit_time": exit_time,
+            "quantity": matched,
+            "entry_price": entry_price,
+            "exit_price": exit_price,
+            "commission": commission,
+            "pnl": directions * matched * (exit_price - entry_price) - commission,
+            "holding_period": exit_time - entry_time,
+        }
+    )
+
+
+def match_fill_records(fills: Sequence) -> pd.DataFrame:
+    """
+    Match stored fill records into FIFO round trips.
+
+    Args:
+        fills: Records in execution order with ``timestamp``, ``symbol``,
+               signed ``quantity``, ``price`` and ``commission`` attributes
+               (e.g. trade database FillModel rows)
+
+    Returns:
+        Round-trip table from match_round_trips
+    """
+    return match_round_trips(
+        timestamps=[fill.timestamp for fill in fills],
+        symbols=[fill.symbol for fill in fills],
+        quantities=[fill.quantity for fill in fills],
+        prices=[fill.price for fill in fills],
+        commissions=[fill.commission or 0.0 for fill in fills],
+    )
+
+
+def round_trip_stats(pnls: Sequence[float]) -> Dict:
+    """
+    Summarize round-trip P&Ls.
+
+    Args:
+        pnls: P&L of each round trip (e.g. ``match_round_trips(...)['pnl']``)
+
+    Returns:
+        Dictionary with num_trades, num_winning, num_losing, win_rate,
+        profit_factor, avg_win, avg_loss and avg_trade (all zero when empty)
+    """
+    pnls = np.asarray(pnls, dtype=float)
+    wins = pnls[pnls > 0]
+    losses = pnls[pnls < 0]
+
+    if len(pnls) == 0:
+        return {
+            "num_trades": 0,
+            "num_winning": 0,
+            "num_losing": 0,
+            "win_rate": 0.0,
+            "profit_factor": 0.0,
+            "avg_win": 0.0,
+            "avg_loss": 0.0,
+            "avg_trade": 0.0,
+        }
+
+    # Profit factor = Gross Profit / Gross Loss
+    gross_loss = abs(float(losses.sum()))
+    return {
+        "num_trades": len(pnls),
+        "num_winning": len(wins),
+        "num_losing": len(losses),
+        "win_rate": len(wins) / len(pnls),
+        "profit_factor": float(wins.sum()) / gross_loss if gross_loss > 0 else 0.0,
+        "avg_win": float(wins.mean()) if len(wins) else 0.0,
+        "avg_loss": float(losses.mean()) if len(losses) else 0.0,
+        "avg_trade": float(pnls.mean()),
+    }
+
+
+def _match_direction(
+    codes: np.ndarray,
+    offsets: np.ndarray,
+    opens: np.ndarray,
+    closes: np.ndarray,
+    open_qty: np.ndarray,
+    close_qty: np.ndarray,
+    direction: int,
+) -> tuple:
+    """
+    Overlap opening and closing intervals for one direction.
+
+    Opening lots occupy consecutive intervals on each symbol's stretch of
+    the cumulative axis, and so do closes. Because both sides advance in
+    execution order, FIFO pairs are exactly the overlapping intervals:
+    every segment between consecutive interval end points lies inside at
+    most one lot and one close.
+    """
+    if len(opens) == 0 or len(closes) == 0:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty, np.empty(0), np.empty(0, dtype=np.int8)
+
+    open_end = offsets[codes[opens]] + _grouped_cumsum(codes[opens], open_qty[opens])
+    open_start = open_end - open_qty[opens]
+    close_end = offsets[codes[closes]] + _grouped_cumsum(codes[closes], close_qty[closes])
+    close_start = close_end - close_qty[closes]
+
+    points = np.unique(np.concatenate([open_start, open_end, close_start, close_end]))
+    lengths = np.diff(points)
+    middle = points[:-1] + lengths / 2
+
+    i = np.minimum(np.searchsorted(open_end, middle), len(opens) - 1)
+    j = np.minimum(np.searchsorted(close_end, middle), len(closes) - 1)
+    inside = (open_start[i] < middle) & (middle < open_end[i]) & (close_start[j] < middle) & (middle < close_end[j])
+    keep = inside & (lengths > EPSILON)
+
+    return opens[i[keep]], closes[j[keep]], lengths[keep], np.full(keep.sum(), direction, dtype=np.int8)
+
+
+def _grouped_cumsum(codes: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Running sum of values restarting at each new code (codes must be grouped)."""
+    running = np.cumsum(values)
+    starts = np.flatnonzero(np.concatenate([[True], codes[1:] != codes[:-1]]))
+    base = running[starts] - values[starts]
+    return running - np.repeat(base, np.diff(np.append(starts, len(codes))))
+
+
+def _snap(values: np.ndarray) -> np.ndarray:
+    """Zero out float drift."""
+    return np.where(np.abs(values) < EPSILON, 0.0, values)
+
+
+def _empty_round_trips() -> pd.DataFrame:
+    """Empty round-trip table with the standard columns."""
+    return pd.DataFrame(
+        {
+            "symbol": pd.Series(dtype=object),
+            "direction": pd.Series(dtype=object),
+            "entry_time": pd.Series(dtype="datetime64[ns]"),
+            "exit_time": pd.Series(dtype="datetime64[ns]"),
+            "quantity": pd.Series(dtype=float),
+            "entry_price": pd.Series(dtype=float),
+            "exit_price": pd.Series(dtype=float),
+            "commission": pd.Series(dtype=float),
+            "pnl": pd.Series(dtype=float),
+            "holding_period": pd.Series(dtype="timedelta64[ns]"),
+        }
+    )
@@ -0,0 +1,470 @@
+"""
+Signal collection strategies for MultiStrategyEngine.
+
+At every bar MultiStrategyEngine asks each strategy for signals before it
+ranks and fills them. By default the strategies run one after another; the
+executors here overlap that work:
+
+- ``sequential``: call each strategy in turn (the default)
+- ``thread``: call strategies concurrently on a thread pool, which helps
+  strategies spending their time in NumPy, pandas or statsmodels code that
+  releases the GIL
+- ``process``: keep each strategy alive in a worker process for the whole
+  run; workers step through the same market data and receive their fills,
+  so per-strategy state persists exactly as in sequential mode
+- ``precompute``: generate every strategy's full signal stream up front, in
+  parallel, then replay it through the sequential allocation and fill pass.
+  Only valid for strategies whose signals do not depend on their fills.
+
+Every executor returns results in strategy registration order, so ranking,
+fills and attribution are identical across modes.
+"""
+
+import copy
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from copilot_quant.backtest.data_view import MarketDataCursor, PriceMatrix
+from copilot_quant.backtest.features import FeatureStore
+from copilot_quant.backtest.orders import Fill
+from copilot_quant.backtest.signals import SignalBasedStrategy, TradingSignal
+from copilot_quant.backtest.sweep import SharedMarketData
+
+logger = logging.getLogger(__name__)
+
+# Supported values for MultiStrategyEngine(signal_execution=...)
+SIGNAL_EXECUTION_MODES = ("sequential", "thread", "process", "precompute")
+
+# (signals, seconds spent in generate_signals, error message or None)
+SignalResult = Tuple[List[TradingSignal], float, Optional[str]]
+
+
+class StrategyTiming:
+    """
+    Time spent in one strategy's ``generate_signals``.
+
+    Attributes:
+        calls: Number of calls
+        total_time: Total seconds
+        max_time: Slowest single call in seconds
+    """
+
+    __slots__ = ("calls", "total_time", "max_time")
+
+    def __init__(self):
+        """Initialize empty timing."""
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def record(self, elapsed: float) -> None:
+        """Record one call."""
+        self.calls += 1
+        self.total_time += elapsed
+        if elapsed > self.max_time:
+            self.max_time = elapsed
+
+    @property
+    def mean_time(self) -> float:
+        """Average seconds per call."""
+        return self.total_time / self.calls if self.calls else 0.0
+
+    def to_dict(self) -> dict:
+        """Convert timing to dictionary."""
+        return {
+            "calls": self.calls,
+            "total_time": self.total_time,
+            "mean_time": self.mean_time,
+            "max_time": self.max_time,
+        }
+
+
+def evaluate_strategy(strategy: SignalBasedStrategy, timestamp, data) -> SignalResult:
+    """
+    Call ``generate_signals`` and time it.
+
+    Exceptions are returned as the error message so one failing strategy
+    does not stop the others.
+
+    Args:
+        strategy: Strategy to evaluate
+        timestamp: Current timestamp
+        data: Market data passed to the strategy
+
+    Returns:
+        Tuple of (signals with strategy_name set, elapsed seconds, error)
+    """
+    start = time.perf_counter()
+    try:
+        signals = strategy.generate_signals(timestamp, data) or []
+        for signal in signals:
+            if not signal.strategy_name:
+                signal.strategy_name = strategy.name
+        return list(signals), time.perf_counter() - start, None
+    except Exception as e:
+        return [], time.perf_counter() - start, str(e)
+
+
+class SignalExecutor(ABC):
+    """
+    Collects one bar of signals from every strategy.
+
+    Subclasses implement ``collect``. The engine calls ``on_fill`` for every
+    fill owned by a strategy and ``close`` once the run ends.
+    """
+
+    def __init__(self, strategies: Sequence[SignalBasedStrategy]):
+        """
+        Initialize executor.
+
+        Args:
+            strategies: Strategies in registration order
+        """
+        self.strategies = strategies
+
+    @abstractmethod
+    def collect(self, bar: int, timestamp, data_for: Callable[[int], Any]) -> List[SignalResult]:
+        """
+        Evaluate every strategy at one bar.
+
+        Args:
+            bar: Bar index in the run
+            timestamp: Timestamp of the bar
+            data_for: Returns the market data for the strategy at an index
+
+        Returns:
+            One SignalResult per strategy, in registration order
+        """
+        pass
+
+    def on_fill(self, index: int, fill: Fill) -> None:
+        """Deliver a fill to the strategy at ``index``."""
+        self.strategies[index].on_fill(fill)
+
+    def close(self) -> None:
+        """Release workers at the end of a run."""
+        pass
+
+
+class SequentialSignalExecutor(SignalExecutor):
+    """Evaluates strategies one after another in the calling thread."""
+
+    def collect(self, bar: int, timestamp, data_for: Callable[[int], Any]) -> List[SignalResult]:
+        return [evaluate_strategy(s, timestamp, data_for(i)) for i, s in enumerate(self.strategies)]
+
+
+class ThreadSignalExecutor(SignalExecutor):
+    """Evaluates strategies concurrently on a thread pool kept for the run."""
+
+    def __init__(self, strategies: Sequence[SignalBasedStrategy], max_workers: Optional[int] = None):
+        super().__init__(strategies)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="signals")
+
+    def collect(self, bar: int, timestamp, data_for: Callable[[int], Any]) -> List[SignalResult]:
+        # Market data views are built here so the cursor is only read by one thread
+        inputs = [data_for(i) for i in range(len(self.strategies))]
+        futures = [
+            self._pool.submit(evaluate_strategy, strategy, timestamp, data)
+            for strategy, data in zip(self.strategies, inputs, strict=True)
+        ]
+        return [future.result() for future in futures]
+
+    def close(self) -> None:
+        self._pool.shutdown()
+
+
+class _StrategyRunner:
+    """Steps a group of strategies through market data in a worker process."""
+
+    def __init__(self, data: pd.DataFrame, symbols: List[str], strategies: List[SignalBasedStrategy]):
+        self.cursor = MarketDataCursor(data)
+        self.prices = PriceMatrix(self.cursor.data, self.cursor.timestamps, symbols)
+        self.features = FeatureStore(symbols=self.prices.symbols, capacity=len(self.cursor))
+        self.strategies = strategies
+        self._next_bar = 0
+        self.windows = []
+        for strategy in strategies:
+            strategy.features = self.features
+            window = None
+            if getattr(strategy, "data_mode", "frame") == "window":
+                window = self.cursor.window(lookback=getattr(strategy, "max_lookback", None))
+            self.windows.append(window)
+
+    def step(self, bar: int, fills: Sequence[Tuple[int, Fill]] = ()) -> List[SignalResult]:
+        """Apply pending fills, advance to ``bar`` and evaluate every strategy."""
+        self.apply_fills(fills)
+        self.cursor.seek(bar)
+        timestamp = self.cursor.timestamps[bar]
+        # Warm-up bars the engine skipped still belong in the feature history
+        for row in range(self._next_bar, bar + 1):
+            self.features.append(self.cursor.timestamps[row], self.prices.row(row))
+        self._next_bar = bar + 1
+
+        results = []
+        for strategy, window in zip(self.strategies, self.windows, strict=True):
+            data = window if window is not None else self.cursor.frame(lookback=getattr(strategy, "max_lookback", None))
+            results.append(evaluate_strategy(strategy, timestamp, data))
+        return results
+
+    def apply_fills(self, fills: Sequence[Tuple[int, Fill]]) -> None:
+        """Deliver fills to strategies by their index in the group."""
+        for index, fill in fills:
+            self.strategies[index].on_fill(fill)
+
+    def detach(self) -> List[SignalBasedStrategy]:
+        """Drop the worker's feature store from the strategies before returning them."""
+        for strategy in self.strategies:
+            strategy.features = None
+        return self.strategies
+
+
+def _detached(strategy: SignalBasedStrategy) -> SignalBasedStrategy:
+    """Shallow copy of a strategy without the engine's feature store, for shipping to a worker."""
+    clone = copy.copy(strategy)
+    clone.features = None
+    return clone
+
+
+def _adopt_state(strategy: SignalBasedStrategy, remote: SignalBasedStrategy) -> None:
+    """Copy a worker's strategy state back onto the engine's instance."""
+    features = strategy.features
+    vars(strategy).update(vars(remote))
+    strategy.features = features
+
+
+def _serve_strategies(conn, shared: SharedMarketData, symbols: List[str], strategies, log_level: int) -> None:
+    """Worker process loop: answer step requests until told to close."""
+    logging.getLogger("copilot_quant").setLevel(log_level)
+    runner = _StrategyRunner(shared.load(), symbols, strategies)
+    while True:
+        message = conn.recv()
+        if message[0] == "step":
+            conn.send(runner.step(message[1], message[2]))
+            continue
+
+        # Fills from the final bar arrive with the close request
+        runner.apply_fills(message[1])
+        try:
+            conn.send(runner.detach())
+        except Exception as e:
+            logger.error(f"Could not return strategy state from signal worker: {e}")
+            conn.send(None)
+        break
+    conn.close()
+
+
+class ProcessSignalExecutor(SignalExecutor):
+    """
+    Keeps strategies alive in worker processes for the whole run.
+
+    Strategies are assigned round-robin to at most ``max_workers`` workers.
+    Each worker maps the run's market data, builds its own cursor and feature
+    store and, at every bar, receives the fills its strategies got on the
+    previous bar before evaluating them. At the end of the run each worker's
+    strategy state is copied back onto the engine's instances.
+    """
+
+    def __init__(
+        self,
+        strategies: Sequence[SignalBasedStrategy],
+        data: pd.DataFrame,
+        symbols: List[str],
+        max_workers: Optional[int] = None,
+    ):
+        super().__init__(strategies)
+        num_workers = max(min(max_workers or os.cpu_count() or 1, len(strategies)), 1)
+        self._groups = [list(range(w, len(strategies), num_workers)) for w in range(num_workers)]
+        self._location = {index: (w, i) for w, group in enumerate(self._groups) for i, index in enumerate(group)}
+        self._pending: List[List[Tuple[int, Fill]]] = [[] for _ in self._groups]
+
+        self._tmpdir = tempfile.TemporaryDirectory(prefix="copilot_quant_signals_")
+        shared = SharedMarketData.write(data, self._tmpdir.name)
+        log_level = logging.getLogger("copilot_quant").getEffectiveLevel()
+        context = multiprocessing.get_context()
+
+        self._workers = []
+        for group in self._groups:
+            parent, child = context.Pipe()
+            clones = [_detached(strategies[index]) for index in group]
+            process = context.Process(
+                target=_serve_strategies, args=(child, shared, symbols, clones, log_level), daemon=True
+            )
+            process.start()
+            child.close()
+            self._workers.append((process, parent))
+
+        logger.info(f"Started {num_workers} signal worker processes for {len(strategies)} strategies")
+
+    def collect(self, bar: int, timestamp, data_for: Callable[[int], Any]) -> List[SignalResult]:
+        for w, (_, conn) in enumerate(self._workers):
+            conn.send(("step", bar, self._pending[w]))
+            self._pending[w] = []
+
+        results: List[Optional[SignalResult]] = [None] * len(self.strategies)
+        for w, group in enumerate(self._groups):
+            for index, result in zip(group, self._receive(w), strict=True):
+                results[index] = result
+        return results
+
+    def on_fill(self, index: int, fill: Fill) -> None:
+        worker, local = self._location[index]
+        self._pending[worker].append((local, fill))
+
+    def close(self) -> None:
+        for w, (process, conn) in enumerate(self._workers):
+            try:
+                conn.send(("close", self._pending[w]))
+                remote = conn.recv()
+                if remote is not None:
+                    for index, strategy in zip(self._groups[w], remote, strict=True):
+                        _adopt_state(self.strategies[index], strategy)
+            except (EOFError, OSError) as e:
+                logger.warning(f"Signal worker {w} did not return strategy state: {e}")
+            conn.close()
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._workers = []
+        self._tmpdir.cleanup()
+
+    def _receive(self, worker: int) -> List[SignalResult]:
+        """Wait for one worker's results."""
+        try:
+            return self._workers[worker][1].recv()
+        except EOFError:
+            raise RuntimeError(f"Signal worker {worker} exited unexpectedly") from None
+
+
+class _SignalStream:
+    """One strategy's precomputed results from ``start_bar`` on, storing only bars with signals or errors."""
+
+    def __init__(self, results: Sequence[SignalResult], start_bar: int = 0):
+        self.start_bar = start_bar
+        self.elapsed = np.array([elapsed for _, elapsed, _ in results])
+        self.events: Dict[int, Tuple[List[TradingSignal], Optional[str]]] = {
+            bar: (signals, error)
+            for bar, (signals, _, error) in enumerate(results, start=start_bar)
+            if signals or error
+        }
+
+    def at(self, bar: int) -> SignalResult:
+        signals, error = self.events.get(bar, ((), None))
+        return list(signals), float(self.elapsed[bar - self.start_bar]), error
+
+
+# Market data installed in each precompute worker by _init_precompute_worker
+_WORKER_CONTEXT: Dict[str, Any] = {}
+
+
+def _init_precompute_worker(shared: SharedMarketData, symbols: List[str], log_level: int) -> None:
+    """Load shared market data in a precompute worker process."""
+    logging.getLogger("copilot_quant").setLevel(log_level)
+    _WORKER_CONTEXT["data"] = shared.load()
+    _WORKER_CONTEXT["symbols"] = symbols
+
+
+def _precompute_stream(
+    data: pd.DataFrame, symbols: List[str], strategy: SignalBasedStrategy, start_bar: int = 0
+) -> Tuple[_SignalStream, SignalBasedStrategy]:
+    """Run one strategy over every bar from ``start_bar`` without fills."""
+    runner = _StrategyRunner(data, symbols, [strategy])
+    stream = _SignalStream([runner.step(bar)[0] for bar in range(start_bar, len(runner.cursor))], start_bar)
+    return stream, runner.detach()[0]
+
+
+def _precompute_in_worker(strategy: SignalBasedStrategy, start_bar: int) -> Tuple[_SignalStream, SignalBasedStrategy]:
+    """Precompute one strategy using the worker's preloaded data."""
+    return _precompute_stream(_WORKER_CONTEXT["data"], _WORKER_CONTEXT["symbols"], strategy, start_bar)
+
+
+class PrecomputedSignalExecutor(SignalExecutor):
+    """
+    Generates each strategy's full signal stream before the run.
+
+    Streams are computed in parallel, one process per strategy (in-process
+    when ``max_workers == 1`` or there is one strategy), and replayed bar by
+    bar. Strategies never see their fills while generating signals, so this
+    mode is only equivalent to sequential mode for strategies whose signals
+    depend on market data alone. Fills are still delivered to ``on_fill``
+    during the replay.
+    """
+
+    def __init__(
+        self,
+        strategies: Sequence[SignalBasedStrategy],
+        data: pd.DataFrame,
+        symbols: List[str],
+        max_workers: Optional[int] = None,
+        start_bar: int = 0,
+    ):
+        super().__init__(strategies)
+        clones = [_detached(strategy) for strategy in strategies]
+        start = time.perf_counter()
+
+        if max_workers == 1 or len(strategies) == 1:
+            outputs = [_precompute_stream(data, symbols, clone, start_bar) for clone in clones]
+        else:
+            log_level = logging.getLogger("copilot_quant").getEffectiveLevel()
+            with tempfile.TemporaryDirectory(prefix="copilot_quant_signals_") as tmpdir:
+                shared = SharedMarketData.write(data, tmpdir)
+                with ProcessPoolExecutor(
+                    max_workers=max_workers, initializer=_init_precompute_worker, initargs=(shared, symbols, log_level)
+                ) as pool:
+                    futures = [pool.submit(_precompute_in_worker, clone, start_bar) for clone in clones]
+                    outputs = [future.result() for future in futures]
+
+        self._streams = []
+        for strategy, (stream, remote) in zip(strategies, outputs, strict=True):
+            _adopt_state(strategy, remote)
+            self._streams.append(stream)
+
+        logger.info(f"Precomputed signals for {len(strategies)} strategies in {time.perf_counter() - start:.2f}s")
+
+    def collect(self, bar: int, timestamp, data_for: Callable[[int], Any]) -> List[SignalResult]:
+        return [stream.at(bar) for stream in self._streams]
+
+
+def create_signal_executor(
+    mode: str,
+    strategies: Sequence[SignalBasedStrategy],
+    data: pd.DataFrame,
+    symbols: List[str],
+    max_workers: Optional[int] = None,
+    start_bar: int = 0,
+) -> SignalExecutor:
+    """
+    Create the executor for a signal execution mode.
+
+    Args:
+        mode: One of SIGNAL_EXECUTION_MODES
+        strategies: Strategies in registration order
+        data: Market data for the run (used by worker processes)
+        symbols: Symbols being traded
+        max_workers: Threads or processes to use (None = CPU count)
+        start_bar: First bar the engine collects signals at; earlier bars
+                   are warm-up history only
+
+    Returns:
+        SignalExecutor for the run
+
+    Raises:
+        ValueError: If the mode is not supported
+    """
+    if mode == "sequential":
+        return SequentialSignalExecutor(strategies)
+    if mode == "thread":
+        return ThreadSignalExecutor(strategies, max_workers)
+    if mode == "process":
+        return ProcessSignalExecutor(strategies, data, symbols, max_workers)
+    if mode == "precompute":
+        return PrecomputedSignalExecutor(strategies, data, symbols, max_workers, start_bar)
+    raise ValueError(f"Invalid signal_execution: {mode}. Must be one of {SIGNAL_EXECUTION_MODES}")
@@ -30,6 +30,9 @@ class TradingSignal:
         stop_loss: Optional stop loss price
         take_profit: Optional take profit price
         strategy_name: Name of strategy generating this signal
+        quantity: Optional explicit order quantity (e.g. to close a position
+                  exactly); None lets the engine size the order from the
+                  signal quality
     """
 
     symbol: str
@@ -40,6 +43,7 @@ class TradingSignal:
     stop_loss: Optional[float] = None
     take_profit: Optional[float] = None
     strategy_name: str = ""
+    quantity: Optional[float] = None
 
     def __post_init__(self):
         """Validate signal after initialization."""
@@ -58,6 +62,9 @@ class TradingSignal:
         if self.take_profit is not None and self.take_profit <= 0:
             raise ValueError(f"Invalid take_profit: {self.take_profit}. Must be positive")
 
+        if self.quantity is not None and self.quantity <= 0:
+            raise ValueError(f"Invalid quantity: {self.quantity}. Must be positive")
+
     @property
     def quality_score(self) -> float:
         """
@@ -6,12 +6,15 @@ This module provides the abstract base class that all trading strategies inherit
 
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import List
+from typing import TYPE_CHECKING, List, Optional
 
 import pandas as pd
 
 from copilot_quant.backtest.orders import Order
 
+if TYPE_CHECKING:
+    from copilot_quant.backtest.features import FeatureStore
+
 
 class Strategy(ABC):
     """
@@ -32,8 +35,22 @@ class Strategy(ABC):
         ...             return [Order(symbol='SPY', quantity=100,
         ...                          order_type='market', side='buy')]
         ...         return []
+
+    Attributes:
+        data_mode: How market data is passed to ``on_data``. ``"frame"`` (default)
+                   passes a DataFrame with all history up to the timestamp;
+                   ``"window"`` passes a read-only, append-only BarWindow backed
+                   by NumPy arrays.
+        max_lookback: Maximum number of bars of history passed to ``on_data``
+                      (None for full history). Applies to both data modes.
+        features: Rolling indicator cache shared by every strategy in the run,
+                  set by the engine before the first bar (None outside an engine)
     """
 
+    data_mode: str = "frame"
+    max_lookback: Optional[int] = None
+    features: Optional["FeatureStore"] = None
+
     def __init__(self):
         """Initialize strategy."""
         self.name = self.__class__.__name__
@@ -51,6 +68,7 @@ class Strategy(ABC):
             data: DataFrame with current and historical market data
                   Index: DatetimeIndex
                   Columns: Multi-level (Metric, Symbol) or Symbol-specific
+                  (a BarWindow when ``data_mode`` is ``"window"``)
 
         Returns:
             List of Order objects to execute. Return empty list for no orders.
@@ -0,0 +1,613 @@
+"""
+Parallel parameter sweeps for backtesting.
+
+This module runs the same backtest over many parameter sets. Market data is
+fetched once, written to memory-mapped files and opened copy-on-write by
+each worker process, so workers share the pages instead of re-downloading
+or unpickling the data per run. Results are collected into a tidy DataFrame
+with one row per parameter set and one column per PerformanceAnalyzer metric.
+"""
+
+import hashlib
+import inspect
+import itertools
+import json
+import logging
+import pickle
+import random
+import tempfile
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from copilot_quant.backtest.engine import BacktestEngine
+from copilot_quant.backtest.metrics import PerformanceAnalyzer
+from copilot_quant.backtest.results import BacktestResult
+from copilot_quant.backtest.strategy import Strategy
+from copilot_quant.data.providers import DataProvider
+
+logger = logging.getLogger(__name__)
+
+StrategyFactory = Callable[[Dict[str, Any]], Union[Strategy, Sequence[Strategy]]]
+ProgressCallback = Callable[[int, int, Dict[str, Any]], None]
+
+
+class ParameterGrid:
+    """
+    Exhaustive grid over parameter values.
+
+    Example:
+        >>> grid = ParameterGrid({'entry_zscore': [1.5, 2.0], 'lookback': [40, 60]})
+        >>> len(grid)
+        4
+    """
+
+    def __init__(self, space: Dict[str, Sequence[Any]]):
+        """
+        Initialize grid.
+
+        Args:
+            space: Mapping of parameter name to candidate values
+
+        Raises:
+            ValueError: If a parameter has no candidate values
+        """
+        for name, values in space.items():
+            if len(values) == 0:
+                raise ValueError(f"Parameter '{name}' has no values")
+        self.space = dict(space)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        names = list(self.space)
+        for values in itertools.product(*(self.space[name] for name in names)):
+            yield dict(zip(names, values, strict=True))
+
+    def __len__(self) -> int:
+        return int(np.prod([len(values) for values in self.space.values()]))
+
+
+class RandomSearch:
+    """
+    Random sample of parameter sets.
+
+    Each parameter is either a sequence (sampled uniformly) or a callable
+    taking a ``numpy.random.Generator`` and returning a value. Samples are
+    drawn up front from ``seed``, so the same seed always yields the same
+    parameter sets.
+
+    Example:
+        >>> search = RandomSearch(
+        ...     {'entry_zscore': lambda rng: rng.uniform(1.5, 2.5), 'lookback': [40, 60, 90]},
+        ...     n_iter=20,
+        ...     seed=7,
+        ... )
+    """
+
+    def __init__(
+        self, space: Dict[str, Union[Sequence[Any], Callable[[np.random.Generator], Any]]], n_iter: int, seed: int = 0
+    ):
+        """
+        Initialize random search.
+
+        Args:
+            space: Mapping of parameter name to candidate values or sampler
+            n_iter: Number of parameter sets to draw
+            seed: Seed for sampling
+
+        Raises:
+            ValueError: If n_iter is not positive or a parameter has no values
+        """
+        if n_iter <= 0:
+            raise ValueError(f"Invalid n_iter: {n_iter}. Must be positive")
+        for name, values in space.items():
+            if not callable(values) and len(values) == 0:
+                raise ValueError(f"Parameter '{name}' has no values")
+
+        self.space = dict(space)
+        self.n_iter = n_iter
+        self.seed = seed
+        self._samples = self._draw()
+
+    def _draw(self) -> List[Dict[str, Any]]:
+        rng = np.random.default_rng(self.seed)
+        samples = []
+        for _ in range(self.n_iter):
+            params = {}
+            for name, values in self.space.items():
+                if callable(values):
+                    value = values(rng)
+                else:
+                    value = values[int(rng.integers(len(values)))]
+                params[name] = value.item() if isinstance(value, np.generic) else value
+            samples.append(params)
+        return samples
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter([dict(params) for params in self._samples])
+
+    def __len__(self) -> int:
+        return self.n_iter
+
+
+class SharedMarketData:
+    """
+    Market data DataFrame stored as memory-mapped ``.npy`` files.
+
+    Numeric columns are saved one file per column and reopened with
+    ``mmap_mode='c'`` (copy-on-write), so every process maps the same pages
+    and in-place writes stay private to the writer. Object columns (e.g. the
+    long-format ``Symbol`` column) are stored as factorized codes.
+    """
+
+    META_FILE = "meta.pkl"
+
+    def __init__(self, directory: Union[str, Path]):
+        """
+        Initialize handle to an existing shared data directory.
+
+        Args:
+            directory: Directory written by ``SharedMarketData.write``
+        """
+        self.directory = Path(directory)
+
+    @classmethod
+    def write(cls, data: pd.DataFrame, directory: Union[str, Path]) -> "SharedMarketData":
+        """
+        Write a DataFrame to a directory of memory-mappable files.
+
+        Args:
+            data: Market data to share
+            directory: Target directory (created if missing)
+
+        Returns:
+            Handle that can be pickled cheaply and loaded in other processes
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        categories = {}
+        for i in range(data.shape[1]):
+            column = data.iloc[:, i]
+            if pd.api.types.is_numeric_dtype(column.dtype) or pd.api.types.is_bool_dtype(column.dtype):
+                values = column.to_numpy()
+            else:
+                values, uniques = pd.factorize(column, use_na_sentinel=True)
+                categories[i] = np.asarray(uniques, dtype=object)
+            np.save(directory / f"col_{i}.npy", values, allow_pickle=False)
+
+        meta = {"index": data.index, "columns": data.columns, "categories": categories}
+        with open(directory / cls.META_FILE, "wb") as f:
+            pickle.dump(meta, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        return cls(directory)
+
+    def load(self) -> pd.DataFrame:
+        """
+        Reconstruct the DataFrame backed by memory-mapped columns.
+
+        Returns:
+            DataFrame equal to the one passed to ``write``
+        """
+        with open(self.directory / self.META_FILE, "rb") as f:
+            meta = pickle.load(f)
+
+        arrays = {}
+        for i in range(len(meta["columns"])):
+            # np.asarray drops the memmap subclass but keeps the mapped buffer
+            values = np.asarray(np.load(self.directory / f"col_{i}.npy", mmap_mode="c"))
+            if i in meta["categories"]:
+                uniques = meta["categories"][i]
+                decoded = np.empty(len(values), dtype=object)
+                valid = values >= 0
+                decoded[valid] = uniques[values[valid]]
+                decoded[~valid] = np.nan
+                values = decoded
+            arrays[i] = values
+
+        data = pd.DataFrame(arrays, index=meta["index"], copy=False)
+        data.columns = meta["columns"]
+        return data
+
+
+class _PreloadedDataProvider(DataProvider):
+    """Data provider serving an already-fetched DataFrame."""
+
+    def __init__(self, data: pd.DataFrame):
+        self.data = data
+
+    def get_historical_data(self, symbol, start_date=None, end_date=None, interval="1d"):
+        # Shallow copy so engines adding columns do not mutate the shared frame
+        return self.data.copy(deep=False)
+
+    def get_multiple_symbols(self, symbols, start_date=None, end_date=None, interval="1d"):
+        return self.data.copy(deep=False)
+
+    def get_ticker_info(self, symbol):
+        return {"symbol": symbol}
+
+
+# Per-process state installed by _init_worker so the strategy factory and
+# market data are transferred once per worker instead of once per task.
+_WORKER_CONTEXT: Dict[str, Any] = {}
+
+
+def _init_worker(shared: SharedMarketData, config: Dict[str, Any]) -> None:
+    """Load shared market data and sweep configuration in a worker process."""
+    logging.getLogger("copilot_quant").setLevel(config["log_level"])
+    _WORKER_CONTEXT["data"] = shared.load()
+    _WORKER_CONTEXT["config"] = config
+
+
+def _run_in_worker(task: "SweepTask") -> Tuple[Dict[str, Any], Optional[BacktestResult]]:
+    """Run one task using the worker's preloaded context."""
+    return _run_task(_WORKER_CONTEXT["data"], _WORKER_CONTEXT["config"], task)
+
+
+@dataclass
+class SweepTask:
+    """
+    One backtest to run in a sweep.
+
+    Attributes:
+        run_id: Identifier echoed in the result record
+        params: Parameter set
+        seed: Seed for ``random`` and ``np.random``
+        rows: Optional ``(start, stop)`` row range of the shared data to run on.
+              The slice is a positional view, so overlapping windows reuse
+              the same memory. None runs over the configured date range.
+        keep_result: Return the BacktestResult alongside the metrics record
+        tags: Extra fields copied into the record (e.g. the window number)
+        close_positions: Close open positions at the last bar (passed to
+                         the engine's ``run``)
+        warmup_rows: Leading rows of ``rows`` given to the strategies as
+                     history only; trading and recording start after them
+    """
+
+    run_id: int
+    params: Dict[str, Any]
+    seed: int
+    rows: Optional[Tuple[int, int]] = None
+    keep_result: bool = False
+    tags: Dict[str, Any] = field(default_factory=dict)
+    close_positions: bool = False
+    warmup_rows: int = 0
+
+
+def _run_task(
+    data: pd.DataFrame, config: Dict[str, Any], task: SweepTask
+) -> Tuple[Dict[str, Any], Optional[BacktestResult]]:
+    """
+    Run one backtest and compute its metrics.
+
+    Errors are captured in the ``error`` field so one failing parameter set
+    does not abort the sweep.
+    """
+    record: Dict[str, Any] = {"run_id": task.run_id, **task.tags, **task.params, "seed": task.seed}
+    result = None
+    start = time.perf_counter()
+
+    try:
+        random.seed(task.seed)
+        np.random.seed(task.seed)
+
+        start_date, end_date = config["start_date"], config["end_date"]
+        if task.rows is not None:
+            data = data.iloc[task.rows[0] : task.rows[1]]
+            start_date, end_date = data.index[task.warmup_rows], data.index[-1]
+
+        engine_cls = config["engine_cls"]
+        engine_params = {k: v for k, v in task.params.items() if k in config["engine_param_names"]}
+        engine = engine_cls(
+            initial_capital=config["initial_capital"],
+            data_provider=_PreloadedDataProvider(data),
+            **{**config["engine_kwargs"], **engine_params},
+        )
+
+        strategies = config["strategy_factory"](dict(task.params))
+        if isinstance(strategies, Strategy):
+            strategies = [strategies]
+        for strategy in strategies:
+            engine.add_strategy(strategy)
+
+        # Only pass run options that are set, so engines with the plain run signature still work
+        run_options: Dict[str, Any] = {}
+        if task.close_positions:
+            run_options["close_positions"] = True
+        if task.warmup_rows:
+            run_options["warmup_bars"] = data.index[: task.warmup_rows].nunique()
+        result = engine.run(start_date, end_date, config["symbols"], **run_options)
+
+        analyzer = PerformanceAnalyzer(risk_free_rate=config["risk_free_rate"])
+        metrics = analyzer.calculate_metrics(result.get_equity_curve(), result.trade_ledger, result.initial_capital)
+        record.update({k: float(v) if isinstance(v, (np.floating, np.integer)) else v for k, v in metrics.items()})
+        record["final_capital"] = float(result.final_capital)
+        record["error"] = None
+    except Exception as e:
+        logger.error(f"Sweep run {task.run_id} failed for {task.params}: {e}")
+        record["error"] = f"{type(e).__name__}: {e}"
+        result = None
+
+    record["elapsed_s"] = time.perf_counter() - start
+    return record, result if task.keep_result else None
+
+
+def _map_tasks(
+    tasks: List[SweepTask],
+    data: pd.DataFrame,
+    config: Dict[str, Any],
+    max_workers: Optional[int],
+    shared: Optional[SharedMarketData] = None,
+) -> Iterator[Tuple[Dict[str, Any], Optional[BacktestResult]]]:
+    """
+    Yield ``(record, result)`` pairs as tasks complete.
+
+    Runs in-process when ``max_workers == 1`` (or there is a single task),
+    otherwise across a process pool whose workers map the data from
+    ``shared`` (written to a temporary directory when not given).
+    """
+    if max_workers == 1 or len(tasks) == 1:
+        for task in tasks:
+            yield _run_task(data, config, task)
+        return
+
+    with tempfile.TemporaryDirectory(prefix="copilot_quant_sweep_") as tmpdir:
+        if shared is None:
+            shared = SharedMarketData.write(data, tmpdir)
+        with ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_worker, initargs=(shared, config)
+        ) as executor:
+            futures = [executor.submit(_run_in_worker, task) for task in tasks]
+            for future in as_completed(futures):
+                yield future.result()
+
+
+def params_key(params: Dict[str, Any]) -> str:
+    """
+    Stable identifier for a parameter set.
+
+    Args:
+        params: Parameter set
+
+    Returns:
+        Canonical JSON string with sorted keys
+    """
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+def derive_seed(base_seed: int, params: Dict[str, Any]) -> int:
+    """
+    Derive a per-run seed from the sweep seed and the parameter values.
+
+    Seeds depend only on the parameter set (not on scheduling order or worker),
+    so re-running or resuming a sweep reproduces each run exactly.
+
+    Args:
+        base_seed: Sweep-level seed
+        params: Parameter set
+
+    Returns:
+        32-bit seed suitable for ``random.seed`` and ``np.random.seed``
+    """
+    sequence = np.random.SeedSequence([base_seed, zlib.crc32(params_key(params).encode())])
+    return int(sequence.generate_state(1)[0])
+
+
+class ParameterSweep:
+    """
+    Run a backtest for every parameter set in a grid or random search.
+
+    Parameters whose names match an engine constructor argument (e.g.
+    ``max_position_pct`` and ``max_deployed_pct`` for MultiStrategyEngine,
+    or ``commission``) configure the engine. The full parameter dict is
+    passed to ``strategy_factory``, which returns a strategy (or a list of
+    strategies for MultiStrategyEngine). With ``max_workers > 1`` the factory
+    must be picklable, i.e. a module-level function or class.
+
+    Example:
+        >>> def make_pairs(params):
+        ...     return PairsTradingStrategy(entry_zscore=params['entry_zscore'], lookback=params['lookback'])
+        >>> sweep = ParameterSweep(make_pairs, data_provider=YFinanceProvider(), initial_capital=100000)
+        >>> results = sweep.run(
+        ...     ParameterGrid({'entry_zscore': [1.5, 2.0, 2.5], 'lookback': [40, 60]}),
+        ...     start_date=datetime(2020, 1, 1),
+        ...     end_date=datetime(2023, 12, 31),
+        ...     symbols=['KO', 'PEP'],
+        ...     max_workers=4,
+        ...     checkpoint_path='pairs_sweep.jsonl',
+        ... )
+        >>> results.sort_values('sharpe_ratio', ascending=False).head()
+    """
+
+    def __init__(
+        self,
+        strategy_factory: StrategyFactory,
+        data_provider: DataProvider,
+        initial_capital: float,
+        engine_cls: type = BacktestEngine,
+        engine_kwargs: Optional[Dict[str, Any]] = None,
+        risk_free_rate: float = 0.02,
+        seed: int = 0,
+    ):
+        """
+        Initialize parameter sweep.
+
+        Args:
+            strategy_factory: Callable mapping a parameter dict to strategy instance(s)
+            data_provider: Data provider used once to fetch market data
+            initial_capital: Starting capital for every run
+            engine_cls: BacktestEngine or a subclass such as MultiStrategyEngine
+            engine_kwargs: Fixed engine constructor arguments (e.g. commission)
+            risk_free_rate: Risk-free rate for PerformanceAnalyzer
+            seed: Sweep-level seed from which per-run seeds are derived
+        """
+        self.strategy_factory = strategy_factory
+        self.data_provider = data_provider
+        self.initial_capital = initial_capital
+        self.engine_cls = engine_cls
+        self.engine_kwargs = dict(engine_kwargs or {})
+        self.risk_free_rate = risk_free_rate
+        self.seed = seed
+
+        signature = inspect.signature(engine_cls.__init__)
+        self.engine_param_names = {
+            name for name in signature.parameters if name not in ("self", "initial_capital", "data_provider")
+        }
+
+    def run(
+        self,
+        parameters: Union[ParameterGrid, RandomSearch, Sequence[Dict[str, Any]]],
+        start_date: datetime,
+        end_date: datetime,
+        symbols: List[str],
+        max_workers: Optional[int] = None,
+        checkpoint_path: Optional[Union[str, Path]] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> pd.DataFrame:
+        """
+        Run the sweep.
+
+        Args:
+            parameters: ParameterGrid, RandomSearch or explicit list of parameter dicts
+            start_date: Start date for every backtest
+            end_date: End date for every backtest
+            symbols: Symbols to trade
+            max_workers: Worker processes (None = CPU count, 1 = run in-process)
+            checkpoint_path: JSON-lines file of completed runs. Runs already
+                recorded without an error for the same sweep configuration
+                (dates, symbols, seed, capital, engine and strategy factory)
+                are skipped, so an interrupted sweep resumes where it stopped.
+                Records written under a different configuration are ignored.
+            progress: Optional callback ``progress(completed, total, record)``
+
+        Returns:
+            DataFrame with one row per parameter set: run_id, parameters, seed,
+            PerformanceAnalyzer metrics, final_capital, error and elapsed_s, ordered by run_id
+
+        Raises:
+            ValueError: If max_workers is not positive
+        """
+        if max_workers is not None and max_workers <= 0:
+            raise ValueError(f"Invalid max_workers: {max_workers}. Must be positive")
+
+        param_sets = [dict(params) for params in parameters]
+        total = len(param_sets)
+
+        config_key = self._config_key(start_date, end_date, symbols)
+        completed = self._load_checkpoint(checkpoint_path, config_key)
+        records = []
+        pending = []
+        for run_id, params in enumerate(param_sets):
+            key = params_key(params)
+            if key in completed:
+                records.append({**completed[key], "run_id": run_id})
+            else:
+                pending.append(SweepTask(run_id=run_id, params=params, seed=derive_seed(self.seed, params)))
+
+        if records:
+            logger.info(f"Resuming sweep: {len(records)}/{total} runs loaded from {checkpoint_path}")
+
+        if pending:
+            data = self._fetch_data(symbols, start_date, end_date)
+            config = self._worker_config(start_date, end_date, symbols)
+
+            for record, _ in _map_tasks(pending, data, config, max_workers):
+                records.append(record)
+                self._append_checkpoint(checkpoint_path, config_key, param_sets[record["run_id"]], record)
+                logger.info(f"Sweep progress: {len(records)}/{total} (run {record['run_id']})")
+                if progress is not None:
+                    progress(len(records), total, record)
+
+        if not records:
+            return pd.DataFrame()
+        return pd.DataFrame(records).sort_values("run_id").reset_index(drop=True)
+
+    def _fetch_data(self, symbols: List[str], start_date: datetime, end_date: datetime) -> pd.DataFrame:
+        """Fetch market data once, using the engine's own fetch logic."""
+        engine = self.engine_cls(
+            initial_capital=self.initial_capital, data_provider=self.data_provider, **self.engine_kwargs
+        )
+        data = engine._fetch_data(symbols, start_date, end_date)
+        # Single-symbol fetches add a Symbol column; workers add it again
+        if len(symbols) == 1 and "Symbol" in data.columns:
+            data = data.drop(columns="Symbol")
+        return data
+
+    def _worker_config(self, start_date: datetime, end_date: datetime, symbols: List[str]) -> Dict[str, Any]:
+        return {
+            "strategy_factory": self.strategy_factory,
+            "engine_cls": self.engine_cls,
+            "engine_kwargs": self.engine_kwargs,
+            "engine_param_names": self.engine_param_names,
+            "initial_capital": self.initial_capital,
+            "risk_free_rate": self.risk_free_rate,
+            "start_date": start_date,
+            "end_date": end_date,
+            "symbols": list(symbols),
+            "log_level": logging.getLogger("copilot_quant").getEffectiveLevel(),
+        }
+
+    def _config_key(self, start_date: datetime, end_date: datetime, symbols: List[str]) -> str:
+        """Fingerprint of everything besides the parameter set that affects a run's result."""
+        factory = self.strategy_factory
+        config = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "symbols": list(symbols),
+            "seed": self.seed,
+            "initial_capital": self.initial_capital,
+            "risk_free_rate": self.risk_free_rate,
+            "engine_cls": f"{self.engine_cls.__module__}.{self.engine_cls.__qualname__}",
+            "engine_kwargs": self.engine_kwargs,
+            "strategy_factory": f"{getattr(factory, '__module__', '')}."
+            f"{getattr(factory, '__qualname__', type(factory).__qualname__)}",
+        }
+        return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+    @staticmethod
+    def _load_checkpoint(checkpoint_path: Optional[Union[str, Path]], config_key: str) -> Dict[str, Dict[str, Any]]:
+        """Load successful records written under ``config_key``, keyed by parameter set."""
+        if checkpoint_path is None or not Path(checkpoint_path).exists():
+            return {}
+
+        completed = {}
+        stale = 0
+        with open(checkpoint_path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Partially written last line from an interrupted sweep
+                    logger.warning(f"Skipping malformed checkpoint line in {checkpoint_path}")
+                    continue
+                if entry.get("config") != config_key:
+                    stale += 1
+                    continue
+                if entry["record"].get("error") is None:
+                    completed[entry["key"]] = entry["record"]
+        if stale:
+            logger.warning(
+                f"Ignoring {stale} checkpoint records in {checkpoint_path} written for a different sweep configuration"
+            )
+        return completed
+
+    @staticmethod
+    def _append_checkpoint(
+        checkpoint_path: Optional[Union[str, Path]], config_key: str, params: Dict[str, Any], record: Dict[str, Any]
+    ) -> None:
+        """Append one completed record to the checkpoint file."""
+        if checkpoint_path is None:
+            return
+
+        entry = {"config": config_key, "key": params_key(params), "record": record}
+        with open(checkpoint_path, "a") as f:
+            f.write(json.dumps(entry, default=str) + "\n")
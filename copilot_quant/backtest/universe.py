@@ -0,0 +1,383 @@
+"""
+Universe fan-out backtests: one strategy run independently per symbol.
+
+Screening a single-asset strategy across a universe (e.g. the S&P 500)
+means one backtest per symbol. UniverseRunner loads the price panel once,
+for example with ``SP500EODLoader.load_panel``, stores each field as a
+(symbols x dates) memory-mapped array and shards the symbols across worker
+processes. Every worker maps the same pages, slices out one contiguous row
+per symbol and runs an ordinary BacktestEngine on it, so nothing is
+re-fetched or pickled per symbol. The per-symbol metrics are combined into
+one table, and the run reports its throughput in symbols per second.
+"""
+
+import logging
+import math
+import os
+import pickle
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from copilot_quant.backtest.engine import BacktestEngine
+from copilot_quant.backtest.metrics import PerformanceAnalyzer
+from copilot_quant.backtest.strategy import Strategy
+from copilot_quant.backtest.sweep import _PreloadedDataProvider, derive_seed
+
+logger = logging.getLogger(__name__)
+
+SymbolStrategyFactory = Callable[[str], Strategy]
+ProgressCallback = Callable[[int, int, Dict[str, Any]], None]
+
+
+def _engine_field(name: Any) -> str:
+    """Map loader field names ('close', 'adj_close') to engine column names ('Close', 'Adj Close')."""
+    return str(name).replace("_", " ").title()
+
+
+class SharedPricePanel:
+    """
+    Wide price panel stored as memory-mapped ``.npy`` files.
+
+    Each field is saved as one (symbols x dates) float array, so the bars of
+    one symbol are a contiguous row. Arrays are reopened with ``mmap_mode='c'``
+    (copy-on-write), so every worker process shares the same pages.
+    """
+
+    META_FILE = "meta.pkl"
+
+    def __init__(self, directory: Union[str, Path]):
+        """
+        Initialize handle to an existing shared panel directory.
+
+        Args:
+            directory: Directory written by ``SharedPricePanel.write``
+        """
+        self.directory = Path(directory)
+        self._meta: Optional[Dict[str, Any]] = None
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._symbol_ids: Dict[str, int] = {}
+
+    @classmethod
+    def write(cls, panel: pd.DataFrame, directory: Union[str, Path]) -> "SharedPricePanel":
+        """
+        Write a price panel to a directory of memory-mappable files.
+
+        Args:
+            panel: Dates x symbols frame of close prices, or a frame with
+                   (field, symbol) MultiIndex columns
+            directory: Target directory (created if missing)
+
+        Returns:
+            Handle that can be pickled cheaply and opened in other processes
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        if isinstance(panel.columns, pd.MultiIndex):
+            fields = list(dict.fromkeys(panel.columns.get_level_values(0)))
+            symbols = list(dict.fromkeys(panel.columns.get_level_values(1)))
+            frames = {_engine_field(name): panel[name].reindex(columns=symbols) for name in fields}
+        else:
+            symbols = list(panel.columns)
+            frames = {"Close": panel}
+
+        for i, frame in enumerate(frames.values()):
+            np.save(directory / f"field_{i}.npy", np.ascontiguousarray(frame.to_numpy(dtype=float).T))
+
+        meta = {"index": panel.index, "fields": list(frames), "symbols": [str(s) for s in symbols]}
+        with open(directory / cls.META_FILE, "wb") as f:
+            pickle.dump(meta, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        return cls(directory)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Only the directory travels to workers; each opens its own mappings
+        return {"directory": self.directory}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["directory"])
+
+    def _open(self) -> Dict[str, Any]:
+        """Map the arrays on first use."""
+        if self._meta is None:
+            with open(self.directory / self.META_FILE, "rb") as f:
+                self._meta = pickle.load(f)
+            for i, name in enumerate(self._meta["fields"]):
+                self._arrays[name] = np.load(self.directory / f"field_{i}.npy", mmap_mode="c")
+            self._symbol_ids = {symbol: i for i, symbol in enumerate(self._meta["symbols"])}
+        return self._meta
+
+    @property
+    def symbols(self) -> List[str]:
+        """Symbols in the panel."""
+        return list(self._open()["symbols"])
+
+    def frame(self, symbol: str) -> pd.DataFrame:
+        """
+        Single-symbol OHLCV frame in the layout ``get_historical_data`` returns.
+
+        Bars before the symbol's first and after its last close are dropped.
+
+        Args:
+            symbol: Symbol to extract
+
+        Returns:
+            DataFrame indexed by date with one column per field
+
+        Raises:
+            KeyError: If the symbol is not in the panel
+        """
+        meta = self._open()
+        row = self._symbol_ids[symbol]
+        data = pd.DataFrame({name: array[row] for name, array in self._arrays.items()}, index=meta["index"])
+        listed = np.flatnonzero(np.isfinite(data["Close"].to_numpy()))
+        if len(listed) == 0:
+            return data.iloc[:0]
+        return data.iloc[listed[0] : listed[-1] + 1]
+
+
+@dataclass
+class UniverseResult:
+    """
+    Outcome of a universe fan-out run.
+
+    Attributes:
+        results: One row per symbol: symbol, seed, PerformanceAnalyzer
+                 metrics, final_capital, bars, error and elapsed_s, in the
+                 order the symbols were requested
+        elapsed_s: Wall-clock seconds for the whole run, excluding panel loading
+        num_workers: Worker processes used (1 = in-process)
+    """
+
+    results: pd.DataFrame = field(default_factory=pd.DataFrame)
+    elapsed_s: float = 0.0
+    num_workers: int = 1
+
+    @property
+    def symbols_per_second(self) -> float:
+        """Backtests completed per wall-clock second."""
+        return len(self.results) / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    @property
+    def failed(self) -> List[str]:
+        """Symbols whose backtest raised an error."""
+        if self.results.empty:
+            return []
+        return self.results.loc[self.results["error"].notna(), "symbol"].tolist()
+
+
+def _run_symbol(panel: SharedPricePanel, config: Dict[str, Any], symbol: str) -> Dict[str, Any]:
+    """
+    Backtest one symbol and compute its metrics.
+
+    Errors are captured in the ``error`` field so one failing symbol does not
+    abort the run.
+    """
+    seed = derive_seed(config["seed"], {"symbol": symbol})
+    record: Dict[str, Any] = {"symbol": symbol, "seed": seed}
+    start = time.perf_counter()
+
+    try:
+        random.seed(seed)
+        np.random.seed(seed)
+
+        data = panel.frame(symbol)
+        record["bars"] = len(data)
+        if data.empty:
+            raise ValueError(f"No price data for {symbol}")
+
+        engine = config["engine_cls"](
+            initial_capital=config["initial_capital"],
+            data_provider=_PreloadedDataProvider(data),
+            **config["engine_kwargs"],
+        )
+        engine.add_strategy(config["strategy_factory"](symbol))
+        result = engine.run(data.index[0].to_pydatetime(), data.index[-1].to_pydatetime(), [symbol])
+
+        analyzer = PerformanceAnalyzer(risk_free_rate=config["risk_free_rate"])
+        metrics = analyzer.calculate_metrics(result.get_equity_curve(), result.trade_ledger, result.initial_capital)
+        record.update({k: float(v) if isinstance(v, (np.floating, np.integer)) else v for k, v in metrics.items()})
+        record["final_capital"] = float(result.final_capital)
+        record["error"] = None
+    except Exception as e:
+        logger.error(f"Universe run failed for {symbol}: {e}")
+        record["error"] = f"{type(e).__name__}: {e}"
+
+    record["elapsed_s"] = time.perf_counter() - start
+    return record
+
+
+def _run_shard(panel: SharedPricePanel, config: Dict[str, Any], symbols: Sequence[str]) -> List[Dict[str, Any]]:
+    """Backtest a shard of symbols one after another."""
+    return [_run_symbol(panel, config, symbol) for symbol in symbols]
+
+
+# Per-process state installed by _init_worker so the panel is mapped and the
+# configuration unpickled once per worker instead of once per shard.
+_WORKER_CONTEXT: Dict[str, Any] = {}
+
+
+def _init_worker(panel: SharedPricePanel, config: Dict[str, Any]) -> None:
+    """Open the shared panel and store the run configuration in a worker process."""
+    logging.getLogger("copilot_quant").setLevel(config["log_level"])
+    _WORKER_CONTEXT["panel"] = panel
+    _WORKER_CONTEXT["config"] = config
+
+
+def _run_shard_in_worker(symbols: Sequence[str]) -> List[Dict[str, Any]]:
+    """Run one shard using the worker's preloaded context."""
+    return _run_shard(_WORKER_CONTEXT["panel"], _WORKER_CONTEXT["config"], symbols)
+
+
+class UniverseRunner:
+    """
+    Run one single-asset strategy independently on every symbol of a universe.
+
+    ``strategy_factory`` is called with each symbol and returns a fresh
+    strategy for that symbol's backtest. With ``max_workers > 1`` the factory
+    must be picklable, i.e. a module-level function or class. Each run gets
+    the full ``initial_capital`` and a seed derived from the symbol, so
+    results do not depend on sharding or worker count.
+
+    Example:
+        >>> loader = SP500EODLoader(storage_type='parquet')
+        >>> panel = loader.load_panel(start_date='2018-01-01', fields=['open', 'high', 'low', 'close', 'volume'])
+        >>> runner = UniverseRunner(make_breakout, initial_capital=100000)
+        >>> universe = runner.run(panel, max_workers=8)
+        >>> universe.symbols_per_second
+        41.7
+        >>> universe.results.sort_values('sharpe_ratio', ascending=False).head(20)
+    """
+
+    def __init__(
+        self,
+        strategy_factory: SymbolStrategyFactory,
+        initial_capital: float,
+        engine_cls: type = BacktestEngine,
+        engine_kwargs: Optional[Dict[str, Any]] = None,
+        risk_free_rate: float = 0.02,
+        seed: int = 0,
+    ):
+        """
+        Initialize universe runner.
+
+        Args:
+            strategy_factory: Callable mapping a symbol to a strategy instance
+            initial_capital: Starting capital for every symbol's backtest
+            engine_cls: BacktestEngine or a subclass
+            engine_kwargs: Fixed engine constructor arguments (e.g. commission)
+            risk_free_rate: Risk-free rate for PerformanceAnalyzer
+            seed: Run-level seed from which per-symbol seeds are derived
+        """
+        self.strategy_factory = strategy_factory
+        self.initial_capital = initial_capital
+        self.engine_cls = engine_cls
+        self.engine_kwargs = dict(engine_kwargs or {})
+        self.risk_free_rate = risk_free_rate
+        self.seed = seed
+
+    def run(
+        self,
+        panel: pd.DataFrame,
+        symbols: Optional[Sequence[str]] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        max_workers: Optional[int] = None,
+        shard_size: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> UniverseResult:
+        """
+        Backtest every symbol.
+
+        Args:
+            panel: Dates x symbols close prices, or (field, symbol) MultiIndex
+                   columns as returned by ``SP500EODLoader.load_panel`` with a
+                   list of fields. Lower-case loader fields are renamed to the
+                   engine's columns ('close' -> 'Close').
+            symbols: Symbols to run (default: every symbol in the panel)
+            start_date: Optional first date (inclusive)
+            end_date: Optional last date (inclusive)
+            max_workers: Worker processes (None = CPU count, 1 = run in-process)
+            shard_size: Symbols per task (default: about four shards per worker)
+            progress: Optional callback ``progress(completed, total, record)``
+
+        Returns:
+            UniverseResult with one row per symbol and the run's throughput
+
+        Raises:
+            ValueError: If max_workers or shard_size is not positive, or a
+                        requested symbol is missing from the panel
+        """
+        if max_workers is not None and max_workers <= 0:
+            raise ValueError(f"Invalid max_workers: {max_workers}. Must be positive")
+        if shard_size is not None and shard_size <= 0:
+            raise ValueError(f"Invalid shard_size: {shard_size}. Must be positive")
+
+        panel = panel.sort_index().loc[start_date:end_date]
+        available = panel.columns.get_level_values(-1) if isinstance(panel.columns, pd.MultiIndex) else panel.columns
+        available = [str(s) for s in dict.fromkeys(available)]
+        symbols = list(symbols) if symbols is not None else available
+        missing = sorted(set(symbols) - set(available))
+        if missing:
+            raise ValueError(f"Invalid symbols: {missing}. Not in the panel")
+
+        num_workers = 1 if max_workers == 1 else max(min(max_workers or os.cpu_count() or 1, len(symbols)), 1)
+        shard_size = shard_size or max(1, math.ceil(len(symbols) / (num_workers * 4)))
+        shards = [symbols[i : i + shard_size] for i in range(0, len(symbols), shard_size)]
+        config = self._worker_config()
+
+        logger.info(f"Running {len(symbols)} symbols in {len(shards)} shards on {num_workers} workers")
+        start = time.perf_counter()
+        records: Dict[str, Dict[str, Any]] = {}
+        with tempfile.TemporaryDirectory(prefix="copilot_quant_universe_") as tmpdir:
+            shared = SharedPricePanel.write(panel, tmpdir)
+            for shard_records in self._map_shards(shards, shared, config, num_workers):
+                for record in shard_records:
+                    records[record["symbol"]] = record
+                    if progress is not None:
+                        progress(len(records), len(symbols), record)
+                logger.info(f"Universe progress: {len(records)}/{len(symbols)}")
+        elapsed = time.perf_counter() - start
+
+        results = pd.DataFrame([records[symbol] for symbol in symbols]) if symbols else pd.DataFrame()
+        universe = UniverseResult(results=results, elapsed_s=elapsed, num_workers=num_workers)
+        logger.info(
+            f"Universe run complete: {len(symbols)} symbols in {elapsed:.2f}s "
+            f"({universe.symbols_per_second:.1f} symbols/s, {len(universe.failed)} failed)"
+        )
+        return universe
+
+    @staticmethod
+    def _map_shards(
+        shards: List[List[str]], shared: SharedPricePanel, config: Dict[str, Any], num_workers: int
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield each shard's records as it completes, in-process for one worker or shard."""
+        if num_workers == 1 or len(shards) <= 1:
+            for shard in shards:
+                yield _run_shard(shared, config, shard)
+            return
+
+        with ProcessPoolExecutor(max_workers=num_workers, initializer=_init_worker, initargs=(shared, config)) as pool:
+            futures = [pool.submit(_run_shard_in_worker, shard) for shard in shards]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def _worker_config(self) -> Dict[str, Any]:
+        return {
+            "strategy_factory": self.strategy_factory,
+            "engine_cls": self.engine_cls,
+            "engine_kwargs": self.engine_kwargs,
+            "initial_capital": self.initial_capital,
+            "risk_free_rate": self.risk_free_rate,
+            "seed": self.seed,
+            "log_level": logging.getLogger("copilot_quant").getEffectiveLevel(),
+        }
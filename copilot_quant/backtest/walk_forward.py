@@ -0,0 +1,374 @@
+"""
+Walk-forward optimization for backtesting.
+
+Walk-forward analysis repeatedly optimizes strategy parameters on an
+in-sample window and evaluates the winning parameters on the following
+out-of-sample window. The out-of-sample equity curves are stitched into a
+single BacktestResult, which is a far less optimistic estimate of live
+performance than the best in-sample sweep result.
+
+Market data is fetched once for the whole period and shared with worker
+processes through memory-mapped files; every window is a positional view
+of that data, so overlapping windows never re-fetch or copy it.
+"""
+
+import logging
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from copilot_quant.backtest.ledger import TradeLedger
+from copilot_quant.backtest.results import BacktestResult
+from copilot_quant.backtest.sweep import (
+    ParameterGrid,
+    ParameterSweep,
+    RandomSearch,
+    SharedMarketData,
+    SweepTask,
+    _map_tasks,
+    derive_seed,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WalkForwardWindow:
+    """
+    One in-sample/out-of-sample split, expressed in bars.
+
+    Attributes:
+        index: Window number (0-based)
+        train_start: First in-sample bar
+        train_end: One past the last in-sample bar
+        test_start: First out-of-sample bar
+        test_end: One past the last out-of-sample bar
+    """
+
+    index: int
+    train_start: int
+    train_end: int
+    test_start: int
+    test_end: int
+
+
+def walk_forward_windows(
+    num_bars: int,
+    train_bars: int,
+    test_bars: int,
+    step_bars: Optional[int] = None,
+    anchored: bool = False,
+) -> List[WalkForwardWindow]:
+    """
+    Generate rolling (or anchored) walk-forward windows.
+
+    Window k trains on ``train_bars`` bars and tests on the next
+    ``test_bars`` bars; each window advances by ``step_bars``. With
+    ``anchored=True`` every in-sample window starts at bar 0 and grows.
+    The final out-of-sample window is truncated to the available bars.
+
+    Args:
+        num_bars: Number of bars (unique timestamps) available
+        train_bars: In-sample length in bars
+        test_bars: Out-of-sample length in bars
+        step_bars: Bars between consecutive windows (default: test_bars, so
+                   out-of-sample windows tile without overlap). Must be at
+                   least test_bars so out-of-sample windows never overlap.
+        anchored: Keep the in-sample start fixed at the first bar
+
+    Returns:
+        List of windows in chronological order
+
+    Raises:
+        ValueError: If a length is not positive or step_bars < test_bars
+    """
+    step_bars = test_bars if step_bars is None else step_bars
+    for name, value in (("train_bars", train_bars), ("test_bars", test_bars), ("step_bars", step_bars)):
+        if value <= 0:
+            raise ValueError(f"Invalid {name}: {value}. Must be positive")
+    if step_bars < test_bars:
+        # Overlapping out-of-sample windows would count the shared bars twice when stitched
+        raise ValueError(f"Invalid step_bars: {step_bars}. Must be at least test_bars ({test_bars})")
+
+    windows = []
+    offset = 0
+    while offset + train_bars < num_bars:
+        train_start = 0 if anchored else offset
+        train_end = offset + train_bars
+        test_end = min(train_end + test_bars, num_bars)
+        windows.append(WalkForwardWindow(len(windows), train_start, train_end, train_end, test_end))
+        offset += step_bars
+    return windows
+
+
+@dataclass
+class WalkForwardResult:
+    """
+    Outcome of a walk-forward optimization.
+
+    Attributes:
+        result: Out-of-sample equity curves stitched into one BacktestResult
+        windows: One row per window with its dates, chosen parameters, the
+                 in-sample objective and the out-of-sample metrics
+        in_sample: Every in-sample sweep record, tagged with its window
+    """
+
+    result: BacktestResult
+    windows: pd.DataFrame = field(default_factory=pd.DataFrame)
+    in_sample: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+
+class WalkForwardOptimizer(ParameterSweep):
+    """
+    Rolling in-sample optimization with out-of-sample evaluation.
+
+    Uses the same strategy factory, engine configuration and seeding rules as
+    ParameterSweep. The in-sample sweeps of all windows run concurrently in
+    one process pool, followed by the out-of-sample runs of all windows.
+
+    Example:
+        >>> optimizer = WalkForwardOptimizer(make_pairs, data_provider=provider, initial_capital=100000)
+        >>> wf = optimizer.run(
+        ...     ParameterGrid({'entry_zscore': [1.5, 2.0, 2.5], 'lookback': [40, 60]}),
+        ...     start_date=datetime(2015, 1, 1),
+        ...     end_date=datetime(2023, 12, 31),
+        ...     symbols=['KO', 'PEP'],
+        ...     train_bars=504,
+        ...     test_bars=126,
+        ... )
+        >>> wf.result.get_equity_curve()  # stitched out-of-sample equity
+        >>> wf.windows[['window', 'test_start', 'entry_zscore', 'sharpe_ratio']]
+    """
+
+    def run(
+        self,
+        parameters: Union[ParameterGrid, RandomSearch, Sequence[Dict[str, Any]]],
+        start_date: datetime,
+        end_date: datetime,
+        symbols: List[str],
+        train_bars: int = 252,
+        test_bars: int = 63,
+        step_bars: Optional[int] = None,
+        anchored: bool = False,
+        objective: str = "sharpe_ratio",
+        maximize: bool = True,
+        max_workers: Optional[int] = None,
+    ) -> WalkForwardResult:
+        """
+        Run walk-forward optimization.
+
+        Args:
+            parameters: ParameterGrid, RandomSearch or explicit list of parameter dicts
+            start_date: Start of the full period
+            end_date: End of the full period
+            symbols: Symbols to trade
+            train_bars: In-sample window length in bars
+            test_bars: Out-of-sample window length in bars
+            step_bars: Bars between windows (default: test_bars; must be >= test_bars)
+            anchored: Grow the in-sample window from the first bar
+            objective: Metric column used to pick the in-sample winner
+            maximize: Pick the largest objective (False picks the smallest)
+            max_workers: Worker processes (None = CPU count, 1 = run in-process)
+
+        Returns:
+            WalkForwardResult with the stitched out-of-sample BacktestResult
+
+        Raises:
+            ValueError: If max_workers is not positive, step_bars is smaller
+                        than test_bars or the data is too short for a single window
+        """
+        if max_workers is not None and max_workers <= 0:
+            raise ValueError(f"Invalid max_workers: {max_workers}. Must be positive")
+
+        param_sets = [dict(params) for params in parameters]
+        data = self._fetch_data(symbols, start_date, end_date)
+        if data.empty:
+            logger.warning("No data available for walk-forward optimization")
+            return WalkForwardResult(result=self._empty_result(start_date, end_date))
+
+        if not data.index.is_monotonic_increasing:
+            data = data.sort_index(kind="mergesort")
+
+        # Windows are defined on unique timestamps; map them to row ranges once
+        timestamps = data.index.unique()
+        bar_rows = np.searchsorted(data.index, timestamps, side="left")
+        bar_rows = np.append(bar_rows, len(data))
+
+        windows = walk_forward_windows(len(timestamps), train_bars, test_bars, step_bars, anchored)
+        if not windows:
+            raise ValueError(
+                f"Not enough data for walk-forward: {len(timestamps)} bars, need more than train_bars={train_bars}"
+            )
+
+        def rows(start_bar: int, end_bar: int) -> tuple:
+            return int(bar_rows[start_bar]), int(bar_rows[end_bar])
+
+        config = self._worker_config(start_date, end_date, symbols)
+        logger.info(
+            f"Walk-forward: {len(windows)} windows x {len(param_sets)} parameter sets "
+            f"(train={train_bars}, test={test_bars} bars)"
+        )
+
+        with tempfile.TemporaryDirectory(prefix="copilot_quant_walk_forward_") as tmpdir:
+            shared = SharedMarketData.write(data, tmpdir) if max_workers != 1 else None
+
+            # In-sample sweeps for every window at once
+            in_sample_tasks = [
+                SweepTask(
+                    run_id=run_id,
+                    params=params,
+                    seed=derive_seed(self.seed, params),
+                    rows=rows(window.train_start, window.train_end),
+                    tags={"window": window.index},
+                )
+                for window in windows
+                for run_id, params in enumerate(param_sets)
+            ]
+            in_sample = pd.DataFrame(
+                [record for record, _ in _map_tasks(in_sample_tasks, data, config, max_workers, shared)]
+            )
+            in_sample = in_sample.sort_values(["window", "run_id"]).reset_index(drop=True)
+
+            # Out-of-sample run of each window's winner, warmed up on its in-sample bars
+            best = {window.index: self._select_best(in_sample, window.index, objective, maximize) for window in windows}
+            out_of_sample_tasks = [
+                SweepTask(
+                    run_id=best[window.index],
+                    params=param_sets[best[window.index]],
+                    seed=derive_seed(self.seed, param_sets[best[window.index]]),
+                    rows=rows(window.train_start, window.test_end),
+                    keep_result=True,
+                    tags={"window": window.index},
+                    close_positions=True,
+                    warmup_rows=int(bar_rows[window.test_start] - bar_rows[window.train_start]),
+                )
+                for window in windows
+                if best[window.index] is not None
+            ]
+            out_of_sample = {
+                record["window"]: (record, result)
+                for record, result in _map_tasks(out_of_sample_tasks, data, config, max_workers, shared)
+            }
+
+        summary = self._summarize_windows(windows, timestamps, in_sample, best, out_of_sample, objective)
+        stitched = self._stitch(
+            [(w.index, out_of_sample[w.index][1]) for w in windows if w.index in out_of_sample],
+            start_date=timestamps[windows[0].test_start],
+            end_date=timestamps[windows[-1].test_end - 1],
+        )
+        return WalkForwardResult(result=stitched, windows=summary, in_sample=in_sample)
+
+    @staticmethod
+    def _select_best(in_sample: pd.DataFrame, window: int, objective: str, maximize: bool) -> Optional[int]:
+        """Return the run_id of the best successful in-sample run, or None."""
+        candidates = in_sample[(in_sample["window"] == window) & in_sample["error"].isna()]
+        if candidates.empty or objective not in candidates.columns:
+            logger.warning(f"Walk-forward window {window}: no successful in-sample runs")
+            return None
+
+        scores = candidates[objective].astype(float)
+        scores = scores.fillna(-np.inf if maximize else np.inf)
+        best = scores.idxmax() if maximize else scores.idxmin()
+        return int(candidates.loc[best, "run_id"])
+
+    def _summarize_windows(
+        self,
+        windows: List[WalkForwardWindow],
+        timestamps: pd.Index,
+        in_sample: pd.DataFrame,
+        best: Dict[int, Optional[int]],
+        out_of_sample: Dict[int, tuple],
+        objective: str,
+    ) -> pd.DataFrame:
+        """Build the per-window summary table."""
+        rows = []
+        for window in windows:
+            row: Dict[str, Any] = {
+                "window": window.index,
+                "train_start": timestamps[window.train_start],
+                "train_end": timestamps[window.train_end - 1],
+                "test_start": timestamps[window.test_start],
+                "test_end": timestamps[window.test_end - 1],
+                "run_id": best[window.index],
+            }
+            if best[window.index] is not None:
+                chosen = in_sample[(in_sample["window"] == window.index) & (in_sample["run_id"] == best[window.index])]
+                row[f"in_sample_{objective}"] = chosen[objective].iloc[0]
+            if window.index in out_of_sample:
+                record = dict(out_of_sample[window.index][0])
+                record.pop("window")
+                record.pop("run_id")
+                row.update(record)
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+    def _stitch(
+        self, results: List[Tuple[int, BacktestResult]], start_date: datetime, end_date: datetime
+    ) -> BacktestResult:
+        """
+        Chain out-of-sample results into one compounded BacktestResult.
+
+        Each window starts flat from ``initial_capital`` and closes its
+        positions on its last bar, so no holdings cross a boundary and the
+        window's last equity point already includes the exit costs. A
+        window's dollar columns, position sizes and fills are rescaled by
+        the capital carried over from the previous windows, so the stitched
+        trade log reconciles with the stitched equity curve.
+
+        Args:
+            results: (window index, out-of-sample result) pairs in chronological order
+            start_date: First out-of-sample date
+            end_date: Last out-of-sample date
+        """
+        if not results:
+            return self._empty_result(start_date, end_date)
+
+        frames = []
+        ledgers = []
+        scales = []
+        capital = self.initial_capital
+        for window, result in results:
+            scale = capital / result.initial_capital
+            frame = result.portfolio_history.copy()
+            scaled_columns = [
+                c
+                for c in frame.columns
+                if c in ("portfolio_value", "cash", "positions_value") or c.startswith(("value_", "position_"))
+            ]
+            frame[scaled_columns] = frame[scaled_columns] * scale
+            frame.insert(1, "window", window)
+            frames.append(frame)
+            ledgers.append(result.trade_ledger)
+            scales.append(scale)
+            capital = result.final_capital * scale
+
+        # Symbols first traded in a later window have no rows in earlier frames
+        history = pd.concat(frames, ignore_index=True)
+        position_columns = [c for c in history.columns if c.startswith(("value_", "position_"))]
+        history[position_columns] = history[position_columns].fillna(0.0)
+
+        strategy_name = results[0][1].strategy_name
+        return BacktestResult(
+            strategy_name=f"WalkForward({strategy_name})",
+            start_date=start_date,
+            end_date=end_date,
+            initial_capital=self.initial_capital,
+            final_capital=capital,
+            total_return=(capital - self.initial_capital) / self.initial_capital,
+            portfolio_history=history,
+            ledger=TradeLedger.concat(ledgers, scales),
+        )
+
+    def _empty_result(self, start_date: datetime, end_date: datetime) -> BacktestResult:
+        return BacktestResult(
+            strategy_name="WalkForward",
+            start_date=start_date,
+            end_date=end_date,
+            initial_capital=self.initial_capital,
+            final_capital=self.initial_capital,
+            total_return=0.0,
+        )
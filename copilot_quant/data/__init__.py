@@ -11,6 +11,9 @@ This module provides:
 - Signal persistence and database models
 """
 
+from copilot_quant.data.cache import (
+    CachingDataProvider,
+)
 from copilot_quant.data.models import (
     SignalRecord,
     SignalStatus,
@@ -60,6 +63,7 @@ __all__ = [
     "DataProvider",
     "YFinanceProvider",
     "get_data_provider",
+    "CachingDataProvider",
     # S&P500 utilities
     "get_sp500_tickers",
     "get_sp500_info",
@@ -0,0 +1,441 @@
+"""
+On-disk OHLCV cache for market data providers.
+
+This module provides CachingDataProvider, a DataProvider decorator that
+persists downloaded bars per symbol and interval as uncompressed Feather
+(Arrow IPC) files. Repeated requests are served from disk, only the date
+ranges not yet cached are fetched from the wrapped provider, and cache hits
+are memory-mapped so numeric columns are returned without copying.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import quote
+
+import pandas as pd
+
+from copilot_quant.data.providers import DataProvider
+
+try:
+    import pyarrow.feather as feather
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    logging.warning("pyarrow not available - CachingDataProvider will not work")
+
+logger = logging.getLogger(__name__)
+
+DateLike = Optional[Union[str, datetime]]
+Range = Tuple[pd.Timestamp, pd.Timestamp]
+
+
+class CachingDataProvider(DataProvider):
+    """
+    Caching decorator for any DataProvider.
+
+    Bars are stored per (symbol, interval) in ``{cache_dir}/{interval}/``.
+    A JSON index records which half-open ``[start, end)`` date ranges have
+    been requested for each entry (so weekends and holidays at the edges
+    are not re-fetched), when the entry was fetched and when it was last used.
+    Access times of cache hits are written back once per request, so LRU
+    eviction stays accurate across restarts.
+
+    Cached frames are memory-mapped and therefore read-only: call ``.copy()``
+    before modifying values in place (adding columns is fine).
+
+    Example:
+        >>> provider = CachingDataProvider(YFinanceProvider(), cache_dir='data/cache',
+        ...                                ttl=timedelta(days=7), max_size_bytes=2 * 1024**3)
+        >>> engine = BacktestEngine(initial_capital=100000, data_provider=provider)
+    """
+
+    INDEX_FILE = "cache_index.json"
+
+    def __init__(
+        self,
+        provider: DataProvider,
+        cache_dir: Union[str, Path] = "data/cache",
+        ttl: Optional[timedelta] = None,
+        max_size_bytes: Optional[int] = None,
+        memory_map: bool = True,
+    ):
+        """
+        Initialize caching provider.
+
+        Args:
+            provider: Provider used to fetch data missing from the cache
+            cache_dir: Directory for cached files and the cache index
+            ttl: Maximum age of a cache entry before it is re-fetched in full
+                 (None = never expire)
+            max_size_bytes: Evict least recently used entries once the cache
+                            exceeds this size (None = unbounded)
+            memory_map: Memory-map cached files on read (zero-copy for
+                        numeric columns)
+
+        Raises:
+            ImportError: If pyarrow is not installed
+            ValueError: If ttl or max_size_bytes is not positive
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is not available. Install it with: pip install pyarrow")
+        if ttl is not None and ttl.total_seconds() <= 0:
+            raise ValueError(f"Invalid ttl: {ttl}. Must be positive")
+        if max_size_bytes is not None and max_size_bytes <= 0:
+            raise ValueError(f"Invalid max_size_bytes: {max_size_bytes}. Must be positive")
+
+        self.provider = provider
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.max_size_bytes = max_size_bytes
+        self.memory_map = memory_map
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._index: Dict[str, Dict] = self._load_index()
+        self._index_dirty = False
+
+        logger.info(f"Initialized CachingDataProvider at {self.cache_dir} wrapping {type(provider).__name__}")
+
+    # ------------------------------------------------------------------
+    # DataProvider interface
+    # ------------------------------------------------------------------
+
+    def get_historical_data(
+        self,
+        symbol: str,
+        start_date: DateLike = None,
+        end_date: DateLike = None,
+        interval: str = "1d",
+    ) -> pd.DataFrame:
+        """
+        Get historical OHLCV data, fetching only ranges missing from the cache.
+
+        Args:
+            symbol: Ticker symbol
+            start_date: Start date (default: 1 year ago)
+            end_date: End date, exclusive (default: now)
+            interval: Data interval ('1d', '1wk', '1mo', etc.)
+
+        Returns:
+            DataFrame in the wrapped provider's layout
+        """
+        start, end = self._normalize_range(start_date, end_date)
+
+        with self._lock:
+            missing = self._missing_ranges(symbol, interval, start, end)
+            for range_start, range_end in missing:
+                fetched = self.provider.get_historical_data(
+                    symbol, start_date=range_start, end_date=range_end, interval=interval
+                )
+                self._merge(symbol, interval, fetched, (range_start, range_end))
+
+            data = self._read(symbol, interval, start, end)
+            if missing:
+                self._evict(protect={self._key(symbol, interval)})
+            self._flush_index()
+            return data
+
+    def get_multiple_symbols(
+        self,
+        symbols: List[str],
+        start_date: DateLike = None,
+        end_date: DateLike = None,
+        interval: str = "1d",
+    ) -> pd.DataFrame:
+        """
+        Get historical data for multiple symbols, fetching only missing ranges.
+
+        Symbols missing the same date range are fetched together in a single
+        ``get_multiple_symbols`` call on the wrapped provider.
+
+        Args:
+            symbols: List of ticker symbols
+            start_date: Start date (default: 1 year ago)
+            end_date: End date, exclusive (default: now)
+            interval: Data interval ('1d', '1wk', '1mo', etc.)
+
+        Returns:
+            DataFrame with multi-level columns: (Metric, Symbol)
+        """
+        start, end = self._normalize_range(start_date, end_date)
+
+        with self._lock:
+            groups: Dict[Range, List[str]] = {}
+            for symbol in symbols:
+                for missing in self._missing_ranges(symbol, interval, start, end):
+                    groups.setdefault(missing, []).append(symbol)
+
+            for (range_start, range_end), group in groups.items():
+                fetched = self.provider.get_multiple_symbols(
+                    group, start_date=range_start, end_date=range_end, interval=interval
+                )
+                for symbol in group:
+                    self._merge(symbol, interval, self._split_symbol(fetched, symbol, group), (range_start, range_end))
+
+            frames = {symbol: self._read(symbol, interval, start, end) for symbol in symbols}
+            if groups:
+                self._evict(protect={self._key(symbol, interval) for symbol in symbols})
+            self._flush_index()
+
+        frames = {symbol: frame for symbol, frame in frames.items() if not frame.empty}
+        if not frames:
+            return pd.DataFrame()
+
+        combined = pd.concat(frames, axis=1).swaplevel(0, 1, axis=1)
+        metrics = list(dict.fromkeys(combined.columns.get_level_values(0)))
+        return combined.reindex(columns=pd.MultiIndex.from_product([metrics, list(frames)]))
+
+    def get_ticker_info(self, symbol: str) -> dict:
+        """
+        Get ticker metadata from the wrapped provider (not cached).
+
+        Args:
+            symbol: Ticker symbol
+
+        Returns:
+            Dictionary with ticker information
+        """
+        return self.provider.get_ticker_info(symbol)
+
+    # ------------------------------------------------------------------
+    # Cache management
+    # ------------------------------------------------------------------
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of cached files in bytes."""
+        return sum(entry["size"] for entry in self._index.values())
+
+    def invalidate(self, symbol: str, interval: Optional[str] = None) -> None:
+        """
+        Remove cached data for a symbol.
+
+        Args:
+            symbol: Ticker symbol
+            interval: Interval to remove (None = all intervals)
+        """
+        with self._lock:
+            for key in [k for k, e in self._index.items() if e["symbol"] == symbol]:
+                if interval is None or self._index[key]["interval"] == interval:
+                    self._remove(key)
+            self._save_index()
+
+    def clear(self) -> None:
+        """Remove all cached data."""
+        with self._lock:
+            for key in list(self._index):
+                self._remove(key)
+            self._save_index()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _normalize_range(start_date: DateLike, end_date: DateLike) -> Range:
+        """Convert request bounds to naive timestamps with the provider defaults."""
+        now = pd.Timestamp.now()
+        start = pd.Timestamp(start_date) if start_date is not None else now - pd.Timedelta(days=365)
+        end = pd.Timestamp(end_date) if end_date is not None else now
+        if start.tzinfo is not None:
+            start = start.tz_convert(None)
+        if end.tzinfo is not None:
+            end = end.tz_convert(None)
+        return start, end
+
+    @staticmethod
+    def _key(symbol: str, interval: str) -> str:
+        return f"{interval}/{quote(symbol, safe='')}"
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.feather"
+
+    def _entry(self, symbol: str, interval: str) -> Optional[Dict]:
+        """Return the index entry for a symbol, dropping it if expired."""
+        key = self._key(symbol, interval)
+        entry = self._index.get(key)
+        if entry is None:
+            return None
+        if self.ttl is not None and time.time() - entry["fetched_at"] > self.ttl.total_seconds():
+            logger.info(f"Cache entry for {symbol} ({interval}) expired")
+            self._remove(key)
+            return None
+        if not self._path(key).exists():
+            self._index.pop(key)
+            return None
+        return entry
+
+    def _missing_ranges(self, symbol: str, interval: str, start: pd.Timestamp, end: pd.Timestamp) -> List[Range]:
+        """Sub-ranges of ``[start, end)`` not covered by the cache entry."""
+        entry = self._entry(symbol, interval)
+        covered = [] if entry is None else [(pd.Timestamp(s), pd.Timestamp(e)) for s, e in entry["ranges"]]
+
+        missing = []
+        cursor = start
+        for range_start, range_end in covered:
+            if range_end <= cursor:
+                continue
+            if range_start >= end:
+                break
+            if range_start > cursor:
+                missing.append((cursor, range_start))
+            cursor = max(cursor, range_end)
+        if cursor < end:
+            missing.append((cursor, end))
+        return missing
+
+    @staticmethod
+    def _split_symbol(data: pd.DataFrame, symbol: str, group: List[str]) -> pd.DataFrame:
+        """Extract one symbol's bars from a multi-symbol download."""
+        if data.empty:
+            return pd.DataFrame()
+        if isinstance(data.columns, pd.MultiIndex):
+            if symbol not in data.columns.get_level_values(1):
+                return pd.DataFrame()
+            frame = data.xs(symbol, axis=1, level=1)
+        elif len(group) == 1:
+            frame = data
+        else:
+            return pd.DataFrame()
+        return frame.dropna(how="all")
+
+    def _merge(self, symbol: str, interval: str, fetched: pd.DataFrame, requested: Range) -> None:
+        """Merge newly fetched bars into the cache entry and record coverage."""
+        key = self._key(symbol, interval)
+        entry = self._entry(symbol, interval)
+        path = self._path(key)
+
+        cached = self._read_file(path, memory_map=False) if entry is not None else pd.DataFrame()
+        if "_empty" in cached.columns:
+            cached = pd.DataFrame()
+        if fetched is not None and not fetched.empty:
+            if cached.empty:
+                merged = fetched
+            else:
+                if cached.index.tz is None and fetched.index.tz is not None:
+                    cached.index = cached.index.tz_localize(fetched.index.tz)
+                merged = pd.concat([cached, fetched])
+                merged = merged[~merged.index.duplicated(keep="last")]
+            merged = merged.sort_index()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            feather.write_feather(merged, tmp_path, compression="uncompressed")
+            os.replace(tmp_path, path)
+        elif entry is None:
+            # Nothing to store (e.g. a holiday-only range); keep an empty file
+            # so the requested coverage is still remembered.
+            path.parent.mkdir(parents=True, exist_ok=True)
+            feather.write_feather(pd.DataFrame({"_empty": pd.Series(dtype=float)}), path, compression="uncompressed")
+
+        # Today's bar is still forming: never mark it (or the future) as covered
+        requested_start, requested_end = requested
+        requested_end = min(requested_end, pd.Timestamp.now().normalize())
+        ranges = [] if entry is None else [(pd.Timestamp(s), pd.Timestamp(e)) for s, e in entry["ranges"]]
+        if requested_start < requested_end:
+            ranges.append((requested_start, requested_end))
+
+        now = time.time()
+        self._index[key] = {
+            "symbol": symbol,
+            "interval": interval,
+            "ranges": [[s.isoformat(), e.isoformat()] for s, e in self._merge_ranges(ranges)],
+            "fetched_at": entry["fetched_at"] if entry is not None else now,
+            "last_access": now,
+            "size": path.stat().st_size,
+        }
+        self._save_index()
+
+    @staticmethod
+    def _merge_ranges(ranges: List[Range]) -> List[Range]:
+        """Merge overlapping or touching ranges."""
+        merged: List[Range] = []
+        for start, end in sorted(ranges):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    def _read(self, symbol: str, interval: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        """Read ``[start, end)`` of a cached entry as a positional (no-copy) slice."""
+        key = self._key(symbol, interval)
+        entry = self._index.get(key)
+        if entry is None:
+            return pd.DataFrame()
+
+        entry["last_access"] = time.time()
+        self._index_dirty = True
+        data = self._read_file(self._path(key), memory_map=self.memory_map)
+        if data.empty or "_empty" in data.columns:
+            return pd.DataFrame()
+
+        index = data.index
+        if index.tz is not None:
+            start, end = start.tz_localize(index.tz), end.tz_localize(index.tz)
+        lo = index.searchsorted(start, side="left")
+        hi = index.searchsorted(end, side="left")
+        return data.iloc[lo:hi]
+
+    @staticmethod
+    def _read_file(path: Path, memory_map: bool) -> pd.DataFrame:
+        if not path.exists():
+            return pd.DataFrame()
+        table = feather.read_table(path, memory_map=memory_map)
+        return table.to_pandas(split_blocks=True)
+
+    def _remove(self, key: str) -> None:
+        self._index.pop(key, None)
+        path = self._path(key)
+        if path.exists():
+            path.unlink()
+
+    def _evict(self, protect: Optional[set] = None) -> None:
+        """
+        Evict least recently used entries until the cache fits max_size_bytes.
+
+        Entries in ``protect`` (those serving the current request) are kept
+        even if the cache stays over budget.
+        """
+        if self.max_size_bytes is None:
+            return
+
+        protect = protect or set()
+        for key, entry in sorted(self._index.items(), key=lambda item: item[1]["last_access"]):
+            if self.size_bytes <= self.max_size_bytes:
+                break
+            if key in protect:
+                continue
+            logger.info(f"Evicting {entry['symbol']} ({entry['interval']}) from cache")
+            self._remove(key)
+        self._save_index()
+
+    def _load_index(self) -> Dict[str, Dict]:
+        path = self.cache_dir / self.INDEX_FILE
+        if not path.exists():
+            return {}
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable cache index {path}: {e}")
+            return {}
+
+    def _save_index(self) -> None:
+        path = self.cache_dir / self.INDEX_FILE
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, path)
+        self._index_dirty = False
+
+    def _flush_index(self) -> None:
+        """Write the index if access times changed since the last save (one write per request)."""
+        if self._index_dirty:
+            self._save_index()
@@ -8,7 +8,8 @@ Features:
 - Fetch data for single or multiple symbols
 - Configurable date ranges
 - Automatic handling of splits and dividends
-- Save to CSV or SQLite database
+- Save to CSV, SQLite database or a partitioned Parquet store
+- Load aligned wide panels for cross-sectional backtests
 - Robust error handling and rate limiting
 - Progress tracking for bulk downloads
 
@@ -24,16 +25,28 @@ Example Usage:
     # Save to SQLite
     loader = SP500EODLoader(storage_type='sqlite', db_path='data/market_data.db')
     loader.fetch_all(start_date='2023-01-01', end_date='2024-01-01')
+
+    # Save to Parquet and load a wide close-price panel in one call
+    loader = SP500EODLoader(storage_type='parquet', parquet_dir='data/parquet')
+    loader.fetch_all(start_date='2004-01-01', end_date='2024-01-01')
+    closes = loader.load_panel(['AAPL', 'MSFT'], start_date='2020-01-01', end_date='2023-12-31')
 """
 
 import logging
 import sqlite3
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import quote
 
+import numpy as np
 import pandas as pd
 
+from copilot_quant.data.rate_limit import AdaptiveRateLimiter, is_rate_limit_error
+from copilot_quant.data.sqlite_writer import PRICE_COLUMNS, EquityDataWriter
+
 try:
     import yfinance as yf
     YFINANCE_AVAILABLE = True
@@ -41,26 +54,49 @@ except ImportError:
     YFINANCE_AVAILABLE = False
     logging.warning("yfinance not available - SP500EODLoader will not work")
 
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+# Default ceiling of the concurrent request rate, as a multiple of 1 / rate_limit_delay
+MAX_RATE_MULTIPLIER = 4.0
+
 
 class SP500EODLoader:
     """
     End-of-Day data loader for S&P500 equities.
 
-    Fetches historical market data from Yahoo Finance and stores it in CSV or SQLite format.
-    Handles splits, dividends, and provides robust error handling with rate limiting.
+    Fetches historical market data from Yahoo Finance and stores it in CSV, SQLite or
+    Parquet format. Handles splits, dividends, and provides robust error handling with
+    rate limiting.
+
+    The Parquet store is hive-partitioned by symbol (``symbol=AAPL/data.parquet``)
+    with one row group per calendar year, so symbol filters prune whole files and
+    date filters skip row groups using their min/max statistics.
 
     Attributes:
-        storage_type (str): Either 'csv' or 'sqlite'
+        storage_type (str): 'csv', 'sqlite' or 'parquet'
         data_dir (Path): Directory for CSV storage
         db_path (Path): Path to SQLite database
+        parquet_dir (Path): Root directory of the Parquet store
         symbols (List[str]): List of stock symbols to fetch
         rate_limit_delay (float): Delay between API calls in seconds
     """
 
+    STORAGE_TYPES = ("csv", "sqlite", "parquet")
+
+    # Columns kept in the typed stores (SQLite table and Parquet files)
+    PRICE_COLUMNS = PRICE_COLUMNS
+
     def __init__(
         self,
         symbols: Optional[List[str]] = None,
@@ -69,6 +105,8 @@ class SP500EODLoader:
         data_dir: str = "data/historical",
         db_path: str = "data/market_data.db",
         rate_limit_delay: float = 0.5,
+        parquet_dir: str = "data/parquet",
+        sqlite_batch_size: int = 5000,
     ):
         """
         Initialize the EOD loader.
@@ -76,17 +114,28 @@ class SP500EODLoader:
         Args:
             symbols: List of stock symbols to fetch (e.g., ['AAPL', 'GOOGL'])
             symbols_file: Path to CSV file containing symbols (column: 'Symbol')
-            storage_type: 'csv' or 'sqlite' for data storage
+            storage_type: 'csv', 'sqlite' or 'parquet' for data storage
             data_dir: Directory path for CSV files (default: 'data/historical')
             db_path: Path to SQLite database file (default: 'data/market_data.db')
             rate_limit_delay: Delay between API calls in seconds (default: 0.5)
+            parquet_dir: Root directory of the Parquet store (default: 'data/parquet')
+            sqlite_batch_size: Rows per SQLite transaction in batch writes (default: 5000)
+
+        Raises:
+            ValueError: If storage_type is unknown
+            ImportError: If storage_type is 'parquet' and pyarrow is not installed
         """
         self.storage_type = storage_type.lower()
-        if self.storage_type not in ["csv", "sqlite"]:
-            raise ValueError("storage_type must be 'csv' or 'sqlite'")
+        if self.storage_type not in self.STORAGE_TYPES:
+            raise ValueError("storage_type must be 'csv', 'sqlite' or 'parquet'")
+        if self.storage_type == "parquet" and not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is not available. Install it with: pip install pyarrow")
 
         self.data_dir = Path(data_dir)
         self.db_path = Path(db_path)
+        self.parquet_dir = Path(parquet_dir)
+        self.sqlite_batch_size = sqlite_batch_size
+        self._sqlite_writer: Optional[EquityDataWriter] = None
         self.rate_limit_delay = rate_limit_delay
 
         # Load symbols
@@ -103,6 +152,8 @@ class SP500EODLoader:
         elif self.storage_type == "sqlite":
             self.db_path.parent.mkdir(parents=True, exist_ok=True)
             self._initialize_database()
+        elif self.storage_type == "parquet":
+            self.parquet_dir.mkdir(parents=True, exist_ok=True)
 
         logger.info(f"Initialized SP500EODLoader with {len(self.symbols)} symbols")
         logger.info(f"Storage type: {self.storage_type}")
@@ -178,54 +229,59 @@ class SP500EODLoader:
             DataFrame with EOD data or None if fetch fails
         """
         try:
-            logger.info(f"Fetching data for {symbol}")
-
-            # Create ticker object
-            ticker = yf.Ticker(symbol)
-
-            # Fetch historical data
-            df = ticker.history(
-                start=start_date,
-                end=end_date,
-                auto_adjust=auto_adjust,
-                actions=True,  # Include dividends and splits
-            )
-
-            if df.empty:
-                logger.warning(f"No data returned for {symbol}")
-                return None
-
-            # Add symbol column
-            df["Symbol"] = symbol
-
-            # Reset index to make Date a column
-            df.reset_index(inplace=True)
-
-            # Rename columns to standardized format
-            df.rename(
-                columns={
-                    "Open": "open",
-                    "High": "high",
-                    "Low": "low",
-                    "Close": "close",
-                    "Volume": "volume",
-                    "Dividends": "dividends",
-                    "Stock Splits": "stock_splits",
-                },
-                inplace=True,
-            )
-
-            # Add adj_close column (same as close if auto_adjust=True)
-            if "adj_close" not in df.columns:
-                df["adj_close"] = df["close"]
-
-            logger.info(f"Fetched {len(df)} rows for {symbol}")
-            return df
-
+            return self._download_symbol(symbol, start_date, end_date, auto_adjust)
         except Exception as e:
             logger.error(f"Error fetching data for {symbol}: {e}")
             return None
 
+    def _download_symbol(
+        self, symbol: str, start_date: Optional[str], end_date: Optional[str], auto_adjust: bool
+    ) -> Optional[pd.DataFrame]:
+        """Download and standardize EOD data; errors propagate so callers can classify them."""
+        logger.info(f"Fetching data for {symbol}")
+
+        # Create ticker object
+        ticker = yf.Ticker(symbol)
+
+        # Fetch historical data
+        df = ticker.history(
+            start=start_date,
+            end=end_date,
+            auto_adjust=auto_adjust,
+            actions=True,  # Include dividends and splits
+        )
+
+        if df.empty:
+            logger.warning(f"No data returned for {symbol}")
+            return None
+
+        # Add symbol column
+        df["Symbol"] = symbol
+
+        # Reset index to make Date a column
+        df.reset_index(inplace=True)
+
+        # Rename columns to standardized format
+        df.rename(
+            columns={
+                "Open": "open",
+                "High": "high",
+                "Low": "low",
+                "Close": "close",
+                "Volume": "volume",
+                "Dividends": "dividends",
+                "Stock Splits": "stock_splits",
+            },
+            inplace=True,
+        )
+
+        # Add adj_close column (same as close if auto_adjust=True)
+        if "adj_close" not in df.columns:
+            df["adj_close"] = df["close"]
+
+        logger.info(f"Fetched {len(df)} rows for {symbol}")
+        return df
+
     def save_to_csv(self, df: pd.DataFrame, symbol: str):
         """
         Save DataFrame to CSV file.
@@ -246,50 +302,126 @@ class SP500EODLoader:
         """
         Save DataFrame to SQLite database.
 
+        Rows are upserted on (symbol, date), so re-saving a range replaces
+        existing rows instead of duplicating them. Inside ``batch_writes()``
+        the rows go to the shared writer and are committed in batches.
+
         Args:
             df: DataFrame with EOD data
             symbol: Stock symbol
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-
-            # Prepare data for insertion
-            df_copy = df.copy()
-            df_copy["symbol"] = symbol
-
-            # Convert date to string format
-            if "Date" in df_copy.columns:
-                df_copy["date"] = pd.to_datetime(df_copy["Date"]).dt.strftime("%Y-%m-%d")
-
-            # Select and rename columns for database
-            columns_map = {
-                "date": "date",
-                "open": "open",
-                "high": "high",
-                "low": "low",
-                "close": "close",
-                "adj_close": "adj_close",
-                "volume": "volume",
-                "dividends": "dividends",
-                "stock_splits": "stock_splits",
-                "symbol": "symbol",
-            }
-
-            # Keep only columns that exist
-            available_cols = [col for col in columns_map.keys() if col in df_copy.columns]
-            df_insert = df_copy[available_cols]
-
-            # Insert data (replace existing records)
-            df_insert.to_sql("equity_data", conn, if_exists="append", index=False)
-
-            conn.commit()
-            conn.close()
+            if self._sqlite_writer is not None:
+                self._sqlite_writer.write(df, symbol)
+            else:
+                with EquityDataWriter(self.db_path) as writer:
+                    writer.write(df, symbol)
             logger.info(f"Saved {len(df)} rows to database for {symbol}")
 
         except Exception as e:
             logger.error(f"Error saving to database for {symbol}: {e}")
             raise
 
+    def save_batch(self, frames: Dict[str, pd.DataFrame]):
+        """
+        Save several symbols' data at once.
+
+        With SQLite storage every frame is written through one connection and
+        committed in batches of ``sqlite_batch_size`` rows; other storage
+        types save each symbol in turn.
+
+        Args:
+            frames: Mapping of symbol to EOD data
+        """
+        with self.batch_writes():
+            for symbol, df in frames.items():
+                self.save(df, symbol)
+
+    @contextmanager
+    def batch_writes(self) -> Iterator[None]:
+        """
+        Keep one SQLite connection open for all saves inside the block.
+
+        Rows are committed every ``sqlite_batch_size`` rows and when the
+        block exits. Rows still pending are not visible to ``load_from_sqlite``
+        until then. Does nothing for other storage types or when nested.
+        """
+        if self.storage_type != "sqlite" or self._sqlite_writer is not None:
+            yield
+            return
+
+        with EquityDataWriter(self.db_path, batch_size=self.sqlite_batch_size) as writer:
+            self._sqlite_writer = writer
+            try:
+                yield
+            finally:
+                self._sqlite_writer = None
+
+    def save_to_parquet(self, df: pd.DataFrame, symbol: str):
+        """
+        Save DataFrame to the Parquet store.
+
+        Rows are merged with any data already stored for the symbol (new rows
+        win on duplicate dates) and written sorted by date, one row group per year.
+
+        Args:
+            df: DataFrame with EOD data ('Date' or 'date' column)
+            symbol: Stock symbol
+        """
+        try:
+            new_rows = self._to_parquet_frame(df)
+            path = self._parquet_path(symbol)
+
+            if path.exists():
+                existing = pq.ParquetFile(path).read().to_pandas()
+                new_rows = pd.concat([existing, new_rows], ignore_index=True)
+                new_rows = new_rows.drop_duplicates(subset="date", keep="last")
+            new_rows = new_rows.sort_values("date", kind="mergesort").reset_index(drop=True)
+
+            table = pa.Table.from_pandas(new_rows, preserve_index=False)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            years = new_rows["date"].dt.year.to_numpy()
+            with pq.ParquetWriter(tmp_path, table.schema) as writer:
+                # One row group per year so date filters can skip whole row groups
+                boundaries = [0, *(i for i in range(1, len(years)) if years[i] != years[i - 1]), len(years)]
+                for start, stop in zip(boundaries[:-1], boundaries[1:], strict=True):
+                    writer.write_table(table.slice(start, stop - start))
+            tmp_path.replace(path)
+
+            logger.info(f"Saved {len(df)} rows to Parquet store for {symbol}")
+        except Exception as e:
+            logger.error(f"Error saving Parquet for {symbol}: {e}")
+            raise
+
+    def _to_parquet_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Normalize fetched or user data to the typed Parquet schema."""
+        date_column = "Date" if "Date" in df.columns else "date"
+        frame = pd.DataFrame({"date": self._normalize_dates(df[date_column])})
+        for column in self.PRICE_COLUMNS:
+            if column in df.columns:
+                frame[column] = pd.to_numeric(df[column], errors="coerce").astype(float).to_numpy()
+            else:
+                frame[column] = float("nan")
+        return frame
+
+    @staticmethod
+    def _normalize_dates(dates: pd.Series) -> pd.Series:
+        """Convert a date column (strings, naive or tz-aware datetimes) to naive midnight datetimes."""
+        if isinstance(dates.dtype, pd.DatetimeTZDtype):
+            return dates.dt.tz_localize(None).dt.normalize()
+        if pd.api.types.is_datetime64_any_dtype(dates):
+            return dates.dt.normalize()
+        # Strings such as '2023-01-03 00:00:00-05:00': keep the exchange-local calendar date
+        return pd.to_datetime(dates.astype(str).str[:10], format="%Y-%m-%d")
+
+    def _parquet_path(self, symbol: str) -> Path:
+        return self.parquet_dir / f"symbol={quote(symbol, safe='')}" / "data.parquet"
+
+    def _parquet_dataset(self) -> "ds.Dataset":
+        partitioning = ds.partitioning(pa.schema([("symbol", pa.string())]), flavor="hive")
+        return ds.dataset(self.parquet_dir, format="parquet", partitioning=partitioning)
+
     def save(self, df: pd.DataFrame, symbol: str):
         """
         Save data using configured storage type.
@@ -302,6 +434,8 @@ class SP500EODLoader:
             self.save_to_csv(df, symbol)
         elif self.storage_type == "sqlite":
             self.save_to_sqlite(df, symbol)
+        elif self.storage_type == "parquet":
+            self.save_to_parquet(df, symbol)
 
     def fetch_and_save(
         self, symbol: str, start_date: Optional[str] = None, end_date: Optional[str] = None, auto_adjust: bool = True
@@ -331,30 +465,92 @@ class SP500EODLoader:
         end_date: Optional[str] = None,
         auto_adjust: bool = True,
         continue_on_error: bool = True,
+        symbols: Optional[List[str]] = None,
+        max_workers: int = 1,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        max_rate: Optional[float] = None,
     ) -> dict:
         """
         Fetch data for all symbols in the list.
 
+        With ``max_workers=1`` symbols are fetched one at a time with
+        ``rate_limit_delay`` between requests. With more workers, downloads
+        run on a thread pool behind an adaptive token bucket. It starts at
+        one request per ``rate_limit_delay``, speeds up after successful
+        downloads up to ``max_rate`` and slows down on HTTP 429 or empty
+        responses; each result is saved as soon as it arrives and failed
+        downloads are retried with exponential backoff.
+
         Args:
             start_date: Start date in 'YYYY-MM-DD' format
             end_date: End date in 'YYYY-MM-DD' format
             auto_adjust: Adjust all OHLC data for splits/dividends
             continue_on_error: Continue fetching if one symbol fails
+            symbols: Symbols to fetch (default: the loader's symbols)
+            max_workers: Concurrent downloads (1 = sequential)
+            max_retries: Retries per symbol in concurrent mode
+            backoff_base: First retry delay in seconds, doubled on each retry
+            max_rate: Ceiling on requests per second in concurrent mode
+                      (default: 4 requests per ``rate_limit_delay``)
 
         Returns:
             Dictionary with 'success' and 'failed' symbol lists
+
+        Raises:
+            ValueError: If max_workers, max_retries or max_rate is out of range
         """
-        if not self.symbols:
+        if max_workers < 1:
+            raise ValueError(f"Invalid max_workers: {max_workers}. Must be at least 1")
+        if max_retries < 0:
+            raise ValueError(f"Invalid max_retries: {max_retries}. Must be non-negative")
+        if max_rate is not None and max_rate <= 0:
+            raise ValueError(f"Invalid max_rate: {max_rate}. Must be positive")
+
+        symbols = list(symbols) if symbols is not None else self.symbols
+        if not symbols:
             logger.warning("No symbols to fetch. Load symbols first.")
             return {"success": [], "failed": []}
 
-        logger.info(f"Starting bulk fetch for {len(self.symbols)} symbols")
+        logger.info(f"Starting bulk fetch for {len(symbols)} symbols")
+
+        with self.batch_writes():
+            if max_workers > 1:
+                success, failed = self._fetch_all_concurrent(
+                    symbols,
+                    start_date,
+                    end_date,
+                    auto_adjust,
+                    continue_on_error,
+                    max_workers,
+                    max_retries,
+                    backoff_base,
+                    max_rate,
+                )
+            else:
+                success, failed = self._fetch_all_sequential(
+                    symbols, start_date, end_date, auto_adjust, continue_on_error
+                )
+
+        logger.info(f"Bulk fetch complete: {len(success)} succeeded, {len(failed)} failed")
+        if failed:
+            logger.warning(f"Failed symbols: {', '.join(failed)}")
+
+        return {"success": success, "failed": failed}
 
+    def _fetch_all_sequential(
+        self,
+        symbols: List[str],
+        start_date: Optional[str],
+        end_date: Optional[str],
+        auto_adjust: bool,
+        continue_on_error: bool,
+    ) -> Tuple[List[str], List[str]]:
         success = []
         failed = []
 
-        for i, symbol in enumerate(self.symbols):
-            logger.info(f"Processing {i + 1}/{len(self.symbols)}: {symbol}")
+        for i, symbol in enumerate(symbols):
+            logger.info(f"Processing {i + 1}/{len(symbols)}: {symbol}")
 
             try:
                 if self.fetch_and_save(symbol, start_date, end_date, auto_adjust):
@@ -369,14 +565,74 @@ class SP500EODLoader:
                     raise
 
             # Rate limiting
-            if i < len(self.symbols) - 1:  # Don't delay after last symbol
+            if i < len(symbols) - 1:  # Don't delay after last symbol
                 time.sleep(self.rate_limit_delay)
 
-        logger.info(f"Bulk fetch complete: {len(success)} succeeded, {len(failed)} failed")
-        if failed:
-            logger.warning(f"Failed symbols: {', '.join(failed)}")
+        return success, failed
 
-        return {"success": success, "failed": failed}
+    def _fetch_all_concurrent(
+        self,
+        symbols: List[str],
+        start_date: Optional[str],
+        end_date: Optional[str],
+        auto_adjust: bool,
+        continue_on_error: bool,
+        max_workers: int,
+        max_retries: int,
+        backoff_base: float,
+        max_rate: Optional[float],
+    ) -> Tuple[List[str], List[str]]:
+        """Download on a thread pool and save results on this thread as they complete."""
+        # Start at the sequential rate and let successful downloads probe above it
+        initial_rate = 1.0 / self.rate_limit_delay if self.rate_limit_delay > 0 else 1e6
+        max_rate = max_rate if max_rate is not None else MAX_RATE_MULTIPLIER * initial_rate
+        limiter = AdaptiveRateLimiter(
+            max_rate=max_rate,
+            initial_rate=min(initial_rate, max_rate),
+            min_rate=min(initial_rate, max_rate) / 32,
+        )
+
+        def download(symbol: str) -> Optional[pd.DataFrame]:
+            for attempt in range(max_retries + 1):
+                limiter.acquire()
+                try:
+                    df = self._download_symbol(symbol, start_date, end_date, auto_adjust)
+                except Exception as e:
+                    if is_rate_limit_error(e):
+                        limiter.throttled()
+                    logger.warning(f"{symbol}: attempt {attempt + 1}/{max_retries + 1} failed: {e}")
+                else:
+                    if df is not None and not df.empty:
+                        limiter.succeeded()
+                        return df
+                    # Yahoo often answers throttled requests with an empty frame
+                    limiter.throttled()
+                if attempt < max_retries:
+                    time.sleep(backoff_base * 2**attempt)
+            return None
+
+        status = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(download, symbol): symbol for symbol in symbols}
+            for done, future in enumerate(as_completed(futures), start=1):
+                symbol = futures[future]
+                logger.info(f"Processing {done}/{len(symbols)}: {symbol}")
+                try:
+                    df = future.result()
+                    if df is not None:
+                        self.save(df, symbol)
+                    status[symbol] = df is not None
+                except Exception as e:
+                    logger.error(f"Error processing {symbol}: {e}")
+                    status[symbol] = False
+                    if not continue_on_error:
+                        for pending in futures:
+                            pending.cancel()
+                        raise
+
+        success = [symbol for symbol in symbols if status.get(symbol)]
+        failed = [symbol for symbol in symbols if not status.get(symbol)]
+        return success, failed
 
     def load_from_csv(self, symbol: str) -> Optional[pd.DataFrame]:
         """
@@ -444,3 +700,194 @@ class SP500EODLoader:
         except Exception as e:
             logger.error(f"Error loading from database for {symbol}: {e}")
             return None
+
+    def load_from_parquet(
+        self, symbol: str, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Load data from the Parquet store.
+
+        Args:
+            symbol: Stock symbol
+            start_date: Optional start date filter (inclusive)
+            end_date: Optional end date filter (inclusive)
+
+        Returns:
+            DataFrame with symbol, date and price columns, or None if no data found
+        """
+        try:
+            table = self._scan_parquet([symbol], start_date, end_date, ["symbol", "date", *self.PRICE_COLUMNS])
+            if table.num_rows == 0:
+                logger.warning(f"No data found in Parquet store for {symbol}")
+                return None
+
+            df = table.to_pandas()
+            logger.info(f"Loaded {len(df)} rows from Parquet store for {symbol}")
+            return df
+        except Exception as e:
+            logger.error(f"Error loading Parquet for {symbol}: {e}")
+            return None
+
+    def _scan_parquet(
+        self, symbols: Optional[List[str]], start_date: Optional[str], end_date: Optional[str], columns: List[str]
+    ) -> "pa.Table":
+        """Scan the Parquet store with symbol and date predicates pushed down (symbols=None reads all)."""
+        if not self.parquet_dir.exists() or not any(self.parquet_dir.iterdir()):
+            return pa.table({column: [] for column in columns})
+
+        predicate = ds.scalar(True)
+        if symbols is not None:
+            predicate &= ds.field("symbol").isin(list(symbols))
+        if start_date is not None:
+            predicate &= ds.field("date") >= pd.Timestamp(start_date).to_pydatetime()
+        if end_date is not None:
+            predicate &= ds.field("date") <= pd.Timestamp(end_date).to_pydatetime()
+
+        return self._parquet_dataset().to_table(columns=columns, filter=predicate)
+
+    def load_dates(self, symbols: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Load the stored dates of many symbols in one pass.
+
+        SQLite uses a single query and Parquet a single dataset scan; CSV
+        reads each symbol's file.
+
+        Args:
+            symbols: Symbols to load (default: every symbol in the store)
+
+        Returns:
+            DataFrame with 'symbol' and naive, midnight-normalized 'date' columns
+        """
+        if self.storage_type == "parquet":
+            long = self._scan_parquet(symbols, None, None, ["symbol", "date"]).to_pandas()
+            long["symbol"] = long["symbol"].astype(str)
+        elif self.storage_type == "sqlite":
+            # SQLite trims the time part so only 'YYYY-MM-DD' strings reach pandas
+            query = "SELECT symbol, substr(date, 1, 10) AS date FROM equity_data"
+            params: List[str] = []
+            if symbols is not None:
+                query += f" WHERE symbol IN ({', '.join('?' for _ in symbols)})"
+                params = list(symbols)
+            conn = sqlite3.connect(self.db_path)
+            try:
+                long = pd.read_sql_query(query, conn, params=params)
+            finally:
+                conn.close()
+            long["date"] = pd.to_datetime(long["date"], format="%Y-%m-%d")
+        else:
+            if symbols is None:
+                symbols = sorted(path.stem[len("equity_") :] for path in self.data_dir.glob("equity_*.csv"))
+            frames = []
+            for symbol in symbols:
+                df = self.load_from_csv(symbol)
+                if df is None or df.empty:
+                    continue
+                date_column = "Date" if "Date" in df.columns else "date"
+                if date_column not in df.columns:
+                    continue
+                frames.append(pd.DataFrame({"symbol": symbol, "date": df[date_column]}))
+            long = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["symbol", "date"])
+
+        if long.empty:
+            return pd.DataFrame({"symbol": pd.Series(dtype=object), "date": pd.Series(dtype="datetime64[ns]")})
+        long["date"] = self._normalize_dates(long["date"])
+        return long[["symbol", "date"]]
+
+    def load_panel(
+        self,
+        symbols: Optional[List[str]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        fields: Union[str, List[str]] = "close",
+    ) -> pd.DataFrame:
+        """
+        Load an aligned wide panel (dates x symbols) in one call.
+
+        With the Parquet store this is a single dataset scan with the symbol
+        and date predicates pushed down to partition and row-group level.
+        SQLite uses one query; CSV falls back to reading each file.
+
+        Args:
+            symbols: Symbols to load (default: the loader's symbols)
+            start_date: Optional start date (inclusive)
+            end_date: Optional end date (inclusive)
+            fields: A price column (e.g. 'close') for a dates x symbols frame,
+                    or a list of columns for (field, symbol) MultiIndex columns
+
+        Returns:
+            DataFrame indexed by date with one column per requested symbol
+            (NaN where a symbol has no bar on a date)
+        """
+        symbols = list(symbols) if symbols is not None else list(self.symbols)
+        field_list = [fields] if isinstance(fields, str) else list(fields)
+
+        if self.storage_type == "parquet":
+            long = self._scan_parquet(symbols, start_date, end_date, ["symbol", "date", *field_list]).to_pandas()
+        elif self.storage_type == "sqlite":
+            long = self._query_sqlite_panel(symbols, start_date, end_date, field_list)
+        else:
+            long = self._read_csv_panel(symbols, start_date, end_date, field_list)
+
+        # Scatter the long rows straight into a dates x (fields, symbols) array;
+        # much cheaper than DataFrame.pivot on millions of rows
+        dates, date_codes = np.unique(long["date"].to_numpy(dtype="datetime64[ns]"), return_inverse=True)
+        symbol_codes = pd.Index(symbols).get_indexer(long["symbol"].astype(str))
+        values = np.full((len(dates), len(field_list) * len(symbols)), np.nan)
+        for i, field in enumerate(field_list):
+            values[date_codes, i * len(symbols) + symbol_codes] = long[field].to_numpy(dtype=float)
+
+        if isinstance(fields, str):
+            columns = pd.Index(symbols)
+        else:
+            columns = pd.MultiIndex.from_product([field_list, symbols])
+        panel = pd.DataFrame(values, index=pd.DatetimeIndex(dates, name="date"), columns=columns)
+        logger.info(f"Loaded panel with {len(panel)} dates x {len(symbols)} symbols")
+        return panel
+
+    def _query_sqlite_panel(
+        self, symbols: List[str], start_date: Optional[str], end_date: Optional[str], fields: List[str]
+    ) -> pd.DataFrame:
+        """Load rows for many symbols with a single SQLite query."""
+        unknown = set(fields) - set(self.PRICE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {sorted(unknown)}. Available: {self.PRICE_COLUMNS}")
+
+        placeholders = ", ".join("?" for _ in symbols)
+        query = f"SELECT symbol, date, {', '.join(fields)} FROM equity_data WHERE symbol IN ({placeholders})"
+        params: List[str] = list(symbols)
+        if start_date:
+            query += " AND date >= ?"
+            params.append(str(pd.Timestamp(start_date).date()))
+        if end_date:
+            query += " AND date <= ?"
+            params.append(str(pd.Timestamp(end_date).date()))
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            long = pd.read_sql_query(query, conn, params=params)
+        finally:
+            conn.close()
+        long["date"] = pd.to_datetime(long["date"])
+        return long
+
+    def _read_csv_panel(
+        self, symbols: List[str], start_date: Optional[str], end_date: Optional[str], fields: List[str]
+    ) -> pd.DataFrame:
+        """Load rows for many symbols from per-symbol CSV files."""
+        frames = []
+        for symbol in symbols:
+            df = self.load_from_csv(symbol)
+            if df is None or df.empty:
+                continue
+            date_column = "Date" if "Date" in df.columns else "date"
+            frame = pd.DataFrame({"date": self._normalize_dates(df[date_column]), "symbol": symbol})
+            for field in fields:
+                frame[field] = df[field].to_numpy() if field in df.columns else float("nan")
+            if start_date is not None:
+                frame = frame[frame["date"] >= pd.Timestamp(start_date)]
+            if end_date is not None:
+                frame = frame[frame["date"] <= pd.Timestamp(end_date)]
+            frames.append(frame)
+        if not frames:
+            return pd.DataFrame(columns=["date", "symbol", *fields])
+        return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,152 @@
+"""
+Rate limiting for market data downloads.
+
+Provides a thread-safe token bucket whose refill rate adapts to upstream
+throttling: every throttled request (HTTP 429, or an empty response that
+usually means the same thing) halves the rate, and every successful request
+nudges it up toward the configured maximum (additive increase,
+multiplicative decrease). Starting below the maximum lets the limiter probe
+for a faster rate than a known-safe starting point.
+
+Example Usage:
+    limiter = AdaptiveRateLimiter(max_rate=8.0, initial_rate=2.0, burst=4)
+
+    limiter.acquire()          # blocks until a request may be sent
+    try:
+        df = download(symbol)
+    except RateLimitError:
+        limiter.throttled()    # back off
+    else:
+        limiter.succeeded()    # recover toward max_rate
+"""
+
+import logging
+import re
+import threading
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveRateLimiter:
+    """
+    Thread-safe token bucket with AIMD rate adaptation.
+
+    Tokens refill continuously at ``rate`` per second up to ``burst``.
+    ``acquire`` reserves a token and sleeps outside the lock until it is due,
+    so concurrent callers are spaced out fairly instead of racing.
+
+    Attributes:
+        max_rate: Upper bound on the refill rate (requests per second)
+        min_rate: Lower bound the rate never drops below
+        rate: Current refill rate
+    """
+
+    def __init__(
+        self,
+        max_rate: float,
+        burst: int = 1,
+        min_rate: Optional[float] = None,
+        initial_rate: Optional[float] = None,
+        backoff_factor: float = 0.5,
+        recovery_step: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            max_rate: Maximum requests per second
+            burst: Bucket capacity (requests that may be sent back to back)
+            min_rate: Minimum requests per second (default: max_rate / 32)
+            initial_rate: Starting requests per second (default: max_rate)
+            backoff_factor: Multiplier applied to the rate when throttled
+            recovery_step: Rate added after each success (default: max_rate / 20)
+            clock: Monotonic clock in seconds (injectable for tests)
+            sleep: Sleep function (injectable for tests)
+
+        Raises:
+            ValueError: If a rate, burst or factor is out of range
+        """
+        if max_rate <= 0:
+            raise ValueError(f"Invalid max_rate: {max_rate}. Must be positive")
+        if burst < 1:
+            raise ValueError(f"Invalid burst: {burst}. Must be at least 1")
+        if not 0 < backoff_factor < 1:
+            raise ValueError(f"Invalid backoff_factor: {backoff_factor}. Must be between 0 and 1")
+
+        self.max_rate = float(max_rate)
+        self.min_rate = float(min_rate) if min_rate is not None else self.max_rate / 32
+        if not 0 < self.min_rate <= self.max_rate:
+            raise ValueError(f"Invalid min_rate: {min_rate}. Must be positive and at most max_rate")
+
+        self.burst = burst
+        self.backoff_factor = backoff_factor
+        self.recovery_step = recovery_step if recovery_step is not None else self.max_rate / 20
+        self.rate = float(initial_rate) if initial_rate is not None else self.max_rate
+        if not self.min_rate <= self.rate <= self.max_rate:
+            raise ValueError(f"Invalid initial_rate: {initial_rate}. Must be between min_rate and max_rate")
+
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self) -> float:
+        """
+        Block until a request may be sent.
+
+        Returns:
+            Seconds spent waiting
+        """
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def throttled(self):
+        """Record a throttled request: cut the rate and drain the bucket."""
+        with self._lock:
+            self._refill(self._clock())
+            self.rate = max(self.min_rate, self.rate * self.backoff_factor)
+            self._tokens = min(self._tokens, 0.0)
+        logger.warning(f"Upstream throttling detected, request rate lowered to {self.rate:.2f}/s")
+
+    def succeeded(self):
+        """Record a successful request: raise the rate toward max_rate."""
+        with self._lock:
+            self._refill(self._clock())
+            self.rate = min(self.max_rate, self.rate + self.recovery_step)
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """
+    Check whether an exception signals upstream throttling.
+
+    Recognizes yfinance's ``YFRateLimitError``, HTTP errors carrying a 429
+    status code and messages mentioning "Too Many Requests".
+
+    Args:
+        error: Exception raised by a download
+
+    Returns:
+        True if the error is a rate limit response
+    """
+    if "RateLimit" in type(error).__name__:
+        return True
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    message = str(error)
+    return bool(re.search(r"\b429\b", message)) or "Too Many Requests" in message
@@ -0,0 +1,180 @@
+"""
+Bulk SQLite writer for historical equity data.
+
+Keeps a single connection open in WAL mode and upserts rows into the
+``equity_data`` table with ``executemany`` inside large transactions, so
+re-running a backfill replaces rows instead of duplicating them and the
+journal is synced once per batch rather than once per symbol.
+
+Example Usage:
+    with EquityDataWriter('data/market_data.db', batch_size=5000) as writer:
+        for symbol, df in frames.items():
+            writer.write(df, symbol)     # committed every ~5000 rows
+    # remaining rows are committed on exit
+"""
+
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PRICE_COLUMNS = ["open", "high", "low", "close", "adj_close", "volume", "dividends", "stock_splits"]
+
+UPSERT_SQL = (
+    f"INSERT INTO equity_data (symbol, date, {', '.join(PRICE_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in range(len(PRICE_COLUMNS) + 2))}) "
+    f"ON CONFLICT(symbol, date) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in PRICE_COLUMNS)}"
+)
+
+# Applied to every connection; WAL lets readers proceed while a batch is written
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",
+)
+
+
+class EquityDataWriter:
+    """
+    Batched upsert writer for the ``equity_data`` table.
+
+    Rows are buffered and flushed in one transaction whenever ``batch_size``
+    rows are pending, and on ``flush``/``close``. Used as a context manager,
+    pending rows are committed when the block exits, even if it raises, so
+    every symbol queued before an error is kept.
+
+    Attributes:
+        db_path (Path): Path to the SQLite database
+        batch_size (int): Rows per transaction
+        rows_written (int): Rows committed so far
+    """
+
+    def __init__(self, db_path: Union[str, Path], batch_size: int = 5000):
+        """
+        Initialize the writer.
+
+        Args:
+            db_path: Path to a database containing the equity_data table
+            batch_size: Rows buffered before a transaction is committed
+
+        Raises:
+            ValueError: If batch_size is not positive
+        """
+        if batch_size <= 0:
+            raise ValueError(f"Invalid batch_size: {batch_size}. Must be positive")
+
+        self.db_path = Path(db_path)
+        self.batch_size = batch_size
+        self.rows_written = 0
+        self._pending: List[Tuple] = []
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def __enter__(self) -> "EquityDataWriter":
+        self._connect()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            # Autocommit mode: transactions are opened explicitly in flush()
+            self._conn = sqlite3.connect(self.db_path, isolation_level=None)
+            for pragma in PRAGMAS:
+                self._conn.execute(pragma)
+        return self._conn
+
+    @staticmethod
+    def to_rows(df: pd.DataFrame, symbol: str) -> List[Tuple]:
+        """
+        Convert a frame of EOD data to upsert parameter tuples.
+
+        Args:
+            df: EOD data with a 'Date' or 'date' column and lowercase price columns
+            symbol: Stock symbol
+
+        Returns:
+            One (symbol, date, open, ..., stock_splits) tuple per row; missing
+            columns and NaN values become NULL
+        """
+        if df.empty:
+            return []
+
+        date_column = "Date" if "Date" in df.columns else "date"
+        dates = pd.to_datetime(df[date_column]).dt.strftime("%Y-%m-%d").tolist()
+
+        columns = [[symbol] * len(df), dates]
+        for column in PRICE_COLUMNS:
+            if column not in df.columns:
+                columns.append([None] * len(df))
+                continue
+            # INTEGER affinity stores whole-number floats (volume) as integers
+            values = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=float)
+            cells = values.tolist()
+            missing = np.isnan(values)
+            if missing.any():
+                cells = [None if m else v for v, m in zip(cells, missing, strict=True)]
+            columns.append(cells)
+        return list(zip(*columns, strict=True))
+
+    def write(self, df: pd.DataFrame, symbol: str) -> int:
+        """
+        Queue one symbol's rows, flushing whenever a batch fills up.
+
+        Args:
+            df: EOD data for the symbol
+            symbol: Stock symbol
+
+        Returns:
+            Number of rows queued
+        """
+        rows = self.to_rows(df, symbol)
+        self._pending.extend(rows)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+        return len(rows)
+
+    def write_many(self, frames: Dict[str, pd.DataFrame]) -> int:
+        """
+        Queue several symbols' rows.
+
+        Args:
+            frames: Mapping of symbol to EOD data
+
+        Returns:
+            Number of rows queued
+        """
+        return sum(self.write(df, symbol) for symbol, df in frames.items())
+
+    def flush(self):
+        """Upsert all pending rows in a single transaction."""
+        if not self._pending:
+            return
+
+        conn = self._connect()
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(UPSERT_SQL, self._pending)
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+        self.rows_written += len(self._pending)
+        logger.debug(f"Committed {len(self._pending)} rows to {self.db_path}")
+        self._pending.clear()
+
+    def close(self):
+        """Flush pending rows and close the connection."""
+        try:
+            self.flush()
+        finally:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
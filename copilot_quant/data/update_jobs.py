@@ -29,13 +29,17 @@ import logging
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 from copilot_quant.data.eod_loader import SP500EODLoader
 from copilot_quant.data.providers import YFinanceProvider
 
+if TYPE_CHECKING:
+    from copilot_quant.orchestrator.market_calendar import MarketCalendar
+
 logger = logging.getLogger(__name__)
 
 
@@ -55,6 +59,8 @@ class DataUpdater:
         db_path: str = "data/market_data.db",
         provider: Optional[YFinanceProvider] = None,
         rate_limit_delay: float = 0.5,
+        calendar: Optional["MarketCalendar"] = None,
+        parquet_dir: str = "data/parquet",
     ):
         """
         Initialize the data updater.
@@ -65,6 +71,8 @@ class DataUpdater:
             db_path: Path to SQLite database
             provider: Data provider instance (defaults to YFinanceProvider)
             rate_limit_delay: Delay between API calls in seconds
+            calendar: Trading calendar used for gap detection (defaults to NYSE MarketCalendar)
+            parquet_dir: Root directory of the Parquet store
         """
         self.storage_type = storage_type.lower()
         self.data_dir = Path(data_dir)
@@ -74,13 +82,25 @@ class DataUpdater:
         # Initialize provider
         self.provider = provider or YFinanceProvider()
 
+        if calendar is None:
+            # Imported lazily: the orchestrator package is heavy and not needed for plain updates
+            from copilot_quant.orchestrator.market_calendar import MarketCalendar
+
+            calendar = MarketCalendar()
+        self.calendar = calendar
+
         # Initialize loader
         self.loader = SP500EODLoader(
-            storage_type=storage_type, data_dir=str(data_dir), db_path=str(db_path), rate_limit_delay=rate_limit_delay
+            storage_type=storage_type,
+            data_dir=str(data_dir),
+            db_path=str(db_path),
+            rate_limit_delay=rate_limit_delay,
+            parquet_dir=str(parquet_dir),
         )
 
         # Metadata tracking
         self.metadata_file = self.data_dir / "update_metadata.csv"
+        self._deferred_metadata: Optional[List[str]] = None
         self._load_metadata()
 
         logger.info("Initialized DataUpdater")
@@ -124,6 +144,11 @@ class DataUpdater:
                     if "date" in df.columns:
                         return pd.to_datetime(df["date"]).max().strftime("%Y-%m-%d")
 
+            elif self.storage_type == "parquet":
+                df = self.loader.load_from_parquet(symbol)
+                if df is not None and not df.empty:
+                    return df["date"].max().strftime("%Y-%m-%d")
+
         except Exception as e:
             logger.debug(f"Could not get last date for {symbol}: {e}")
 
@@ -252,6 +277,10 @@ class DataUpdater:
         """
         Update multiple symbols in batch.
 
+        With SQLite storage all symbols are written through one connection
+        and committed every ``loader.sqlite_batch_size`` rows; update metadata
+        is recorded once the rows are committed.
+
         Args:
             symbols: List of stock ticker symbols
             force: Force update even if data is fresh
@@ -271,40 +300,57 @@ class DataUpdater:
         success = []
         failed = []
 
-        for i, symbol in enumerate(symbols):
-            logger.info(f"Processing {i + 1}/{len(symbols)}: {symbol}")
-
-            try:
-                if self.update_symbol(symbol, force=force, max_age_days=max_age_days):
-                    success.append(symbol)
-                else:
-                    failed.append(symbol)
-
-            except Exception as e:
-                logger.error(f"Error updating {symbol}: {e}")
-                failed.append(symbol)
-                if not continue_on_error:
-                    raise
-
-            # Rate limiting
-            if i < len(symbols) - 1:
-                time.sleep(self.rate_limit_delay)
+        self._deferred_metadata = []
+        try:
+            with self.loader.batch_writes():
+                for i, symbol in enumerate(symbols):
+                    logger.info(f"Processing {i + 1}/{len(symbols)}: {symbol}")
+
+                    try:
+                        if self.update_symbol(symbol, force=force, max_age_days=max_age_days):
+                            success.append(symbol)
+                        else:
+                            failed.append(symbol)
+
+                    except Exception as e:
+                        logger.error(f"Error updating {symbol}: {e}")
+                        failed.append(symbol)
+                        if not continue_on_error:
+                            raise
+
+                    # Rate limiting
+                    if i < len(symbols) - 1:
+                        time.sleep(self.rate_limit_delay)
+        finally:
+            # Batched rows are committed now, so last dates can be read back
+            deferred, self._deferred_metadata = self._deferred_metadata, None
+            for symbol in deferred:
+                self._update_metadata(symbol)
 
         logger.info(f"Batch update complete: {len(success)} succeeded, {len(failed)} failed")
 
         return {"success": success, "failed": failed}
 
     def batch_backfill(
-        self, symbols: List[str], start_date: str, end_date: Optional[str] = None, continue_on_error: bool = True
+        self,
+        symbols: List[str],
+        start_date: str,
+        end_date: Optional[str] = None,
+        continue_on_error: bool = True,
+        max_workers: int = 1,
     ) -> Dict[str, List[str]]:
         """
         Backfill historical data for multiple symbols.
 
+        With ``max_workers > 1`` downloads run concurrently through
+        ``SP500EODLoader.fetch_all`` (adaptive rate limiting and retries).
+
         Args:
             symbols: List of stock ticker symbols
             start_date: Start date in 'YYYY-MM-DD' format
             end_date: End date in 'YYYY-MM-DD' format
             continue_on_error: Continue processing if one symbol fails
+            max_workers: Concurrent downloads (1 = sequential)
 
         Returns:
             Dictionary with 'success' and 'failed' symbol lists
@@ -318,6 +364,21 @@ class DataUpdater:
         """
         logger.info(f"Starting batch backfill for {len(symbols)} symbols")
 
+        if max_workers > 1:
+            if end_date is None:
+                end_date = datetime.now().strftime("%Y-%m-%d")
+            result = self.loader.fetch_all(
+                start_date=start_date,
+                end_date=end_date,
+                continue_on_error=continue_on_error,
+                symbols=symbols,
+                max_workers=max_workers,
+            )
+            for symbol in result["success"]:
+                self._update_metadata(symbol)
+            logger.info(f"Batch backfill complete: {len(result['success'])} succeeded, {len(result['failed'])} failed")
+            return result
+
         success = []
         failed = []
 
@@ -345,7 +406,11 @@ class DataUpdater:
         return {"success": success, "failed": failed}
 
     def _update_metadata(self, symbol: str):
-        """Update metadata for a symbol."""
+        """Update metadata for a symbol (deferred until the batch commits inside batch_update)."""
+        if self._deferred_metadata is not None:
+            self._deferred_metadata.append(symbol)
+            return
+
         now = datetime.now()
         last_date = self._get_last_date(symbol)
 
@@ -404,11 +469,15 @@ class DataUpdater:
         """
         Find date gaps in historical data for a symbol.
 
+        A gap is a run of NYSE trading sessions with no stored row between
+        the symbol's first and last stored dates.
+
         Args:
             symbol: Stock ticker symbol
 
         Returns:
-            List of (start_date, end_date) tuples representing gaps
+            List of (start_date, end_date) tuples: the last stored date before
+            each gap and the first stored date after it
 
         Example:
             >>> updater = DataUpdater()
@@ -416,43 +485,111 @@ class DataUpdater:
             >>> for start, end in gaps:
             ...     print(f"Gap: {start} to {end}")
         """
-        try:
-            if self.storage_type == "csv":
-                df = self.loader.load_from_csv(symbol)
-            else:
-                df = self.loader.load_from_sqlite(symbol)
+        return self.find_all_gaps([symbol]).get(symbol, [])
 
-            if df is None or df.empty:
-                return []
+    def find_all_gaps(self, symbols: Optional[List[str]] = None) -> Dict[str, List[Tuple[str, str]]]:
+        """
+        Find date gaps for many symbols in one pass.
 
-            # Get date column
-            if "Date" in df.columns:
-                dates = pd.to_datetime(df["Date"]).sort_values()
-            elif "date" in df.columns:
-                dates = pd.to_datetime(df["date"]).sort_values()
-            else:
-                return []
+        Args:
+            symbols: Symbols to check (default: every symbol in storage)
 
-            # Find gaps (more than 3 days between consecutive dates)
-            gaps = []
-            for i in range(1, len(dates)):
-                days_diff = (dates.iloc[i] - dates.iloc[i - 1]).days
-                if days_diff > 3:  # Account for weekends
-                    gaps.append((dates.iloc[i - 1].strftime("%Y-%m-%d"), dates.iloc[i].strftime("%Y-%m-%d")))
+        Returns:
+            Mapping of symbol to its (start_date, end_date) gap tuples; symbols
+            without gaps are omitted
+        """
+        gaps, _ = self._session_gaps(symbols)
+        result: Dict[str, List[Tuple[str, str]]] = {}
+        if gaps.empty:
+            return result
+
+        for symbol, gap_start, gap_end in zip(
+            gaps["symbol"],
+            gaps["gap_start"].dt.strftime("%Y-%m-%d"),
+            gaps["gap_end"].dt.strftime("%Y-%m-%d"),
+            strict=True,
+        ):
+            result.setdefault(symbol, []).append((gap_start, gap_end))
+
+        for symbol, symbol_gaps in result.items():
+            logger.info(f"{symbol}: Found {len(symbol_gaps)} date gaps")
+        return result
+
+    def find_missing_sessions(self, symbols: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        List every missing trading session for many symbols in one pass.
 
-            logger.info(f"{symbol}: Found {len(gaps)} date gaps")
-            return gaps
+        Args:
+            symbols: Symbols to check (default: every symbol in storage)
+
+        Returns:
+            DataFrame with 'symbol' and 'date' columns, one row per trading
+            session missing between a symbol's first and last stored dates
+        """
+        gaps, sessions = self._session_gaps(symbols)
+        if gaps.empty:
+            return pd.DataFrame({"symbol": pd.Series(dtype=object), "date": pd.Series(dtype="datetime64[ns]")})
 
+        counts = gaps["missing_sessions"].to_numpy()
+        # Session positions of every missing day: first_missing + 0..count-1 per gap
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        positions = np.repeat(gaps["first_missing_position"].to_numpy(), counts) + offsets
+        return pd.DataFrame({"symbol": np.repeat(gaps["symbol"].to_numpy(), counts), "date": sessions[positions]})
+
+    def _session_gaps(self, symbols: Optional[List[str]]) -> Tuple[pd.DataFrame, pd.DatetimeIndex]:
+        """
+        Locate runs of missing sessions with np.diff over session positions.
+
+        Every stored date is mapped to its index in the trading calendar; within
+        a symbol, consecutive indices that differ by more than one bracket a gap.
+        Returns the gaps and the session calendar their positions refer to.
+        """
+        columns = ["symbol", "gap_start", "gap_end", "first_missing_position", "missing_sessions"]
+        try:
+            stored = self.loader.load_dates(symbols)
         except Exception as e:
-            logger.error(f"Error finding gaps for {symbol}: {e}")
-            return []
+            logger.error(f"Error loading stored dates: {e}")
+            stored = pd.DataFrame(columns=["symbol", "date"])
+        if stored.empty:
+            return pd.DataFrame(columns=columns), pd.DatetimeIndex([])
+
+        dates = stored["date"].to_numpy(dtype="datetime64[ns]")
+        sessions = self.calendar.trading_days(dates.min(), dates.max())
+        session_values = sessions.to_numpy(dtype="datetime64[ns]")
+
+        # Keep stored dates that are sessions (rows on holidays cannot bracket a gap)
+        positions = np.searchsorted(session_values, dates)
+        in_range = positions < len(session_values)
+        is_session = in_range.copy()
+        is_session[in_range] = session_values[positions[in_range]] == dates[in_range]
+        codes, uniques = pd.factorize(stored["symbol"].to_numpy()[is_session])
+        positions = positions[is_session]
+
+        order = np.lexsort((positions, codes))
+        codes = codes[order]
+        positions = positions[order]
+
+        steps = np.diff(positions)
+        gap_index = np.flatnonzero((codes[1:] == codes[:-1]) & (steps > 1))
+        gaps = pd.DataFrame(
+            {
+                "symbol": uniques[codes[gap_index]],
+                "gap_start": sessions[positions[gap_index]],
+                "gap_end": sessions[positions[gap_index + 1]],
+                "first_missing_position": positions[gap_index] + 1,
+                "missing_sessions": steps[gap_index] - 1,
+            },
+            columns=columns,
+        )
+        return gaps, sessions
 
-    def fill_gaps(self, symbol: str) -> bool:
+    def fill_gaps(self, symbol: str, gaps: Optional[List[Tuple[str, str]]] = None) -> bool:
         """
         Fill date gaps in historical data for a symbol.
 
         Args:
             symbol: Stock ticker symbol
+            gaps: Gaps from ``find_gaps``/``find_all_gaps`` (found if omitted)
 
         Returns:
             True if gaps were filled successfully, False otherwise
@@ -462,7 +599,8 @@ class DataUpdater:
             >>> updater.fill_gaps('AAPL')
             True
         """
-        gaps = self.find_gaps(symbol)
+        if gaps is None:
+            gaps = self.find_gaps(symbol)
 
         if not gaps:
             logger.info(f"{symbol}: No gaps found")
@@ -472,8 +610,10 @@ class DataUpdater:
 
         for start_date, end_date in gaps:
             try:
-                # Fetch data for gap period
-                self.loader.fetch_and_save(symbol, start_date=start_date, end_date=end_date)
+                # Fetch the missing sessions only: the day after the last stored
+                # date up to (exclusive) the next stored date
+                fetch_start = (pd.Timestamp(start_date) + timedelta(days=1)).strftime("%Y-%m-%d")
+                self.loader.fetch_and_save(symbol, start_date=fetch_start, end_date=end_date)
                 logger.info(f"{symbol}: Filled gap from {start_date} to {end_date}")
             except Exception as e:
                 logger.error(f"{symbol}: Error filling gap {start_date} to {end_date}: {e}")
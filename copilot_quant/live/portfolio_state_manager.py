@@ -45,10 +45,14 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from copilot_quant.backtest.online import OnlinePerformance
 from copilot_quant.brokers.live_broker_adapter import LiveBrokerAdapter
 
 logger = logging.getLogger(__name__)
 
+# Regular-session minutes per trading day, used to annualize snapshot returns
+TRADING_MINUTES_PER_DAY = 390
+
 Base = declarative_base()
 
 
@@ -233,6 +237,7 @@ class PortfolioStateManager:
 
         # State tracking
         self._peak_nav = 0.0
+        self.performance = self._new_performance()
         self._last_sync_time: Optional[datetime] = None
         self._last_snapshot_time: Optional[datetime] = None
         self._initialized = False
@@ -257,6 +262,7 @@ class PortfolioStateManager:
 
             if last_snapshot:
                 self._peak_nav = last_snapshot.peak_nav
+                self.performance = self._new_performance(peak=last_snapshot.peak_nav)
                 logger.info(f"Loaded last snapshot: NAV=${last_snapshot.nav:,.2f} from {last_snapshot.timestamp}")
             else:
                 logger.info("No previous snapshots found - starting fresh")
@@ -355,12 +361,10 @@ class PortfolioStateManager:
                 price = getattr(pos, "current_price", None) or getattr(pos, "avg_entry_price", 0)
                 equity_value += abs(pos.quantity * price)
 
-            # Update peak NAV
-            if nav > self._peak_nav:
-                self._peak_nav = nav
-
-            # Calculate drawdown
-            drawdown = ((self._peak_nav - nav) / self._peak_nav) if self._peak_nav > 0 else 0.0
+            # Update running metrics; peak NAV and drawdown come from the tracker
+            self.performance.update(nav, datetime.now())
+            self._peak_nav = self.performance.drawdown.peak
+            drawdown = abs(self.performance.current_drawdown)
 
             # Calculate daily PnL
             last_snapshot = self._get_latest_snapshot()
@@ -395,6 +399,23 @@ class PortfolioStateManager:
             logger.error(f"Error taking snapshot: {e}", exc_info=True)
             return False
 
+    def get_performance_metrics(self) -> Dict[str, Any]:
+        """
+        Get running performance metrics over the snapshots taken since startup.
+
+        Sharpe, Sortino, volatility and drawdown are updated in O(1) per
+        snapshot and annualized from the snapshot interval.
+
+        Returns:
+            Dictionary from OnlinePerformance.snapshot()
+        """
+        return self.performance.snapshot()
+
+    def _new_performance(self, peak: Optional[float] = None) -> OnlinePerformance:
+        """Create running metrics annualized for the snapshot interval."""
+        snapshots_per_day = max(TRADING_MINUTES_PER_DAY / self.snapshot_interval_minutes, 1.0)
+        return OnlinePerformance(periods_per_year=252 * snapshots_per_day, peak=peak)
+
     def should_sync(self) -> bool:
         """
         Check if it's time to sync with broker.
@@ -12,11 +12,14 @@ Features:
 """
 
 import logging
+from datetime import date as date_type
 from datetime import datetime, time, timedelta
 from enum import Enum
-from typing import List, Optional
+from typing import List, Optional, Union
 from zoneinfo import ZoneInfo
 
+import pandas as pd
+
 logger = logging.getLogger(__name__)
 
 
@@ -59,6 +62,20 @@ class MarketCalendar:
     # Timezone
     MARKET_TIMEZONE = ZoneInfo("America/New_York")
 
+    # Unscheduled full-day NYSE closures (national days of mourning, weather, 9/11)
+    SPECIAL_CLOSURES = (
+        date_type(2001, 9, 11),
+        date_type(2001, 9, 12),
+        date_type(2001, 9, 13),
+        date_type(2001, 9, 14),
+        date_type(2004, 6, 11),
+        date_type(2007, 1, 2),
+        date_type(2012, 10, 29),
+        date_type(2012, 10, 30),
+        date_type(2018, 12, 5),
+        date_type(2025, 1, 9),
+    )
+
     def __init__(self, timezone: Optional[str] = None):
         """
         Initialize market calendar.
@@ -84,11 +101,12 @@ class MarketCalendar:
         - Presidents' Day (3rd Monday in February)
         - Good Friday (Friday before Easter)
         - Memorial Day (last Monday in May)
-        - Juneteenth (June 19)
+        - Juneteenth (June 19, since 2022)
         - Independence Day (July 4)
         - Labor Day (1st Monday in September)
         - Thanksgiving Day (4th Thursday in November)
         - Christmas Day (December 25)
+        - Unscheduled closures listed in SPECIAL_CLOSURES
 
         Args:
             year: Year to get holidays for
@@ -119,9 +137,10 @@ class MarketCalendar:
         memorial_day = self._last_weekday(year, 5, 0)
         holidays.append(memorial_day)
 
-        # Juneteenth (June 19, observed if weekend)
-        juneteenth = datetime(year, 6, 19, tzinfo=self.timezone)
-        holidays.append(self._adjust_for_weekend(juneteenth))
+        # Juneteenth (June 19, observed if weekend; NYSE holiday since 2022)
+        if year >= 2022:
+            juneteenth = datetime(year, 6, 19, tzinfo=self.timezone)
+            holidays.append(self._adjust_for_weekend(juneteenth))
 
         # Independence Day (July 4, observed if weekend)
         independence_day = datetime(year, 7, 4, tzinfo=self.timezone)
@@ -139,6 +158,12 @@ class MarketCalendar:
         christmas = datetime(year, 12, 25, tzinfo=self.timezone)
         holidays.append(self._adjust_for_weekend(christmas))
 
+        holidays.extend(
+            datetime(closure.year, closure.month, closure.day, tzinfo=self.timezone)
+            for closure in self.SPECIAL_CLOSURES
+            if closure.year == year
+        )
+
         return holidays
 
     def _nth_weekday(self, year: int, month: int, weekday: int, n: int) -> datetime:
@@ -298,6 +323,41 @@ class MarketCalendar:
         """
         return not (self.is_weekend(date) or self.is_holiday(date))
 
+    def trading_days(
+        self, start: Union[str, datetime, pd.Timestamp], end: Union[str, datetime, pd.Timestamp]
+    ) -> pd.DatetimeIndex:
+        """
+        Get all trading sessions between two dates.
+
+        Vectorized equivalent of filtering every day with ``is_trading_day``.
+
+        Args:
+            start: First date (inclusive)
+            end: Last date (inclusive)
+
+        Returns:
+            Naive, midnight-normalized DatetimeIndex of trading days
+        """
+        start = pd.Timestamp(start)
+        end = pd.Timestamp(end)
+        if start.tzinfo is not None:
+            start = start.tz_convert(self.timezone).tz_localize(None)
+        if end.tzinfo is not None:
+            end = end.tz_convert(self.timezone).tz_localize(None)
+
+        days = pd.bdate_range(start.normalize(), end.normalize())
+        # A Saturday New Year's Day is listed under the next year as Dec 31, but
+        # is_holiday only consults the date's own year, so match that here
+        holidays = pd.DatetimeIndex(
+            [
+                holiday.replace(tzinfo=None)
+                for year in range(start.year, end.year + 1)
+                for holiday in self._get_us_market_holidays(year)
+                if holiday.year == year
+            ]
+        ).normalize()
+        return days[~days.isin(holidays)]
+
     def is_market_open(self, now: Optional[datetime] = None) -> bool:
         """
         Check if the market is currently open for regular trading.
@@ -1,5 +1,17 @@
 """Trading strategies module."""
 
+from copilot_quant.strategies.factor_engine import (
+    FactorEngine,
+    FactorStrategy,
+    cross_sectional_rank,
+    cross_sectional_zscore,
+    low_volatility,
+    momentum,
+    neutralize,
+    winsorize,
+)
+from copilot_quant.strategies.pair_discovery import PairScanResult, discover_pairs
+from copilot_quant.strategies.pair_tracker import PairTracker
 from copilot_quant.strategies.pairs_trading import PairsTradingStrategy
 from copilot_quant.strategies.pairs_utils import (
     calculate_correlation,
@@ -13,11 +25,22 @@ from copilot_quant.strategies.pairs_utils import (
 
 __all__ = [
     "PairsTradingStrategy",
+    "PairTracker",
     "check_cointegration",
     "calculate_correlation",
     "calculate_hedge_ratio",
     "calculate_spread",
     "calculate_zscore",
     "find_cointegrated_pairs",
+    "discover_pairs",
+    "PairScanResult",
     "calculate_half_life",
+    "FactorEngine",
+    "FactorStrategy",
+    "momentum",
+    "low_volatility",
+    "cross_sectional_rank",
+    "cross_sectional_zscore",
+    "winsorize",
+    "neutralize",
 ]
@@ -0,0 +1,592 @@
+"""
+Cross-sectional factor engine.
+
+Factor strategies such as momentum, value and low volatility rank a whole
+universe against itself on each rebalance date. Written against
+``Strategy.on_data`` one symbol at a time they loop over thousands of
+symbols in Python. FactorEngine instead works on (dates x symbols) panels:
+
+1. Each factor is computed for every symbol and date at once from the wide
+   price panel (or supplied as a precomputed panel, e.g. book-to-price).
+2. On the rebalance dates each factor is winsorized, standardized (z-score
+   or rank) and optionally neutralized within groups such as sectors, all
+   as row-wise array operations.
+3. The standardized factors are combined into a weighted composite, which
+   becomes target weights for VectorizedBacktester or TradingSignal objects
+   for MultiStrategyEngine (through FactorStrategy).
+
+No step loops over symbols.
+"""
+
+import logging
+from datetime import datetime
+from typing import Callable, Dict, Hashable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from copilot_quant.backtest.signals import SignalBasedStrategy, TradingSignal
+
+logger = logging.getLogger(__name__)
+
+# A factor maps the wide price panel to a score panel, or is a precomputed score panel
+Factor = Union[Callable[[pd.DataFrame], pd.DataFrame], pd.DataFrame]
+
+# Supported values for FactorEngine standardize
+STANDARDIZE_METHODS = ("zscore", "rank")
+
+
+def momentum(prices: pd.DataFrame, lookback: int = 252, skip: int = 21) -> pd.DataFrame:
+    """
+    Total return over ``lookback`` bars, excluding the most recent ``skip`` bars.
+
+    Args:
+        prices: Wide panel of prices (dates x symbols)
+        lookback: Bars in the formation period (e.g. 252 = 12 months)
+        skip: Most recent bars left out to avoid short-term reversal
+
+    Returns:
+        Score panel; NaN until a symbol has ``lookback`` bars
+    """
+    return prices.shift(skip) / prices.shift(lookback) - 1.0
+
+
+def low_volatility(prices: pd.DataFrame, lookback: int = 63) -> pd.DataFrame:
+    """
+    Negative standard deviation of daily returns, so calmer stocks score higher.
+
+    Args:
+        prices: Wide panel of prices (dates x symbols)
+        lookback: Bars in the volatility window
+
+    Returns:
+        Score panel; NaN until a symbol has ``lookback`` returns
+    """
+    return -prices.pct_change(fill_method=None).rolling(lookback).std()
+
+
+def cross_sectional_rank(scores: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rank each date's scores onto [0, 1].
+
+    The lowest score maps to 0 and the highest to 1, and ties share their
+    average rank. A date with a single score maps it to 0.5.
+
+    Args:
+        scores: Score panel (dates x symbols)
+
+    Returns:
+        Rank panel; NaN where the score is missing
+    """
+    ranks = scores.rank(axis=1).to_numpy()
+    counts = scores.notna().sum(axis=1).to_numpy()[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = np.where(counts > 1, (ranks - 1) / (counts - 1), 0.5)
+    return pd.DataFrame(np.where(np.isnan(ranks), np.nan, pct), index=scores.index, columns=scores.columns)
+
+
+def cross_sectional_zscore(scores: pd.DataFrame) -> pd.DataFrame:
+    """
+    Standardize each date's scores to zero mean and unit (sample) standard deviation.
+
+    Args:
+        scores: Score panel (dates x symbols)
+
+    Returns:
+        Z-score panel; NaN where the score is missing or the date has no dispersion
+    """
+    values = scores.to_numpy(dtype=float)
+    valid = np.isfinite(values)
+    counts = valid.sum(axis=1)[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.where(valid, values, 0.0).sum(axis=1)[:, None] / counts
+        deviation = np.where(valid, values - mean, 0.0)
+        std = np.sqrt((deviation**2).sum(axis=1)[:, None] / (counts - 1))
+        zscores = np.where(valid & (std > 0), deviation / std, np.nan)
+    return pd.DataFrame(zscores, index=scores.index, columns=scores.columns)
+
+
+def winsorize(scores: pd.DataFrame, lower: float = 0.01, upper: float = 0.99) -> pd.DataFrame:
+    """
+    Clip each date's scores to its ``lower`` and ``upper`` quantiles.
+
+    Args:
+        scores: Score panel (dates x symbols)
+        lower: Lower quantile in [0, 1]
+        upper: Upper quantile in [0, 1], at least ``lower``
+
+    Returns:
+        Winsorized panel
+
+    Raises:
+        ValueError: If the quantiles are out of range or reversed
+    """
+    if not 0 <= lower <= upper <= 1:
+        raise ValueError(f"Invalid quantiles: ({lower}, {upper}). Must satisfy 0 <= lower <= upper <= 1")
+
+    values = scores.to_numpy(dtype=float)
+    values = np.where(np.isfinite(values), values, np.nan)
+    has_values = ~np.isnan(values).all(axis=1)
+    bounds = np.full((2, len(values)), np.nan)
+    if has_values.any():
+        bounds[:, has_values] = np.nanquantile(values[has_values], [lower, upper], axis=1)
+    clipped = np.clip(values, bounds[0][:, None], bounds[1][:, None])
+    return pd.DataFrame(clipped, index=scores.index, columns=scores.columns)
+
+
+def neutralize(scores: pd.DataFrame, groups: Mapping[str, Hashable]) -> pd.DataFrame:
+    """
+    Remove each group's mean score on every date (e.g. sector neutralization).
+
+    Group means come from one matrix product with a symbol-by-group
+    indicator matrix. Symbols without a group are left unchanged.
+
+    Args:
+        scores: Score panel (dates x symbols)
+        groups: Mapping of symbol to group label
+
+    Returns:
+        Panel with zero mean within every group on every date
+    """
+    codes, _ = pd.factorize(pd.Series([groups.get(symbol) for symbol in scores.columns], dtype=object))
+    membership = np.zeros((len(codes), max(codes.max(initial=-1) + 1, 0)))
+    grouped = codes >= 0
+    membership[np.flatnonzero(grouped), codes[grouped]] = 1.0
+
+    values = scores.to_numpy(dtype=float)
+    valid = np.isfinite(values)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = (np.where(valid, values, 0.0) @ membership) / (valid @ membership)
+    neutral = values - np.nan_to_num(means) @ membership.T
+    return pd.DataFrame(neutral, index=scores.index, columns=scores.columns)
+
+
+class FactorEngine:
+    """
+    Combine cross-sectional factors into composite scores and portfolios.
+
+    Example:
+        >>> engine = FactorEngine(
+        ...     factors={'momentum': momentum, 'low_vol': low_volatility, 'value': book_to_price},
+        ...     weights={'momentum': 0.5, 'low_vol': 0.25, 'value': 0.25},
+        ...     groups=sectors,
+        ... )
+        >>> weights = engine.target_weights(closes, rebalance='ME', long_quantile=0.1, short_quantile=0.1)
+        >>> positions = engine.target_positions(closes, capital=1_000_000, rebalance='ME')
+        >>> result = VectorizedBacktester(initial_capital=1_000_000).run(closes, positions=positions)
+    """
+
+    def __init__(
+        self,
+        factors: Mapping[str, Factor],
+        weights: Optional[Mapping[str, float]] = None,
+        standardize: str = "zscore",
+        winsorize_limits: Optional[Tuple[float, float]] = (0.01, 0.99),
+        groups: Optional[Mapping[str, Hashable]] = None,
+    ):
+        """
+        Initialize factor engine.
+
+        Args:
+            factors: Mapping of factor name to a function of the wide price
+                     panel returning a score panel, or to a precomputed score
+                     panel (carried forward to the price dates). Higher
+                     scores are more attractive.
+            weights: Weight per factor in the composite (default: equal)
+            standardize: "zscore" or "rank" (ranks centered on [-0.5, 0.5])
+            winsorize_limits: Quantiles each factor is clipped to before
+                              standardizing (None to skip)
+            groups: Optional mapping of symbol to sector or other label;
+                    factors are demeaned within each group
+
+        Raises:
+            ValueError: If no factors are given, weights name unknown
+                        factors, or standardize is not supported
+        """
+        if not factors:
+            raise ValueError("Invalid factors: empty. Must provide at least one factor")
+        if standardize not in STANDARDIZE_METHODS:
+            raise ValueError(f"Invalid standardize: {standardize}. Must be one of {STANDARDIZE_METHODS}")
+        weights = dict(weights) if weights is not None else {name: 1.0 for name in factors}
+        unknown = set(weights) - set(factors)
+        if unknown:
+            raise ValueError(f"Invalid weights: unknown factors {sorted(unknown)}")
+        if winsorize_limits is not None:
+            winsorize(pd.DataFrame(), *winsorize_limits)  # validate the quantiles up front
+
+        self.factors = dict(factors)
+        self.weights = weights
+        self.standardize = standardize
+        self.winsorize_limits = winsorize_limits
+        self.groups = groups
+
+    def raw_scores(self, prices: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """
+        Compute every factor over the whole price panel.
+
+        Args:
+            prices: Wide panel of prices (dates x symbols)
+
+        Returns:
+            Mapping of factor name to its score panel aligned with ``prices``
+        """
+        scores = {}
+        for name, factor in self.factors.items():
+            panel = factor if isinstance(factor, pd.DataFrame) else factor(prices)
+            # Precomputed panels (e.g. quarterly fundamentals) are carried forward, never backward
+            scores[name] = panel.sort_index().reindex(index=prices.index, columns=prices.columns, method="ffill")
+        return scores
+
+    def factor_scores(
+        self, prices: pd.DataFrame, dates: Optional[Sequence[datetime]] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Winsorized, standardized and neutralized factor scores.
+
+        Args:
+            prices: Wide panel of prices (dates x symbols)
+            dates: Dates to score (default: every date in ``prices``)
+
+        Returns:
+            Mapping of factor name to its processed score panel (dates x symbols)
+        """
+        processed = {}
+        for name, scores in self.raw_scores(prices).items():
+            if dates is not None:
+                scores = scores.loc[dates]
+            if self.winsorize_limits is not None:
+                scores = winsorize(scores, *self.winsorize_limits)
+            if self.standardize == "rank":
+                scores = cross_sectional_rank(scores) - 0.5
+            else:
+                scores = cross_sectional_zscore(scores)
+            if self.groups is not None:
+                scores = neutralize(scores, self.groups)
+            processed[name] = scores
+        return processed
+
+    def composite(self, prices: pd.DataFrame, dates: Optional[Sequence[datetime]] = None) -> pd.DataFrame:
+        """
+        Weighted composite of the processed factor scores.
+
+        A symbol missing some factors is scored on the ones it has, with
+        their weights renormalized.
+
+        Args:
+            prices: Wide panel of prices (dates x symbols)
+            dates: Dates to score (default: every date in ``prices``)
+
+        Returns:
+            Composite score panel (dates x symbols); NaN where no factor is available
+        """
+        total = weight_sum = None
+        for name, scores in self.factor_scores(prices, dates).items():
+            weight = self.weights.get(name, 0.0)
+            if weight == 0:
+                continue
+            values = scores.to_numpy(dtype=float)
+            valid = np.isfinite(values)
+            contribution = np.where(valid, weight * values, 0.0)
+            total = contribution if total is None else total + contribution
+            weight_sum = valid * abs(weight) if weight_sum is None else weight_sum + valid * abs(weight)
+
+        index = prices.index if dates is None else pd.Index(dates)
+        if total is None:
+            return pd.DataFrame(np.nan, index=index, columns=prices.columns)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            combined = np.where(weight_sum > 0, total / weight_sum, np.nan)
+        return pd.DataFrame(combined, index=index, columns=prices.columns)
+
+    def target_weights(
+        self,
+        prices: pd.DataFrame,
+        rebalance: Union[int, str] = 21,
+        long_quantile: float = 0.2,
+        short_quantile: float = 0.0,
+        gross_exposure: float = 1.0,
+    ) -> pd.DataFrame:
+        """
+        Equal-weighted quantile portfolios on each rebalance date.
+
+        Args:
+            prices: Wide panel of prices (dates x symbols)
+            rebalance: Bars between rebalances, or a pandas frequency such
+                       as "ME" (rebalancing on the last bar of each period)
+            long_quantile: Fraction of scored symbols held long
+            short_quantile: Fraction of scored symbols held short (0 = long-only)
+            gross_exposure: Sum of absolute weights, split evenly between the
+                            legs of a long-short portfolio
+
+        Returns:
+            Weight panel indexed by rebalance date; weights hold until the next one
+
+        Raises:
+            ValueError: If a quantile is out of range or rebalance is not positive
+        """
+        for label, quantile in (("long_quantile", long_quantile), ("short_quantile", short_quantile)):
+            if not 0 <= quantile <= 1:
+                raise ValueError(f"Invalid {label}: {quantile}. Must be between 0 and 1")
+
+        dates = rebalance_dates(prices.index, rebalance)
+        pct = cross_sectional_rank(self.composite(prices, dates)).to_numpy()
+        with np.errstate(invalid="ignore"):
+            longs = (pct >= 1 - long_quantile) & (long_quantile > 0)
+            shorts = (pct <= short_quantile) & (short_quantile > 0) & ~longs
+
+        leg_exposure = gross_exposure / 2 if short_quantile > 0 else gross_exposure
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weights = np.nan_to_num(longs / longs.sum(axis=1, keepdims=True)) - np.nan_to_num(
+                shorts / shorts.sum(axis=1, keepdims=True)
+            )
+        return pd.DataFrame(weights * leg_exposure, index=pd.Index(dates), columns=prices.columns)
+
+    def target_positions(self, prices: pd.DataFrame, capital: float, **kwargs) -> pd.DataFrame:
+        """
+        Whole-share target holdings for VectorizedBacktester.run(positions=...).
+
+        Args:
+            prices: Wide panel of prices (dates x symbols)
+            capital: Capital the weights are applied to
+            **kwargs: Passed to target_weights
+
+        Returns:
+            Share panel indexed by rebalance date
+        """
+        weights = self.target_weights(prices, **kwargs)
+        marks = prices.ffill().reindex(weights.index)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            shares = np.fix(weights * capital / marks)
+        return shares.fillna(0.0)
+
+    def signals(
+        self,
+        scores: pd.Series,
+        prices: pd.Series,
+        long_quantile: float = 0.2,
+        short_quantile: float = 0.0,
+        sharpe_estimate: float = 1.0,
+        strategy_name: str = "",
+    ) -> List[TradingSignal]:
+        """
+        Turn one date's composite scores into TradingSignal objects.
+
+        Symbols in the top ``long_quantile`` get buy signals and those in the
+        bottom ``short_quantile`` get sell signals. Confidence is the
+        symbol's cross-sectional rank (distance from the bottom for sells),
+        so stronger scores earn more capital in MultiStrategyEngine.
+
+        Args:
+            scores: Composite scores by symbol
+            prices: Latest prices by symbol (used as entry prices)
+            long_quantile: Fraction of scored symbols to buy
+            short_quantile: Fraction of scored symbols to sell
+            sharpe_estimate: Sharpe estimate attached to every signal
+            strategy_name: Name recorded on the signals
+
+        Returns:
+            Buy signals followed by sell signals, strongest first
+        """
+        prices = prices.reindex(scores.index)
+        tradable = scores.where(np.isfinite(prices) & (prices > 0))
+        pct = cross_sectional_rank(tradable.to_frame().T).iloc[0]
+
+        signals = []
+        for side, selected, confidence in (
+            ("buy", pct >= 1 - long_quantile if long_quantile > 0 else None, pct),
+            ("sell", pct <= short_quantile if short_quantile > 0 else None, 1 - pct),
+        ):
+            if selected is None:
+                continue
+            chosen = confidence[selected].sort_values(ascending=False, kind="stable")
+            signals.extend(
+                TradingSignal(
+                    symbol=str(symbol),
+                    side=side,
+                    confidence=float(value),
+                    sharpe_estimate=sharpe_estimate,
+                    entry_price=float(prices[symbol]),
+                    strategy_name=strategy_name,
+                )
+                for symbol, value in chosen.items()
+            )
+        return signals
+
+
+def rebalance_dates(index: pd.Index, rebalance: Union[int, str]) -> pd.Index:
+    """
+    Select rebalance dates from a date index.
+
+    Args:
+        index: Sorted dates of the price panel
+        rebalance: Bars between rebalances (starting with the first bar), or
+                   a pandas frequency such as "ME" or "W-FRI" (the last bar
+                   of each period)
+
+    Returns:
+        Rebalance dates, a subset of ``index``
+
+    Raises:
+        ValueError: If rebalance is an integer below 1
+    """
+    if isinstance(rebalance, str):
+        positions = pd.Series(np.arange(len(index)), index=index).resample(rebalance).last().dropna()
+        return index[positions.to_numpy(dtype=int)]
+    if rebalance < 1:
+        raise ValueError(f"Invalid rebalance: {rebalance}. Must be at least 1")
+    return index[::rebalance]
+
+
+class FactorStrategy(SignalBasedStrategy):
+    """
+    Signal-based strategy that trades a FactorEngine's ranking.
+
+    Every ``rebalance_frequency`` bars the strategy scores the universe on
+    the latest bar and emits buy signals for the top names (and sell
+    signals for the bottom names when ``short_quantile`` > 0). Holdings are
+    tracked from fills: names already held on the selected side are not
+    traded again, and held names that drop out of the selection are closed
+    with signals sized to the held quantity, so the book follows the
+    ranking. Prices come from the engine's shared feature store, so no
+    long-format data is pivoted per rebalance.
+
+    Example:
+        >>> strategy = FactorStrategy(
+        ...     FactorEngine({'momentum': momentum, 'low_vol': low_volatility}),
+        ...     rebalance_frequency=21,
+        ...     history=253,
+        ...     long_quantile=0.1,
+        ... )
+        >>> engine = MultiStrategyEngine(initial_capital=1_000_000, data_provider=provider)
+        >>> engine.add_strategy(strategy)
+    """
+
+    def __init__(
+        self,
+        engine: FactorEngine,
+        rebalance_frequency: int = 21,
+        history: Optional[int] = None,
+        long_quantile: float = 0.2,
+        short_quantile: float = 0.0,
+        sharpe_estimate: float = 1.0,
+    ):
+        """
+        Initialize factor strategy.
+
+        Args:
+            engine: Factor engine producing the composite scores
+            rebalance_frequency: Bars between rebalances
+            history: Bars of prices passed to the factors (None for all;
+                     should cover the longest factor lookback)
+            long_quantile: Fraction of scored symbols to buy
+            short_quantile: Fraction of scored symbols to sell
+            sharpe_estimate: Sharpe estimate attached to every signal
+
+        Raises:
+            ValueError: If rebalance_frequency or history is not positive
+        """
+        if rebalance_frequency < 1:
+            raise ValueError(f"Invalid rebalance_frequency: {rebalance_frequency}. Must be at least 1")
+        if history is not None and history < 1:
+            raise ValueError(f"Invalid history: {history}. Must be positive")
+
+        super().__init__()
+        self.engine = engine
+        self.rebalance_frequency = rebalance_frequency
+        self.history = history
+        self.long_quantile = long_quantile
+        self.short_quantile = short_quantile
+        self.sharpe_estimate = sharpe_estimate
+        self.last_scores: Optional[pd.Series] = None
+        self.holdings: Dict[str, float] = {}
+
+    def initialize(self) -> None:
+        """Start each run without holdings."""
+        self.holdings = {}
+
+    def on_fill(self, fill) -> None:
+        """
+        Track the net quantity held per symbol.
+
+        Args:
+            fill: Fill of one of this strategy's orders
+        """
+        symbol = fill.order.symbol
+        quantity = fill.fill_quantity if fill.order.side == "buy" else -fill.fill_quantity
+        held = self.holdings.get(symbol, 0.0) + quantity
+        if held == 0:
+            self.holdings.pop(symbol, None)
+        else:
+            self.holdings[symbol] = held
+
+    def generate_signals(self, timestamp: datetime, data: pd.DataFrame) -> List[TradingSignal]:
+        """
+        Score the universe on rebalance bars and emit signals.
+
+        Args:
+            timestamp: Current timestamp
+            data: Historical price data (used only without a feature store)
+
+        Returns:
+            Exit signals for held names no longer selected, followed by
+            entry signals for selected names not yet held; empty between
+            rebalances
+        """
+        if (self._bars(data) - 1) % self.rebalance_frequency != 0:
+            return []
+        prices = self._price_panel(data)
+        if prices.empty:
+            return []
+
+        scores = self.engine.composite(prices, dates=prices.index[-1:]).iloc[-1]
+        self.last_scores = scores
+        latest = prices.ffill().iloc[-1]
+        entries = self.engine.signals(
+            scores,
+            latest,
+            long_quantile=self.long_quantile,
+            short_quantile=self.short_quantile,
+            sharpe_estimate=self.sharpe_estimate,
+            strategy_name=self.name,
+        )
+        selected = {(signal.symbol, signal.side) for signal in entries}
+
+        exits = []
+        for symbol, held in self.holdings.items():
+            side = "buy" if held > 0 else "sell"
+            price = latest.get(symbol, np.nan)
+            if (symbol, side) in selected or not np.isfinite(price) or price <= 0:
+                continue
+            # Full confidence ranks exits ahead of entries, freeing their capital first
+            exits.append(
+                TradingSignal(
+                    symbol=symbol,
+                    side="sell" if held > 0 else "buy",
+                    confidence=1.0,
+                    sharpe_estimate=self.sharpe_estimate,
+                    entry_price=float(price),
+                    strategy_name=self.name,
+                    quantity=abs(held),
+                )
+            )
+
+        held_sides = {(symbol, "buy" if held > 0 else "sell") for symbol, held in self.holdings.items()}
+        return exits + [signal for signal in entries if (signal.symbol, signal.side) not in held_sides]
+
+    def _bars(self, data: pd.DataFrame) -> int:
+        """Number of bars seen so far."""
+        if self.features is not None and len(self.features) > 0:
+            return len(self.features)
+        return data.index.nunique()
+
+    def _price_panel(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Wide close prices, from the feature store when the engine provides one."""
+        if self.features is not None and len(self.features) > 0:
+            return self.features.price_frame(lookback=self.history)
+
+        if isinstance(data.columns, pd.MultiIndex):
+            prices = data["Close"]
+        elif "Symbol" in data.columns:
+            prices = data.pivot_table(index=data.index, columns="Symbol", values="Close")
+        else:
+            prices = data
+        return prices.tail(self.history) if self.history is not None else prices
@@ -0,0 +1,159 @@
+"""
+Incremental hedge ratio and spread statistics for one pair.
+
+PairTracker replaces the per-bar rolling OLS and z-score of a pair with
+recursive updates. The hedge ratio and intercept follow recursive least
+squares with exponential forgetting, and the spread's mean and variance
+are exponentially weighted. Each bar costs O(1) whatever the lookback,
+and the state depends only on the sequence of prices fed to it. The same
+bars therefore produce the same signals in a backtest and in a live
+session.
+"""
+
+from datetime import datetime
+from typing import Optional, Sequence
+
+import numpy as np
+
+# Minimum bars needed to warm start a tracker
+MIN_WARMUP_BARS = 3
+
+
+class PairTracker:
+    """
+    Recursive least squares hedge ratio and spread z-score for one pair.
+
+    The model is ``price1 = hedge_ratio * price2 + intercept + spread``.
+    Observations are weighted by ``forgetting ** age``, so the effective
+    memory is about ``1 / (1 - forgetting)`` bars. The default
+    ``1 - 1 / lookback`` makes that the strategy's lookback. Each new bar's
+    spread is the a priori residual, i.e. its error against the hedge
+    ratio and intercept estimated before the bar. Its z-score is measured
+    against the exponentially weighted mean and variance of past
+    residuals, and then the bar is folded into the state.
+
+    Example:
+        >>> tracker = PairTracker(lookback=60)
+        >>> tracker.warm_start(prices_a[-60:], prices_b[-60:], timestamp=dates[-1])
+        >>> tracker.update(101.2, 50.3, timestamp=next_date)
+        >>> tracker.hedge_ratio, tracker.zscore
+    """
+
+    def __init__(self, lookback: int, forgetting: Optional[float] = None):
+        """
+        Initialize tracker.
+
+        Args:
+            lookback: Effective memory in bars; sets the default forgetting factor
+            forgetting: Weight decay per bar in (0, 1] (default: 1 - 1 / lookback)
+
+        Raises:
+            ValueError: If lookback is too short or forgetting is out of range
+        """
+        if lookback < MIN_WARMUP_BARS:
+            raise ValueError(f"Invalid lookback: {lookback}. Must be at least {MIN_WARMUP_BARS}")
+        forgetting = 1.0 - 1.0 / lookback if forgetting is None else forgetting
+        if not 0 < forgetting <= 1:
+            raise ValueError(f"Invalid forgetting: {forgetting}. Must be in (0, 1]")
+
+        self.lookback = lookback
+        self.forgetting = forgetting
+
+        self.hedge_ratio = np.nan
+        self.intercept = np.nan
+        self.spread = np.nan
+        self.zscore = np.nan
+        self.spread_mean = 0.0
+        self.spread_var = 0.0
+        self.last_timestamp: Optional[datetime] = None
+        self.bars = 0
+        # Inverse of the weighted (price2, 1) cross-product matrix
+        self._cov = np.zeros((2, 2))
+
+    @property
+    def ready(self) -> bool:
+        """Whether the tracker has been warm started."""
+        return self.bars > 0
+
+    def warm_start(
+        self, prices1: Sequence[float], prices2: Sequence[float], timestamp: Optional[datetime] = None
+    ) -> None:
+        """
+        Initialize the state from a window of history.
+
+        Fits OLS over the window and takes the spread mean and variance
+        from its residuals. The z-score of the last bar is measured against
+        them, as a rolling z-score over the window would be.
+
+        Args:
+            prices1: Dependent prices, oldest first
+            prices2: Independent prices, oldest first
+            timestamp: Timestamp of the last bar in the window
+
+        Raises:
+            ValueError: If the window has fewer than MIN_WARMUP_BARS bars or
+                        prices2 is constant
+        """
+        y = np.asarray(prices1, dtype=float)
+        x = np.asarray(prices2, dtype=float)
+        if len(y) < MIN_WARMUP_BARS or len(x) != len(y):
+            raise ValueError(f"Invalid warm-up window: {len(y)} bars. Must have at least {MIN_WARMUP_BARS}")
+
+        design = np.column_stack([x, np.ones_like(x)])
+        xtx = design.T @ design
+        if not np.linalg.cond(xtx) < 1 / np.finfo(float).eps:
+            raise ValueError("Invalid warm-up window: constant prices2")
+
+        self._cov = np.linalg.inv(xtx)
+        self.hedge_ratio, self.intercept = self._cov @ (design.T @ y)
+        resid = y - self.hedge_ratio * x - self.intercept
+        self.spread_mean = float(resid.mean())
+        self.spread_var = float(resid.var(ddof=1))
+        self.spread = float(resid[-1])
+        self.zscore = self._zscore(self.spread)
+        self.last_timestamp = timestamp
+        self.bars = len(y)
+
+    def update(self, price1: float, price2: float, timestamp: Optional[datetime] = None) -> float:
+        """
+        Fold one bar into the state.
+
+        Args:
+            price1: Dependent price
+            price2: Independent price
+            timestamp: Bar timestamp
+
+        Returns:
+            Z-score of the bar's spread
+        """
+        lam = self.forgetting
+        phi = np.array([price2, 1.0])
+
+        # Score the bar against the state before it
+        spread = price1 - self.hedge_ratio * price2 - self.intercept
+        self.spread = spread
+        self.zscore = self._zscore(spread)
+
+        # Recursive least squares with forgetting
+        p_phi = self._cov @ phi
+        gain = p_phi / (lam + phi @ p_phi)
+        self.hedge_ratio += gain[0] * spread
+        self.intercept += gain[1] * spread
+        cov = (self._cov - np.outer(gain, p_phi)) / lam
+        self._cov = (cov + cov.T) / 2
+
+        # Exponentially weighted spread mean and variance
+        weight = 1.0 - lam
+        deviation = spread - self.spread_mean
+        self.spread_mean += weight * deviation
+        self.spread_var = lam * (self.spread_var + weight * deviation * deviation)
+
+        self.last_timestamp = timestamp
+        self.bars += 1
+        return self.zscore
+
+    def _zscore(self, spread: float) -> float:
+        """Z-score of a spread against the current mean and variance."""
+        if not self.spread_var > 0:
+            return np.nan
+        return (spread - self.spread_mean) / np.sqrt(self.spread_var)
@@ -6,13 +6,15 @@ cointegrated pairs, calculates spreads, and executes mean-reversion trades
 based on Z-score signals.
 """
 
+import copy
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
 from copilot_quant.backtest import Order, Strategy
+from copilot_quant.strategies.pair_tracker import PairTracker
 from copilot_quant.strategies.pairs_utils import (
     calculate_hedge_ratio,
     calculate_spread,
@@ -20,6 +22,9 @@ from copilot_quant.strategies.pairs_utils import (
     find_cointegrated_pairs,
 )
 
+# Hedge ratio estimators supported by PairsTradingStrategy
+HEDGE_METHODS = ("rls", "rolling")
+
 
 class PairsTradingStrategy(Strategy):
     """
@@ -31,7 +36,7 @@ class PairsTradingStrategy(Strategy):
 
     The strategy:
     1. Identifies cointegrated pairs from the asset universe
-    2. Calculates hedge ratios using regression
+    2. Tracks hedge ratios with recursive least squares (or rolling OLS)
     3. Computes spreads between paired assets
     4. Generates entry signals when spread Z-score exceeds thresholds
     5. Generates exit signals when spread reverts to mean
@@ -42,6 +47,8 @@ class PairsTradingStrategy(Strategy):
         exit_zscore: Z-score threshold for exiting positions (default: 0.5)
         quantity: Base quantity to trade per asset
         max_pairs: Maximum number of pairs to trade simultaneously
+        hedge_method: "rls" for incremental PairTracker state, "rolling" for
+                      a rolling OLS hedge ratio and z-score over the lookback
 
     Example:
         >>> strategy = PairsTradingStrategy(
@@ -68,6 +75,7 @@ class PairsTradingStrategy(Strategy):
         min_correlation: float = 0.6,
         cointegration_pvalue: float = 0.05,
         rebalance_frequency: int = 20,
+        hedge_method: str = "rls",
     ):
         """
         Initialize pairs trading strategy.
@@ -81,7 +89,15 @@ class PairsTradingStrategy(Strategy):
             min_correlation: Minimum correlation for pair consideration
             cointegration_pvalue: P-value threshold for cointegration test
             rebalance_frequency: Days between pair re-evaluation
+            hedge_method: "rls" (recursive least squares with a forgetting
+                          factor of 1 - 1/lookback) or "rolling" (rolling OLS)
+
+        Raises:
+            ValueError: If hedge_method is not "rls" or "rolling"
         """
+        if hedge_method not in HEDGE_METHODS:
+            raise ValueError(f"Invalid hedge_method: {hedge_method}. Must be one of {HEDGE_METHODS}")
+
         super().__init__()
         self.lookback = lookback
         self.entry_zscore = entry_zscore
@@ -91,12 +107,14 @@ class PairsTradingStrategy(Strategy):
         self.min_correlation = min_correlation
         self.cointegration_pvalue = cointegration_pvalue
         self.rebalance_frequency = rebalance_frequency
+        self.hedge_method = hedge_method
 
         # Strategy state
         self.active_pairs: Dict[Tuple[str, str], Dict] = {}
         self.pair_positions: Dict[Tuple[str, str], int] = {}  # 1=long spread, -1=short spread, 0=flat
         self.last_rebalance_day: int = 0
         self.trading_pairs: List[Tuple[str, str]] = []
+        self.trackers: Dict[Tuple[str, str], PairTracker] = {}
 
     def initialize(self):
         """Called before backtest starts."""
@@ -146,17 +164,17 @@ class PairsTradingStrategy(Strategy):
         Args:
             data: Historical price data
         """
-        # Get unique symbols from data
-        if "Symbol" in data.columns:
+        # Take only recent history for pair identification
+        if self.features is not None and len(self.features) > 0:
+            # The engine's feature store already holds the wide price panel
+            recent_prices = self.features.price_frame(lookback=self.lookback * 2)
+        elif "Symbol" in data.columns:
             # Data in long format
             # Pivot to get prices by symbol
-            prices_df = data.pivot_table(index=data.index, columns="Symbol", values="Close")
+            recent_prices = data.pivot_table(index=data.index, columns="Symbol", values="Close").tail(self.lookback * 2)
         else:
             # Data already in wide format
-            prices_df = data
-
-        # Take only recent history for pair identification
-        recent_prices = prices_df.tail(self.lookback * 2)
+            recent_prices = data.tail(self.lookback * 2)
 
         # Find cointegrated pairs
         pairs = find_cointegrated_pairs(
@@ -165,6 +183,7 @@ class PairsTradingStrategy(Strategy):
 
         # Select top pairs (up to max_pairs)
         self.trading_pairs = [(sym1, sym2) for sym1, sym2, pval, corr in pairs[: self.max_pairs]]
+        self.trackers = {pair: tracker for pair, tracker in self.trackers.items() if pair in self.trading_pairs}
 
         if self.trading_pairs:
             print(f"\n[Rebalance] Identified {len(self.trading_pairs)} cointegrated pairs:")
@@ -188,36 +207,16 @@ class PairsTradingStrategy(Strategy):
         """
         sym1, sym2 = pair
 
-        # Extract price series
-        if "Symbol" in data.columns:
-            # Long format
-            prices1 = data[data["Symbol"] == sym1]["Close"]
-            prices2 = data[data["Symbol"] == sym2]["Close"]
+        features = self.features
+        if self.hedge_method == "rls":
+            hedge_ratio, current_zscore = self._tracked_zscore(pair, data)
+        elif features is not None and sym1 in features and sym2 in features:
+            hedge_ratio, current_zscore = self._feature_zscore(sym1, sym2)
         else:
-            # Wide format
-            prices1 = data[sym1] if sym1 in data.columns else None
-            prices2 = data[sym2] if sym2 in data.columns else None
-
-        if prices1 is None or prices2 is None:
-            return []
-
-        # Get recent data for spread calculation
-        recent_prices1 = prices1.tail(self.lookback)
-        recent_prices2 = prices2.tail(self.lookback)
-
-        if len(recent_prices1) < self.lookback or len(recent_prices2) < self.lookback:
-            return []
-
-        # Calculate hedge ratio and spread
-        hedge_ratio = calculate_hedge_ratio(recent_prices1, recent_prices2)
-        spread = calculate_spread(recent_prices1, recent_prices2, hedge_ratio)
-
-        # Calculate Z-score
-        zscore = calculate_zscore(spread, window=self.lookback)
-        current_zscore = zscore.iloc[-1]
+            hedge_ratio, current_zscore = self._frame_zscore(sym1, sym2, data)
 
         # Check if we have valid Z-score
-        if np.isnan(current_zscore) or np.isinf(current_zscore):
+        if hedge_ratio is None or np.isnan(current_zscore) or np.isinf(current_zscore):
             return []
 
         # Get current position for this pair
@@ -270,6 +269,170 @@ class PairsTradingStrategy(Strategy):
 
         return orders
 
+    def _tracked_zscore(self, pair: Tuple[str, str], data: pd.DataFrame) -> Tuple[Optional[float], float]:
+        """
+        Advance the pair's tracker to the latest bar and read its state.
+
+        The stored tracker only folds in completed bars, i.e. every bar but
+        the newest. It is warm started on the first ``lookback`` bars where
+        both prices are present, and then every completed bar newer than
+        its last timestamp is folded in. The newest bar, which a live
+        session revises on every tick, is scored on a copy. The state
+        therefore depends only on the price history and not on when or how
+        often this is called; a live session and a backtest over the same
+        bars agree.
+
+        Args:
+            pair: Tuple of (symbol1, symbol2)
+            data: Historical price data
+
+        Returns:
+            Tuple of (hedge_ratio, zscore); hedge_ratio is None until the
+            tracker can be warm started
+        """
+        series = self._pair_prices(*pair, data)
+        if series is None:
+            return None, np.nan
+        timestamps, prices1, prices2 = series
+        newest = len(timestamps) - 1
+
+        tracker = self.trackers.get(pair)
+        if tracker is None:
+            rows = np.flatnonzero(np.isfinite(prices1) & np.isfinite(prices2))[: self.lookback]
+            if len(rows) < self.lookback:
+                return None, np.nan
+            provisional = rows[-1] == newest
+            tracker = PairTracker(self.lookback)
+            try:
+                tracker.warm_start(prices1[rows], prices2[rows], timestamp=timestamps[rows[-1]])
+            except ValueError:
+                return None, np.nan
+            if provisional:
+                # The newest bar is still forming; warm start again once it completes
+                return tracker.hedge_ratio, tracker.zscore
+            self.trackers[pair] = tracker
+
+        # Walk back to the first completed bar the tracker has not seen
+        start = newest
+        while start > 0 and timestamps[start - 1] > tracker.last_timestamp:
+            start -= 1
+        for row in range(start, newest):
+            if np.isfinite(prices1[row]) and np.isfinite(prices2[row]):
+                tracker.update(prices1[row], prices2[row], timestamp=timestamps[row])
+
+        priced = np.isfinite(prices1[newest]) and np.isfinite(prices2[newest])
+        if not priced or not timestamps[newest] > tracker.last_timestamp:
+            return tracker.hedge_ratio, tracker.zscore
+        current = copy.deepcopy(tracker)
+        current.update(prices1[newest], prices2[newest], timestamp=timestamps[newest])
+        return current.hedge_ratio, current.zscore
+
+    def _pair_prices(
+        self, sym1: str, sym2: str, data: pd.DataFrame
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Aligned, forward-filled prices of a pair.
+
+        Reads the shared feature store when it holds both symbols and
+        otherwise aligns the two series from the data frame the same way.
+
+        Args:
+            sym1: First symbol
+            sym2: Second symbol
+            data: Historical price data
+
+        Returns:
+            Tuple of (timestamps, prices1, prices2), or None when either
+            symbol is missing
+        """
+        features = self.features
+        if features is not None and sym1 in features and sym2 in features:
+            return features.timestamps, features.prices(sym1), features.prices(sym2)
+
+        if "Symbol" in data.columns:
+            closes = {symbol: data.loc[data["Symbol"] == symbol, "Close"] for symbol in (sym1, sym2)}
+        elif sym1 in data.columns and sym2 in data.columns:
+            closes = {sym1: data[sym1], sym2: data[sym2]}
+        else:
+            return None
+        if any(prices.empty for prices in closes.values()):
+            return None
+
+        prices = pd.concat(closes, axis=1).sort_index().ffill()
+        return prices.index.to_numpy(), prices[sym1].to_numpy(dtype=float), prices[sym2].to_numpy(dtype=float)
+
+    def _feature_zscore(self, sym1: str, sym2: str) -> Tuple[Optional[float], float]:
+        """
+        Compute hedge ratio and spread Z-score from the shared feature store.
+
+        The OLS hedge ratio and the spread's rolling mean and standard
+        deviation follow from the pair's rolling means, variances and
+        covariance, which the store updates incrementally each bar.
+
+        Args:
+            sym1: First symbol
+            sym2: Second symbol
+
+        Returns:
+            Tuple of (hedge_ratio, zscore); hedge_ratio is None while the
+            lookback window is incomplete or the spread has no variance
+        """
+        features, window = self.features, self.lookback
+        var2 = features.rolling_cov(sym2, sym2, window)[-1]
+        if not var2 > 0:
+            return None, np.nan
+
+        cov = features.rolling_cov(sym1, sym2, window)[-1]
+        hedge_ratio = cov / var2
+        mean = features.rolling_mean(sym1, window)[-1] - hedge_ratio * features.rolling_mean(sym2, window)[-1]
+        spread_var = features.rolling_cov(sym1, sym1, window)[-1] - hedge_ratio * cov
+        if not spread_var > 0:
+            return None, np.nan
+
+        spread = features.prices(sym1)[-1] - hedge_ratio * features.prices(sym2)[-1]
+        return hedge_ratio, (spread - mean) / np.sqrt(spread_var)
+
+    def _frame_zscore(self, sym1: str, sym2: str, data: pd.DataFrame) -> Tuple[Optional[float], float]:
+        """
+        Compute hedge ratio and spread Z-score from the data frame.
+
+        Args:
+            sym1: First symbol
+            sym2: Second symbol
+            data: Historical price data
+
+        Returns:
+            Tuple of (hedge_ratio, zscore); hedge_ratio is None when either
+            series is missing or shorter than the lookback
+        """
+        # Extract price series
+        if "Symbol" in data.columns:
+            # Long format
+            prices1 = data[data["Symbol"] == sym1]["Close"]
+            prices2 = data[data["Symbol"] == sym2]["Close"]
+        else:
+            # Wide format
+            prices1 = data[sym1] if sym1 in data.columns else None
+            prices2 = data[sym2] if sym2 in data.columns else None
+
+        if prices1 is None or prices2 is None:
+            return None, np.nan
+
+        # Get recent data for spread calculation
+        recent_prices1 = prices1.tail(self.lookback)
+        recent_prices2 = prices2.tail(self.lookback)
+
+        if len(recent_prices1) < self.lookback or len(recent_prices2) < self.lookback:
+            return None, np.nan
+
+        # Calculate hedge ratio and spread
+        hedge_ratio = calculate_hedge_ratio(recent_prices1, recent_prices2)
+        spread = calculate_spread(recent_prices1, recent_prices2, hedge_ratio)
+
+        # Calculate Z-score
+        zscore = calculate_zscore(spread, window=self.lookback)
+        return hedge_ratio, zscore.iloc[-1]
+
     def finalize(self):
         """Called after backtest ends."""
         print(f"\nFinalizing {self.name} strategy")
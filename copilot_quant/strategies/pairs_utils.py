@@ -6,7 +6,7 @@ pairs trading strategies, including cointegration tests, correlation
 analysis, and spread calculations.
 """
 
-from typing import List, Tuple
+from typing import Hashable, List, Mapping, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -180,18 +180,25 @@ def calculate_zscore(series: pd.Series, window: int = None, min_periods: int = N
 
 
 def find_cointegrated_pairs(
-    prices: pd.DataFrame, significance_level: float = 0.05, min_correlation: float = 0.5
+    prices: pd.DataFrame,
+    significance_level: float = 0.05,
+    min_correlation: float = 0.5,
+    groups: Optional[Mapping[str, Hashable]] = None,
+    max_workers: Optional[int] = 1,
 ) -> List[Tuple[str, str, float, float]]:
     """
     Find all cointegrated pairs from a dataframe of price series.
 
-    Tests all possible pairs and returns those that are both correlated
-    and cointegrated.
+    Tests all pairs that are sufficiently correlated and returns those that
+    are cointegrated. Correlations come from one vectorized matrix, so only
+    the surviving pairs are tested (see pair_discovery.discover_pairs).
 
     Args:
         prices: DataFrame where each column is a price series for a symbol
         significance_level: P-value threshold for cointegration test
         min_correlation: Minimum correlation to consider
+        groups: Optional mapping of symbol to sector; only pairs within a sector are tested
+        max_workers: Worker processes for the tests (default: run in-process)
 
     Returns:
         List of tuples: (symbol1, symbol2, p_value, correlation)
@@ -203,39 +210,16 @@ def find_cointegrated_pairs(
         >>> for sym1, sym2, pval, corr in pairs:
         ...     print(f"{sym1}-{sym2}: p={pval:.4f}, corr={corr:.3f}")
     """
-    symbols = prices.columns.tolist()
-    cointegrated_pairs = []
+    from copilot_quant.strategies.pair_discovery import discover_pairs
 
-    # Test all unique pairs
-    for i in range(len(symbols)):
-        for j in range(i + 1, len(symbols)):
-            sym1, sym2 = symbols[i], symbols[j]
-
-            # Get price series
-            s1 = prices[sym1].dropna()
-            s2 = prices[sym2].dropna()
-
-            # Need overlapping data
-            if len(s1) < 30 or len(s2) < 30:
-                continue
-
-            # Calculate correlation
-            corr = calculate_correlation(s1, s2)
-
-            # Only test pairs with sufficient correlation
-            if abs(corr) < min_correlation:
-                continue
-
-            # Test cointegration
-            is_coint, p_value, test_stat = check_cointegration(s1, s2)
-
-            if is_coint:
-                cointegrated_pairs.append((sym1, sym2, p_value, corr))
-
-    # Sort by p-value (most significant first)
-    cointegrated_pairs.sort(key=lambda x: x[2])
-
-    return cointegrated_pairs
+    scan = discover_pairs(
+        prices,
+        significance_level=significance_level,
+        min_correlation=min_correlation,
+        groups=groups,
+        max_workers=max_workers,
+    )
+    return scan.to_tuples()
 
 
 def calculate_half_life(spread: pd.Series) -> float:
@@ -293,3 +277,277 @@ def calculate_half_life(spread: pd.Series) -> float:
     except Exception:
         # Catch regression errors (e.g., singular matrix, numerical issues)
         return np.inf
+
+
+# MacKinnon (1994) response surface for the Engle-Granger test with a constant
+# and two I(1) series (the values statsmodels' coint uses)
+_EG_TAU_MAX = 0.92
+_EG_TAU_MIN = -18.86
+_EG_TAU_STAR = -2.62
+_EG_TAU_SMALL_P = (2.92, 1.5012, 0.039796)
+_EG_TAU_LARGE_P = (2.1945, 0.64695, -0.29198, -0.042377)
+
+# coint reports perfectly collinear pairs as cointegrated (statistic -inf)
+_COLLINEAR_RSQUARED = 1 - 100 * np.sqrt(np.finfo(float).eps)
+
+# Upper bound on the elements of the prefix-sum arrays built per batch
+_BATCH_ELEMENTS = 4_000_000
+
+
+def _mackinnon_pvalue(stat: np.ndarray) -> np.ndarray:
+    """Approximate asymptotic p-values of Engle-Granger statistics."""
+    polyval = np.polynomial.polynomial.polyval
+    with np.errstate(invalid="ignore"):
+        fitted = np.where(stat <= _EG_TAU_STAR, polyval(stat, _EG_TAU_SMALL_P), polyval(stat, _EG_TAU_LARGE_P))
+    pvalue = stats.norm.cdf(fitted)
+    return np.where(stat > _EG_TAU_MAX, 1.0, np.where(stat < _EG_TAU_MIN, 0.0, pvalue))
+
+
+def _adf_statistics(resid: np.ndarray) -> np.ndarray:
+    """
+    ADF t-statistics without constant for each row of ``resid``.
+
+    Mirrors ``adfuller(x, autolag='aic', regression='n')``: the lag order is
+    chosen by AIC over a common sample, then the regression is refit with
+    the chosen lag. Every cross product the regressions need is a window sum
+    of a lagged product, so each is read from prefix sums computed once per
+    batch and only the small normal equations are solved per lag.
+    """
+    num_rows, n = resid.shape
+    maxlag = min(n // 2 - 1, int(np.ceil(12.0 * np.power(n / 100.0, 1 / 4.0))))
+    diff = np.diff(resid, axis=1)
+
+    def prefix(values: np.ndarray) -> np.ndarray:
+        out = np.zeros((num_rows, values.shape[1] + 1))
+        np.cumsum(values, axis=1, out=out[:, 1:])
+        return out
+
+    # dd[h][:, i]: sum of diff[s] * diff[s + h] for s < i
+    dd = [prefix(diff[:, : n - 1 - h] * diff[:, h:]) for h in range(maxlag + 1)]
+    # ed[j][:, i]: sum of resid[s + j] * diff[s] for s < i
+    ed = [prefix(resid[:, j : n - 1] * diff[:, : n - 1 - j]) for j in range(maxlag + 1)]
+    ee = prefix(resid**2)
+
+    def gram(rows: np.ndarray, start: int, lags: int) -> np.ndarray:
+        """
+        Cross products over t = start..n-2 of [resid[t], diff[t-1], ..., diff[t-lags], diff[t]].
+
+        Column ``c`` for 1 <= c <= lags is diff lagged by c; the last column
+        (the dependent variable) is diff lagged by 0.
+        """
+        size = lags + 2
+        lag_of = list(range(lags + 1)) + [0]
+        out = np.empty((len(rows), size, size))
+        out[:, 0, 0] = ee[rows, n - 1] - ee[rows, start]
+        for a in range(1, size):
+            j = lag_of[a]
+            out[:, 0, a] = out[:, a, 0] = ed[j][rows, n - 1 - j] - ed[j][rows, start - j]
+            for b in range(a, size):
+                low, high = sorted((j, lag_of[b]))
+                h = high - low
+                out[:, a, b] = out[:, b, a] = dd[h][rows, n - 1 - high] - dd[h][rows, start - high]
+        return out
+
+    def fit(g: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Coefficients, residual sum of squares and XtX of the lag-k regression."""
+        xtx = g[:, : k + 1, : k + 1]
+        xty = g[:, : k + 1, -1]
+        beta = np.linalg.solve(xtx, xty[..., None])[..., 0]
+        ssr = g[:, -1, -1] - np.einsum("ij,ij->i", beta, xty)
+        return beta, ssr, xtx
+
+    all_rows = np.arange(num_rows)
+    stat = np.full(num_rows, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Lag selection over the common sample t = maxlag..n-2
+        full = gram(all_rows, maxlag, maxlag)
+        nobs = n - 1 - maxlag
+        aic = np.empty((num_rows, maxlag + 1))
+        for k in range(maxlag + 1):
+            _, ssr, _ = fit(full, k)
+            aic[:, k] = nobs * np.log(ssr / nobs) + 2 * (k + 1)
+        best = np.argmin(np.where(np.isnan(aic), np.inf, aic), axis=1)
+
+        # Refit each pair with its chosen lag on the longest sample it allows
+        for k in np.unique(best):
+            rows = all_rows[best == k]
+            beta, ssr, xtx = fit(gram(rows, k, k), k)
+            unit = np.zeros((len(rows), k + 1, 1))
+            unit[:, 0] = 1.0
+            inv00 = np.linalg.solve(xtx, unit)[:, 0, 0]
+            sigma2 = ssr / (n - 1 - k - (k + 1))
+            stat[rows] = beta[:, 0] / np.sqrt(sigma2 * inv00)
+    return stat
+
+
+def _half_lives(spreads: np.ndarray) -> np.ndarray:
+    """calculate_half_life for each row of a complete (rows x bars) spread matrix."""
+    n = spreads.shape[1]
+    if n < 4:
+        return np.full(len(spreads), np.inf)
+
+    lag = spreads[:, 1:-1]
+    change = spreads[:, 2:] - lag
+    lag_centered = lag - lag.mean(axis=1, keepdims=True)
+    change_centered = change - change.mean(axis=1, keepdims=True)
+    variance = np.einsum("ij,ij->i", lag_centered, lag_centered)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.einsum("ij,ij->i", lag_centered, change_centered) / variance
+        half_life = np.where(slope >= 0, np.inf, -np.log(2) / slope)
+    half_life = np.where((half_life <= 0) | (half_life > n), np.inf, half_life)
+    # A constant spread has no regression (calculate_half_life catches the error)
+    return np.where(variance > 0, half_life, np.inf)
+
+
+def _engle_granger(y: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """
+    Engle-Granger tests of ``y[p]`` on ``x[p]`` for complete (pairs x bars) rows.
+
+    Returns:
+        (pairs x 4) array of (p_value, test_statistic, hedge_ratio, half_life)
+    """
+    y_centered = y - y.mean(axis=1, keepdims=True)
+    x_centered = x - x.mean(axis=1, keepdims=True)
+    sxx = np.einsum("ij,ij->i", x_centered, x_centered)
+    syy = np.einsum("ij,ij->i", y_centered, y_centered)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        hedge = np.einsum("ij,ij->i", x_centered, y_centered) / sxx
+    resid = y_centered - hedge[:, None] * x_centered
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsquared = 1 - np.einsum("ij,ij->i", resid, resid) / syy
+    collinear = rsquared >= _COLLINEAR_RSQUARED
+
+    stat = np.full(len(y), -np.inf)
+    if (~collinear).any():
+        stat[~collinear] = _adf_statistics(resid[~collinear])
+
+    out = np.empty((len(y), 4))
+    out[:, 0] = _mackinnon_pvalue(stat)
+    out[:, 1] = stat
+    out[:, 2] = hedge
+    out[:, 3] = _half_lives(resid)
+    return out
+
+
+def _mask_patterns(valid: np.ndarray) -> np.ndarray:
+    """Integer id per column of a (bars x columns) mask; equal ids have equal masks."""
+    if valid.all():
+        return np.zeros(valid.shape[1], dtype=int)
+    _, ids = np.unique(np.packbits(valid, axis=0).T, axis=0, return_inverse=True)
+    return ids.ravel()
+
+
+def _engle_granger_pairs(values: np.ndarray, first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """
+    Engle-Granger tests of column ``first[k]`` on column ``second[k]`` of a price matrix.
+
+    Each pair uses the bars where both prices are present, like
+    check_cointegration. Pairs are batched by that set of bars, so gaps
+    only split the batch. Pairs with fewer than 30 shared bars get a
+    p-value of 1 and a statistic of 0.
+
+    Returns:
+        (pairs x 4) array of (p_value, test_statistic, hedge_ratio, half_life)
+    """
+    out = np.empty((len(first), 4))
+    out[:] = (1.0, 0.0, np.nan, np.inf)
+    if len(first) == 0:
+        return out
+
+    valid = np.isfinite(values)
+    patterns = _mask_patterns(valid)
+    keys = patterns[first] * (patterns.max() + 1) + patterns[second]
+    for key in np.unique(keys):
+        members = np.flatnonzero(keys == key)
+        bars = valid[:, first[members[0]]] & valid[:, second[members[0]]]
+        n = int(bars.sum())
+        if n < 30:
+            continue
+
+        block = values[bars]
+        maxlag = int(np.ceil(12.0 * np.power(n / 100.0, 1 / 4.0)))
+        batch = max(1, _BATCH_ELEMENTS // (n * (2 * maxlag + 3)))
+        for start in range(0, len(members), batch):
+            chunk = members[start : start + batch]
+            out[chunk] = _engle_granger(block[:, first[chunk]].T, block[:, second[chunk]].T)
+    return out
+
+
+def check_cointegration_batch(
+    prices: pd.DataFrame,
+    pairs: Optional[List[Tuple[str, str]]] = None,
+    significance_level: float = 0.05,
+) -> pd.DataFrame:
+    """
+    Engle-Granger cointegration tests for many pairs in one call.
+
+    Equivalent to calling check_cointegration on every pair, but hedge
+    ratios, residuals, the ADF lag search and MacKinnon p-values are all
+    computed on stacked arrays instead of one statsmodels call per pair.
+
+    Args:
+        prices: DataFrame where each column is a price series for a symbol
+        pairs: (symbol1, symbol2) pairs to test, symbol1 being the dependent
+               series (default: every pair of columns)
+        significance_level: P-value threshold for cointegration
+
+    Returns:
+        DataFrame with one row per pair: symbol1, symbol2, is_cointegrated,
+        p_value, test_statistic, hedge_ratio and half_life of the spread
+
+    Example:
+        >>> results = check_cointegration_batch(prices_df, [('KO', 'PEP'), ('XOM', 'CVX')])
+        >>> results[results['is_cointegrated']]
+    """
+    symbols = list(prices.columns)
+    if pairs is None:
+        first, second = np.triu_indices(len(symbols), k=1)
+    else:
+        position = {symbol: i for i, symbol in enumerate(symbols)}
+        first = np.array([position[sym1] for sym1, _ in pairs], dtype=int)
+        second = np.array([position[sym2] for _, sym2 in pairs], dtype=int)
+
+    tests = _engle_granger_pairs(prices.to_numpy(dtype=float), first, second)
+    return pd.DataFrame(
+        {
+            "symbol1": [symbols[i] for i in first],
+            "symbol2": [symbols[j] for j in second],
+            "is_cointegrated": tests[:, 0] < significance_level,
+            "p_value": tests[:, 0],
+            "test_statistic": tests[:, 1],
+            "hedge_ratio": tests[:, 2],
+            "half_life": tests[:, 3],
+        }
+    )
+
+
+def calculate_half_life_batch(spreads: pd.DataFrame) -> pd.Series:
+    """
+    Calculate the mean-reversion half-life of many spreads at once.
+
+    Equivalent to calculate_half_life on each column, with one vectorized
+    regression per set of columns sharing the same missing values.
+
+    Args:
+        spreads: DataFrame with one spread series per column
+
+    Returns:
+        Series of half-lives indexed by column (np.inf where a spread does
+        not mean-revert)
+
+    Example:
+        >>> half_lives = calculate_half_life_batch(spreads_df)
+        >>> half_lives[half_lives < 20]
+    """
+    values = spreads.to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+    patterns = _mask_patterns(valid)
+
+    half_lives = np.full(values.shape[1], np.inf)
+    for pattern in np.unique(patterns):
+        columns = np.flatnonzero(patterns == pattern)
+        rows = valid[:, columns[0]]
+        half_lives[columns] = _half_lives(values[rows][:, columns].T)
+    return pd.Series(half_lives, index=spreads.columns)
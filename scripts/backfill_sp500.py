@@ -150,7 +150,8 @@ def backfill_sp500(
     db_path: str = 'data/market_data.db',
     continue_on_error: bool = True,
     resume: bool = True,
-    rate_limit_delay: float = 0.5
+    rate_limit_delay: float = 0.5,
+    max_workers: int = 1
 ) -> dict:
     """
     Backfill historical data for S&P500 stocks.
@@ -165,6 +166,7 @@ def backfill_sp500(
         continue_on_error: Continue processing if one symbol fails
         resume: Resume from previous run (skip already processed symbols)
         rate_limit_delay: Delay between API calls in seconds
+        max_workers: Concurrent downloads (1 = sequential)
         
     Returns:
         Dictionary with 'success' and 'failed' symbol lists
@@ -212,7 +214,8 @@ def backfill_sp500(
         symbols=symbols,
         start_date=start_date,
         end_date=end_date,
-        continue_on_error=continue_on_error
+        continue_on_error=continue_on_error,
+        max_workers=max_workers
     )
     
     # Save status for each symbol
@@ -318,6 +321,12 @@ Examples:
         default=0.5,
         help='Delay between API calls in seconds (default: 0.5)'
     )
+    parser.add_argument(
+        '--max-workers',
+        type=int,
+        default=1,
+        help='Concurrent downloads with adaptive rate limiting (default: 1, sequential)'
+    )
     parser.add_argument(
         '--log-dir',
         default='data/logs',
@@ -351,7 +360,8 @@ Examples:
             db_path=args.db_path,
             continue_on_error=True,  # Always continue on error by default
             resume=True,  # Always resume by default
-            rate_limit_delay=args.rate_limit_delay
+            rate_limit_delay=args.rate_limit_delay,
+            max_workers=args.max_workers
         )
         
         # Exit with error code if there were failures
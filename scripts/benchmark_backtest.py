@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Backtest Performance Benchmarks
+
+This script measures the runtime of backtest engine components on synthetic
+market data so that performance changes can be compared across revisions.
+No network access is required.
+
+Usage:
+    # Compare DataFrame vs BarWindow data delivery as the number of bars grows
+    python scripts/benchmark_backtest.py data-view --bars 500,1000,2000,4000
+
+    # Peak memory of portfolio history recording (500 symbols, ~10 years)
+    python scripts/benchmark_backtest.py history --symbols 500 --bars 2520
+
+    # Event-driven engine vs VectorizedBacktester on the same SMA crossover
+    python scripts/benchmark_backtest.py vectorized --symbols 10,100,500 --bars 2520
+
+Benchmarks:
+    data-view   Per-bar cost of the legacy "full history DataFrame" strategy
+                pattern vs the incremental BarWindow mode with bounded lookback
+    history     Peak memory of per-bar dict records vs the columnar
+                PortfolioHistory recorder
+    vectorized  Runtime of a multi-symbol SMA crossover in BacktestEngine vs
+                the same decisions as a signal panel in VectorizedBacktester
+"""
+
+import argparse
+import logging
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from copilot_quant.backtest.engine import BacktestEngine
+from copilot_quant.backtest.orders import Order
+from copilot_quant.backtest.strategy import Strategy
+from copilot_quant.backtest.vectorized import VectorizedBacktester
+from copilot_quant.data.providers import DataProvider
+
+
+class SyntheticDataProvider(DataProvider):
+    """Data provider generating random-walk OHLCV data."""
+
+    def __init__(self, num_bars: int, seed: int = 42):
+        self.num_bars = num_bars
+        self.seed = seed
+
+    def _prices(self, num_symbols: int) -> np.ndarray:
+        rng = np.random.default_rng(self.seed)
+        returns = rng.normal(0.0003, 0.01, size=(self.num_bars, num_symbols))
+        return 100.0 * np.exp(np.cumsum(returns, axis=0))
+
+    def _dates(self) -> pd.DatetimeIndex:
+        return pd.bdate_range("2000-01-03", periods=self.num_bars)
+
+    def get_historical_data(self, symbol, start_date=None, end_date=None, interval="1d"):
+        close = self._prices(1)[:, 0]
+        return pd.DataFrame(
+            {"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close, "Volume": 1_000_000},
+            index=self._dates(),
+        )
+
+    def get_multiple_symbols(self, symbols, start_date=None, end_date=None, interval="1d"):
+        close = self._prices(len(symbols))
+        frames = {("Close", sym): close[:, i] for i, sym in enumerate(symbols)}
+        frames.update({("Volume", sym): np.full(self.num_bars, 1_000_000) for sym in symbols})
+        data = pd.DataFrame(frames, index=self._dates())
+        data.columns = pd.MultiIndex.from_tuples(data.columns)
+        return data
+
+    def get_ticker_info(self, symbol):
+        return {"symbol": symbol}
+
+
+class FrameMovingAverage(Strategy):
+    """Moving-average strategy written against the full-history DataFrame."""
+
+    def __init__(self, window: int = 20):
+        super().__init__()
+        self.window = window
+        self.invested = False
+
+    def on_data(self, timestamp, data):
+        sma = data["Close"].rolling(self.window).mean().iloc[-1]
+        return self._orders(data["Close"].iloc[-1], sma)
+
+    def _orders(self, price: float, sma: float) -> List[Order]:
+        if np.isnan(sma):
+            return []
+        if price > sma and not self.invested:
+            self.invested = True
+            return [Order(symbol="SYN", quantity=10, order_type="market", side="buy")]
+        if price < sma and self.invested:
+            self.invested = False
+            return [Order(symbol="SYN", quantity=10, order_type="market", side="sell")]
+        return []
+
+
+class WindowMovingAverage(FrameMovingAverage):
+    """Same strategy reading a bounded, read-only BarWindow."""
+
+    data_mode = "window"
+
+    def __init__(self, window: int = 20):
+        super().__init__(window)
+        self.max_lookback = window
+
+    def on_data(self, timestamp, data):
+        closes = data["Close"]
+        sma = closes.mean() if len(closes) == self.window else np.nan
+        return self._orders(closes[-1], sma)
+
+
+class BuyAndHoldBasket(Strategy):
+    """Buys every symbol on the first bar and holds to the end."""
+
+    data_mode = "window"
+    max_lookback = 1
+
+    def __init__(self, symbols: List[str]):
+        super().__init__()
+        self.symbols = symbols
+        self.invested = False
+
+    def on_data(self, timestamp, data):
+        if self.invested:
+            return []
+        self.invested = True
+        return [Order(symbol=sym, quantity=1, order_type="market", side="buy") for sym in self.symbols]
+
+
+class BasketMovingAverage(Strategy):
+    """SMA crossover on every symbol: long 10 shares above the SMA, flat below."""
+
+    data_mode = "window"
+
+    def __init__(self, symbols: List[str], window: int = 20):
+        super().__init__()
+        self.symbols = symbols
+        self.window = window
+        self.max_lookback = window
+
+    def initialize(self):
+        self.invested = dict.fromkeys(self.symbols, False)
+
+    def on_data(self, timestamp, data):
+        orders = []
+        for sym in self.symbols:
+            closes = data[("Close", sym)]
+            if len(closes) < self.window:
+                continue
+            price, sma = closes[-1], closes.mean()
+            if price > sma and not self.invested[sym]:
+                self.invested[sym] = True
+                orders.append(Order(symbol=sym, quantity=10, order_type="market", side="buy"))
+            elif price < sma and self.invested[sym]:
+                self.invested[sym] = False
+                orders.append(Order(symbol=sym, quantity=10, order_type="market", side="sell"))
+        return orders
+
+
+class LegacyHistoryEngine(BacktestEngine):
+    """Engine recording history the pre-columnar way: one dict per bar."""
+
+    def _reset_state(self) -> None:
+        super()._reset_state()
+        self.records: List[Dict] = []
+
+    def _record_portfolio_state(self, timestamp) -> None:
+        portfolio_value = self.get_portfolio_value()
+        record = {
+            "timestamp": timestamp,
+            "portfolio_value": portfolio_value,
+            "cash": self.cash,
+            "positions_value": portfolio_value - self.cash,
+            "num_positions": len(self.positions),
+        }
+        for symbol, position in self.positions.items():
+            record[f"position_{symbol}"] = position.quantity
+            record[f"value_{symbol}"] = position.market_value
+        self.records.append(record)
+
+
+def time_run(num_bars: int, strategy_factory: Callable[[], Strategy], symbols: List[str]) -> float:
+    """Time a single backtest run in seconds."""
+    engine = BacktestEngine(initial_capital=1_000_000, data_provider=SyntheticDataProvider(num_bars))
+    engine.add_strategy(strategy_factory())
+
+    start = time.perf_counter()
+    engine.run(datetime(2000, 1, 1), datetime(2030, 1, 1), symbols)
+    return time.perf_counter() - start
+
+
+def benchmark_data_view(bar_counts: List[int]) -> pd.DataFrame:
+    """
+    Compare DataFrame and BarWindow delivery as the number of bars grows.
+
+    A constant per-bar cost (linear total runtime) shows up as a flat
+    ``us_per_bar`` column; a growing ``us_per_bar`` indicates quadratic work.
+    """
+    rows = []
+    for num_bars in bar_counts:
+        frame_time = time_run(num_bars, FrameMovingAverage, ["SYN"])
+        window_time = time_run(num_bars, WindowMovingAverage, ["SYN"])
+        rows.append(
+            {
+                "bars": num_bars,
+                "frame_s": frame_time,
+                "window_s": window_time,
+                "frame_us_per_bar": frame_time / num_bars * 1e6,
+                "window_us_per_bar": window_time / num_bars * 1e6,
+                "speedup": frame_time / window_time if window_time > 0 else float("nan"),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def measure_history_run(engine_cls, num_symbols: int, num_bars: int) -> Dict[str, float]:
+    """Run a buy-and-hold basket under tracemalloc and report peak memory in MB."""
+    symbols = [f"S{i:04d}" for i in range(num_symbols)]
+    provider = SyntheticDataProvider(num_bars)
+    data = provider.get_multiple_symbols(symbols)
+    provider.get_multiple_symbols = lambda *args, **kwargs: data  # exclude data generation
+
+    engine = engine_cls(initial_capital=1e9, data_provider=provider, commission=0.0, slippage=0.0)
+    engine.add_strategy(BuyAndHoldBasket(symbols))
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = engine.run(datetime(2000, 1, 1), datetime(2030, 1, 1), symbols)
+    run_peak = tracemalloc.get_traced_memory()[1]
+
+    if isinstance(engine, LegacyHistoryEngine):
+        frame = pd.DataFrame(engine.records)
+    else:
+        frame = result.portfolio_history
+    elapsed = time.perf_counter() - start
+    total_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    assert len(frame) == num_bars
+    return {"run_peak_mb": run_peak / 2**20, "frame_peak_mb": total_peak / 2**20, "seconds": elapsed}
+
+
+def benchmark_history(num_symbols: int, num_bars: int) -> pd.DataFrame:
+    """
+    Compare peak memory of dict-per-bar and columnar history recording.
+
+    ``run_peak_mb`` is the peak while running the backtest (what every run
+    pays); ``frame_peak_mb`` additionally includes materializing the wide
+    ``portfolio_history`` DataFrame, which the columnar recorder defers until
+    it is accessed.
+    """
+    rows = []
+    for label, engine_cls in (("dict records", LegacyHistoryEngine), ("columnar", BacktestEngine)):
+        stats = measure_history_run(engine_cls, num_symbols, num_bars)
+        rows.append({"recorder": label, "symbols": num_symbols, "bars": num_bars, **stats})
+    return pd.DataFrame(rows)
+
+
+def benchmark_vectorized(symbol_counts: List[int], num_bars: int, window: int = 20) -> pd.DataFrame:
+    """
+    Compare the event-driven engine with VectorizedBacktester.
+
+    Both run the same SMA crossover decisions on the same synthetic closes;
+    ``final_diff`` is the absolute difference in final capital.
+    """
+    rows = []
+    for num_symbols in symbol_counts:
+        symbols = [f"S{i:04d}" for i in range(num_symbols)]
+        provider = SyntheticDataProvider(num_bars)
+        data = provider.get_multiple_symbols(symbols)
+        provider.get_multiple_symbols = lambda *args, _data=data, **kwargs: _data  # exclude data generation
+
+        engine = BacktestEngine(initial_capital=1e9, data_provider=provider)
+        engine.add_strategy(BasketMovingAverage(symbols, window))
+        start = time.perf_counter()
+        event_result = engine.run(datetime(2000, 1, 1), datetime(2030, 1, 1), symbols)
+        event_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        closes = data["Close"]
+        sma = closes.rolling(window).mean()
+        signals = pd.DataFrame(np.nan, index=closes.index, columns=closes.columns)
+        signals[closes > sma] = 1.0
+        signals[closes < sma] = 0.0
+        vector_result = VectorizedBacktester(initial_capital=1e9).run(closes, signals=signals, order_size=10)
+        vector_time = time.perf_counter() - start
+
+        rows.append(
+            {
+                "symbols": num_symbols,
+                "bars": num_bars,
+                "event_s": event_time,
+                "vectorized_s": vector_time,
+                "speedup": event_time / vector_time if vector_time > 0 else float("nan"),
+                "trades": len(vector_result.trades),
+                "final_diff": abs(vector_result.final_capital - event_result.final_capital),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def parse_int_list(value: str) -> List[int]:
+    """Parse a comma-separated list of integers."""
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark backtest engine components on synthetic data",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    data_view = subparsers.add_parser("data-view", help="DataFrame vs BarWindow data delivery")
+    data_view.add_argument(
+        "--bars", type=parse_int_list, default=[500, 1000, 2000, 4000], help="Comma-separated bar counts"
+    )
+
+    history = subparsers.add_parser("history", help="Portfolio history recording peak memory")
+    history.add_argument("--symbols", type=int, default=500, help="Number of symbols")
+    history.add_argument("--bars", type=int, default=2520, help="Number of bars (2520 ~ 10 years)")
+
+    vectorized = subparsers.add_parser("vectorized", help="Event-driven engine vs VectorizedBacktester")
+    vectorized.add_argument(
+        "--symbols", type=parse_int_list, default=[10, 100, 500], help="Comma-separated symbol counts (at least 2)"
+    )
+    vectorized.add_argument("--bars", type=int, default=2520, help="Number of bars (2520 ~ 10 years)")
+
+    args = parser.parse_args()
+    if args.benchmark == "vectorized" and min(args.symbols) < 2:
+        parser.error("vectorized benchmark needs at least 2 symbols per run")
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.benchmark == "data-view":
+        results = benchmark_data_view(args.bars)
+    elif args.benchmark == "history":
+        results = benchmark_history(args.symbols, args.bars)
+    elif args.benchmark == "vectorized":
+        results = benchmark_vectorized(args.symbols, args.bars)
+
+    print(results.to_string(index=False, float_format=lambda v: f"{v:,.3f}"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
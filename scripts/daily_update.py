@@ -141,10 +141,13 @@ def fill_data_gaps(
     """
     Find and fill data gaps for symbols.
     
+    Gaps are detected for all symbols in one pass against the NYSE session
+    calendar; only the fetches are limited.
+
     Args:
         updater: DataUpdater instance
         symbols: List of symbols to check
-        max_symbols: Maximum number of symbols to process for gaps
+        max_symbols: Maximum number of symbols with gaps to fill
         
     Returns:
         Number of symbols with gaps filled
@@ -154,17 +157,21 @@ def fill_data_gaps(
     logger.info("Checking for data gaps...")
     
     gaps_filled = 0
-    symbols_checked = symbols[:max_symbols]  # Limit to avoid long runs
+    try:
+        all_gaps = updater.find_all_gaps(symbols)
+    except Exception as e:
+        logger.warning(f"Error checking gaps: {e}")
+        return 0
+
+    logger.info(f"Found gaps in {len(all_gaps)} of {len(symbols)} symbols")
     
-    for symbol in symbols_checked:
+    for symbol, gaps in list(all_gaps.items())[:max_symbols]:  # Limit fetches to avoid long runs
         try:
-            gaps = updater.find_gaps(symbol)
-            if gaps:
-                logger.info(f"{symbol}: Found {len(gaps)} gaps, filling...")
-                if updater.fill_gaps(symbol):
-                    gaps_filled += 1
+            logger.info(f"{symbol}: Found {len(gaps)} gaps, filling...")
+            if updater.fill_gaps(symbol, gaps=gaps):
+                gaps_filled += 1
         except Exception as e:
-            logger.warning(f"{symbol}: Error checking gaps: {e}")
+            logger.warning(f"{symbol}: Error filling gaps: {e}")
     
     if gaps_filled > 0:
         logger.info(f"Filled gaps for {gaps_filled} symbols")
@@ -0,0 +1,94 @@
+"""Tests for round-trip trade statistics computed from stored fills."""
+
+from datetime import datetime
+
+import pytest
+
+from copilot_quant.analytics.attribution import AttributionAnalyzer
+from copilot_quant.analytics.performance_engine import PerformanceEngine
+from copilot_quant.brokers.trade_database import FillModel, TradeDatabase
+
+
+def make_trade_db(rows, commission=0.0):
+    """In-memory database holding (symbol, quantity, price, timestamp) fills."""
+    db = TradeDatabase("sqlite:///:memory:")
+    with db.get_session() as session:
+        for i, (symbol, quantity, price, timestamp) in enumerate(rows):
+            session.add(
+                FillModel(
+                    fill_id=f"F{i}",
+                    order_id=i,
+                    symbol=symbol,
+                    quantity=quantity,
+                    price=price,
+                    commission=commission,
+                    timestamp=timestamp,
+                )
+            )
+    return db
+
+
+@pytest.fixture
+def trade_db():
+    """In-memory database with a long round trip split over two sells and a short."""
+    return make_trade_db(
+        [
+            ("AAPL", 10, 100.0, datetime(2024, 1, 2)),
+            ("AAPL", -4, 110.0, datetime(2024, 1, 3)),
+            ("TSLA", -5, 200.0, datetime(2024, 1, 3)),
+            ("AAPL", -6, 95.0, datetime(2024, 1, 4)),
+            ("TSLA", 5, 180.0, datetime(2024, 1, 5)),
+        ]
+    )
+
+
+class TestPerformanceEngineTrades:
+    """Tests for PerformanceEngine trade statistics."""
+
+    def test_trade_statistics(self, trade_db):
+        """Test partial closes and shorts are counted as round trips."""
+        engine = PerformanceEngine(trade_db, initial_capital=100_000)
+
+        stats = engine._calculate_trade_statistics()
+
+        assert stats["num_trades"] == 3
+        assert stats["num_winning"] == 2
+        assert stats["win_rate"] == pytest.approx(2 / 3)
+        assert stats["profit_factor"] == pytest.approx((40 + 100) / 30)
+        assert engine._calculate_realized_pnl() == pytest.approx(40 - 30 + 100)
+
+
+class TestAttributionTrades:
+    """Tests for AttributionAnalyzer trade statistics."""
+
+    def test_symbol_attribution(self, trade_db):
+        """Test per-symbol P&L and round-trip counts."""
+        attribution = AttributionAnalyzer(trade_db).get_symbol_attribution()
+
+        assert list(attribution) == ["TSLA", "AAPL"]
+        assert attribution["TSLA"]["pnl"] == pytest.approx(100.0)
+        assert attribution["TSLA"]["win_rate"] == 1.0
+        assert attribution["AAPL"]["pnl"] == pytest.approx(10.0)
+        assert attribution["AAPL"]["num_trades"] == 2
+        assert attribution["AAPL"]["win_rate"] == 0.5
+
+    def test_pnl_net_of_commission_with_open_lots(self):
+        """Test P&L is net of commission and open lots are marked at their symbol's last price."""
+        db = make_trade_db(
+            [
+                ("AAPL", 10, 100.0, datetime(2024, 1, 2)),
+                ("MSFT", 5, 200.0, datetime(2024, 1, 2)),
+                ("MSFT", 5, 210.0, datetime(2024, 1, 3)),
+                ("AAPL", -10, 110.0, datetime(2024, 1, 3)),
+            ],
+            commission=1.0,
+        )
+        analyzer = AttributionAnalyzer(db)
+
+        symbols = analyzer.get_symbol_attribution()
+        periods = analyzer.get_time_attribution(period="monthly")
+
+        assert symbols["AAPL"]["pnl"] == pytest.approx(100.0 - 2.0)
+        assert symbols["MSFT"]["pnl"] == pytest.approx(5 * 10.0 - 2.0)  # open lots marked at 210
+        assert symbols["MSFT"]["num_trades"] == 0
+        assert periods[0]["pnl"] == pytest.approx(98.0 + 48.0)
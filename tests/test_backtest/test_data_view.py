@@ -0,0 +1,355 @@
+"""Tests for incremental market data views."""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from copilot_quant.backtest.data_view import BarWindow, MarketDataCursor, PriceMatrix
+from copilot_quant.backtest.engine import BacktestEngine
+from copilot_quant.backtest.orders import Order
+from copilot_quant.backtest.strategy import Strategy
+from copilot_quant.data.providers import DataProvider
+
+
+def make_single_symbol_data(periods=10):
+    """Create single-symbol OHLCV data."""
+    dates = pd.date_range("2024-01-01", periods=periods, freq="D")
+    return pd.DataFrame(
+        {
+            "Close": [100.0 + i for i in range(periods)],
+            "Volume": [1000000] * periods,
+        },
+        index=dates,
+    )
+
+
+def make_long_format_data():
+    """Create long-format data with two symbols per timestamp, unsorted."""
+    dates = pd.date_range("2024-01-01", periods=4, freq="D")
+    aapl = pd.DataFrame({"Close": [10.0, 11.0, 12.0, 13.0], "Symbol": "AAPL"}, index=dates)
+    msft = pd.DataFrame({"Close": [20.0, 21.0, 22.0, 23.0], "Symbol": "MSFT"}, index=dates)
+    return pd.concat([aapl, msft])
+
+
+class StaticProvider(DataProvider):
+    """Provider returning a fixed DataFrame."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def get_historical_data(self, symbol, start_date=None, end_date=None, interval="1d"):
+        return self.data.copy()
+
+    def get_multiple_symbols(self, symbols, start_date=None, end_date=None, interval="1d"):
+        return self.data.copy()
+
+    def get_ticker_info(self, symbol):
+        return {}
+
+
+class RecordingStrategy(Strategy):
+    """Strategy that records what it receives."""
+
+    def __init__(self, data_mode="frame", max_lookback=None):
+        super().__init__()
+        self.data_mode = data_mode
+        self.max_lookback = max_lookback
+        self.received = []
+
+    def on_data(self, timestamp, data):
+        if isinstance(data, BarWindow):
+            self.received.append(("window", len(data), data["Close"][-1]))
+        else:
+            self.received.append(("frame", len(data), data["Close"].iloc[-1]))
+        return []
+
+
+class TestMarketDataCursor:
+    """Tests for MarketDataCursor."""
+
+    def test_timestamps_are_unique_and_sorted(self):
+        """Test cursor exposes sorted unique timestamps."""
+        cursor = MarketDataCursor(make_long_format_data())
+
+        assert len(cursor) == 4
+        assert cursor.timestamps.is_monotonic_increasing
+
+    def test_frame_matches_loc_slice(self):
+        """Test frame() returns the same rows as data.loc[:timestamp]."""
+        data = make_long_format_data()
+        cursor = MarketDataCursor(data)
+        sorted_data = data.sort_index(kind="mergesort")
+
+        for bar, timestamp in enumerate(cursor.timestamps):
+            cursor.seek(bar)
+            pd.testing.assert_frame_equal(cursor.frame(), sorted_data.loc[:timestamp])
+
+    def test_frame_with_lookback(self):
+        """Test lookback limits the number of bars returned."""
+        cursor = MarketDataCursor(make_long_format_data())
+        cursor.seek(3)
+
+        frame = cursor.frame(lookback=2)
+
+        assert len(frame) == 4  # 2 bars x 2 symbols
+        assert frame.index.min() == pd.Timestamp("2024-01-03")
+
+    def test_seek_backwards_raises(self):
+        """Test the cursor cannot move backwards."""
+        cursor = MarketDataCursor(make_single_symbol_data())
+        cursor.seek(5)
+
+        with pytest.raises(ValueError, match="forward-only"):
+            cursor.seek(2)
+
+    def test_seek_out_of_range_raises(self):
+        """Test seeking past the end raises."""
+        cursor = MarketDataCursor(make_single_symbol_data(periods=3))
+
+        with pytest.raises(ValueError, match="out of range"):
+            cursor.seek(3)
+
+    def test_arrays_are_read_only(self):
+        """Test column arrays cannot be modified."""
+        cursor = MarketDataCursor(make_single_symbol_data())
+
+        arr = cursor.array("Close")
+
+        with pytest.raises(ValueError):
+            arr[0] = 0.0
+
+    def test_multiindex_column_access(self):
+        """Test arrays can be read by full multi-level column label."""
+        dates = pd.date_range("2024-01-01", periods=3, freq="D")
+        data = pd.DataFrame({("Close", "AAPL"): [1.0, 2.0, 3.0], ("Close", "MSFT"): [4.0, 5.0, 6.0]}, index=dates)
+        data.columns = pd.MultiIndex.from_tuples(data.columns)
+        cursor = MarketDataCursor(data)
+
+        np.testing.assert_array_equal(cursor.array(("Close", "MSFT")), [4.0, 5.0, 6.0])
+
+        with pytest.raises(KeyError):
+            cursor.array("Close")
+
+
+class TestBarWindow:
+    """Tests for BarWindow."""
+
+    def test_window_grows_with_cursor(self):
+        """Test the window is append-only as the cursor advances."""
+        cursor = MarketDataCursor(make_single_symbol_data())
+        window = cursor.window()
+
+        assert window.empty
+        assert window.timestamp is None
+
+        cursor.seek(0)
+        assert len(window) == 1
+        cursor.seek(4)
+        assert len(window) == 5
+        np.testing.assert_array_equal(window["Close"], [100.0, 101.0, 102.0, 103.0, 104.0])
+        assert window.timestamp == pd.Timestamp("2024-01-05")
+
+    def test_window_bounded_lookback(self):
+        """Test lookback keeps only the most recent bars."""
+        cursor = MarketDataCursor(make_single_symbol_data())
+        window = cursor.window(lookback=3)
+
+        cursor.seek(8)
+
+        assert window.num_bars == 3
+        np.testing.assert_array_equal(window["Close"], [106.0, 107.0, 108.0])
+        assert window.last("Close") == 108.0
+
+    def test_window_views_are_read_only(self):
+        """Test window column views cannot be modified."""
+        cursor = MarketDataCursor(make_single_symbol_data())
+        window = cursor.window()
+        cursor.seek(2)
+
+        with pytest.raises(ValueError):
+            window["Close"][0] = 0.0
+
+    def test_to_frame(self):
+        """Test to_frame returns a DataFrame of visible rows."""
+        cursor = MarketDataCursor(make_long_format_data())
+        window = cursor.window(lookback=1)
+        cursor.seek(1)
+
+        frame = window.to_frame()
+
+        assert isinstance(frame, pd.DataFrame)
+        assert list(frame["Symbol"]) == ["AAPL", "MSFT"]
+        assert window.symbols() == ["AAPL", "MSFT"]
+
+    def test_invalid_lookback(self):
+        """Test non-positive lookback is rejected."""
+        cursor = MarketDataCursor(make_single_symbol_data())
+
+        with pytest.raises(ValueError, match="Invalid lookback"):
+            cursor.window(lookback=0)
+
+
+class TestPriceMatrix:
+    """Tests for PriceMatrix."""
+
+    def test_multiindex_layout(self):
+        """Test prices are extracted from (Metric, Symbol) columns and forward-filled."""
+        dates = pd.date_range("2024-01-01", periods=3, freq="D")
+        data = pd.DataFrame(
+            {("Close", "AAPL"): [1.0, np.nan, 3.0], ("Close", "MSFT"): [np.nan, 5.0, 6.0], ("Volume", "AAPL"): 1},
+            index=dates,
+        )
+        data.columns = pd.MultiIndex.from_tuples(data.columns)
+
+        prices = PriceMatrix(data, data.index.unique())
+
+        assert prices.symbols == ["AAPL", "MSFT"]
+        assert prices.price(0, "MSFT") is None
+        assert prices.price(1, "AAPL") == 1.0
+        assert prices.price(2, "MSFT") == 6.0
+        assert prices.price(2, "GOOGL") is None
+
+    def test_long_format_layout(self):
+        """Test long-format rows are scattered into one column per symbol."""
+        cursor = MarketDataCursor(make_long_format_data())
+
+        prices = PriceMatrix(cursor.data, cursor.timestamps)
+
+        assert sorted(prices.symbols) == ["AAPL", "MSFT"]
+        np.testing.assert_array_equal(prices.row(2)[[prices.symbol_id("AAPL"), prices.symbol_id("MSFT")]], [12.0, 22.0])
+
+    def test_long_format_matches_legacy_lookup(self):
+        """Test lookups match filtering the history for the symbol's last close."""
+        data = make_long_format_data()
+        cursor = MarketDataCursor(data)
+        prices = PriceMatrix(cursor.data, cursor.timestamps)
+
+        for bar, timestamp in enumerate(cursor.timestamps):
+            history = cursor.data.loc[:timestamp]
+            for symbol in ["AAPL", "MSFT"]:
+                expected = history[history["Symbol"] == symbol].iloc[-1]["Close"]
+                assert prices.price(bar, symbol) == expected
+
+    def test_single_series_layout(self):
+        """Test data without symbols prices every symbol from the same series."""
+        data = make_single_symbol_data(3)
+
+        prices = PriceMatrix(data, data.index.unique(), symbols=["SPY"])
+
+        assert prices.symbols == ["SPY"]
+        assert prices.price(2, "SPY") == 102.0
+        assert prices.price(2, "QQQ") == 102.0
+        assert prices.num_symbols == 2
+
+    def test_missing_price_field(self):
+        """Test data without a Close column produces no prices."""
+        data = make_single_symbol_data(3).drop(columns=["Close"])
+
+        prices = PriceMatrix(data, data.index.unique(), symbols=["SPY"])
+
+        assert prices.price(0, "SPY") is None
+
+
+class TestEngineDataModes:
+    """Tests for BacktestEngine data delivery modes."""
+
+    def test_frame_mode_receives_full_history(self):
+        """Test legacy strategies receive a growing DataFrame."""
+        engine = BacktestEngine(initial_capital=10000, data_provider=StaticProvider(make_single_symbol_data(5)))
+        strategy = RecordingStrategy()
+        engine.add_strategy(strategy)
+
+        engine.run(datetime(2024, 1, 1), datetime(2024, 1, 5), ["AAPL"])
+
+        assert [r[0] for r in strategy.received] == ["frame"] * 5
+        assert [r[1] for r in strategy.received] == [1, 2, 3, 4, 5]
+        assert strategy.received[-1][2] == 104.0
+
+    def test_frame_mode_respects_max_lookback(self):
+        """Test legacy strategies can bound their DataFrame history."""
+        engine = BacktestEngine(initial_capital=10000, data_provider=StaticProvider(make_single_symbol_data(5)))
+        strategy = RecordingStrategy(max_lookback=2)
+        engine.add_strategy(strategy)
+
+        engine.run(datetime(2024, 1, 1), datetime(2024, 1, 5), ["AAPL"])
+
+        assert [r[1] for r in strategy.received] == [1, 2, 2, 2, 2]
+
+    def test_window_mode_receives_bar_window(self):
+        """Test window-mode strategies receive a BarWindow."""
+        engine = BacktestEngine(initial_capital=10000, data_provider=StaticProvider(make_single_symbol_data(5)))
+        strategy = RecordingStrategy(data_mode="window", max_lookback=3)
+        engine.add_strategy(strategy)
+
+        engine.run(datetime(2024, 1, 1), datetime(2024, 1, 5), ["AAPL"])
+
+        assert [r[0] for r in strategy.received] == ["window"] * 5
+        assert [r[1] for r in strategy.received] == [1, 2, 3, 3, 3]
+        assert [r[2] for r in strategy.received] == [100.0, 101.0, 102.0, 103.0, 104.0]
+
+    def test_window_mode_executes_orders(self):
+        """Test orders from window-mode strategies fill at the current price."""
+
+        class BuyOnce(Strategy):
+            data_mode = "window"
+
+            def on_data(self, timestamp, data):
+                if data.num_bars == 3:
+                    return [Order(symbol="AAPL", quantity=1, order_type="market", side="buy")]
+                return []
+
+        engine = BacktestEngine(
+            initial_capital=10000,
+            data_provider=StaticProvider(make_single_symbol_data(5)),
+            commission=0.0,
+            slippage=0.0,
+        )
+        engine.add_strategy(BuyOnce())
+
+        result = engine.run(datetime(2024, 1, 1), datetime(2024, 1, 5), ["AAPL"])
+
+        assert len(result.trades) == 1
+        assert result.trades[0].fill_price == 102.0
+
+    def test_invalid_data_mode_rejected(self):
+        """Test unknown data modes are rejected when adding a strategy."""
+        engine = BacktestEngine(initial_capital=10000, data_provider=StaticProvider(make_single_symbol_data()))
+
+        with pytest.raises(ValueError, match="Invalid data_mode"):
+            engine.add_strategy(RecordingStrategy(data_mode="columns"))
+
+
+class TestEngineMarkToMarket:
+    """Tests for vectorized price lookups in the engine."""
+
+    def test_unrealized_pnl_tracks_latest_price(self):
+        """Test positions are marked to the current bar's close."""
+        dates = pd.date_range("2024-01-01", periods=4, freq="D")
+        data = pd.DataFrame(
+            {("Close", "AAPL"): [100.0, 110.0, 120.0, 130.0], ("Close", "MSFT"): [50.0, 40.0, 30.0, 20.0]},
+            index=dates,
+        )
+        data.columns = pd.MultiIndex.from_tuples(data.columns)
+
+        class BuyBoth(Strategy):
+            def on_data(self, timestamp, data):
+                if len(data) == 1:
+                    return [
+                        Order(symbol="AAPL", quantity=10, order_type="market", side="buy"),
+                        Order(symbol="MSFT", quantity=10, order_type="market", side="sell"),
+                    ]
+                return []
+
+        engine = BacktestEngine(
+            initial_capital=100000, data_provider=StaticProvider(data), commission=0.0, slippage=0.0
+        )
+        engine.add_strategy(BuyBoth())
+
+        result = engine.run(datetime(2024, 1, 1), datetime(2024, 1, 4), ["AAPL", "MSFT"])
+
+        # Marked at the last recorded bar's close before orders ran
+        assert engine.positions["AAPL"].unrealized_pnl == pytest.approx((130.0 - 100.0) * 10)
+        assert engine.positions["MSFT"].unrealized_pnl == pytest.approx((20.0 - 50.0) * -10)
+        assert result.portfolio_history["positions_value"].iloc[1] == pytest.approx(110.0 * 10 + 50.0 * 10 + 100.0)
@@ -171,6 +171,25 @@ class TestBacktestEngine:
         assert result.trades[0].order.symbol == "AAPL"
         assert result.trades[0].fill_quantity == 10
 
+    def test_backtest_records_fills_in_ledger(self):
+        """Test fills are kept in the columnar ledger with integer ids."""
+        provider = MockDataProvider()
+        engine = BacktestEngine(initial_capital=10000, data_provider=provider)
+        fills = []
+
+        strategy = BuyOnceStrategy()
+        strategy.on_fill = fills.append
+        engine.add_strategy(strategy)
+
+        result = engine.run(start_date=datetime(2024, 1, 1), end_date=datetime(2024, 1, 10), symbols=["AAPL"])
+
+        assert result.ledger is engine.ledger
+        assert len(result.ledger) == 1
+        assert fills[0].fill_id == 0
+        assert result.trades[0].fill_id == 0
+        assert result.trades[0].fill_price == fills[0].fill_price
+        assert result.get_trade_log()["symbol"].tolist() == ["AAPL"]
+
     def test_backtest_applies_commission(self):
         """Test that commission is applied to trades."""
         dates = pd.date_range("2024-01-01", periods=5, freq="D")
@@ -296,6 +315,62 @@ class TestBacktestEngine:
         assert "portfolio_value" in result.portfolio_history.columns
         assert len(result.portfolio_history) == 5  # One for each day
 
+    def test_backtest_tracks_running_performance(self):
+        """Test running metrics match the recorded equity curve after a run."""
+        dates = pd.date_range("2024-01-01", periods=6, freq="D")
+        closes = [100.0, 104.0, 98.0, 101.0, 97.0, 103.0]
+        data = pd.DataFrame({"Close": closes, "Open": closes, "Volume": [1000000] * 6}, index=dates)
+
+        provider = MockDataProvider(data=data)
+        engine = BacktestEngine(initial_capital=10000, data_provider=provider, commission=0.001, slippage=0.0005)
+        engine.add_strategy(BuyOnceStrategy())
+
+        result = engine.run(start_date=datetime(2024, 1, 1), end_date=datetime(2024, 1, 6), symbols=["AAPL"])
+
+        equity = result.portfolio_history["portfolio_value"]
+        performance = engine.get_performance()
+        assert performance["count"] == len(equity)
+        assert performance["portfolio_value"] == pytest.approx(equity.iloc[-1])
+        assert performance["max_drawdown"] == pytest.approx(result.get_metric("max_drawdown"))
+        assert performance["sharpe_ratio"] == pytest.approx(result.get_metric("sharpe_ratio"))
+
+    def test_backtest_warmup_bars(self):
+        """Test warm-up bars are visible as history but not traded or recorded."""
+        data = MockDataProvider().get_historical_data("AAPL")
+        seen = []
+
+        class RecordingStrategy(BuyOnceStrategy):
+            def on_data(self, timestamp, data):
+                seen.append((timestamp, len(data), len(self.features)))
+                return super().on_data(timestamp, data)
+
+        engine = BacktestEngine(initial_capital=10000, data_provider=MockDataProvider(), commission=0.0, slippage=0.0)
+        engine.add_strategy(RecordingStrategy())
+
+        result = engine.run(datetime(2024, 1, 1), datetime(2024, 1, 10), symbols=["AAPL"], warmup_bars=4)
+
+        assert seen[0] == (data.index[4], 5, 5)
+        assert len(seen) == 6
+        assert list(result.portfolio_history["timestamp"]) == list(data.index[4:])
+        assert result.trades[0].timestamp == data.index[4]
+        assert result.trades[0].fill_price == 104.0
+
+        with pytest.raises(ValueError, match="Invalid warmup_bars"):
+            engine.run(datetime(2024, 1, 1), datetime(2024, 1, 10), symbols=["AAPL"], warmup_bars=-1)
+
+    def test_backtest_close_positions(self):
+        """Test close_positions sells open holdings on the last bar."""
+        engine = BacktestEngine(initial_capital=10000, data_provider=MockDataProvider(), commission=0.0, slippage=0.0)
+        engine.add_strategy(BuyOnceStrategy())
+
+        result = engine.run(datetime(2024, 1, 1), datetime(2024, 1, 10), symbols=["AAPL"], close_positions=True)
+
+        assert [(f.order.side, f.fill_price) for f in result.trades] == [("buy", 100.0), ("sell", 109.0)]
+        assert engine.positions == {}
+        assert result.final_capital == pytest.approx(10000 + 10 * 9.0)
+        assert result.portfolio_history["num_positions"].iloc[-1] == 0
+        assert result.get_equity_curve().iloc[-1] == pytest.approx(result.final_capital)
+
     def test_backtest_calculates_return(self):
         """Test that total return is calculated correctly."""
         dates = pd.date_range("2024-01-01", periods=5, freq="D")
@@ -0,0 +1,232 @@
+"""Tests for the shared rolling feature store."""
+
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from copilot_quant.backtest.features import FeatureStore, _RollingWindow
+from copilot_quant.backtest.multi_strategy import MultiStrategyEngine
+from copilot_quant.backtest.signals import SignalBasedStrategy
+from copilot_quant.data.providers import DataProvider
+
+
+def random_prices(num_bars=400, seed=3):
+    """Wide close prices with a late listing, a data gap and a flat stretch."""
+    rng = np.random.default_rng(seed)
+    values = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (num_bars, 4)), axis=0))
+    values[:40, 2] = np.nan
+    values[200:205, 1] = np.nan
+    values[300:330, 3] = values[299, 3]
+    return pd.DataFrame(values, columns=["A", "B", "C", "D"], index=pd.bdate_range("2022-01-03", periods=num_bars))
+
+
+class TestFeatureStore:
+    """Tests for FeatureStore."""
+
+    def test_matches_pandas_rolling(self):
+        """Test incremental indicators equal pandas rolling on forward-filled prices."""
+        prices = random_prices()
+        store = FeatureStore(list(prices.columns), chunk_size=64)
+        store.extend(prices.iloc[:150])
+        store.rolling_mean("A", 20)  # window created mid-run is backfilled
+        store.extend(prices.iloc[150:])
+
+        expected = prices.ffill().rolling(20)
+        for symbol in prices.columns:
+            np.testing.assert_allclose(store.rolling_mean(symbol, 20), expected.mean()[symbol], rtol=1e-10)
+            np.testing.assert_allclose(store.rolling_std(symbol, 20), expected.std()[symbol], rtol=1e-7, atol=1e-9)
+        zscore = (prices.ffill() - expected.mean()) / expected.std()
+        np.testing.assert_allclose(store.zscore("B", 20), zscore["B"], rtol=1e-6)
+
+    def test_flat_window_has_zero_std(self):
+        """Test a constant window gives zero std and an undefined z-score."""
+        store = FeatureStore(["A", "B", "C", "D"])
+        store.extend(random_prices())
+
+        assert np.all(store.rolling_std("D", 10)[310:330] == 0.0)
+        assert np.all(np.isnan(store.zscore("D", 10)[310:330]))
+
+    def test_rolling_cov(self):
+        """Test pair covariance, including one registered mid-run and a late-listed symbol."""
+        prices = random_prices()
+        store = FeatureStore(list(prices.columns))
+        store.extend(prices.iloc[:100])
+        store.rolling_cov("A", "C", 30)
+        store.extend(prices.iloc[100:])
+
+        filled = prices.ffill()
+        np.testing.assert_allclose(store.rolling_cov("A", "C", 30), filled["A"].rolling(30).cov(filled["C"]), rtol=1e-8)
+        np.testing.assert_allclose(store.rolling_cov("B", "B", 30), filled["B"].rolling(30).var(), rtol=1e-7)
+
+    def test_concurrent_pair_requests(self, monkeypatch):
+        """Test threads requesting the same new pair never read it before it is backfilled."""
+        prices = random_prices()
+        store = FeatureStore(list(prices.columns))
+        store.extend(prices)
+        store.rolling_mean("A", 30)
+
+        backfill = _RollingWindow._backfill
+
+        def slow_backfill(self, store, pair_ids):
+            time.sleep(0.05)
+            backfill(self, store, pair_ids)
+
+        monkeypatch.setattr(_RollingWindow, "_backfill", slow_backfill)
+        barrier = threading.Barrier(8)
+        results, errors = [], []
+
+        def request():
+            barrier.wait()
+            try:
+                results.append(store.rolling_cov("A", "C", 30).copy())
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=request) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        filled = prices.ffill()
+        assert errors == []
+        assert store._windows[30].num_pairs == 5
+        for result in results:
+            np.testing.assert_allclose(result, filled["A"].rolling(30).cov(filled["C"]), rtol=1e-8)
+
+    def test_windows_are_shared(self):
+        """Test repeated requests reuse one computed window."""
+        store = FeatureStore(["A", "B", "C", "D"])
+        store.extend(random_prices())
+
+        store.rolling_mean("A", 10)
+        store.zscore("B", 10)
+        store.panel("std", 10)
+
+        assert store.windows == [10]
+        assert store.panel("mean", 10).shape == (400, 4)
+
+    def test_views_are_read_only(self):
+        """Test returned arrays cannot modify the store."""
+        store = FeatureStore(["A"])
+        store.extend(pd.DataFrame({"A": np.arange(1.0, 11.0)}))
+
+        with pytest.raises(ValueError):
+            store.rolling_mean("A", 3)[-1] = 0.0
+
+    def test_add_symbols(self):
+        """Test symbols added mid-run start without history."""
+        store = FeatureStore(["A"])
+        store.rolling_mean("A", 2)
+        store.append(1, [1.0])
+        store.add_symbols(["B"])
+        store.append(2, [2.0, 10.0])
+        store.append(3, [3.0, 12.0])
+
+        assert list(store.rolling_mean("A", 2)) == [pytest.approx(x, nan_ok=True) for x in (np.nan, 1.5, 2.5)]
+        assert store.rolling_mean("B", 2)[-1] == 11.0
+
+    def test_update_last_matches_final_prices(self):
+        """Test revising the newest bar gives the same indicators as appending its final prices."""
+        prices = random_prices()
+        store = FeatureStore(list(prices.columns))
+        store.rolling_mean("A", 20)
+        store.rolling_cov("A", "B", 20)
+        for timestamp, row in prices.iterrows():
+            store.append(timestamp, row * 0.98)
+            store.update_last([row["A"] * 1.01, np.nan])  # a missing price keeps the bar's current one
+            store.update_last(row)
+
+        expected = FeatureStore(list(prices.columns))
+        expected.extend(prices)
+        np.testing.assert_allclose(store.rolling_mean("A", 20), expected.rolling_mean("A", 20), rtol=1e-10)
+        np.testing.assert_allclose(store.rolling_cov("A", "B", 20), expected.rolling_cov("A", "B", 20), rtol=1e-7)
+        np.testing.assert_array_equal(store.price_panel(), expected.price_panel())
+
+        with pytest.raises(ValueError, match="empty"):
+            FeatureStore(["A"]).update_last([1.0])
+
+    def test_price_panel_matches_pivot(self):
+        """Test the wide panel equals pivoting the long data and forward-filling it."""
+        prices = random_prices()
+        long = prices.melt(var_name="Symbol", value_name="Close", ignore_index=False).sort_index(kind="stable")
+        store = FeatureStore(list(prices.columns), chunk_size=64)
+        store.extend(prices)
+
+        pivoted = long.pivot_table(index=long.index, columns="Symbol", values="Close", dropna=False).ffill()
+        pd.testing.assert_frame_equal(store.price_frame(), pivoted, check_names=False, check_freq=False)
+        pd.testing.assert_frame_equal(store.price_frame(lookback=50), pivoted.tail(50), check_names=False)
+        np.testing.assert_array_equal(store.price_panel(lookback=10)[:, store.symbol_index("C")], pivoted["C"][-10:])
+        assert store.price_panel(lookback=1000).shape == (400, 4)
+
+        with pytest.raises(ValueError):
+            store.price_panel()[-1, 0] = 0.0
+
+    def test_invalid_arguments(self):
+        """Test window, indicator, symbol and row validation."""
+        store = FeatureStore(["A"])
+        with pytest.raises(ValueError, match="Invalid window"):
+            store.rolling_mean("A", 1)
+        with pytest.raises(ValueError, match="Invalid indicator"):
+            store.panel("skew", 5)
+        with pytest.raises(KeyError, match="Unknown symbol"):
+            store.prices("ZZZ")
+        with pytest.raises(KeyError, match="Unknown symbol"):
+            store.symbol_index("ZZZ")
+        with pytest.raises(ValueError, match="Invalid lookback"):
+            store.price_panel(lookback=0)
+        with pytest.raises(ValueError, match="Invalid prices"):
+            store.append(0, [1.0, 2.0])
+
+
+class WidePricesProvider(DataProvider):
+    """Provider returning fixed multi-symbol close prices."""
+
+    def __init__(self, prices):
+        self.prices = prices
+
+    def get_historical_data(self, symbol, start_date=None, end_date=None, interval="1d"):
+        return pd.DataFrame({"Close": self.prices[symbol]})
+
+    def get_multiple_symbols(self, symbols, start_date=None, end_date=None, interval="1d"):
+        return pd.concat({"Close": self.prices[symbols]}, axis=1)
+
+    def get_ticker_info(self, symbol):
+        return {}
+
+
+class ZScoreRecorder(SignalBasedStrategy):
+    """Records the z-score it reads from the shared store."""
+
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+        self.zscores = []
+
+    def generate_signals(self, timestamp, data):
+        self.zscores.append(self.features.zscore("A", 20)[-1])
+        return []
+
+
+class TestEngineFeatures:
+    """Tests for the engine-owned feature store."""
+
+    def test_strategies_share_store(self):
+        """Test every strategy in a run reads the same store, updated before each bar."""
+        prices = random_prices()
+        engine = MultiStrategyEngine(initial_capital=100_000, data_provider=WidePricesProvider(prices))
+        first, second = ZScoreRecorder("first"), ZScoreRecorder("second")
+        engine.add_strategy(first)
+        engine.add_strategy(second)
+
+        engine.run(datetime(2022, 1, 3), datetime(2022, 12, 31), symbols=["A", "B"])
+
+        assert first.features is second.features is engine.features
+        assert engine.features.windows == [20]
+        expected = (prices["A"] - prices["A"].rolling(20).mean()) / prices["A"].rolling(20).std()
+        np.testing.assert_allclose(first.zscores, expected, rtol=1e-8)
+        np.testing.assert_array_equal(first.zscores, second.zscores)
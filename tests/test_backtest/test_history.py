@@ -0,0 +1,178 @@
+"""Tests for columnar portfolio history recording."""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from copilot_quant.backtest.history import PortfolioHistory
+from copilot_quant.backtest.results import BacktestResult
+
+
+def record_bars(history, num_bars):
+    """Record bars where AAPL is held from bar 1 and MSFT from bar 2."""
+    for bar in range(num_bars):
+        quantities = np.array([10.0 if bar >= 1 else 0.0, -5.0 if bar >= 2 else 0.0])
+        values = np.array([1000.0 + bar, 500.0]) * (quantities != 0)
+        history.record(pd.Timestamp("2024-01-01") + pd.Timedelta(days=bar), 5000.0, quantities, values)
+
+
+class TestPortfolioHistory:
+    """Tests for PortfolioHistory."""
+
+    def test_record_scalars(self):
+        """Test cash, values and position counts are recorded per bar."""
+        history = PortfolioHistory(symbols=["AAPL", "MSFT"], capacity=3)
+        record_bars(history, 3)
+
+        assert len(history) == 3
+        np.testing.assert_array_equal(history.cash, [5000.0] * 3)
+        np.testing.assert_array_equal(history.positions_value, [0.0, 1001.0, 1502.0])
+        np.testing.assert_array_equal(history.portfolio_value, [5000.0, 6001.0, 6502.0])
+        np.testing.assert_array_equal(history.num_positions, [0, 1, 2])
+
+    def test_flat_positions_stored_as_nan(self):
+        """Test per-symbol arrays mark flat positions with NaN."""
+        history = PortfolioHistory(symbols=["AAPL", "MSFT"], capacity=3)
+        record_bars(history, 3)
+
+        assert np.isnan(history.quantities[0]).all()
+        assert history.quantities[2, 1] == -5.0
+
+    def test_grows_in_chunks(self):
+        """Test capacity grows by chunk_size when exhausted."""
+        history = PortfolioHistory(symbols=["AAPL", "MSFT"], capacity=2, chunk_size=4)
+        record_bars(history, 5)
+
+        assert len(history) == 5
+        assert history.capacity == 6
+        assert history.quantities.shape == (5, 2)
+        np.testing.assert_array_equal(history.num_positions, [0, 1, 2, 2, 2])
+
+    def test_invalid_chunk_size(self):
+        """Test non-positive chunk sizes are rejected."""
+        with pytest.raises(ValueError, match="chunk_size"):
+            PortfolioHistory(symbols=[], chunk_size=0)
+
+    def test_add_symbols(self):
+        """Test symbols can be appended after recording started."""
+        history = PortfolioHistory(symbols=["AAPL"], capacity=2)
+        history.record(pd.Timestamp("2024-01-01"), 100.0, np.array([1.0]), np.array([10.0]))
+
+        history.add_symbols(["MSFT"])
+        history.record(pd.Timestamp("2024-01-02"), 100.0, np.array([1.0, 2.0]), np.array([10.0, 20.0]))
+
+        assert history.symbols == ["AAPL", "MSFT"]
+        assert np.isnan(history.quantities[0, 1])
+        assert history.quantities[1, 1] == 2.0
+
+    def test_to_frame_legacy_layout(self):
+        """Test the materialized frame matches the per-bar dict layout."""
+        history = PortfolioHistory(symbols=["AAPL", "MSFT"], capacity=3)
+        record_bars(history, 3)
+
+        frame = history.to_frame()
+
+        assert list(frame.columns) == [
+            "timestamp",
+            "portfolio_value",
+            "cash",
+            "positions_value",
+            "num_positions",
+            "position_AAPL",
+            "value_AAPL",
+            "position_MSFT",
+            "value_MSFT",
+        ]
+        assert pd.api.types.is_datetime64_any_dtype(frame["timestamp"])
+        assert np.isnan(frame["position_MSFT"].iloc[1])
+        assert frame["value_AAPL"].iloc[2] == 1002.0
+
+    def test_to_frame_skips_never_held_symbols(self):
+        """Test symbols that were never held get no columns."""
+        history = PortfolioHistory(symbols=["AAPL", "MSFT", "GOOGL"], capacity=3)
+        for _bar in range(3):
+            history.record(pd.Timestamp("2024-01-01"), 100.0, np.array([1.0, 0.0, 0.0]), np.array([5.0, 0.0, 0.0]))
+
+        frame = history.to_frame()
+
+        assert "position_AAPL" in frame.columns
+        assert "position_MSFT" not in frame.columns
+        assert "value_GOOGL" not in frame.columns
+
+    def test_empty_history(self):
+        """Test an empty history produces an empty frame."""
+        history = PortfolioHistory(symbols=["AAPL"])
+
+        assert history.to_frame().empty
+        assert history.get_equity_curve().empty
+
+
+class TestBacktestResultLazyHistory:
+    """Tests for lazily materialized portfolio history on BacktestResult."""
+
+    def make_result(self, **kwargs):
+        return BacktestResult(
+            strategy_name="Test",
+            start_date=datetime(2024, 1, 1),
+            end_date=datetime(2024, 1, 3),
+            initial_capital=5000.0,
+            final_capital=6502.0,
+            total_return=0.3,
+            **kwargs,
+        )
+
+    def test_portfolio_history_built_from_history(self):
+        """Test portfolio_history is materialized from the columnar history."""
+        history = PortfolioHistory(symbols=["AAPL", "MSFT"], capacity=3)
+        record_bars(history, 3)
+        result = self.make_result(history=history)
+
+        frame = result.portfolio_history
+
+        assert len(frame) == 3
+        assert result.portfolio_history is frame  # cached after first access
+
+    def test_equity_curve_reads_history_directly(self):
+        """Test the equity curve does not require the wide frame."""
+        history = PortfolioHistory(symbols=["AAPL", "MSFT"], capacity=3)
+        record_bars(history, 3)
+        result = self.make_result(history=history)
+
+        equity = result.get_equity_curve()
+
+        assert list(equity) == [5000.0, 6001.0, 6502.0]
+        assert result._portfolio_history is None
+
+    def test_bar_timestamps(self):
+        """Test bar timestamps come from the history, a timestamp column or the equity index."""
+        history = PortfolioHistory(symbols=["AAPL", "MSFT"], capacity=3)
+        record_bars(history, 3)
+        expected = pd.date_range("2024-01-01", periods=3)
+
+        from_history = self.make_result(history=history)
+        from_column = self.make_result(portfolio_history=history.to_frame())
+        from_index = self.make_result(
+            portfolio_history=pd.DataFrame({"portfolio_value": [1.0, 2.0, 3.0]}, index=expected)
+        )
+
+        assert from_history.get_bar_timestamps().equals(expected)
+        assert from_history._portfolio_history is None
+        assert from_column.get_bar_timestamps().equals(expected)
+        assert from_index.get_bar_timestamps().equals(expected)
+
+    def test_explicit_portfolio_history_still_supported(self):
+        """Test passing a DataFrame directly keeps working."""
+        frame = pd.DataFrame({"portfolio_value": [1.0, 2.0]})
+        result = self.make_result(portfolio_history=frame)
+
+        assert result.portfolio_history is frame
+        assert list(result.equity_curve) == [1.0, 2.0]
+
+    def test_default_portfolio_history_is_empty(self):
+        """Test results without any history expose an empty DataFrame."""
+        result = self.make_result()
+
+        assert isinstance(result.portfolio_history, pd.DataFrame)
+        assert result.portfolio_history.empty
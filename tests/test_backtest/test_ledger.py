@@ -0,0 +1,196 @@
+"""Tests for the columnar trade ledger."""
+
+import dataclasses
+import pickle
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from copilot_quant.backtest.ledger import BUY, SELL, TradeLedger
+from copilot_quant.backtest.metrics import PerformanceAnalyzer
+from copilot_quant.backtest.orders import Fill, Order
+from copilot_quant.backtest.results import BacktestResult
+
+
+def make_fill(symbol, side, quantity, price, day, commission=1.0, order_type="market", limit_price=None):
+    order = Order(symbol=symbol, quantity=quantity, order_type=order_type, side=side, limit_price=limit_price)
+    return Fill(order, price, quantity, commission, datetime(2024, 1, day))
+
+
+@pytest.fixture
+def fills():
+    return [
+        make_fill("AAPL", "buy", 10, 100.0, 2),
+        make_fill("MSFT", "buy", 5, 300.0, 2),
+        make_fill("AAPL", "sell", 4, 110.0, 3),
+        make_fill("MSFT", "sell", 5, 290.0, 4, order_type="limit", limit_price=290.0),
+        make_fill("AAPL", "sell", 6, 95.0, 5),
+    ]
+
+
+class TestTradeLedger:
+    """Tests for TradeLedger."""
+
+    def test_append_returns_integer_ids(self):
+        """Test fill ids are consecutive row numbers."""
+        ledger = TradeLedger(chunk_size=2)
+
+        ids = [ledger.append(datetime(2024, 1, 2), "AAPL", "buy", 1, 100.0, 0.1) for _ in range(5)]
+
+        assert ids == [0, 1, 2, 3, 4]
+        assert len(ledger) == 5
+        assert ledger.capacity == 6
+        assert ledger.symbols == ["AAPL"]
+
+    def test_columns(self, fills):
+        """Test columns are read from the structured array."""
+        ledger = TradeLedger.from_fills(fills)
+
+        assert ledger.symbols == ["AAPL", "MSFT"]
+        np.testing.assert_array_equal(ledger.symbol_ids, [0, 1, 0, 1, 0])
+        np.testing.assert_array_equal(ledger.sides, [BUY, BUY, SELL, SELL, SELL])
+        np.testing.assert_array_equal(ledger.quantities, [10, 5, 4, 5, 6])
+        np.testing.assert_allclose(ledger.net_proceeds, [fill.net_proceeds for fill in fills])
+        np.testing.assert_allclose(ledger.total_cost, [fill.total_cost for fill in fills])
+
+    def test_to_frame_matches_fill_attributes(self, fills):
+        """Test the trade log has the BacktestResult layout."""
+        frame = TradeLedger.from_fills(fills).to_frame()
+
+        assert list(frame.columns) == ["symbol", "side", "quantity", "price", "commission", "total_cost"]
+        assert frame.index.name == "timestamp"
+        assert list(frame["side"]) == [fill.order.side for fill in fills]
+        assert list(frame.index) == [pd.Timestamp(fill.timestamp) for fill in fills]
+
+    def test_fill_round_trip(self, fills):
+        """Test Fill objects are rebuilt with order type and limit price."""
+        ledger = TradeLedger.from_fills(fills)
+
+        rebuilt = ledger.to_fills()
+
+        assert [f.fill_id for f in rebuilt] == [0, 1, 2, 3, 4]
+        for original, fill in zip(fills, rebuilt, strict=True):
+            assert fill.order.symbol == original.order.symbol
+            assert fill.order.side == original.order.side
+            assert fill.order.order_type == original.order.order_type
+            assert fill.order.limit_price == original.order.limit_price
+            assert fill.fill_price == original.fill_price
+            assert fill.timestamp == original.timestamp
+        assert ledger.fill(3).order.limit_price == 290.0
+        with pytest.raises(IndexError):
+            ledger.fill(5)
+
+    def test_order_id_and_timestamp_round_trip(self, fills):
+        """Test rebuilt orders keep their id and creation time, including after concat."""
+        order = Order("AAPL", 10, "limit", "buy", limit_price=99.0, timestamp=datetime(2024, 1, 1, 15), order_id="A-1")
+        ledger = TradeLedger.from_fills([Fill(order, 99.0, 10, 1.0, datetime(2024, 1, 2)), *fills])
+
+        rebuilt = TradeLedger.concat([TradeLedger.from_fills(fills[:1]), ledger]).to_fills()
+
+        assert (rebuilt[1].order.order_id, rebuilt[1].order.timestamp) == ("A-1", datetime(2024, 1, 1, 15))
+        assert ledger.fill(0).order == order
+        assert all(fill.order.order_id is None and fill.order.timestamp is None for fill in rebuilt[2:])
+
+    def test_tz_aware_timestamps(self):
+        """Test tz-aware timestamps come back in their time zone."""
+        ledger = TradeLedger()
+        timestamp = pd.Timestamp("2024-01-02 16:00", tz="America/New_York")
+        ledger.append(timestamp, "AAPL", "buy", 1, 100.0, 0.0)
+
+        assert ledger.timestamps[0] == timestamp
+        assert str(ledger.timestamps.tz) == "America/New_York"
+        assert ledger.fill(0).timestamp == timestamp
+
+    def test_extend(self):
+        """Test bulk appends record market fills."""
+        ledger = TradeLedger(symbols=["AAA", "BBB"])
+
+        ids = ledger.extend(
+            timestamps=pd.bdate_range("2024-01-01", periods=3),
+            symbol_ids=np.array([1, 0, 1]),
+            sides=np.array([1, 1, -1]),
+            quantities=np.array([2.0, 3.0, 2.0]),
+            prices=np.array([10.0, 20.0, 11.0]),
+            commissions=np.zeros(3),
+        )
+
+        np.testing.assert_array_equal(ids, [0, 1, 2])
+        assert list(ledger.to_frame()["symbol"]) == ["BBB", "AAA", "BBB"]
+
+    def test_concat_remaps_symbols(self, fills):
+        """Test concatenated ledgers share one symbol table."""
+        first = TradeLedger.from_fills(fills[:2])
+        second = TradeLedger.from_fills([make_fill("TSLA", "buy", 1, 200.0, 8), *fills[2:]])
+
+        combined = TradeLedger.concat([first, second])
+
+        assert combined.symbols == ["AAPL", "MSFT", "TSLA"]
+        assert list(combined.to_frame()["symbol"]) == ["AAPL", "MSFT", "TSLA", "AAPL", "MSFT", "AAPL"]
+
+    def test_pickle_trims_capacity(self, fills):
+        """Test pickled ledgers only carry recorded rows."""
+        ledger = TradeLedger.from_fills(fills)
+        ledger._grow(10_000)
+
+        restored = pickle.loads(pickle.dumps(ledger))
+
+        assert restored.capacity == len(fills)
+        pd.testing.assert_frame_equal(restored.to_frame(), ledger.to_frame())
+
+    def test_metrics_read_ledger(self, fills):
+        """Test trade statistics agree for Fill lists and ledgers."""
+        analyzer = PerformanceAnalyzer()
+        equity = pd.Series([100_000.0, 100_500.0, 100_200.0])
+
+        from_fills = analyzer.calculate_metrics(equity, fills, 100_000)
+        from_ledger = analyzer.calculate_metrics(equity, TradeLedger.from_fills(fills), 100_000)
+
+        trade_keys = ["total_trades", "win_rate", "profit_factor", "avg_win", "avg_loss", "avg_trade"]
+        assert {k: from_fills[k] for k in trade_keys} == {k: from_ledger[k] for k in trade_keys}
+        assert from_ledger["total_trades"] == 5
+        assert analyzer.calculate_win_rate(TradeLedger.from_fills(fills)) == pytest.approx(1 / 3)
+
+
+class TestResultLedger:
+    """Tests for BacktestResult backed by a ledger."""
+
+    def make_result(self, **kwargs):
+        return BacktestResult("Test", datetime(2024, 1, 1), datetime(2024, 2, 1), 100_000, 100_000, 0.0, **kwargs)
+
+    def test_trades_rebuilt_lazily(self, fills):
+        """Test trades are materialized from the ledger."""
+        result = self.make_result(ledger=TradeLedger.from_fills(fills))
+
+        assert result.num_trades == 5
+        assert result._ledger_fills is None
+        assert [fill.fill_id for fill in result.trades] == [0, 1, 2, 3, 4]
+        assert result.trades is result.trades
+
+    def test_explicit_trades(self, fills):
+        """Test results built from Fill lists still work."""
+        result = self.make_result(trades=fills)
+
+        assert result.num_trades == 5
+        assert list(result.get_trade_log()["symbol"]) == ["AAPL", "MSFT", "AAPL", "MSFT", "AAPL"]
+
+        result.trades.append(make_fill("TSLA", "buy", 1, 200.0, 9))
+        assert result.num_trades == 6
+
+    def test_replace_keeps_trades(self, fills):
+        """Test dataclasses.replace carries explicit and ledger-backed trades over."""
+        explicit = dataclasses.replace(self.make_result(trades=fills), total_return=0.1)
+        from_ledger = dataclasses.replace(self.make_result(ledger=TradeLedger.from_fills(fills)), total_return=0.1)
+
+        assert explicit.trades == fills
+        assert [fill.fill_id for fill in from_ledger.trades] == [0, 1, 2, 3, 4]
+        assert explicit.total_return == from_ledger.total_return == 0.1
+
+    def test_default_trades_empty(self):
+        """Test a result without trades has an empty log."""
+        result = self.make_result()
+
+        assert result.trades == []
+        assert result.num_trades == 0
+        assert result.get_trade_log().empty
@@ -259,5 +259,58 @@ class TestLiveIntegration(unittest.TestCase):
         engine.disconnect()
 
 
+class TestLiveFeatureStore(unittest.TestCase):
+    """Tests for the live engine's feature store"""
+
+    @patch("copilot_quant.brokers.live_data_adapter.IBKRLiveDataFeed")
+    @patch("copilot_quant.brokers.live_broker_adapter.IBKRBroker")
+    def test_feature_store_updates_from_new_bars(self, mock_broker_class, mock_data_feed_class):
+        """Test the feature store is seeded from history and appended once per new bar"""
+        engine = LiveStrategyEngine(paper_trading=True)
+        strategy = SimpleTestStrategy()
+        engine.add_strategy(strategy)
+        engine.symbols = ["AAPL"]
+        engine._historical_data = {
+            "AAPL": pd.DataFrame({"Close": [100.0, 101.0, 102.0]}, index=pd.date_range("2024-01-01", periods=3))
+        }
+
+        engine._build_feature_store()
+        self.assertIs(strategy.features, engine.features)
+        self.assertEqual(engine.features.rolling_mean("AAPL", 3)[-1], 101.0)
+
+        engine._latest_data["AAPL"] = pd.Series({"Close": 106.0}, name=datetime(2024, 1, 4))
+        engine._update_feature_store()
+        engine._update_feature_store()  # same bar again revises it in place
+
+        self.assertEqual(len(engine.features), 4)
+        self.assertEqual(engine.features.rolling_mean("AAPL", 3)[-1], 103.0)
+
+    @patch("copilot_quant.brokers.live_data_adapter.IBKRLiveDataFeed")
+    @patch("copilot_quant.brokers.live_broker_adapter.IBKRBroker")
+    def test_intrabar_ticks_update_last_bar(self, mock_broker_class, mock_data_feed_class):
+        """Test tz-aware history and naive ticks share a clock and ticks within a bar update it in place"""
+        engine = LiveStrategyEngine(paper_trading=True)
+        engine.add_strategy(SimpleTestStrategy())
+        engine.symbols = ["AAPL"]
+        index = pd.date_range("2024-01-01", periods=3, tz="UTC")
+        engine._historical_data = {"AAPL": pd.DataFrame({"Close": [100.0, 101.0, 102.0]}, index=index)}
+        engine._build_feature_store()
+
+        for hour, close in ((15, 104.0), (16, 108.0)):
+            engine._latest_data["AAPL"] = pd.Series({"Close": close}, name=datetime(2024, 1, 4, hour))
+            engine._update_feature_store()
+
+        self.assertEqual(len(engine.features), 4)
+        self.assertEqual(list(engine.features.timestamps), list(pd.date_range("2024-01-01", periods=4)))
+        self.assertEqual(engine.features.prices("AAPL")[-1], 108.0)
+        self.assertAlmostEqual(engine.features.rolling_mean("AAPL", 3)[-1], (101.0 + 102.0 + 108.0) / 3)
+
+        engine._latest_data["AAPL"] = pd.Series({"Close": 110.0}, name=datetime(2024, 1, 5, 15))
+        engine._update_feature_store()
+
+        self.assertEqual(len(engine.features), 5)
+        self.assertAlmostEqual(engine.features.rolling_mean("AAPL", 3)[-1], (102.0 + 108.0 + 110.0) / 3)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -2,6 +2,7 @@
 
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -10,6 +11,7 @@ from copilot_quant.backtest.multi_strategy import (
     StrategyAttribution,
 )
 from copilot_quant.backtest.orders import Fill, Order
+from copilot_quant.backtest.signal_executors import SignalExecutor
 from copilot_quant.backtest.signals import SignalBasedStrategy, TradingSignal
 from copilot_quant.data.providers import DataProvider
 
@@ -420,3 +422,203 @@ class TestMaxDeploymentLimit:
             assert max_deployed <= engine.max_deployed_pct * 1.05, (
                 f"Deployed capital ({max_deployed:.1%}) exceeded max limit ({engine.max_deployed_pct:.1%})"
             )
+
+
+class RandomWalkProvider(DataProvider):
+    """Provider returning random-walk close prices for two symbols."""
+
+    def get_historical_data(self, symbol, start_date=None, end_date=None):
+        return self.get_multiple_symbols([symbol])
+
+    def get_multiple_symbols(self, symbols, start_date=None, end_date=None):
+        rng = np.random.default_rng(7)
+        dates = pd.bdate_range("2023-01-02", periods=120)
+        closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (len(dates), len(symbols))), axis=0))
+        return pd.concat({"Close": pd.DataFrame(closes, index=dates, columns=symbols)}, axis=1)
+
+    def get_ticker_info(self, symbol):
+        return {"symbol": symbol}
+
+
+class MeanReversionSignals(SignalBasedStrategy):
+    """Buys below the 5-bar mean and sells above it, stopping after max_fills fills."""
+
+    def __init__(self, symbol, max_fills=None):
+        super().__init__()
+        self.symbol = symbol
+        self.max_fills = max_fills
+        self.name = f"MeanReversion_{symbol}"
+        self.fills_seen = 0
+
+    def generate_signals(self, timestamp, data):
+        if self.max_fills is not None and self.fills_seen >= self.max_fills:
+            return []
+        price = self.features.prices(self.symbol)[-1]
+        mean = self.features.rolling_mean(self.symbol, 5)[-1]
+        if np.isnan(mean) or price == mean:
+            return []
+        side = "buy" if price < mean else "sell"
+        return [TradingSignal(symbol=self.symbol, side=side, confidence=0.7, sharpe_estimate=1.0, entry_price=price)]
+
+    def on_fill(self, fill):
+        self.fills_seen += 1
+
+
+class FailingSignals(SignalBasedStrategy):
+    """Strategy whose signal generation always raises."""
+
+    def generate_signals(self, timestamp, data):
+        raise RuntimeError("boom")
+
+
+def run_modes(signal_execution, make_strategies, max_workers=2, warmup_bars=0):
+    """Run one backtest and return the engine, strategies and result."""
+    engine = MultiStrategyEngine(
+        initial_capital=100000,
+        data_provider=RandomWalkProvider(),
+        signal_execution=signal_execution,
+        max_workers=max_workers,
+    )
+    strategies = make_strategies()
+    for strategy in strategies:
+        engine.add_strategy(strategy)
+    result = engine.run(datetime(2023, 1, 2), datetime(2023, 12, 31), symbols=["AAPL", "MSFT"], warmup_bars=warmup_bars)
+    return engine, strategies, result
+
+
+def fills_of(result):
+    """Comparable view of a result's fills."""
+    return [(f.timestamp, f.order.symbol, f.order.side, round(f.fill_quantity, 8)) for f in result.trades]
+
+
+class TestSignalExecution:
+    """Tests for parallel signal collection modes."""
+
+    @pytest.mark.parametrize("mode", ["thread", "process", "precompute"])
+    def test_modes_match_sequential(self, mode):
+        """Test every mode produces the same fills and attribution as sequential."""
+
+        def make():
+            return [MeanReversionSignals("AAPL"), MeanReversionSignals("MSFT")]
+
+        _, _, expected = run_modes("sequential", make)
+        _, strategies, result = run_modes(mode, make)
+
+        assert len(expected.trades) > 0
+        assert fills_of(result) == fills_of(expected)
+        assert result.strategy_attributions == expected.strategy_attributions
+        assert [s.fills_seen for s in strategies] == [
+            expected.strategy_attributions[s.name]["num_trades"] for s in strategies
+        ]
+
+    @pytest.mark.parametrize("mode", ["sequential", "thread", "process", "precompute"])
+    def test_warmup_bars(self, mode):
+        """Test every mode skips warm-up bars but keeps them in the strategies' feature history."""
+
+        def make():
+            return [MeanReversionSignals("AAPL"), MeanReversionSignals("MSFT")]
+
+        _, _, full = run_modes("sequential", make)
+        engine, _, result = run_modes(mode, make, warmup_bars=30)
+
+        start = full.portfolio_history["timestamp"].iloc[30]
+        assert result.portfolio_history["timestamp"].iloc[0] == start
+        assert len(result.portfolio_history) == 90
+        assert engine.strategy_timings["MeanReversion_AAPL"].calls == 90
+        # The 5-bar mean is available on the first traded bar, so the strategies trade immediately
+        assert min(f.timestamp for f in result.trades) == start
+
+    def test_process_workers_receive_fills(self):
+        """Test fill-dependent strategy state persists in worker processes."""
+
+        def make():
+            return [MeanReversionSignals("AAPL", max_fills=3), MeanReversionSignals("MSFT", max_fills=5)]
+
+        _, _, expected = run_modes("sequential", make)
+        _, strategies, result = run_modes("process", make)
+
+        assert fills_of(result) == fills_of(expected)
+        assert [s.fills_seen for s in strategies] == [3, 5]
+        assert all(s.features is not None for s in strategies)
+
+    @pytest.mark.parametrize("mode", ["sequential", "thread", "process"])
+    def test_strategy_errors_are_isolated(self, mode):
+        """Test a failing strategy is logged and skipped while others trade."""
+
+        def make():
+            return [FailingSignals(), MeanReversionSignals("AAPL")]
+
+        _, _, result = run_modes(mode, make)
+
+        assert result.strategy_attributions["MeanReversion_AAPL"]["num_trades"] > 0
+        assert result.strategy_attributions["FailingSignals"]["num_trades"] == 0
+
+    def test_strategy_timings(self):
+        """Test every strategy call is timed and reported on the result."""
+        engine, _, result = run_modes("thread", lambda: [MeanReversionSignals("AAPL"), FailingSignals()])
+
+        assert set(result.strategy_timings) == {"MeanReversion_AAPL", "FailingSignals"}
+        timing = result.strategy_timings["MeanReversion_AAPL"]
+        assert timing["calls"] == 120
+        assert timing["max_time"] >= timing["mean_time"] > 0
+        assert engine.strategy_timings["FailingSignals"].calls == 120
+
+    def test_executor_requires_collect(self):
+        """Test SignalExecutor is abstract until collect is implemented."""
+        with pytest.raises(TypeError, match="collect"):
+            SignalExecutor([])
+
+    def test_invalid_configuration(self):
+        """Test unknown modes and worker counts are rejected."""
+        with pytest.raises(ValueError, match="Invalid signal_execution"):
+            MultiStrategyEngine(initial_capital=100000, data_provider=MockDataProvider(), signal_execution="gpu")
+        with pytest.raises(ValueError, match="Invalid max_workers"):
+            MultiStrategyEngine(initial_capital=100000, data_provider=MockDataProvider(), max_workers=0)
+
+
+class InvariantCheckingEngine(MultiStrategyEngine):
+    """Engine asserting the running exposure totals match a full rescan on every check."""
+
+    def _can_execute_signal(self, signal):
+        rescanned = sum(pos.market_value for pos in self.positions.values())
+        assert self._deployed_value == pytest.approx(rescanned, rel=1e-9, abs=1e-6)
+
+        owned = {}
+        for symbol, position in self.positions.items():
+            owner = self.position_owners.get(symbol)
+            owned[owner] = owned.get(owner, 0.0) + position.market_value
+        for name, exposure in self.get_strategy_exposures().items():
+            assert exposure == pytest.approx(owned.get(name, 0.0), rel=1e-9, abs=1e-6)
+        return super()._can_execute_signal(signal)
+
+
+class TestExposureTracking:
+    """Tests for incremental deployment and exposure tracking."""
+
+    def test_running_totals_match_positions(self):
+        """Test deployed capital and per-strategy exposure stay equal to a rescan."""
+        engine = InvariantCheckingEngine(
+            initial_capital=100000, data_provider=RandomWalkProvider(), max_position_pct=0.2, max_deployed_pct=0.5
+        )
+        engine.add_strategy(MeanReversionSignals("AAPL"))
+        engine.add_strategy(MeanReversionSignals("MSFT"))
+
+        result = engine.run(datetime(2023, 1, 2), datetime(2023, 12, 31), symbols=["AAPL", "MSFT"])
+
+        assert len(result.trades) > 0
+        assert sum(engine.get_strategy_exposures().values()) == pytest.approx(
+            sum(pos.market_value for pos in engine.positions.values())
+        )
+
+    def test_attribution_unrealized_pnl_by_owner(self):
+        """Test unrealized P&L is attributed to the strategy owning each position."""
+        engine = MultiStrategyEngine(initial_capital=100000, data_provider=MockDataProvider())
+        engine.add_strategy(BuyOnceStrategy(symbol="AAPL"))
+
+        result = engine.run(start_date=datetime(2023, 1, 1), end_date=datetime(2023, 1, 10), symbols=["AAPL"])
+
+        position = engine.positions["AAPL"]
+        attribution = result.strategy_attributions["BuyOnceStrategy"]
+        assert position.unrealized_pnl > 0  # prices rise after the first bar
+        assert attribution["unrealized_pnl"] == pytest.approx(position.unrealized_pnl)
+        assert engine.get_strategy_exposures()["BuyOnceStrategy"] == pytest.approx(position.market_value)
@@ -0,0 +1,142 @@
+"""Tests for online performance accumulators."""
+
+import math
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from copilot_quant.backtest.metrics import PerformanceAnalyzer
+from copilot_quant.backtest.online import DrawdownTracker, EWMoments, OnlinePerformance, RunningMoments
+
+
+def random_curve(num_bars=300, seed=11):
+    """Random-walk equity curve with several drawdowns."""
+    rng = np.random.default_rng(seed)
+    values = 100_000 * np.exp(np.cumsum(rng.normal(0.0003, 0.012, num_bars)))
+    return pd.Series(values, index=pd.bdate_range("2023-01-02", periods=num_bars))
+
+
+class TestRunningMoments:
+    """Tests for RunningMoments and EWMoments."""
+
+    def test_welford_matches_numpy(self):
+        """Test running mean and sample std equal the batch values."""
+        data = np.random.default_rng(0).normal(0.001, 0.02, 500)
+        moments = RunningMoments()
+        for x in data:
+            moments.update(x)
+
+        assert moments.mean == pytest.approx(data.mean(), rel=1e-12)
+        assert moments.std == pytest.approx(data.std(ddof=1), rel=1e-12)
+
+    def test_single_observation_has_no_variance(self):
+        """Test variance is undefined until two observations."""
+        moments = RunningMoments()
+        moments.update(1.0)
+
+        assert math.isnan(moments.std)
+
+    def test_ewm_matches_pandas(self):
+        """Test exponentially weighted moments equal pandas adjust=False."""
+        data = pd.Series(np.random.default_rng(1).normal(0, 0.01, 200))
+        moments = EWMoments(halflife=10)
+        for x in data:
+            moments.update(x)
+
+        ewm = data.ewm(halflife=10, adjust=False)
+        assert moments.mean == pytest.approx(ewm.mean().iloc[-1], rel=1e-10)
+        assert moments.variance == pytest.approx(ewm.var(bias=True).iloc[-1], rel=1e-10)
+
+    def test_ewm_requires_one_parameter(self):
+        """Test halflife and alpha are mutually exclusive."""
+        with pytest.raises(ValueError, match="exactly one"):
+            EWMoments()
+        with pytest.raises(ValueError, match="Invalid alpha"):
+            EWMoments(alpha=1.5)
+
+
+class TestDrawdownTracker:
+    """Tests for DrawdownTracker."""
+
+    def test_peak_trough_and_durations(self):
+        """Test drawdown depth, timestamps and underwater stretches."""
+        tracker = DrawdownTracker()
+        for i, value in enumerate([100, 110, 99, 105, 110, 120, 108, 115]):
+            tracker.update(value, datetime(2024, 1, i + 1))
+
+        assert tracker.max_drawdown == pytest.approx(-0.1)
+        assert tracker.max_drawdown_peak_time == datetime(2024, 1, 2)
+        assert tracker.max_drawdown_trough_time == datetime(2024, 1, 3)
+        assert tracker.peak == 120
+        assert tracker.drawdown == pytest.approx(115 / 120 - 1)
+        assert (tracker.max_duration, tracker.duration, tracker.underwater_periods) == (2, 2, 2)
+
+    def test_seeded_peak(self):
+        """Test a carried-over high-water mark puts the first value underwater."""
+        tracker = DrawdownTracker(peak=200.0)
+        tracker.update(150.0)
+
+        assert tracker.drawdown == pytest.approx(-0.25)
+
+
+class TestOnlinePerformance:
+    """Tests for OnlinePerformance."""
+
+    @pytest.mark.parametrize("risk_free_rate", [0.0, 0.02])
+    def test_matches_performance_analyzer(self, risk_free_rate):
+        """Test streaming metrics equal a full recomputation at every prefix."""
+        curve = random_curve()
+        analyzer = PerformanceAnalyzer(risk_free_rate=risk_free_rate)
+        performance = OnlinePerformance(risk_free_rate=risk_free_rate)
+
+        for i, (timestamp, value) in enumerate(curve.items(), start=1):
+            performance.update(value, timestamp)
+            if i % 50 and i != 3:
+                continue
+            prefix = curve.iloc[:i]
+            returns = analyzer.calculate_returns(prefix)
+            durations = analyzer.calculate_drawdown_duration(prefix)
+
+            assert performance.sharpe_ratio == pytest.approx(analyzer.calculate_sharpe_ratio(returns), rel=1e-9)
+            assert performance.sortino_ratio == pytest.approx(analyzer.calculate_sortino_ratio(returns), rel=1e-9)
+            assert performance.volatility == pytest.approx(returns.std() * np.sqrt(252), rel=1e-9)
+            assert performance.max_drawdown == pytest.approx(analyzer.calculate_max_drawdown(prefix), rel=1e-12)
+            assert performance.drawdown.max_duration == durations["max_drawdown_duration_days"]
+            assert performance.drawdown.duration == durations["current_drawdown_duration_days"]
+            assert performance.drawdown.avg_duration == pytest.approx(durations["avg_drawdown_duration_days"])
+
+    def test_no_downside(self):
+        """Test a rising curve has infinite Sortino and no drawdown."""
+        performance = OnlinePerformance()
+        for value in [100.0, 101.0, 103.0, 104.0]:
+            performance.update(value)
+
+        assert performance.sortino_ratio == math.inf
+        assert performance.max_drawdown == 0.0
+        assert performance.total_return == pytest.approx(0.04)
+
+    def test_ewm_metrics(self):
+        """Test EW metrics are NaN unless a halflife is given."""
+        plain, weighted = OnlinePerformance(), OnlinePerformance(halflife=20)
+        for value in random_curve(60):
+            plain.update(value)
+            weighted.update(value)
+
+        assert math.isnan(plain.ewm_volatility)
+        assert weighted.ewm_volatility > 0
+        assert set(weighted.snapshot()) >= {"sharpe_ratio", "ewm_sharpe_ratio", "max_drawdown"}
+
+    def test_nan_values_ignored(self):
+        """Test NaN values do not reach the accumulators."""
+        performance = OnlinePerformance()
+        performance.update(100.0)
+        performance.update(float("nan"))
+
+        assert performance.count == 1
+
+    def test_invalid_periods_per_year(self):
+        """Test annualization factor must be positive."""
+        with pytest.raises(ValueError, match="Invalid periods_per_year"):
+            OnlinePerformance(periods_per_year=0)
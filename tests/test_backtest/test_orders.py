@@ -70,6 +70,14 @@ class TestOrder:
         with pytest.raises(ValueError, match="Invalid limit_price"):
             Order(symbol="AAPL", quantity=100, order_type="limit", side="buy", limit_price=-150.0)
 
+    def test_order_is_slotted(self):
+        """Test orders carry no per-instance __dict__."""
+        order = Order(symbol="AAPL", quantity=100, order_type="market", side="buy")
+
+        assert not hasattr(order, "__dict__")
+        with pytest.raises(AttributeError):
+            order.note = "extra"
+
 
 class TestFill:
     """Tests for Fill class."""
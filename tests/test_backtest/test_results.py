@@ -0,0 +1,116 @@
+"""Tests for cached metrics on BacktestResult and batched summaries."""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from copilot_quant.backtest.orders import Fill, Order
+from copilot_quant.backtest.results import BacktestResult, summarize_many
+from copilot_quant.backtest.vectorized import VectorizedBacktester
+
+
+def make_results(count=6, num_bars=120, seed=5):
+    """Vectorized SMA results with different windows and lengths."""
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2022-01-03", periods=num_bars)
+    prices = pd.DataFrame(
+        100 * np.exp(np.cumsum(rng.normal(0, 0.01, (num_bars, 3)), axis=0)), index=index, columns=["A", "B", "C"]
+    )
+    results = []
+    for i in range(count):
+        window = 5 + 3 * i
+        sma = prices.rolling(window).mean()
+        signals = (prices > sma).astype(float).where(sma.notna()) - (prices < 0.98 * sma).astype(float)
+        bars = num_bars - 7 * i
+        results.append(
+            VectorizedBacktester(100_000).run(
+                prices.iloc[:bars], signals=signals.iloc[:bars], order_size=10, strategy_name=f"sma_{window}"
+            )
+        )
+    return results
+
+
+class TestCachedMetrics:
+    """Tests for BacktestResult metric caching."""
+
+    def test_metrics_computed_once(self, monkeypatch):
+        """Test repeated reads reuse the cached summary."""
+        result = make_results(count=1)[0]
+        calls = []
+        original = BacktestResult._compute_summary_stats
+        monkeypatch.setattr(
+            BacktestResult,
+            "_compute_summary_stats",
+            lambda self, rate: calls.append(rate) or original(self, rate),
+        )
+
+        first = result.metrics
+        assert result.metrics == first
+        assert result.get_metric("sharpe_ratio") == first["sharpe_ratio"]
+        result.get_summary_stats(risk_free_rate=0.05)
+        result.get_metric("sortino_ratio", risk_free_rate=0.05)
+
+        assert calls == [0.02, 0.05]
+
+    def test_returned_dict_is_a_copy(self):
+        """Test callers cannot corrupt the cache."""
+        result = make_results(count=1)[0]
+
+        result.metrics["sharpe_ratio"] = 99.0
+
+        assert result.metrics["sharpe_ratio"] != 99.0
+
+    def test_risk_free_rate_keys_cache(self):
+        """Test Sharpe depends on the rate while drawdown is shared."""
+        result = make_results(count=1)[0]
+
+        low, high = result.get_summary_stats(0.0), result.get_summary_stats(0.10)
+
+        assert low["sharpe_ratio"] > high["sharpe_ratio"]
+        assert low["max_drawdown"] == high["max_drawdown"] == result.get_drawdown().min()
+
+    def test_invalidate_metrics(self):
+        """Test invalidation picks up modified trades."""
+        buy = Fill(Order("AAA", 10, "market", "buy"), 100.0, 10, 0.0, datetime(2024, 1, 2))
+        sell = Fill(Order("AAA", 10, "market", "sell"), 110.0, 10, 0.0, datetime(2024, 1, 3))
+        history = pd.DataFrame(
+            {"portfolio_value": [100_000.0, 100_100.0]}, index=pd.bdate_range("2024-01-02", periods=2)
+        )
+        result = BacktestResult(
+            "Test", datetime(2024, 1, 2), datetime(2024, 1, 3), 100_000, 100_100, 0.001, [buy], history
+        )
+        assert result.get_metric("win_rate") == 0.0
+
+        result.trades.append(sell)
+        assert result.get_metric("win_rate") == 0.0  # still cached
+        result.invalidate_metrics()
+
+        assert result.get_metric("win_rate") == 1.0
+        assert len(result.get_round_trips()) == 1
+
+    def test_unknown_metric(self):
+        """Test unknown metric names raise KeyError."""
+        with pytest.raises(KeyError, match="Invalid metric"):
+            make_results(count=1)[0].get_metric("alpha")
+
+
+class TestSummarizeMany:
+    """Tests for summarize_many."""
+
+    def test_matches_get_summary_stats(self):
+        """Test each row equals the result's own summary."""
+        results = make_results()
+        empty = BacktestResult("Empty", datetime(2024, 1, 1), datetime(2024, 2, 1), 100_000, 100_000, 0.0)
+        results.append(empty)
+
+        summary = summarize_many(results, risk_free_rate=0.03)
+
+        expected = pd.DataFrame([result.get_summary_stats(0.03) for result in results])
+        assert list(summary.columns) == list(expected.columns)
+        pd.testing.assert_frame_equal(summary, expected, check_dtype=False, rtol=1e-9)
+
+    def test_empty_input(self):
+        """Test no results give an empty frame."""
+        assert summarize_many([]).empty
@@ -0,0 +1,111 @@
+"""Tests for bootstrap and Monte Carlo robustness analysis."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from copilot_quant.backtest.metrics import PerformanceAnalyzer
+from copilot_quant.backtest.robustness import RobustnessAnalyzer
+from copilot_quant.backtest.vectorized import VectorizedBacktester
+from tests.test_backtest.test_vectorized import make_prices
+
+
+def crossover_result(prices):
+    """Moving-average crossover backtest with many round trips."""
+    sma = prices.rolling(20).mean()
+    signals = (prices > sma).astype(float).where(sma.notna())
+    return VectorizedBacktester(initial_capital=100000).run(prices, signals=signals, order_size=100)
+
+
+@pytest.fixture(scope="module")
+def prices():
+    return make_prices(num_bars=500, seed=5, drift=0.0004)
+
+
+@pytest.fixture(scope="module")
+def result(prices):
+    return crossover_result(prices)
+
+
+class TestPathMetrics:
+    """Tests for PerformanceAnalyzer.calculate_path_metrics."""
+
+    def test_matches_calculate_metrics(self, result):
+        """Test the vectorized path metrics equal the per-curve definitions."""
+        equity = result.get_equity_curve()
+        analyzer = PerformanceAnalyzer()
+        expected = analyzer.calculate_metrics(equity, [], result.initial_capital)
+
+        metrics = analyzer.calculate_path_metrics(equity.to_numpy()[None, :], result.initial_capital)
+
+        for name in ("total_return", "cagr", "volatility", "sharpe_ratio", "sortino_ratio", "max_drawdown"):
+            assert metrics[name][0] == pytest.approx(expected[name], rel=1e-9)
+
+
+class TestRobustnessAnalyzer:
+    """Tests for RobustnessAnalyzer."""
+
+    def test_intervals_cover_point_estimates(self, result, prices):
+        """Test every method reports a Sharpe, CAGR and drawdown interval."""
+        robustness = RobustnessAnalyzer(num_samples=400, seed=1).run(result, prices=prices, max_workers=1)
+
+        assert len(robustness.samples) == 1200
+        assert set(robustness.intervals["method"]) == {"block_bootstrap", "trade_shuffle", "entry_delay"}
+        lower, upper = robustness.interval("sharpe_ratio")
+        point = robustness.intervals.query("method == 'block_bootstrap' and metric == 'sharpe_ratio'")["point"]
+        assert lower < point.iloc[0] < upper
+        assert point.iloc[0] == pytest.approx(result.get_metric("sharpe_ratio"))
+
+    def test_results_independent_of_workers(self, result):
+        """Test batches are seeded so worker processes give the in-process samples."""
+        analyzer = RobustnessAnalyzer(num_samples=300, batch_size=100, seed=7)
+
+        local = analyzer.run(result, max_workers=1)
+        parallel = analyzer.run(result, max_workers=2)
+
+        pd.testing.assert_frame_equal(local.samples, parallel.samples)
+
+    def test_trade_shuffle_preserves_total_pnl(self, result):
+        """Test shuffling trade order changes the drawdown but not the CAGR."""
+        robustness = RobustnessAnalyzer(num_samples=200, seed=3).run(result, methods=["trade_shuffle"])
+        samples = robustness.samples
+
+        point = robustness.intervals.set_index("metric")["point"]
+        np.testing.assert_allclose(samples["cagr"], point["cagr"], rtol=1e-9)
+        assert samples["max_drawdown"].std() > 0
+        assert (samples["max_drawdown"] <= 0).all()
+
+    def test_zero_delay_reproduces_trades(self, result, prices):
+        """Test entry_delay with no delay replays the original round trips."""
+        robustness = RobustnessAnalyzer(num_samples=50, max_delay=0).run(result, methods=["entry_delay"], prices=prices)
+
+        point = robustness.intervals.set_index("metric")["point"]
+        for metric in ("sharpe_ratio", "cagr", "max_drawdown"):
+            np.testing.assert_allclose(robustness.samples[metric], point[metric], rtol=1e-9)
+
+    def test_entry_delay_spreads_outcomes(self, result, prices):
+        """Test delayed entries produce a distribution of CAGRs around the original."""
+        robustness = RobustnessAnalyzer(num_samples=200, max_delay=3, seed=2).run(
+            result, methods=["entry_delay"], prices=prices
+        )
+
+        assert robustness.samples["cagr"].std() > 0
+        lower, upper = robustness.interval("cagr", method="entry_delay")
+        assert lower < upper
+
+    def test_entry_delay_needs_prices(self, result):
+        """Test entry_delay is skipped by default and rejected without prices."""
+        robustness = RobustnessAnalyzer(num_samples=10).run(result, max_workers=1)
+        assert "entry_delay" not in set(robustness.samples["method"])
+
+        with pytest.raises(ValueError, match="Requires a prices panel"):
+            RobustnessAnalyzer(num_samples=10).run(result, methods=["entry_delay"])
+
+    def test_invalid_arguments(self, result):
+        """Test argument validation."""
+        with pytest.raises(ValueError, match="Invalid num_samples"):
+            RobustnessAnalyzer(num_samples=0)
+        with pytest.raises(ValueError, match="Invalid confidence"):
+            RobustnessAnalyzer(confidence=1.0)
+        with pytest.raises(ValueError, match="Invalid method"):
+            RobustnessAnalyzer().run(result, methods=["jackknife"])
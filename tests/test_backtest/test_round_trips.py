@@ -0,0 +1,135 @@
+"""Tests for FIFO round-trip matching."""
+
+from collections import deque
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from copilot_quant.backtest.ledger import TradeLedger
+from copilot_quant.backtest.round_trips import ROUND_TRIP_COLUMNS, match_round_trips, round_trip_stats
+
+TIMES = pd.date_range("2024-01-02", periods=6, freq="D")
+
+
+def reference_fifo(timestamps, symbols, quantities, prices, commissions):
+    """Straightforward per-fill FIFO matcher used as the oracle."""
+    lots, trips = {}, []
+    for time, symbol, quantity, price, commission in zip(
+        timestamps, symbols, quantities, prices, commissions, strict=True
+    ):
+        book = lots.setdefault(symbol, deque())
+        remaining, sign, unit = abs(quantity), np.sign(quantity), commission / abs(quantity)
+        while remaining > 0 and book and book[0][1] != sign:
+            lot_qty, lot_sign, lot_price, lot_time, lot_unit = book[0]
+            matched = min(lot_qty, remaining)
+            cost = (lot_unit + unit) * matched
+            trips.append((symbol, lot_time, time, matched, lot_sign * matched * (price - lot_price) - cost))
+            remaining -= matched
+            if matched == lot_qty:
+                book.popleft()
+            else:
+                book[0] = (lot_qty - matched, lot_sign, lot_price, lot_time, lot_unit)
+        if remaining > 0:
+            book.append((remaining, sign, price, time, unit))
+    return pd.DataFrame(trips, columns=["symbol", "entry_time", "exit_time", "quantity", "pnl"])
+
+
+class TestMatchRoundTrips:
+    """Tests for match_round_trips."""
+
+    def test_partial_closes_use_oldest_lots(self):
+        """Test a sell spanning two lots is split between them in FIFO order."""
+        trips = match_round_trips(
+            TIMES[:4], ["AAPL"] * 4, [10, 5, -12, -3], [100.0, 110.0, 120.0, 90.0], [1.0, 0.5, 1.2, 0.3]
+        )
+
+        assert list(trips.columns) == ROUND_TRIP_COLUMNS
+        assert list(trips["quantity"]) == [10, 2, 3]
+        assert list(trips["entry_price"]) == [100.0, 110.0, 110.0]
+        assert list(trips["exit_price"]) == [120.0, 120.0, 90.0]
+        # Lot 1: 10 x 20 - (1.0 + 1.2 * 10/12)
+        assert trips["pnl"].iloc[0] == pytest.approx(200 - 2.0)
+        assert trips["holding_period"].iloc[1] == pd.Timedelta(days=1)
+
+    def test_short_and_flip(self):
+        """Test shorts are matched and a fill through zero closes then reopens."""
+        trips = match_round_trips(TIMES[:3], ["TSLA"] * 3, [-5, 8, -3], [200.0, 190.0, 195.0])
+
+        assert list(trips["direction"]) == ["short", "long"]
+        assert list(trips["quantity"]) == [5, 3]
+        assert list(trips["pnl"]) == [50.0, 15.0]
+
+    def test_symbols_are_matched_independently(self):
+        """Test interleaved symbols never match each other."""
+        trips = match_round_trips(TIMES[:4], ["A", "B", "A", "B"], [10, 10, -10, -10], [1.0, 5.0, 2.0, 4.0])
+
+        assert list(trips["symbol"]) == ["A", "B"]
+        assert list(trips["pnl"]) == [10.0, -10.0]
+
+    def test_open_position_has_no_round_trip(self):
+        """Test unmatched opening fills produce no rows."""
+        trips = match_round_trips(TIMES[:2], ["A", "A"], [10, 5], [1.0, 2.0])
+
+        assert trips.empty
+        assert list(trips.columns) == ROUND_TRIP_COLUMNS
+
+    def test_matches_reference(self):
+        """Test random fill streams against a per-fill FIFO loop."""
+        rng = np.random.default_rng(42)
+        for _ in range(50):
+            n = int(rng.integers(1, 80))
+            symbols = rng.choice(["A", "B", "C"], n)
+            quantities = rng.integers(1, 11, n) * rng.choice([-1, 1], n)
+            prices = rng.uniform(50, 150, n)
+            commissions = rng.uniform(0, 2, n)
+            timestamps = pd.date_range("2024-01-01", periods=n, freq="h")
+
+            trips = match_round_trips(timestamps, symbols, quantities, prices, commissions)
+            expected = reference_fifo(timestamps, symbols, quantities, prices, commissions)
+            expected = expected.sort_values(["exit_time", "entry_time"], kind="stable", ignore_index=True)
+
+            pd.testing.assert_frame_equal(trips[expected.columns], expected, check_dtype=False)
+
+    def test_mismatched_lengths(self):
+        """Test arrays of different lengths are rejected."""
+        with pytest.raises(ValueError, match="lengths"):
+            match_round_trips(TIMES[:2], ["A"], [1, -1], [1.0, 2.0])
+
+
+class TestRoundTripStats:
+    """Tests for round_trip_stats."""
+
+    def test_stats(self):
+        """Test win rate, profit factor and averages."""
+        stats = round_trip_stats([30.0, -10.0, 10.0, -20.0])
+
+        assert stats["num_trades"] == 4
+        assert stats["num_winning"] == 2
+        assert stats["win_rate"] == 0.5
+        assert stats["profit_factor"] == pytest.approx(40 / 30)
+        assert stats["avg_win"] == 20.0
+        assert stats["avg_loss"] == -15.0
+        assert stats["avg_trade"] == 2.5
+
+    def test_empty(self):
+        """Test no round trips give zeros."""
+        assert round_trip_stats([]) == dict.fromkeys(round_trip_stats([]), 0)
+
+
+class TestLedgerRoundTrips:
+    """Tests for round trips read from a TradeLedger."""
+
+    def test_ledger_round_trips(self):
+        """Test ledger columns are matched and symbol ids mapped back to names."""
+        ledger = TradeLedger()
+        ledger.append(TIMES[0], "MSFT", "buy", 10, 300.0, 3.0)
+        ledger.append(TIMES[1], "AAPL", "sell", 4, 150.0, 0.0)
+        ledger.append(TIMES[2], "MSFT", "sell", 10, 310.0, 3.1)
+        ledger.append(TIMES[3], "AAPL", "buy", 4, 140.0, 0.0)
+
+        trips = ledger.round_trips()
+
+        assert list(trips["symbol"]) == ["MSFT", "AAPL"]
+        assert list(trips["direction"]) == ["long", "short"]
+        assert list(trips["pnl"]) == pytest.approx([100.0 - 6.1, 40.0])
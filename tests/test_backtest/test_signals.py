@@ -65,6 +65,13 @@ class TestTradingSignal:
         with pytest.raises(ValueError, match="Invalid entry_price"):
             TradingSignal(symbol="AAPL", side="buy", confidence=0.8, sharpe_estimate=1.5, entry_price=-10.0)
 
+    def test_invalid_quantity(self):
+        """Test that a non-positive explicit quantity raises ValueError."""
+        with pytest.raises(ValueError, match="Invalid quantity"):
+            TradingSignal(
+                symbol="AAPL", side="sell", confidence=1.0, sharpe_estimate=1.5, entry_price=150.0, quantity=0.0
+            )
+
     def test_quality_score_calculation(self):
         """Test quality score calculation."""
         # Test with normal values
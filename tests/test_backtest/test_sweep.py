@@ -0,0 +1,322 @@
+"""Tests for parallel parameter sweeps."""
+
+import json
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from copilot_quant.backtest.multi_strategy import MultiStrategyEngine
+from copilot_quant.backtest.orders import Order
+from copilot_quant.backtest.signals import SignalBasedStrategy, TradingSignal
+from copilot_quant.backtest.strategy import Strategy
+from copilot_quant.backtest.sweep import (
+    ParameterGrid,
+    ParameterSweep,
+    RandomSearch,
+    SharedMarketData,
+    derive_seed,
+)
+from copilot_quant.data.providers import DataProvider
+
+
+class CountingProvider(DataProvider):
+    """Random-walk data provider that counts fetches."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def _dates(self):
+        return pd.bdate_range("2023-01-02", periods=60)
+
+    def get_historical_data(self, symbol, start_date=None, end_date=None, interval="1d"):
+        self.calls += 1
+        close = 100 + np.cumsum(np.random.default_rng(1).normal(0, 1, 60))
+        return pd.DataFrame({"Close": close, "Volume": 1_000_000}, index=self._dates())
+
+    def get_multiple_symbols(self, symbols, start_date=None, end_date=None, interval="1d"):
+        self.calls += 1
+        rng = np.random.default_rng(2)
+        data = {("Close", s): 100 + np.cumsum(rng.normal(0, 1, 60)) for s in symbols}
+        data.update({("Volume", s): np.full(60, 1_000_000) for s in symbols})
+        df = pd.DataFrame(data, index=self._dates())
+        df.columns = pd.MultiIndex.from_tuples(df.columns)
+        return df
+
+    def get_ticker_info(self, symbol):
+        return {"symbol": symbol}
+
+
+class MovingAverageStrategy(Strategy):
+    """Goes long above the moving average, flat below."""
+
+    def __init__(self, window: int, quantity: int = 10):
+        super().__init__()
+        self.window = window
+        self.quantity = quantity
+        self.invested = False
+
+    def on_data(self, timestamp, data):
+        closes = data["Close"]
+        if len(closes) < self.window:
+            return []
+        above = closes.iloc[-1] > closes.iloc[-self.window :].mean()
+        if above and not self.invested:
+            self.invested = True
+            return [Order(symbol="SPY", quantity=self.quantity, order_type="market", side="buy")]
+        if not above and self.invested:
+            self.invested = False
+            return [Order(symbol="SPY", quantity=self.quantity, order_type="market", side="sell")]
+        return []
+
+
+class NoisyStrategy(Strategy):
+    """Trades on draws from the global NumPy RNG (exercises seeding)."""
+
+    def on_data(self, timestamp, data):
+        side = "buy" if np.random.random() < 0.5 else "sell"
+        return [Order(symbol="SPY", quantity=1, order_type="market", side=side)]
+
+
+class BuySignalStrategy(SignalBasedStrategy):
+    """Emits a buy signal for AAPL on the first bar."""
+
+    def __init__(self):
+        super().__init__()
+        self.done = False
+
+    def generate_signals(self, timestamp, data):
+        if self.done:
+            return []
+        self.done = True
+        return [
+            TradingSignal(
+                symbol="AAPL",
+                side="buy",
+                confidence=1.0,
+                sharpe_estimate=1.0,
+                entry_price=100.0,
+                strategy_name=self.name,
+            )
+        ]
+
+
+def make_moving_average(params):
+    """Module-level (picklable) strategy factory."""
+    if params["window"] <= 0:
+        raise ValueError("window must be positive")
+    return MovingAverageStrategy(window=params["window"])
+
+
+def make_noisy(params):
+    return NoisyStrategy()
+
+
+def run_sweep(**kwargs):
+    provider = CountingProvider()
+    sweep = ParameterSweep(make_moving_average, data_provider=provider, initial_capital=100_000)
+    results = sweep.run(
+        kwargs.pop("parameters", ParameterGrid({"window": [5, 10, 20]})),
+        start_date=datetime(2023, 1, 1),
+        end_date=datetime(2023, 12, 31),
+        symbols=["SPY"],
+        **kwargs,
+    )
+    return provider, results
+
+
+class TestParameterSpaces:
+    """Tests for ParameterGrid and RandomSearch."""
+
+    def test_grid_product(self):
+        """Test the grid enumerates the cartesian product."""
+        grid = ParameterGrid({"a": [1, 2], "b": ["x", "y", "z"]})
+
+        params = list(grid)
+
+        assert len(grid) == 6
+        assert params[0] == {"a": 1, "b": "x"}
+        assert params[-1] == {"a": 2, "b": "z"}
+
+    def test_grid_rejects_empty_values(self):
+        """Test empty candidate lists are rejected."""
+        with pytest.raises(ValueError, match="no values"):
+            ParameterGrid({"a": []})
+
+    def test_random_search_is_deterministic(self):
+        """Test the same seed yields the same samples."""
+        space = {"z": lambda rng: rng.uniform(1.0, 3.0), "lookback": [20, 40, 60]}
+
+        first = list(RandomSearch(space, n_iter=5, seed=3))
+        second = list(RandomSearch(space, n_iter=5, seed=3))
+
+        assert first == second
+        assert all(1.0 <= p["z"] <= 3.0 and p["lookback"] in (20, 40, 60) for p in first)
+        assert isinstance(first[0]["z"], float)
+
+    def test_random_search_invalid_n_iter(self):
+        """Test non-positive n_iter is rejected."""
+        with pytest.raises(ValueError, match="n_iter"):
+            RandomSearch({"a": [1]}, n_iter=0)
+
+    def test_derive_seed_depends_only_on_params(self):
+        """Test per-run seeds are stable and distinct."""
+        assert derive_seed(0, {"a": 1, "b": 2}) == derive_seed(0, {"b": 2, "a": 1})
+        assert derive_seed(0, {"a": 1}) != derive_seed(0, {"a": 2})
+        assert derive_seed(0, {"a": 1}) != derive_seed(1, {"a": 1})
+
+
+class TestSharedMarketData:
+    """Tests for memory-mapped market data sharing."""
+
+    def test_round_trip_multiindex(self, tmp_path):
+        """Test MultiIndex frames are reconstructed exactly."""
+        data = CountingProvider().get_multiple_symbols(["AAPL", "MSFT"])
+
+        loaded = SharedMarketData.write(data, tmp_path).load()
+
+        pd.testing.assert_frame_equal(loaded, data)
+
+    def test_round_trip_long_format(self, tmp_path):
+        """Test object columns such as Symbol survive the round trip."""
+        dates = pd.date_range("2023-01-01", periods=3)
+        data = pd.DataFrame(
+            {"Close": [1.0, 2.0, 3.0], "Symbol": ["AAPL", None, "MSFT"]},
+            index=dates,
+        )
+
+        loaded = SharedMarketData.write(data, tmp_path).load()
+
+        assert list(loaded["Symbol"].iloc[[0, 2]]) == ["AAPL", "MSFT"]
+        assert pd.isna(loaded["Symbol"].iloc[1])
+        pd.testing.assert_series_equal(loaded["Close"], data["Close"])
+
+    def test_loaded_columns_are_copy_on_write(self, tmp_path):
+        """Test writes to the loaded frame do not change the files."""
+        data = CountingProvider().get_historical_data("SPY")
+        shared = SharedMarketData.write(data, tmp_path)
+
+        loaded = shared.load()
+        loaded.iloc[0, 0] = -1.0
+
+        assert shared.load().iloc[0, 0] == data.iloc[0, 0]
+
+
+class TestParameterSweep:
+    """Tests for ParameterSweep."""
+
+    def test_tidy_results(self):
+        """Test one row per parameter set with parameters and metrics."""
+        provider, results = run_sweep(max_workers=1)
+
+        assert list(results["run_id"]) == [0, 1, 2]
+        assert list(results["window"]) == [5, 10, 20]
+        assert {"sharpe_ratio", "max_drawdown", "total_return", "seed", "error", "elapsed_s"} <= set(results.columns)
+        assert results["error"].isna().all()
+        assert provider.calls == 1  # data fetched once for the whole sweep
+
+    def test_progress_callback(self):
+        """Test progress is reported after every run."""
+        calls = []
+
+        run_sweep(max_workers=1, progress=lambda done, total, record: calls.append((done, total)))
+
+        assert calls == [(1, 3), (2, 3), (3, 3)]
+
+    def test_failed_run_is_recorded(self):
+        """Test a failing parameter set does not abort the sweep."""
+        _, results = run_sweep(max_workers=1, parameters=[{"window": 5}, {"window": 0}])
+
+        assert results["error"].iloc[0] is None
+        assert "window must be positive" in results["error"].iloc[1]
+
+    def test_parallel_matches_serial(self):
+        """Test process-pool results equal in-process results."""
+        _, serial = run_sweep(max_workers=1)
+        _, parallel = run_sweep(max_workers=2)
+
+        columns = ["window", "seed", "total_return", "sharpe_ratio", "total_trades"]
+        pd.testing.assert_frame_equal(serial[columns], parallel[columns])
+
+    def test_deterministic_seeding(self):
+        """Test runs using the global RNG reproduce across sweeps."""
+        sweep = ParameterSweep(make_noisy, data_provider=CountingProvider(), initial_capital=100_000, seed=5)
+        kwargs = dict(start_date=datetime(2023, 1, 1), end_date=datetime(2023, 12, 31), symbols=["SPY"])
+        params = [{"run": 1}, {"run": 2}]
+
+        first = sweep.run(params, max_workers=1, **kwargs)
+        second = sweep.run(params, max_workers=2, **kwargs)
+
+        pd.testing.assert_series_equal(first["final_capital"], second["final_capital"], check_names=False)
+
+    def test_resume_from_checkpoint(self, tmp_path):
+        """Test completed runs are skipped when resuming."""
+        checkpoint = tmp_path / "sweep.jsonl"
+        run_sweep(max_workers=1, checkpoint_path=checkpoint, parameters=[{"window": 5}, {"window": 0}])
+
+        provider, results = run_sweep(max_workers=1, checkpoint_path=checkpoint)
+
+        lines = [json.loads(line) for line in checkpoint.read_text().splitlines()]
+        assert len(lines) == 4  # 2 from the first sweep + windows 10 and 20
+        assert len(results) == 3
+        assert results["error"].isna().all()
+        assert provider.calls == 1
+
+    def test_fully_resumed_sweep_skips_fetch(self, tmp_path):
+        """Test nothing is fetched when every run is already checkpointed."""
+        checkpoint = tmp_path / "sweep.jsonl"
+        _, first = run_sweep(max_workers=1, checkpoint_path=checkpoint)
+
+        provider, second = run_sweep(max_workers=1, checkpoint_path=checkpoint)
+
+        assert provider.calls == 0
+        pd.testing.assert_series_equal(first["sharpe_ratio"], second["sharpe_ratio"])
+
+    def test_checkpoint_ignored_for_different_config(self, tmp_path):
+        """Test records from a sweep over another date range are not reused."""
+        checkpoint = tmp_path / "sweep.jsonl"
+        run_sweep(max_workers=1, checkpoint_path=checkpoint)
+
+        provider = CountingProvider()
+        sweep = ParameterSweep(make_moving_average, data_provider=provider, initial_capital=100_000)
+        results = sweep.run(
+            ParameterGrid({"window": [5, 10, 20]}),
+            start_date=datetime(2023, 1, 1),
+            end_date=datetime(2023, 2, 28),
+            symbols=["SPY"],
+            max_workers=1,
+            checkpoint_path=checkpoint,
+        )
+
+        assert provider.calls == 1
+        assert len(results) == 3
+        assert len(checkpoint.read_text().splitlines()) == 6
+
+    def test_engine_parameters_routed_to_engine(self):
+        """Test parameters matching engine arguments configure the engine."""
+        sweep = ParameterSweep(
+            lambda params: [BuySignalStrategy()],
+            data_provider=CountingProvider(),
+            initial_capital=100_000,
+            engine_cls=MultiStrategyEngine,
+            engine_kwargs={"commission": 0.0, "slippage": 0.0},
+        )
+
+        results = sweep.run(
+            ParameterGrid({"max_position_pct": [0.01, 0.10]}),
+            start_date=datetime(2023, 1, 1),
+            end_date=datetime(2023, 12, 31),
+            symbols=["AAPL", "MSFT"],
+            max_workers=1,
+        )
+
+        assert results["error"].isna().all()
+        # A larger position limit buys more shares and moves the equity more
+        moves = (results["final_capital"] - 100_000).abs()
+        assert moves.iloc[1] > moves.iloc[0]
+
+    def test_invalid_max_workers(self):
+        """Test non-positive max_workers is rejected."""
+        with pytest.raises(ValueError, match="max_workers"):
+            run_sweep(max_workers=0)
@@ -0,0 +1,148 @@
+"""Tests for universe fan-out backtests."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from copilot_quant.backtest.orders import Order
+from copilot_quant.backtest.strategy import Strategy
+from copilot_quant.backtest.universe import SharedPricePanel, UniverseRunner
+
+
+def make_panel(symbols=("AAA", "BBB", "CCC", "DDD", "EEE"), num_bars=120, seed=3):
+    """Loader-style panel with (field, symbol) columns and lower-case fields."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2023-01-02", periods=num_bars, name="date")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, size=(num_bars, len(symbols))), axis=0))
+    volume = np.full_like(close, 1_000_000.0)
+    columns = pd.MultiIndex.from_product([["close", "volume"], list(symbols)])
+    return pd.DataFrame(np.hstack([close, volume]), index=dates, columns=columns)
+
+
+class MovingAverageStrategy(Strategy):
+    """Goes long above the moving average, flat below."""
+
+    def __init__(self, symbol: str, window: int = 10):
+        super().__init__()
+        self.symbol = symbol
+        self.window = window
+        self.invested = False
+
+    def on_data(self, timestamp, data):
+        closes = data["Close"]
+        if len(closes) < self.window:
+            return []
+        above = closes.iloc[-1] > closes.iloc[-self.window :].mean()
+        if above and not self.invested:
+            self.invested = True
+            return [Order(symbol=self.symbol, quantity=10, order_type="market", side="buy")]
+        if not above and self.invested:
+            self.invested = False
+            return [Order(symbol=self.symbol, quantity=10, order_type="market", side="sell")]
+        return []
+
+
+def make_strategy(symbol):
+    """Module-level (picklable) strategy factory."""
+    if symbol == "BAD":
+        raise ValueError("unsupported symbol")
+    return MovingAverageStrategy(symbol)
+
+
+class TestSharedPricePanel:
+    """Tests for SharedPricePanel."""
+
+    def test_frame_matches_panel(self, tmp_path):
+        """Test per-symbol frames use engine column names and the panel's values."""
+        panel = make_panel()
+        shared = SharedPricePanel.write(panel, tmp_path)
+
+        frame = shared.frame("BBB")
+
+        assert list(frame.columns) == ["Close", "Volume"]
+        np.testing.assert_array_equal(frame["Close"].to_numpy(), panel[("close", "BBB")].to_numpy())
+        assert shared.symbols == ["AAA", "BBB", "CCC", "DDD", "EEE"]
+
+    def test_frame_trims_unlisted_bars(self, tmp_path):
+        """Test bars before a late listing and after a delisting are dropped."""
+        panel = make_panel()
+        panel.loc[panel.index[:10], ("close", "CCC")] = np.nan
+        panel.loc[panel.index[-5:], ("close", "CCC")] = np.nan
+
+        frame = SharedPricePanel.write(panel, tmp_path).frame("CCC")
+
+        assert len(frame) == len(panel) - 15
+        assert frame.index[0] == panel.index[10]
+
+    def test_single_field_panel_is_close(self, tmp_path):
+        """Test a plain dates x symbols panel is treated as close prices."""
+        panel = make_panel()["close"]
+
+        frame = SharedPricePanel.write(panel, tmp_path).frame("AAA")
+
+        assert list(frame.columns) == ["Close"]
+
+
+class TestUniverseRunner:
+    """Tests for UniverseRunner."""
+
+    def test_one_row_per_symbol(self):
+        """Test each symbol gets its own backtest and metrics row."""
+        panel = make_panel()
+        universe = UniverseRunner(make_strategy, initial_capital=100_000).run(panel, max_workers=1)
+
+        results = universe.results
+        assert results["symbol"].tolist() == ["AAA", "BBB", "CCC", "DDD", "EEE"]
+        assert results["error"].isna().all()
+        assert (results["bars"] == len(panel)).all()
+        assert {"sharpe_ratio", "max_drawdown", "total_trades", "final_capital", "elapsed_s"} <= set(results.columns)
+        assert results["total_trades"].gt(0).all()
+        assert universe.symbols_per_second > 0
+
+    def test_parallel_matches_serial(self):
+        """Test sharding across worker processes does not change results."""
+        panel = make_panel()
+        runner = UniverseRunner(make_strategy, initial_capital=100_000)
+
+        serial = runner.run(panel, max_workers=1).results
+        parallel = runner.run(panel, max_workers=2, shard_size=2)
+
+        assert parallel.num_workers == 2
+        columns = [c for c in serial.columns if c != "elapsed_s"]
+        pd.testing.assert_frame_equal(serial[columns], parallel.results[columns])
+
+    def test_failed_symbol_is_recorded(self):
+        """Test one failing symbol does not abort the run."""
+        panel = make_panel(symbols=("AAA", "BAD"))
+        progress = []
+
+        universe = UniverseRunner(make_strategy, initial_capital=100_000).run(
+            panel, max_workers=1, progress=lambda done, total, record: progress.append((done, total))
+        )
+
+        assert universe.failed == ["BAD"]
+        assert "unsupported symbol" in universe.results.set_index("symbol").loc["BAD", "error"]
+        assert progress == [(1, 2), (2, 2)]
+
+    def test_symbol_subset_and_dates(self):
+        """Test symbols and date bounds restrict the run."""
+        panel = make_panel()
+
+        universe = UniverseRunner(make_strategy, initial_capital=100_000).run(
+            panel, symbols=["DDD", "AAA"], start_date=panel.index[20], max_workers=1
+        )
+
+        assert universe.results["symbol"].tolist() == ["DDD", "AAA"]
+        assert (universe.results["bars"] == len(panel) - 20).all()
+
+    def test_invalid_arguments(self):
+        """Test argument validation."""
+        panel = make_panel()
+        runner = UniverseRunner(make_strategy, initial_capital=100_000)
+
+        with pytest.raises(ValueError, match="Invalid max_workers"):
+            runner.run(panel, max_workers=0)
+        with pytest.raises(ValueError, match="Invalid shard_size"):
+            runner.run(panel, shard_size=0)
+        with pytest.raises(ValueError, match="Invalid symbols"):
+            runner.run(panel, symbols=["ZZZ"])
@@ -0,0 +1,262 @@
+"""Tests for the vectorized backtester, including parity with BacktestEngine."""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from copilot_quant.backtest.engine import BacktestEngine
+from copilot_quant.backtest.orders import Order
+from copilot_quant.backtest.results import BacktestResult
+from copilot_quant.backtest.strategy import Strategy
+from copilot_quant.backtest.vectorized import VectorizedBacktester
+from copilot_quant.data.providers import DataProvider
+
+START = datetime(2020, 1, 1)
+END = datetime(2021, 1, 1)
+
+
+def make_prices(num_bars=250, symbols=("AAA", "BBB", "CCC"), seed=7, drift=0.0003):
+    """Random-walk close panel (dates x symbols)."""
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(drift, 0.015, size=(num_bars, len(symbols)))
+    closes = 50.0 * np.exp(np.cumsum(returns, axis=0))
+    return pd.DataFrame(closes, index=pd.bdate_range("2020-01-02", periods=num_bars), columns=list(symbols))
+
+
+class PanelProvider(DataProvider):
+    """Serves a close panel in the (Metric, Symbol) layout."""
+
+    def __init__(self, prices):
+        self.prices = prices
+
+    def get_historical_data(self, symbol, start_date=None, end_date=None, interval="1d"):
+        return pd.DataFrame({"Close": self.prices[symbol]})
+
+    def get_multiple_symbols(self, symbols, start_date=None, end_date=None, interval="1d"):
+        data = pd.concat({"Close": self.prices[symbols]}, axis=1)
+        return data
+
+    def get_ticker_info(self, symbol):
+        return {"symbol": symbol}
+
+
+class MovingAverageCrossover(Strategy):
+    """Long ``size`` shares while close > SMA, flat while close < SMA."""
+
+    data_mode = "window"
+
+    def __init__(self, symbols, window=20, size=10):
+        super().__init__()
+        self.symbols = symbols
+        self.window = window
+        self.size = size
+        self.max_lookback = window
+
+    def initialize(self):
+        self.invested = dict.fromkeys(self.symbols, False)
+
+    def on_data(self, timestamp, data):
+        orders = []
+        for symbol in self.symbols:
+            closes = data[("Close", symbol)]
+            if len(closes) < self.window or np.isnan(closes).any():
+                continue
+            price, sma = closes[-1], closes.mean()
+            if price > sma and not self.invested[symbol]:
+                self.invested[symbol] = True
+                orders.append(Order(symbol=symbol, quantity=self.size, order_type="market", side="buy"))
+            elif price < sma and self.invested[symbol]:
+                self.invested[symbol] = False
+                orders.append(Order(symbol=symbol, quantity=self.size, order_type="market", side="sell"))
+        return orders
+
+    @staticmethod
+    def signals(prices, window):
+        """The same decisions as a signal panel (NaN = keep previous)."""
+        sma = prices.rolling(window).mean()
+        signals = pd.DataFrame(np.nan, index=prices.index, columns=prices.columns)
+        signals[prices > sma] = 1.0
+        signals[prices < sma] = 0.0
+        return signals
+
+
+class TargetFollower(Strategy):
+    """Trades toward a precomputed target-share panel, tracking holdings from fills."""
+
+    data_mode = "window"
+    max_lookback = 1
+
+    def __init__(self, targets):
+        super().__init__()
+        self.targets = targets
+
+    def initialize(self):
+        self.held = dict.fromkeys(self.targets.columns, 0.0)
+
+    def on_data(self, timestamp, data):
+        orders = []
+        for symbol, target in self.targets.loc[timestamp].items():
+            delta = target - self.held[symbol]
+            if delta:
+                side = "buy" if delta > 0 else "sell"
+                orders.append(Order(symbol=symbol, quantity=abs(delta), order_type="market", side=side))
+        return orders
+
+    def on_fill(self, fill):
+        sign = 1 if fill.order.side == "buy" else -1
+        self.held[fill.order.symbol] += sign * fill.fill_quantity
+
+
+def run_engine(prices, strategy, commission=0.001, slippage=0.0005):
+    engine = BacktestEngine(100_000, PanelProvider(prices), commission=commission, slippage=slippage)
+    engine.add_strategy(strategy)
+    return engine.run(START, END, list(prices.columns))
+
+
+def assert_parity(event, vectorized):
+    """Assert two results agree on capital, equity, holdings and fills."""
+    assert vectorized.final_capital == pytest.approx(event.final_capital, rel=1e-12)
+    np.testing.assert_allclose(
+        vectorized.get_equity_curve().to_numpy(), event.get_equity_curve().to_numpy(), rtol=1e-12
+    )
+    np.testing.assert_allclose(vectorized.history.cash, event.history.cash, rtol=1e-12)
+
+    event_frame, vector_frame = event.portfolio_history, vectorized.portfolio_history
+    assert list(vector_frame.columns) == list(event_frame.columns)
+    pd.testing.assert_frame_equal(vector_frame, event_frame, check_exact=False, rtol=1e-12)
+
+    columns = ["symbol", "side", "quantity", "price", "commission"]
+    event_log = event.get_trade_log().reset_index().sort_values(["timestamp", "symbol"], ignore_index=True)
+    vector_log = vectorized.get_trade_log().reset_index().sort_values(["timestamp", "symbol"], ignore_index=True)
+    assert len(vector_log) == len(event_log) > 0
+    pd.testing.assert_frame_equal(
+        vector_log[columns], event_log[columns], check_dtype=False, check_exact=False, rtol=1e-12
+    )
+    assert (vector_log["timestamp"] == event_log["timestamp"]).all()
+
+
+class TestParity:
+    """The vectorized and event-driven engines agree on shared strategies."""
+
+    def test_moving_average_crossover(self):
+        """Test signal panel parity with a bar-by-bar SMA crossover."""
+        prices = make_prices()
+
+        event = run_engine(prices, MovingAverageCrossover(list(prices.columns), window=20, size=10))
+        signals = MovingAverageCrossover.signals(prices, window=20)
+        vectorized = VectorizedBacktester(100_000, commission=0.001, slippage=0.0005).run(
+            prices, signals=signals, order_size=10, start_date=START, end_date=END
+        )
+
+        assert_parity(event, vectorized)
+
+    def test_rebalancing_targets(self):
+        """Test partial buys and sells toward a changing target panel."""
+        prices = make_prices(seed=11)
+        rng = np.random.default_rng(3)
+        targets = pd.DataFrame(
+            rng.integers(0, 40, size=prices.shape).astype(float), index=prices.index, columns=prices.columns
+        )
+        targets.iloc[::3] = np.nan  # hold on every third bar
+        targets = targets.ffill().fillna(0.0)
+
+        event = run_engine(prices, TargetFollower(targets), commission=0.002, slippage=0.001)
+        vectorized = VectorizedBacktester(100_000, commission=0.002, slippage=0.001).run(prices, positions=targets)
+
+        assert_parity(event, vectorized)
+
+    def test_symbol_without_price_waits_for_first_bar(self):
+        """Test targets for an unlisted symbol are applied on its first price."""
+        prices = make_prices(num_bars=60)
+        prices.iloc[:15, prices.columns.get_loc("CCC")] = np.nan
+        targets = pd.DataFrame(5.0, index=prices.index, columns=prices.columns)
+
+        event = run_engine(prices, TargetFollower(targets))
+        vectorized = VectorizedBacktester(100_000).run(prices, positions=targets)
+
+        assert_parity(event, vectorized)
+        first_ccc = vectorized.get_trade_log().query("symbol == 'CCC'").index[0]
+        assert first_ccc == prices.index[15]
+
+    def test_provider_layout_prices(self):
+        """Test (Metric, Symbol) provider data is accepted as the price panel."""
+        prices = make_prices(num_bars=80)
+        data = PanelProvider(prices).get_multiple_symbols(list(prices.columns))
+        signals = MovingAverageCrossover.signals(prices, window=10)
+
+        from_panel = VectorizedBacktester(100_000).run(prices, signals=signals, order_size=10)
+        from_provider = VectorizedBacktester(100_000).run(data, signals=signals, order_size=10)
+
+        assert from_provider.final_capital == from_panel.final_capital
+        assert len(from_provider.trades) == len(from_panel.trades)
+
+
+class TestVectorizedBacktester:
+    """Tests for VectorizedBacktester accounting and validation."""
+
+    def test_costs_and_equity(self):
+        """Test a single round trip against hand-computed cash flows."""
+        prices = pd.DataFrame({"AAA": [100.0, 110.0, 120.0]}, index=pd.bdate_range("2024-01-01", periods=3))
+        positions = pd.DataFrame({"AAA": [10.0, 10.0, 0.0]}, index=prices.index)
+
+        result = VectorizedBacktester(10_000, commission=0.01, slippage=0.001).run(prices, positions=positions)
+
+        buy_price, sell_price = 100.0 * 1.001, 120.0 * 0.999
+        cash_after_buy = 10_000 - 10 * buy_price * 1.01
+        final = cash_after_buy + 10 * sell_price * 0.99
+        assert isinstance(result, BacktestResult)
+        assert result.final_capital == pytest.approx(final)
+        np.testing.assert_allclose(
+            result.get_equity_curve().to_numpy(), [10_000, cash_after_buy + 1100, cash_after_buy + 1200]
+        )
+        assert [fill.order.side for fill in result.trades] == ["buy", "sell"]
+        assert result.trades[1].commission == pytest.approx(10 * sell_price * 0.01)
+
+    def test_short_positions_marked_at_market(self):
+        """Test shorts add proceeds to cash and are valued at quantity x price."""
+        prices = pd.DataFrame({"AAA": [100.0, 90.0, 90.0]}, index=pd.bdate_range("2024-01-01", periods=3))
+
+        result = VectorizedBacktester(10_000, commission=0.0, slippage=0.0).run(
+            prices, signals=pd.DataFrame({"AAA": [-1.0]}, index=prices.index[:1]), order_size=10
+        )
+
+        assert result.get_equity_curve().iloc[-1] == pytest.approx(10_100)
+        assert result.final_capital == pytest.approx(10_100)
+
+    def test_order_size_per_symbol(self):
+        """Test a Series of order sizes scales each symbol's signal."""
+        prices = make_prices(num_bars=5)
+        signals = pd.DataFrame(1.0, index=prices.index, columns=prices.columns)
+
+        result = VectorizedBacktester(100_000).run(
+            prices, signals=signals, order_size=pd.Series({"AAA": 1, "BBB": 2, "CCC": 3})
+        )
+
+        quantities = {fill.order.symbol: fill.fill_quantity for fill in result.trades}
+        assert quantities == {"AAA": 1, "BBB": 2, "CCC": 3}
+
+    def test_empty_prices(self):
+        """Test an empty panel returns an empty result."""
+        result = VectorizedBacktester(10_000).run(pd.DataFrame(), positions=pd.DataFrame())
+
+        assert result.final_capital == 10_000
+        assert result.trades == []
+        assert result.get_equity_curve().empty
+
+    def test_invalid_arguments(self):
+        """Test invalid configuration and inputs are rejected."""
+        prices = make_prices(num_bars=5)
+        backtester = VectorizedBacktester(10_000)
+
+        with pytest.raises(ValueError, match="exactly one"):
+            backtester.run(prices)
+        with pytest.raises(ValueError, match="exactly one"):
+            backtester.run(prices, positions=prices, signals=prices)
+        with pytest.raises(ValueError, match="duplicate"):
+            backtester.run(pd.concat([prices, prices]), positions=prices)
+        with pytest.raises(ValueError, match="initial_capital"):
+            VectorizedBacktester(0)
+        with pytest.raises(ValueError, match="commission"):
+            VectorizedBacktester(10_000, commission=-0.1)
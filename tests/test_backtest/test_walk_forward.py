@@ -0,0 +1,262 @@
+"""Tests for walk-forward optimization."""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from copilot_quant.backtest.orders import Order
+from copilot_quant.backtest.strategy import Strategy
+from copilot_quant.backtest.sweep import ParameterGrid
+from copilot_quant.backtest.walk_forward import (
+    WalkForwardOptimizer,
+    walk_forward_windows,
+)
+from copilot_quant.data.providers import DataProvider
+
+
+class TrendingProvider(DataProvider):
+    """Steadily rising prices so larger positions always earn more."""
+
+    def __init__(self, num_bars: int = 100):
+        self.num_bars = num_bars
+        self.calls = 0
+
+    def get_historical_data(self, symbol, start_date=None, end_date=None, interval="1d"):
+        self.calls += 1
+        dates = pd.bdate_range("2023-01-02", periods=self.num_bars)
+        close = 100.0 * np.exp(0.002 * np.arange(self.num_bars))
+        return pd.DataFrame({"Close": close, "Volume": 1_000_000}, index=dates)
+
+    def get_multiple_symbols(self, symbols, start_date=None, end_date=None, interval="1d"):
+        raise NotImplementedError
+
+    def get_ticker_info(self, symbol):
+        return {"symbol": symbol}
+
+
+class BuyAndHold(Strategy):
+    """Buys ``quantity`` shares on the first bar it sees."""
+
+    def __init__(self, quantity: int):
+        super().__init__()
+        self.quantity = quantity
+        self.bought = False
+
+    def on_data(self, timestamp, data):
+        if self.bought:
+            return []
+        self.bought = True
+        return [Order(symbol="SPY", quantity=self.quantity, order_type="market", side="buy")]
+
+
+class BuyAfterHistory(BuyAndHold):
+    """Buys once at least ``history`` bars of data are available."""
+
+    history = 30
+
+    def on_data(self, timestamp, data):
+        if len(data) < self.history:
+            return []
+        return super().on_data(timestamp, data)
+
+
+def make_buy_and_hold(params):
+    return BuyAndHold(quantity=params["quantity"])
+
+
+def run_walk_forward(provider=None, factory=make_buy_and_hold, engine_kwargs=None, **kwargs):
+    provider = provider or TrendingProvider()
+    optimizer = WalkForwardOptimizer(
+        factory,
+        data_provider=provider,
+        initial_capital=100_000,
+        engine_kwargs=engine_kwargs or {"commission": 0.0, "slippage": 0.0},
+    )
+    kwargs.setdefault("max_workers", 1)
+    wf = optimizer.run(
+        ParameterGrid({"quantity": [10, 100, 50]}),
+        start_date=datetime(2023, 1, 1),
+        end_date=datetime(2023, 12, 31),
+        symbols=["SPY"],
+        train_bars=40,
+        test_bars=20,
+        objective="total_return",
+        **kwargs,
+    )
+    return provider, wf
+
+
+class TestWalkForwardWindows:
+    """Tests for window generation."""
+
+    def test_rolling_windows(self):
+        """Test rolling windows tile the out-of-sample period."""
+        windows = walk_forward_windows(100, train_bars=40, test_bars=20)
+
+        assert [(w.train_start, w.train_end, w.test_start, w.test_end) for w in windows] == [
+            (0, 40, 40, 60),
+            (20, 60, 60, 80),
+            (40, 80, 80, 100),
+        ]
+
+    def test_anchored_windows(self):
+        """Test anchored windows keep the in-sample start fixed."""
+        windows = walk_forward_windows(100, train_bars=40, test_bars=20, anchored=True)
+
+        assert all(w.train_start == 0 for w in windows)
+        assert [w.train_end for w in windows] == [40, 60, 80]
+
+    def test_last_window_truncated(self):
+        """Test the final out-of-sample window stops at the last bar."""
+        windows = walk_forward_windows(90, train_bars=40, test_bars=20)
+
+        assert windows[-1].test_start == 80
+        assert windows[-1].test_end == 90
+
+    def test_custom_step(self):
+        """Test step_bars controls the spacing between windows."""
+        windows = walk_forward_windows(100, train_bars=40, test_bars=20, step_bars=30)
+
+        assert [w.train_start for w in windows] == [0, 30]
+
+    def test_too_short(self):
+        """Test no windows are produced when data is shorter than train_bars."""
+        assert walk_forward_windows(40, train_bars=40, test_bars=10) == []
+
+    def test_invalid_lengths(self):
+        """Test non-positive lengths are rejected."""
+        with pytest.raises(ValueError, match="test_bars"):
+            walk_forward_windows(100, train_bars=40, test_bars=0)
+
+    def test_overlapping_test_windows_rejected(self):
+        """Test a step shorter than the out-of-sample window is rejected."""
+        with pytest.raises(ValueError, match="step_bars"):
+            walk_forward_windows(100, train_bars=40, test_bars=20, step_bars=10)
+
+
+class TestWalkForwardOptimizer:
+    """Tests for WalkForwardOptimizer."""
+
+    def test_selects_in_sample_winner(self):
+        """Test each window evaluates the best in-sample parameters."""
+        _, wf = run_walk_forward()
+
+        assert len(wf.windows) == 3
+        assert list(wf.windows["quantity"]) == [100, 100, 100]
+        assert len(wf.in_sample) == 9
+        assert wf.windows["test_start"].iloc[0] == pd.Timestamp("2023-01-02") + pd.offsets.BDay(40)
+
+    def test_stitched_equity_covers_out_of_sample_bars(self):
+        """Test the stitched curve has one point per out-of-sample bar."""
+        _, wf = run_walk_forward()
+
+        equity = wf.result.get_equity_curve()
+
+        assert len(equity) == 60
+        assert list(wf.result.portfolio_history["window"].unique()) == [0, 1, 2]
+        assert wf.result.strategy_name == "WalkForward(BuyAndHold)"
+
+    def test_stitched_returns_compound(self):
+        """Test window returns are chained into the final capital."""
+        _, wf = run_walk_forward()
+
+        growth = np.prod(1 + wf.windows["total_return"].to_numpy())
+
+        assert wf.result.final_capital == pytest.approx(100_000 * growth)
+        assert wf.result.total_return == pytest.approx(growth - 1)
+        # Equity is continuous across window boundaries (no reset to initial capital)
+        history = wf.result.portfolio_history
+        first_of_window_1 = history[history["window"] == 1]["portfolio_value"].iloc[0]
+        assert first_of_window_1 > 100_000
+
+    def test_stitched_curve_ends_after_exit_costs(self):
+        """Test each window's last equity point includes the commission and slippage of the forced close."""
+        _, wf = run_walk_forward(engine_kwargs={"commission": 0.001, "slippage": 0.0005})
+
+        history = wf.result.portfolio_history
+        window_ends = history.groupby("window")["portfolio_value"].last().to_numpy()
+        growth = np.cumprod(1 + wf.windows["total_return"].to_numpy())
+
+        np.testing.assert_allclose(window_ends, 100_000 * growth)
+        assert wf.result.get_equity_curve().iloc[-1] == pytest.approx(wf.result.final_capital)
+        assert history.groupby("window")["position_SPY"].last().eq(0).all()
+
+    def test_data_fetched_once(self):
+        """Test overlapping windows reuse the same fetched data."""
+        provider, _ = run_walk_forward()
+
+        assert provider.calls == 1
+
+    def test_minimize_objective(self):
+        """Test maximize=False picks the smallest objective."""
+        _, wf = run_walk_forward(maximize=False)
+
+        assert list(wf.windows["quantity"]) == [10, 10, 10]
+
+    def test_parallel_matches_serial(self):
+        """Test process-pool windows give the same result as in-process."""
+        _, serial = run_walk_forward(max_workers=1)
+        _, parallel = run_walk_forward(max_workers=2)
+
+        assert parallel.result.final_capital == pytest.approx(serial.result.final_capital)
+        pd.testing.assert_series_equal(serial.windows["quantity"], parallel.windows["quantity"])
+
+    def test_not_enough_data(self):
+        """Test a period shorter than one window is rejected."""
+        with pytest.raises(ValueError, match="Not enough data"):
+            run_walk_forward(provider=TrendingProvider(num_bars=30))
+
+    def test_positions_closed_at_window_ends(self):
+        """Test every window sells its holdings on its last bar and the fills pair into round trips."""
+        _, wf = run_walk_forward()
+
+        history = wf.result.portfolio_history
+        last_bars = history.groupby("window")["timestamp"].max()
+        sells = wf.result.get_trade_log().query("side == 'sell'")
+
+        assert list(sells.index) == list(last_bars)
+        assert len(wf.result.get_round_trips()) == 3
+
+    def test_positions_and_fills_rescaled(self):
+        """Test share counts and fills compound with the dollar columns."""
+        _, wf = run_walk_forward(engine_kwargs={"commission": 0.001, "slippage": 0.0005})
+
+        history = wf.result.portfolio_history
+        trades = wf.result.get_trade_log()
+        buys = trades[trades["side"] == "buy"]
+        held = history.groupby("window")["position_SPY"].max()
+        np.testing.assert_allclose(buys["quantity"], held)
+        assert held.iloc[2] > held.iloc[0]
+
+        # The stitched trade log reconciles with the stitched final capital
+        signed = np.where(trades["side"] == "buy", -1.0, 1.0)
+        cash_flow = (signed * trades["quantity"] * trades["price"]).sum() - trades["commission"].sum()
+        assert wf.result.final_capital == pytest.approx(100_000 + cash_flow)
+
+    def test_skipped_window_keeps_its_index(self):
+        """Test frames are labelled by window index when a window has no winner."""
+        calls = []
+
+        def fail_first_window(params):
+            calls.append(params)
+            if len(calls) <= 3:
+                raise RuntimeError("no data")
+            return make_buy_and_hold(params)
+
+        _, wf = run_walk_forward(factory=fail_first_window)
+
+        assert list(wf.result.portfolio_history["window"].unique()) == [1, 2]
+        assert wf.windows["quantity"].isna().iloc[0]
+
+    def test_out_of_sample_warm_up(self):
+        """Test out-of-sample runs see their in-sample bars as history and trade on the first test bar."""
+        _, wf = run_walk_forward(factory=lambda params: BuyAfterHistory(quantity=params["quantity"]))
+
+        history = wf.result.portfolio_history
+        buys = wf.result.get_trade_log().query("side == 'buy'")
+
+        assert len(history) == 60
+        assert list(buys.index) == list(history.groupby("window")["timestamp"].min())
+        assert list(buys.index) == list(wf.windows["test_start"])
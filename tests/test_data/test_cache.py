@@ -0,0 +1,242 @@
+"""Tests for the on-disk caching data provider."""
+
+import json
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from copilot_quant.data.cache import CachingDataProvider
+from copilot_quant.data.providers import DataProvider
+
+
+class RecordingProvider(DataProvider):
+    """Deterministic business-day bars; records every fetch."""
+
+    def __init__(self, tz=None):
+        self.tz = tz
+        self.calls = []
+
+    def _bars(self, symbol, start, end):
+        dates = pd.bdate_range(pd.Timestamp(start).normalize(), pd.Timestamp(end), inclusive="left", tz=self.tz)
+        base = sum(ord(c) for c in symbol)
+        close = base + dates.dayofyear.to_numpy().astype(float)
+        return pd.DataFrame({"Close": close, "Volume": np.full(len(dates), 1000)}, index=dates)
+
+    def get_historical_data(self, symbol, start_date=None, end_date=None, interval="1d"):
+        self.calls.append(("single", symbol, pd.Timestamp(start_date), pd.Timestamp(end_date)))
+        return self._bars(symbol, start_date, end_date)
+
+    def get_multiple_symbols(self, symbols, start_date=None, end_date=None, interval="1d"):
+        self.calls.append(("multi", tuple(symbols), pd.Timestamp(start_date), pd.Timestamp(end_date)))
+        frames = {s: self._bars(s, start_date, end_date) for s in symbols}
+        data = pd.concat(frames, axis=1).swaplevel(0, 1, axis=1).sort_index(axis=1)
+        return data
+
+    def get_ticker_info(self, symbol):
+        return {"symbol": symbol}
+
+
+@pytest.fixture
+def inner():
+    return RecordingProvider()
+
+
+@pytest.fixture
+def cached(inner, tmp_path):
+    return CachingDataProvider(inner, cache_dir=tmp_path)
+
+
+class TestCachingDataProvider:
+    """Tests for CachingDataProvider."""
+
+    def test_cache_hit_does_not_refetch(self, inner, cached):
+        """Test a repeated request is served from disk."""
+        first = cached.get_historical_data("AAPL", "2023-01-01", "2023-03-01")
+        second = cached.get_historical_data("AAPL", "2023-01-01", "2023-03-01")
+
+        assert len(inner.calls) == 1
+        pd.testing.assert_frame_equal(first, second)
+        pd.testing.assert_frame_equal(second, inner._bars("AAPL", "2023-01-01", "2023-03-01"), check_freq=False)
+
+    def test_subrange_is_served_from_cache(self, inner, cached):
+        """Test a range inside the cached coverage needs no fetch."""
+        cached.get_historical_data("AAPL", "2023-01-01", "2023-06-01")
+
+        data = cached.get_historical_data("AAPL", "2023-02-01", "2023-03-01")
+
+        assert len(inner.calls) == 1
+        assert data.index.min() >= pd.Timestamp("2023-02-01")
+        assert data.index.max() < pd.Timestamp("2023-03-01")
+
+    def test_only_missing_ranges_fetched(self, inner, cached):
+        """Test extending a cached range fetches just the gaps."""
+        cached.get_historical_data("AAPL", "2023-02-01", "2023-03-01")
+
+        data = cached.get_historical_data("AAPL", "2023-01-01", "2023-04-01")
+
+        assert inner.calls[1:] == [
+            ("single", "AAPL", pd.Timestamp("2023-01-01"), pd.Timestamp("2023-02-01")),
+            ("single", "AAPL", pd.Timestamp("2023-03-01"), pd.Timestamp("2023-04-01")),
+        ]
+        expected = inner._bars("AAPL", "2023-01-01", "2023-04-01")
+        pd.testing.assert_frame_equal(data, expected, check_freq=False)
+
+    def test_cache_persists_across_instances(self, inner, tmp_path):
+        """Test a new provider instance reuses the on-disk cache."""
+        CachingDataProvider(inner, cache_dir=tmp_path).get_historical_data("MSFT", "2023-01-01", "2023-02-01")
+
+        CachingDataProvider(inner, cache_dir=tmp_path).get_historical_data("MSFT", "2023-01-01", "2023-02-01")
+
+        assert len(inner.calls) == 1
+
+    def test_cache_hit_is_memory_mapped(self, cached):
+        """Test cached numeric columns are read-only zero-copy views."""
+        cached.get_historical_data("AAPL", "2023-01-01", "2023-03-01")
+
+        data = cached.get_historical_data("AAPL", "2023-01-01", "2023-03-01")
+
+        assert not data["Close"].to_numpy().flags.writeable
+
+    def test_tz_aware_index(self, tmp_path):
+        """Test naive request bounds are applied to tz-aware data."""
+        inner = RecordingProvider(tz="America/New_York")
+        provider = CachingDataProvider(inner, cache_dir=tmp_path)
+        provider.get_historical_data("AAPL", "2023-01-01", "2023-03-01")
+
+        data = provider.get_historical_data("AAPL", "2023-02-01", "2023-02-08")
+
+        assert len(inner.calls) == 1
+        assert str(data.index.tz) == "America/New_York"
+        assert len(data) == 5
+
+    def test_ttl_expiry_refetches(self, inner, tmp_path):
+        """Test expired entries are fetched again."""
+        provider = CachingDataProvider(inner, cache_dir=tmp_path, ttl=timedelta(seconds=60))
+        provider.get_historical_data("AAPL", "2023-01-01", "2023-02-01")
+
+        key = next(iter(provider._index))
+        provider._index[key]["fetched_at"] = time.time() - 120
+        provider.get_historical_data("AAPL", "2023-01-01", "2023-02-01")
+
+        assert len(inner.calls) == 2
+
+    def test_lru_eviction(self, inner, tmp_path):
+        """Test the least recently used entry is evicted when over budget."""
+        provider = CachingDataProvider(inner, cache_dir=tmp_path)
+        provider.get_historical_data("AAA", "2023-01-01", "2023-06-01")
+        entry_size = provider.size_bytes
+
+        provider = CachingDataProvider(inner, cache_dir=tmp_path, max_size_bytes=int(entry_size * 2.5))
+        provider.get_historical_data("BBB", "2023-01-01", "2023-06-01")
+        provider.get_historical_data("AAA", "2023-01-01", "2023-06-01")  # AAA becomes most recent
+        provider.get_historical_data("CCC", "2023-01-01", "2023-06-01")
+
+        cached_symbols = {entry["symbol"] for entry in provider._index.values()}
+        assert cached_symbols == {"AAA", "CCC"}
+        assert provider.size_bytes <= int(entry_size * 2.5)
+
+    def test_access_times_persist_across_instances(self, inner, tmp_path):
+        """Test cache hits update last_access in the on-disk index."""
+        provider = CachingDataProvider(inner, cache_dir=tmp_path)
+        provider.get_multiple_symbols(["AAA", "BBB"], "2023-01-01", "2023-06-01")
+        provider.get_historical_data("AAA", "2023-01-01", "2023-06-01")  # AAA becomes most recent
+
+        index = json.loads((tmp_path / CachingDataProvider.INDEX_FILE).read_text())
+        accessed = {entry["symbol"]: entry["last_access"] for entry in index.values()}
+        assert accessed["AAA"] > accessed["BBB"]
+
+        entry_size = provider.size_bytes / 2
+        provider = CachingDataProvider(inner, cache_dir=tmp_path, max_size_bytes=int(entry_size * 2.5))
+        provider.get_historical_data("CCC", "2023-01-01", "2023-06-01")
+
+        assert {entry["symbol"] for entry in provider._index.values()} == {"AAA", "CCC"}
+
+    def test_future_range_not_marked_covered(self, inner, cached):
+        """Test ranges after today are fetched again on the next request."""
+        end = pd.Timestamp.now().normalize() + pd.Timedelta(days=5)
+        start = end - pd.Timedelta(days=20)
+
+        cached.get_historical_data("AAPL", start, end)
+        cached.get_historical_data("AAPL", start, end)
+
+        assert len(inner.calls) == 2
+        assert inner.calls[1][2] == pd.Timestamp.now().normalize()
+
+    def test_get_multiple_symbols_groups_missing(self, inner, cached):
+        """Test symbols missing the same range are fetched together."""
+        cached.get_historical_data("AAPL", "2023-01-01", "2023-03-01")
+
+        data = cached.get_multiple_symbols(["AAPL", "MSFT", "GOOGL"], "2023-01-01", "2023-03-01")
+
+        assert inner.calls[1] == (
+            "multi",
+            ("MSFT", "GOOGL"),
+            pd.Timestamp("2023-01-01"),
+            pd.Timestamp("2023-03-01"),
+        )
+        assert list(data.columns.get_level_values(0).unique()) == ["Close", "Volume"]
+        assert list(data["Close"].columns) == ["AAPL", "MSFT", "GOOGL"]
+        expected = inner._bars("MSFT", "2023-01-01", "2023-03-01")["Close"]
+        np.testing.assert_array_equal(data[("Close", "MSFT")].to_numpy(), expected.to_numpy())
+
+    def test_get_multiple_symbols_cache_hit(self, inner, cached):
+        """Test a repeated multi-symbol request makes no calls."""
+        cached.get_multiple_symbols(["AAPL", "MSFT"], "2023-01-01", "2023-03-01")
+        cached.get_multiple_symbols(["AAPL", "MSFT"], "2023-01-01", "2023-03-01")
+
+        assert len(inner.calls) == 1
+
+    def test_empty_range_remembered(self, inner, cached):
+        """Test a range without bars is not re-fetched."""
+        assert cached.get_historical_data("AAPL", "2023-01-07", "2023-01-09").empty  # weekend
+
+        assert cached.get_historical_data("AAPL", "2023-01-07", "2023-01-09").empty
+        assert len(inner.calls) == 1
+
+        data = cached.get_historical_data("AAPL", "2023-01-07", "2023-01-12")
+        assert len(data) == 3
+        assert "_empty" not in data.columns
+
+    def test_invalidate_and_clear(self, inner, cached, tmp_path):
+        """Test entries can be removed explicitly."""
+        cached.get_historical_data("AAPL", "2023-01-01", "2023-02-01")
+        cached.get_historical_data("MSFT", "2023-01-01", "2023-02-01")
+
+        cached.invalidate("AAPL")
+        assert {e["symbol"] for e in cached._index.values()} == {"MSFT"}
+
+        cached.clear()
+        assert cached.size_bytes == 0
+        assert json.loads((tmp_path / CachingDataProvider.INDEX_FILE).read_text()) == {}
+
+    def test_ticker_info_passthrough(self, cached):
+        """Test metadata requests go to the wrapped provider."""
+        assert cached.get_ticker_info("AAPL") == {"symbol": "AAPL"}
+
+    def test_invalid_arguments(self, inner, tmp_path):
+        """Test invalid ttl and size limits are rejected."""
+        with pytest.raises(ValueError, match="ttl"):
+            CachingDataProvider(inner, cache_dir=tmp_path, ttl=timedelta(0))
+        with pytest.raises(ValueError, match="max_size_bytes"):
+            CachingDataProvider(inner, cache_dir=tmp_path, max_size_bytes=0)
+
+    def test_backtest_engine_uses_cache(self, inner, cached):
+        """Test the cache works as an engine data provider."""
+        from copilot_quant.backtest.engine import BacktestEngine
+        from copilot_quant.backtest.strategy import Strategy
+
+        class Idle(Strategy):
+            def on_data(self, timestamp, data):
+                return []
+
+        engine = BacktestEngine(initial_capital=10_000, data_provider=cached)
+        engine.add_strategy(Idle())
+
+        engine.run(datetime(2023, 1, 1), datetime(2023, 3, 1), ["AAPL"])
+        result = engine.run(datetime(2023, 1, 1), datetime(2023, 3, 1), ["AAPL"])
+
+        assert len(inner.calls) == 1
+        assert len(result.get_equity_curve()) == len(inner._bars("AAPL", "2023-01-01", "2023-03-01"))
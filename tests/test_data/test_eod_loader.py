@@ -6,10 +6,13 @@ import tempfile
 from datetime import datetime, timedelta
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 import pytest
 
 from copilot_quant.data.eod_loader import SP500EODLoader
+from copilot_quant.data.rate_limit import AdaptiveRateLimiter
 
 
 @pytest.fixture
@@ -52,7 +55,7 @@ class TestSP500EODLoader:
 
     def test_invalid_storage_type(self, temp_dir):
         """Test that invalid storage type raises error"""
-        with pytest.raises(ValueError, match="storage_type must be 'csv' or 'sqlite'"):
+        with pytest.raises(ValueError, match="storage_type must be 'csv', 'sqlite' or 'parquet'"):
             SP500EODLoader(symbols=["AAPL"], storage_type="invalid", data_dir=temp_dir)
 
     def test_sqlite_database_initialization(self, temp_dir):
@@ -395,3 +398,238 @@ class TestSP500EODLoader:
             dividend_rows = loaded_df[loaded_df["dividends"] > 0]
             assert len(dividend_rows) > 0
             assert dividend_rows.iloc[0]["dividends"] == 0.52
+
+
+def make_eod_frame(symbol, start="2022-12-28", periods=6, base=100.0):
+    """Sample EOD rows in the shape returned by fetch_symbol."""
+    dates = pd.bdate_range(start, periods=periods, tz="America/New_York")
+    close = base + np.arange(periods, dtype=float)
+    return pd.DataFrame(
+        {
+            "Date": dates,
+            "open": close - 1,
+            "high": close + 1,
+            "low": close - 2,
+            "close": close,
+            "adj_close": close,
+            "volume": np.full(periods, 1_000_000),
+            "dividends": 0.0,
+            "stock_splits": 0.0,
+            "Symbol": symbol,
+        }
+    )
+
+
+class TestParquetStore:
+    """Tests for the partitioned Parquet store and panel loading."""
+
+    @pytest.fixture
+    def loader(self, temp_dir):
+        return SP500EODLoader(symbols=["AAPL", "MSFT"], storage_type="parquet", parquet_dir=temp_dir)
+
+    def test_save_and_load(self, loader, temp_dir):
+        """Test rows round-trip through the symbol partition."""
+        loader.save(make_eod_frame("AAPL"), "AAPL")
+
+        loaded = loader.load_from_parquet("AAPL")
+
+        assert (Path(temp_dir) / "symbol=AAPL" / "data.parquet").exists()
+        assert list(loaded["close"]) == [100.0, 101.0, 102.0, 103.0, 104.0, 105.0]
+        assert loaded["date"].iloc[0] == pd.Timestamp("2022-12-28")
+        assert (loaded["symbol"] == "AAPL").all()
+
+    def test_one_row_group_per_year(self, loader, temp_dir):
+        """Test files are split into yearly row groups for date pruning."""
+        loader.save(make_eod_frame("AAPL"), "AAPL")
+
+        metadata = pq.ParquetFile(Path(temp_dir) / "symbol=AAPL" / "data.parquet").metadata
+
+        assert metadata.num_row_groups == 2
+        assert [metadata.row_group(i).num_rows for i in range(2)] == [3, 3]
+
+    def test_save_merges_and_dedupes(self, loader):
+        """Test re-saving overlapping dates keeps the newest rows."""
+        loader.save(make_eod_frame("AAPL"), "AAPL")
+        loader.save(make_eod_frame("AAPL", start="2023-01-03", periods=3, base=500.0), "AAPL")
+
+        loaded = loader.load_from_parquet("AAPL")
+
+        assert len(loaded) == 7
+        assert loaded["date"].is_monotonic_increasing
+        assert list(loaded["close"].iloc[-3:]) == [500.0, 501.0, 502.0]
+
+    def test_load_date_filter(self, loader):
+        """Test start and end dates are inclusive."""
+        loader.save(make_eod_frame("AAPL"), "AAPL")
+
+        loaded = loader.load_from_parquet("AAPL", start_date="2022-12-30", end_date="2023-01-03")
+
+        assert list(loaded["date"]) == list(pd.to_datetime(["2022-12-30", "2023-01-02", "2023-01-03"]))
+
+    def test_load_missing_symbol(self, loader):
+        """Test unknown symbols return None."""
+        assert loader.load_from_parquet("NOPE") is None
+
+    def test_symbol_with_special_characters(self, loader):
+        """Test symbols are escaped in partition directory names."""
+        loader.save(make_eod_frame("BRK/B"), "BRK/B")
+
+        assert len(loader.load_from_parquet("BRK/B")) == 6
+
+    def test_load_panel(self, loader):
+        """Test the panel is aligned on dates with one column per symbol."""
+        loader.save(make_eod_frame("AAPL"), "AAPL")
+        loader.save(make_eod_frame("MSFT", start="2022-12-30", periods=3, base=200.0), "MSFT")
+
+        panel = loader.load_panel(["MSFT", "AAPL", "GOOGL"], start_date="2022-12-29")
+
+        assert list(panel.columns) == ["MSFT", "AAPL", "GOOGL"]
+        assert panel.index[0] == pd.Timestamp("2022-12-29")
+        assert len(panel) == 5
+        assert np.isnan(panel.loc["2022-12-29", "MSFT"])
+        assert panel.loc["2023-01-03", "MSFT"] == 202.0
+        assert panel["GOOGL"].isna().all()
+
+    def test_load_panel_multiple_fields(self, loader):
+        """Test a list of fields gives (field, symbol) columns."""
+        loader.save(make_eod_frame("AAPL"), "AAPL")
+        loader.save(make_eod_frame("MSFT"), "MSFT")
+
+        panel = loader.load_panel(fields=["close", "volume"])
+
+        assert list(panel.columns) == [("close", "AAPL"), ("close", "MSFT"), ("volume", "AAPL"), ("volume", "MSFT")]
+        assert panel["close"].shape == (6, 2)
+
+    def test_load_panel_empty_store(self, loader):
+        """Test an empty store yields an empty panel with the requested columns."""
+        panel = loader.load_panel(["AAPL"])
+
+        assert panel.empty
+        assert list(panel.columns) == ["AAPL"]
+
+    def test_panel_matches_across_storage_types(self, temp_dir):
+        """Test CSV, SQLite and Parquet return the same panel."""
+        frames = {"AAPL": make_eod_frame("AAPL"), "MSFT": make_eod_frame("MSFT", base=200.0)}
+        loaders = [
+            SP500EODLoader(symbols=list(frames), storage_type="csv", data_dir=str(Path(temp_dir) / "csv")),
+            SP500EODLoader(symbols=list(frames), storage_type="sqlite", db_path=str(Path(temp_dir) / "eod.db")),
+            SP500EODLoader(symbols=list(frames), storage_type="parquet", parquet_dir=str(Path(temp_dir) / "pq")),
+        ]
+        for loader in loaders:
+            for symbol, frame in frames.items():
+                frame = frame.copy()
+                if loader.storage_type == "sqlite":
+                    frame["date"] = frame["Date"].dt.strftime("%Y-%m-%d")
+                    frame = frame.drop(columns=["Date", "Symbol"])
+                loader.save(frame, symbol)
+
+        panels = [loader.load_panel(start_date="2022-12-29", end_date="2023-01-04") for loader in loaders]
+
+        for panel in panels[1:]:
+            pd.testing.assert_frame_equal(panel, panels[0], check_index_type=False, check_names=False)
+
+
+class TestConcurrentFetch:
+    """Tests for concurrent fetch_all with retries."""
+
+    @pytest.fixture
+    def loader(self, temp_dir, monkeypatch):
+        loader = SP500EODLoader(
+            symbols=["AAPL", "MSFT", "GOOGL", "AMZN"],
+            storage_type="parquet",
+            parquet_dir=temp_dir,
+            rate_limit_delay=0.001,
+        )
+        monkeypatch.setattr("copilot_quant.data.eod_loader.time.sleep", lambda seconds: None)
+        return loader
+
+    def test_all_symbols_saved(self, loader):
+        """Test every symbol is downloaded and saved."""
+        loader._download_symbol = lambda symbol, *args: make_eod_frame(symbol)
+
+        result = loader.fetch_all(max_workers=3)
+
+        assert result == {"success": ["AAPL", "MSFT", "GOOGL", "AMZN"], "failed": []}
+        assert list(loader.load_panel().columns) == ["AAPL", "MSFT", "GOOGL", "AMZN"]
+        assert loader.load_panel().notna().all().all()
+
+    def test_rate_limited_symbol_retried(self, loader):
+        """Test 429 errors and empty responses are retried."""
+        attempts = {}
+
+        def download(symbol, *args):
+            attempts[symbol] = attempts.get(symbol, 0) + 1
+            if symbol == "MSFT" and attempts[symbol] == 1:
+                raise Exception("429 Client Error: Too Many Requests")
+            if symbol == "GOOGL" and attempts[symbol] < 3:
+                return None
+            return make_eod_frame(symbol)
+
+        loader._download_symbol = download
+
+        result = loader.fetch_all(max_workers=2, max_retries=3)
+
+        assert result["failed"] == []
+        assert attempts == {"AAPL": 1, "MSFT": 2, "GOOGL": 3, "AMZN": 1}
+
+    def test_exhausted_retries_reported_as_failed(self, loader):
+        """Test a symbol that never returns data is reported as failed."""
+        attempts = []
+
+        def download(symbol, *args):
+            if symbol == "GOOGL":
+                attempts.append(symbol)
+                raise Exception("No data found, symbol may be delisted")
+            return make_eod_frame(symbol)
+
+        loader._download_symbol = download
+
+        result = loader.fetch_all(max_workers=4, max_retries=2)
+
+        assert result == {"success": ["AAPL", "MSFT", "AMZN"], "failed": ["GOOGL"]}
+        assert len(attempts) == 3
+
+    def test_save_error_stops_when_not_continuing(self, loader):
+        """Test storage errors propagate with continue_on_error=False."""
+        loader._download_symbol = lambda symbol, *args: make_eod_frame(symbol)
+
+        def broken_save(df, symbol):
+            raise OSError("disk full")
+
+        loader.save = broken_save
+
+        with pytest.raises(OSError, match="disk full"):
+            loader.fetch_all(max_workers=2, continue_on_error=False)
+
+    def test_explicit_symbols(self, loader):
+        """Test a symbol subset can be passed explicitly."""
+        loader._download_symbol = lambda symbol, *args: make_eod_frame(symbol)
+
+        result = loader.fetch_all(symbols=["TSLA"], max_workers=2)
+
+        assert result == {"success": ["TSLA"], "failed": []}
+
+    def test_rate_ceiling_above_sequential_rate(self, loader, monkeypatch):
+        """Test the limiter starts at the sequential rate and may speed up to max_rate."""
+        limiters = []
+
+        class RecordingLimiter(AdaptiveRateLimiter):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                limiters.append(self)
+
+        monkeypatch.setattr("copilot_quant.data.eod_loader.AdaptiveRateLimiter", RecordingLimiter)
+        loader._download_symbol = lambda symbol, *args: make_eod_frame(symbol)
+
+        loader.fetch_all(max_workers=2)
+        loader.fetch_all(max_workers=2, max_rate=5000.0)
+
+        default, explicit = limiters
+        assert default.max_rate == pytest.approx(4 / loader.rate_limit_delay)
+        assert explicit.max_rate == 5000.0
+        assert default.rate > 1 / loader.rate_limit_delay  # recovered above the starting rate
+
+    def test_invalid_max_workers(self, loader):
+        """Test non-positive worker counts are rejected."""
+        with pytest.raises(ValueError, match="max_workers"):
+            loader.fetch_all(max_workers=0)
@@ -0,0 +1,142 @@
+"""Tests for the adaptive rate limiter."""
+
+import threading
+
+import pytest
+
+from copilot_quant.data.rate_limit import AdaptiveRateLimiter, is_rate_limit_error
+
+
+class FakeClock:
+    """Manual clock whose sleep advances time."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class TestAdaptiveRateLimiter:
+    """Tests for AdaptiveRateLimiter."""
+
+    def test_burst_then_steady_rate(self, clock):
+        """Test a full bucket serves a burst, then requests are spaced at 1/rate."""
+        limiter = AdaptiveRateLimiter(max_rate=2.0, burst=2, clock=clock, sleep=clock.sleep)
+
+        waits = [limiter.acquire() for _ in range(4)]
+
+        assert waits == [0.0, 0.0, 0.5, 0.5]
+        assert clock.now == pytest.approx(1.0)
+
+    def test_tokens_refill_over_time(self, clock):
+        """Test idle time refills the bucket up to its capacity."""
+        limiter = AdaptiveRateLimiter(max_rate=1.0, burst=3, clock=clock, sleep=clock.sleep)
+        for _ in range(3):
+            limiter.acquire()
+
+        clock.now += 10.0
+
+        assert [limiter.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert limiter.acquire() == pytest.approx(1.0)
+
+    def test_throttled_halves_rate_and_drains(self, clock):
+        """Test throttling cuts the rate and forces the next request to wait."""
+        limiter = AdaptiveRateLimiter(max_rate=4.0, burst=4, clock=clock, sleep=clock.sleep)
+
+        limiter.throttled()
+
+        assert limiter.rate == 2.0
+        assert limiter.acquire() == pytest.approx(0.5)
+
+    def test_rate_bounded_below(self, clock):
+        """Test repeated throttling stops at min_rate."""
+        limiter = AdaptiveRateLimiter(max_rate=4.0, min_rate=1.0, clock=clock, sleep=clock.sleep)
+
+        for _ in range(10):
+            limiter.throttled()
+
+        assert limiter.rate == 1.0
+
+    def test_success_recovers_additively(self, clock):
+        """Test successes raise the rate back toward max_rate."""
+        limiter = AdaptiveRateLimiter(max_rate=4.0, recovery_step=0.5, clock=clock, sleep=clock.sleep)
+        limiter.throttled()
+
+        limiter.succeeded()
+        assert limiter.rate == 2.5
+
+        for _ in range(10):
+            limiter.succeeded()
+        assert limiter.rate == 4.0
+
+    def test_initial_rate_rises_to_max_rate(self, clock):
+        """Test a limiter started below max_rate speeds up on successes."""
+        limiter = AdaptiveRateLimiter(max_rate=4.0, initial_rate=1.0, recovery_step=1.0, clock=clock, sleep=clock.sleep)
+        assert limiter.rate == 1.0
+
+        for _ in range(10):
+            limiter.succeeded()
+
+        assert limiter.rate == 4.0
+
+    def test_thread_safety(self):
+        """Test concurrent callers each get exactly one token."""
+        limiter = AdaptiveRateLimiter(max_rate=1000.0, burst=1)
+        threads = [threading.Thread(target=limiter.acquire) for _ in range(20)]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert limiter._tokens <= 1.0
+
+    def test_invalid_arguments(self):
+        """Test invalid settings are rejected."""
+        with pytest.raises(ValueError, match="max_rate"):
+            AdaptiveRateLimiter(max_rate=0)
+        with pytest.raises(ValueError, match="burst"):
+            AdaptiveRateLimiter(max_rate=1.0, burst=0)
+        with pytest.raises(ValueError, match="backoff_factor"):
+            AdaptiveRateLimiter(max_rate=1.0, backoff_factor=1.0)
+        with pytest.raises(ValueError, match="min_rate"):
+            AdaptiveRateLimiter(max_rate=1.0, min_rate=2.0)
+        with pytest.raises(ValueError, match="initial_rate"):
+            AdaptiveRateLimiter(max_rate=1.0, initial_rate=2.0)
+
+
+class TestIsRateLimitError:
+    """Tests for rate limit error detection."""
+
+    def test_yfinance_rate_limit_error(self):
+        """Test yfinance's rate limit exception is recognized by name."""
+
+        class YFRateLimitError(Exception):
+            pass
+
+        assert is_rate_limit_error(YFRateLimitError("Rate limited. Try after a while."))
+
+    def test_http_status_and_message(self):
+        """Test 429 responses and messages are recognized."""
+
+        class Response:
+            status_code = 429
+
+        error = Exception("boom")
+        error.response = Response()
+
+        assert is_rate_limit_error(error)
+        assert is_rate_limit_error(Exception("429 Client Error: Too Many Requests"))
+        assert not is_rate_limit_error(Exception("No data found, symbol may be delisted"))
+        assert not is_rate_limit_error(Exception("ticker X4290 not found"))
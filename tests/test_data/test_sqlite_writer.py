@@ -0,0 +1,127 @@
+"""Tests for the batched SQLite equity data writer."""
+
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from copilot_quant.data.eod_loader import SP500EODLoader
+from copilot_quant.data.sqlite_writer import EquityDataWriter
+
+
+def make_frame(start="2023-01-02", periods=5, base=100.0):
+    dates = pd.bdate_range(start, periods=periods, tz="America/New_York")
+    close = base + np.arange(periods, dtype=float)
+    return pd.DataFrame({"Date": dates, "open": close, "close": close, "volume": np.full(periods, 1_000_000)})
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "eod.db"
+    SP500EODLoader(symbols=[], storage_type="sqlite", db_path=str(path))  # creates the schema
+    return path
+
+
+def fetch(db_path, query):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(query).fetchall()
+    finally:
+        conn.close()
+
+
+class TestEquityDataWriter:
+    """Tests for EquityDataWriter."""
+
+    def test_rows_committed_on_exit(self, db_path):
+        """Test queued rows are written when the block exits."""
+        with EquityDataWriter(db_path) as writer:
+            writer.write(make_frame(), "AAPL")
+            assert fetch(db_path, "SELECT COUNT(*) FROM equity_data") == [(0,)]
+
+        assert fetch(db_path, "SELECT COUNT(*) FROM equity_data") == [(5,)]
+        assert writer.rows_written == 5
+
+    def test_upsert_replaces_rows(self, db_path):
+        """Test re-writing a date updates the row instead of duplicating it."""
+        with EquityDataWriter(db_path) as writer:
+            writer.write(make_frame(), "AAPL")
+        with EquityDataWriter(db_path) as writer:
+            writer.write(make_frame(start="2023-01-05", periods=3, base=500.0), "AAPL")
+
+        rows = fetch(db_path, "SELECT date, close FROM equity_data WHERE symbol = 'AAPL' ORDER BY date")
+
+        assert len(rows) == 6
+        assert rows[2] == ("2023-01-04", 102.0)
+        assert rows[3:] == [("2023-01-05", 500.0), ("2023-01-06", 501.0), ("2023-01-09", 502.0)]
+
+    def test_commits_every_batch(self, db_path):
+        """Test a full batch is committed before the block exits."""
+        with EquityDataWriter(db_path, batch_size=8) as writer:
+            writer.write_many({"AAPL": make_frame(), "MSFT": make_frame()})
+            assert writer.rows_written == 10
+            writer.write(make_frame(periods=2), "GOOGL")
+            assert writer.rows_written == 10
+
+        assert fetch(db_path, "SELECT COUNT(*) FROM equity_data") == [(12,)]
+
+    def test_wal_mode(self, db_path):
+        """Test the connection switches the database to WAL journaling."""
+        with EquityDataWriter(db_path) as writer:
+            writer.write(make_frame(), "AAPL")
+
+        assert fetch(db_path, "PRAGMA journal_mode") == [("wal",)]
+
+    def test_missing_values_stored_as_null(self, db_path):
+        """Test NaN and absent columns become NULL; volume stays an integer."""
+        frame = make_frame(periods=2)
+        frame.loc[1, "open"] = np.nan
+
+        with EquityDataWriter(db_path) as writer:
+            writer.write(frame, "AAPL")
+
+        rows = fetch(db_path, "SELECT open, high, volume, typeof(volume) FROM equity_data ORDER BY date")
+        assert rows == [(100.0, None, 1_000_000, "integer"), (None, None, 1_000_000, "integer")]
+
+    def test_rows_kept_when_block_raises(self, db_path):
+        """Test symbols queued before an error are still committed."""
+        with pytest.raises(RuntimeError):
+            with EquityDataWriter(db_path) as writer:
+                writer.write(make_frame(), "AAPL")
+                raise RuntimeError("fetch failed")
+
+        assert fetch(db_path, "SELECT COUNT(*) FROM equity_data") == [(5,)]
+
+    def test_invalid_batch_size(self, db_path):
+        """Test non-positive batch sizes are rejected."""
+        with pytest.raises(ValueError, match="batch_size"):
+            EquityDataWriter(db_path, batch_size=0)
+
+
+class TestLoaderBatchWrites:
+    """Tests for SQLite batch writes through SP500EODLoader."""
+
+    def test_save_to_sqlite_is_idempotent(self, db_path):
+        """Test saving the same frame twice does not duplicate rows."""
+        loader = SP500EODLoader(symbols=["AAPL"], storage_type="sqlite", db_path=str(db_path))
+
+        loader.save_to_sqlite(make_frame(), "AAPL")
+        loader.save_to_sqlite(make_frame(), "AAPL")
+
+        assert len(loader.load_from_sqlite("AAPL")) == 5
+
+    def test_save_batch_uses_one_connection(self, db_path, monkeypatch):
+        """Test a batch save opens a single connection for all symbols."""
+        loader = SP500EODLoader(symbols=[], storage_type="sqlite", db_path=str(db_path))
+        connects = []
+        real_connect = sqlite3.connect
+        monkeypatch.setattr(
+            "copilot_quant.data.sqlite_writer.sqlite3.connect",
+            lambda *args, **kwargs: connects.append(args) or real_connect(*args, **kwargs),
+        )
+
+        loader.save_batch({"AAPL": make_frame(), "MSFT": make_frame(), "GOOGL": make_frame()})
+
+        assert len(connects) == 1
+        assert fetch(db_path, "SELECT COUNT(DISTINCT symbol) FROM equity_data") == [(3,)]
@@ -253,6 +253,96 @@ class TestDataUpdater:
 
         assert result is True
 
+    def test_batch_update_sqlite_commits_in_batches(self, temp_dir):
+        """Test SQLite batch updates share one writer and record metadata after commit."""
+        updater = DataUpdater(
+            storage_type="sqlite", data_dir=temp_dir, db_path=str(Path(temp_dir) / "eod.db"), rate_limit_delay=0
+        )
+        writers = []
+
+        def fetch_symbol(symbol, start_date=None, end_date=None, auto_adjust=True):
+            writers.append(updater.loader._sqlite_writer)
+            return pd.DataFrame({"date": ["2024-01-11", "2024-01-12"], "close": [100.0, 101.0]})
+
+        updater.loader.fetch_symbol = fetch_symbol
+
+        result = updater.batch_update(["AAPL", "MSFT"], force=True)
+
+        assert result == {"success": ["AAPL", "MSFT"], "failed": []}
+        assert writers[0] is not None and writers[0] is writers[1]
+        assert list(updater.metadata["last_date"]) == ["2024-01-12", "2024-01-12"]
+        assert updater._deferred_metadata is None
+
+
+
+def store_sessions(updater, frames):
+    """Save {symbol: [dates]} through the updater's loader."""
+    for symbol, dates in frames.items():
+        df = pd.DataFrame({"date": pd.to_datetime(dates), "close": 100.0})
+        updater.loader.save(df, symbol)
+
+
+class TestSessionGaps:
+    """Tests for calendar-based gap detection across the universe."""
+
+    @pytest.fixture(params=["csv", "sqlite", "parquet"])
+    def updater(self, request, temp_dir):
+        return DataUpdater(
+            storage_type=request.param,
+            data_dir=temp_dir,
+            db_path=str(Path(temp_dir) / "eod.db"),
+            parquet_dir=str(Path(temp_dir) / "parquet"),
+            rate_limit_delay=0,
+        )
+
+    def test_exact_missing_sessions(self, updater):
+        """Test missing sessions are reported exactly, skipping weekends and holidays."""
+        sessions = pd.bdate_range("2024-01-08", "2024-01-31").drop(pd.Timestamp("2024-01-15"))  # MLK Day
+        store_sessions(
+            updater,
+            {
+                "AAPL": sessions.drop(pd.to_datetime(["2024-01-12", "2024-01-16", "2024-01-24"])),
+                "MSFT": sessions,
+            },
+        )
+
+        missing = updater.find_missing_sessions()
+
+        assert list(missing["symbol"]) == ["AAPL", "AAPL", "AAPL"]
+        assert list(missing["date"]) == list(pd.to_datetime(["2024-01-12", "2024-01-16", "2024-01-24"]))
+
+    def test_find_all_gaps_brackets_runs(self, updater):
+        """Test consecutive missing sessions form one gap bracketed by stored dates."""
+        sessions = pd.bdate_range("2024-01-08", "2024-01-31").drop(pd.Timestamp("2024-01-15"))
+        store_sessions(
+            updater,
+            {
+                "AAPL": sessions.drop(pd.to_datetime(["2024-01-12", "2024-01-16", "2024-01-24"])),
+                "MSFT": sessions,
+                "GOOGL": sessions[:3],
+            },
+        )
+
+        gaps = updater.find_all_gaps()
+
+        assert gaps == {"AAPL": [("2024-01-11", "2024-01-17"), ("2024-01-23", "2024-01-25")]}
+        assert updater.find_gaps("MSFT") == []
+        assert updater._get_last_date("GOOGL") == "2024-01-10"
+
+    def test_empty_store(self, updater):
+        """Test an empty store has no gaps."""
+        assert updater.find_all_gaps(["AAPL"]) == {}
+        assert updater.find_missing_sessions().empty
+
+    def test_fill_gaps_fetches_missing_range(self, updater):
+        """Test gaps are re-fetched from the first missing day up to the next stored date."""
+        updater.loader.fetch_and_save = Mock(return_value=True)
+        updater._update_metadata = Mock()
+
+        assert updater.fill_gaps("AAPL", gaps=[("2024-01-11", "2024-01-17")])
+
+        updater.loader.fetch_and_save.assert_called_once_with("AAPL", start_date="2024-01-12", end_date="2024-01-17")
+
 
 class TestLogFileValidation:
     """
@@ -218,6 +218,31 @@ class TestPortfolioStateManager(unittest.TestCase):
         self.manager.take_snapshot()
         self.assertEqual(self.manager._peak_nav, 110000.0)
 
+    def test_performance_metrics(self):
+        """Test running metrics are updated on each snapshot"""
+        for nav in (100000.0, 102000.0, 99000.0, 101000.0):
+            self.broker.account_value = nav
+            self.manager.take_snapshot()
+
+        metrics = self.manager.get_performance_metrics()
+        self.assertEqual(metrics["count"], 4)
+        self.assertAlmostEqual(metrics["max_drawdown"], 99000.0 / 102000.0 - 1)
+        self.assertAlmostEqual(metrics["total_return"], 0.01)
+        self.assertEqual(self.manager.performance.periods_per_year, 252 * 26)
+
+    def test_peak_nav_restored_on_initialize(self):
+        """Test persisted peak NAV seeds the drawdown after a restart"""
+        self.broker.account_value = 120000.0
+        self.manager.take_snapshot()
+
+        restarted = PortfolioStateManager(broker=self.broker, database_url="sqlite:///:memory:")
+        restarted.SessionLocal = self.manager.SessionLocal
+        self.broker.account_value = 108000.0
+        self.assertTrue(restarted.initialize())
+
+        self.assertEqual(restarted._peak_nav, 120000.0)
+        self.assertAlmostEqual(restarted.get_current_state().drawdown, 0.1)
+
     def test_reconciliation_logging(self):
         """Test reconciliation logging"""
         # Sync with broker
@@ -8,6 +8,8 @@ import unittest
 from datetime import datetime, time
 from zoneinfo import ZoneInfo
 
+import pandas as pd
+
 from copilot_quant.orchestrator.market_calendar import MarketCalendar, MarketState
 
 
@@ -159,6 +161,30 @@ class TestMarketCalendar(unittest.TestCase):
         # Independence Day (July 4)
         self.assertIn(datetime(2024, 7, 4, tzinfo=self.eastern).date(), holiday_dates)
 
+    def test_trading_days_matches_is_trading_day(self):
+        """Test the vectorized session list agrees with is_trading_day"""
+        sessions = self.calendar.trading_days("2021-12-01", "2024-12-31")
+
+        expected = [
+            day
+            for day in pd.date_range("2021-12-01", "2024-12-31")
+            if self.calendar.is_trading_day(day.to_pydatetime())
+        ]
+        self.assertTrue(sessions.equals(pd.DatetimeIndex(expected)))
+
+    def test_trading_days_session_counts(self):
+        """Test yearly session counts match the NYSE calendar"""
+        self.assertEqual(len(self.calendar.trading_days("2023-01-01", "2023-12-31")), 250)
+        # Dec 31 2021 was a session even though New Year's Day 2022 fell on a Saturday
+        self.assertIn(pd.Timestamp("2021-12-31"), self.calendar.trading_days("2021-12-01", "2022-01-31"))
+
+    def test_juneteenth_and_special_closures(self):
+        """Test Juneteenth starts in 2022 and unscheduled closures are holidays"""
+        self.assertFalse(self.calendar.is_holiday(datetime(2021, 6, 18, tzinfo=self.eastern)))
+        self.assertTrue(self.calendar.is_holiday(datetime(2023, 6, 19, tzinfo=self.eastern)))
+        self.assertTrue(self.calendar.is_holiday(datetime(2025, 1, 9, tzinfo=self.eastern)))
+        self.assertNotIn(pd.Timestamp("2012-10-29"), self.calendar.trading_days("2012-10-01", "2012-11-30"))
+
 
 if __name__ == "__main__":
     unittest.main()
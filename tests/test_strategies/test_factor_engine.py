@@ -0,0 +1,268 @@
+"""Tests for the cross-sectional factor engine."""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from copilot_quant.backtest import VectorizedBacktester
+from copilot_quant.backtest.multi_strategy import MultiStrategyEngine
+from copilot_quant.strategies.factor_engine import (
+    FactorEngine,
+    FactorStrategy,
+    cross_sectional_rank,
+    cross_sectional_zscore,
+    low_volatility,
+    momentum,
+    neutralize,
+    rebalance_dates,
+    winsorize,
+)
+from tests.test_backtest.test_features import WidePricesProvider
+
+
+def make_prices(num_bars=300, num_symbols=20, seed=0):
+    """Random-walk closes with trending and calm names and a late listing."""
+    rng = np.random.default_rng(seed)
+    drift = np.linspace(-0.001, 0.001, num_symbols)
+    vol = np.linspace(0.005, 0.03, num_symbols)
+    returns = drift + vol * rng.normal(size=(num_bars, num_symbols))
+    prices = pd.DataFrame(
+        100 * np.exp(np.cumsum(returns, axis=0)),
+        index=pd.bdate_range("2022-01-03", periods=num_bars),
+        columns=[f"S{i:02d}" for i in range(num_symbols)],
+    )
+    prices.iloc[:100, -1] = np.nan
+    return prices
+
+
+def make_scores(seed=1):
+    """Score panel with a missing value and an outlier."""
+    rng = np.random.default_rng(seed)
+    scores = pd.DataFrame(rng.normal(size=(5, 8)), columns=list("ABCDEFGH"))
+    scores.iloc[0, 2] = np.nan
+    scores.iloc[1, 3] = 50.0
+    return scores
+
+
+class TestTransforms:
+    """Tests for the cross-sectional transforms."""
+
+    def test_zscore_matches_pandas(self):
+        """Test row-wise z-scores equal pandas' sample standardization."""
+        scores = make_scores()
+
+        expected = scores.sub(scores.mean(axis=1), axis=0).div(scores.std(axis=1), axis=0)
+
+        pd.testing.assert_frame_equal(cross_sectional_zscore(scores), expected)
+
+    def test_rank_spans_unit_interval(self):
+        """Test ranks run from 0 to 1, share ties and skip missing scores."""
+        scores = pd.DataFrame([[3.0, 1.0, 2.0, np.nan], [1.0, 1.0, 2.0, 5.0], [np.nan, 4.0, np.nan, np.nan]])
+
+        ranks = cross_sectional_rank(scores)
+
+        np.testing.assert_allclose(ranks.iloc[0, :3], [1.0, 0.0, 0.5])
+        assert np.isnan(ranks.iloc[0, 3])
+        np.testing.assert_allclose(ranks.iloc[1], [1 / 6, 1 / 6, 2 / 3, 1.0])
+        assert ranks.iloc[2, 1] == 0.5
+
+    def test_winsorize_clips_to_row_quantiles(self):
+        """Test each row is clipped to its own quantiles."""
+        scores = make_scores()
+
+        clipped = winsorize(scores, 0.1, 0.9)
+
+        expected = scores.clip(scores.quantile(0.1, axis=1), scores.quantile(0.9, axis=1), axis=0)
+        pd.testing.assert_frame_equal(clipped, expected)
+        assert clipped.iloc[1, 3] < 50.0
+        with pytest.raises(ValueError, match="Invalid quantiles"):
+            winsorize(scores, 0.9, 0.1)
+
+    def test_neutralize_demeans_groups(self):
+        """Test scores have zero mean within each group and ungrouped symbols are unchanged."""
+        scores = make_scores()
+        groups = {"A": "tech", "B": "tech", "C": "tech", "D": "energy", "E": "energy", "F": "utilities", "G": "tech"}
+
+        neutral = neutralize(scores, groups)
+
+        for members in (["A", "B", "C", "G"], ["D", "E"], ["F"]):
+            np.testing.assert_allclose(neutral[members].mean(axis=1), 0.0, atol=1e-12)
+        pd.testing.assert_series_equal(neutral["H"], scores["H"])
+        assert np.isnan(neutral.iloc[0, 2])
+
+
+class TestFactorEngine:
+    """Tests for FactorEngine."""
+
+    def test_composite_renormalizes_missing_factors(self):
+        """Test the composite is the weighted mean of the factors each symbol has."""
+        prices = make_prices()
+        engine = FactorEngine(
+            {"momentum": lambda p: momentum(p, lookback=60, skip=5), "low_vol": low_volatility},
+            weights={"momentum": 3.0, "low_vol": 1.0},
+            winsorize_limits=None,
+        )
+        dates = prices.index[[120, 250]]
+
+        factors = engine.factor_scores(prices, dates)
+        composite = engine.composite(prices, dates)
+
+        expected = (3 * factors["momentum"] + factors["low_vol"]) / 4
+        pd.testing.assert_frame_equal(composite, expected)
+        pd.testing.assert_frame_equal(factors["low_vol"], cross_sectional_zscore(low_volatility(prices).loc[dates]))
+
+        # 61 bars after listing, the late symbol has momentum but no volatility window yet
+        late = prices.index[[161]]
+        late_factors = engine.factor_scores(prices, late)
+        assert np.isnan(late_factors["low_vol"].iloc[0, -1])
+        assert engine.composite(prices, late).iloc[0, -1] == pytest.approx(late_factors["momentum"].iloc[0, -1])
+
+    def test_precomputed_factor_is_carried_forward(self):
+        """Test a sparse fundamental panel is forward-filled, never backfilled."""
+        prices = make_prices()
+        book_to_price = pd.DataFrame(
+            [np.arange(20.0), np.arange(20.0)[::-1]], index=prices.index[[50, 200]], columns=prices.columns
+        )
+        engine = FactorEngine({"value": book_to_price}, winsorize_limits=None)
+
+        raw = engine.raw_scores(prices)["value"]
+
+        assert raw.iloc[:50].isna().all().all()
+        np.testing.assert_array_equal(raw.iloc[199], np.arange(20.0))
+        np.testing.assert_array_equal(raw.iloc[-1], np.arange(20.0)[::-1])
+
+    def test_target_weights(self):
+        """Test quantile portfolios are equal-weighted and sized to the gross exposure."""
+        prices = make_prices()
+        engine = FactorEngine({"momentum": lambda p: momentum(p, lookback=60, skip=5)})
+
+        long_only = engine.target_weights(prices, rebalance=20, long_quantile=0.25)
+        long_short = engine.target_weights(prices, rebalance="ME", long_quantile=0.2, short_quantile=0.2)
+
+        assert list(long_only.index) == list(prices.index[::20])
+        assert (long_only.iloc[:3] == 0).all().all()  # no scores before the momentum window fills
+        np.testing.assert_allclose(long_only.iloc[5:].sum(axis=1), 1.0)
+        assert ((long_only.iloc[5:] > 0).sum(axis=1) == 5).all()
+
+        invested = long_short.iloc[4:]
+        np.testing.assert_allclose(invested.clip(lower=0).sum(axis=1), 0.5)
+        np.testing.assert_allclose(invested.clip(upper=0).sum(axis=1), -0.5)
+        assert long_short.index.equals(rebalance_dates(prices.index, "ME"))
+        assert (long_short.index.to_series().dt.month.diff().dropna() != 0).all()
+
+    def test_target_positions_run_in_vectorized_backtest(self):
+        """Test share targets feed VectorizedBacktester directly."""
+        prices = make_prices()
+        engine = FactorEngine({"momentum": lambda p: momentum(p, lookback=60, skip=5)})
+
+        positions = engine.target_positions(prices, capital=100_000, rebalance=20, long_quantile=0.2)
+        result = VectorizedBacktester(initial_capital=100_000).run(prices, positions=positions)
+
+        weights = engine.target_weights(prices, rebalance=20, long_quantile=0.2)
+        assert ((positions > 0) == (weights > 0)).all().all()
+        assert (positions == positions.round()).all().all()
+        assert len(result.trades) > 0
+
+    def test_signals_from_scores(self):
+        """Test top names get buy signals and bottom names sell signals, strongest first."""
+        scores = pd.Series(np.arange(10.0), index=[f"S{i}" for i in range(10)])
+        prices = pd.Series(100.0, index=scores.index)
+        prices["S9"] = np.nan
+
+        signals = FactorEngine({"x": scores.to_frame().T}).signals(
+            scores, prices, long_quantile=0.25, short_quantile=0.25, strategy_name="factors"
+        )
+
+        # S9 has no price, so nine names are ranked in steps of 1/8
+        assert [(s.symbol, s.side) for s in signals] == [
+            ("S8", "buy"),
+            ("S7", "buy"),
+            ("S6", "buy"),
+            ("S0", "sell"),
+            ("S1", "sell"),
+            ("S2", "sell"),
+        ]
+        assert signals[0].confidence == 1.0 and signals[1].confidence == pytest.approx(7 / 8)
+        assert all(s.strategy_name == "factors" and s.entry_price == 100.0 for s in signals)
+
+    def test_invalid_arguments(self):
+        """Test argument validation."""
+        with pytest.raises(ValueError, match="Invalid factors"):
+            FactorEngine({})
+        with pytest.raises(ValueError, match="Invalid standardize"):
+            FactorEngine({"m": momentum}, standardize="minmax")
+        with pytest.raises(ValueError, match="Invalid weights"):
+            FactorEngine({"m": momentum}, weights={"v": 1.0})
+        with pytest.raises(ValueError, match="Invalid long_quantile"):
+            FactorEngine({"m": momentum}).target_weights(make_prices(), long_quantile=1.5)
+        with pytest.raises(ValueError, match="Invalid rebalance"):
+            rebalance_dates(make_prices().index, 0)
+        with pytest.raises(ValueError, match="Invalid rebalance_frequency"):
+            FactorStrategy(FactorEngine({"m": momentum}), rebalance_frequency=0)
+
+
+class RecordingFactorStrategy(FactorStrategy):
+    """FactorStrategy that records the signals it emits."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.emitted = []
+
+    def generate_signals(self, timestamp, data):
+        held = dict(self.holdings)
+        signals = super().generate_signals(timestamp, data)
+        self.emitted.append((timestamp, signals, held))
+        return signals
+
+
+class TestFactorStrategy:
+    """Tests for FactorStrategy in MultiStrategyEngine."""
+
+    def test_rebalances_from_feature_store(self):
+        """Test signals are emitted on rebalance bars only and match the engine's scores."""
+        prices = make_prices()
+        factor_engine = FactorEngine({"momentum": lambda p: momentum(p, lookback=60, skip=5)})
+        strategy = RecordingFactorStrategy(factor_engine, rebalance_frequency=20, history=61, long_quantile=0.2)
+
+        engine = MultiStrategyEngine(initial_capital=100_000, data_provider=WidePricesProvider(prices))
+        engine.add_strategy(strategy)
+        result = engine.run(datetime(2022, 1, 3), datetime(2023, 12, 31), symbols=list(prices.columns))
+
+        rebalances = [(timestamp, signals) for timestamp, signals, _ in strategy.emitted if signals]
+        assert [timestamp for timestamp, _ in rebalances] == list(prices.index[60::20])
+        timestamp, signals = rebalances[0]
+        expected = factor_engine.composite(prices.loc[:timestamp], dates=[timestamp]).iloc[-1]
+        assert {s.symbol for s in signals} == set(expected[expected.rank(pct=True) > 0.8].index)
+        assert all(s.side == "buy" for s in signals)
+        assert len(result.trades) > 0
+
+    def test_holdings_follow_ranking(self):
+        """Test names leaving the top quantile are sold and held names are not bought again."""
+        prices = make_prices()
+        factor_engine = FactorEngine({"momentum": lambda p: momentum(p, lookback=60, skip=5)})
+        strategy = RecordingFactorStrategy(factor_engine, rebalance_frequency=20, history=61, long_quantile=0.2)
+
+        engine = MultiStrategyEngine(initial_capital=100_000, data_provider=WidePricesProvider(prices))
+        engine.add_strategy(strategy)
+        engine.run(datetime(2022, 1, 3), datetime(2023, 12, 31), symbols=list(prices.columns))
+
+        rebalance_bars = set(prices.index[60::20])
+        held_after = [held for _, _, held in strategy.emitted[1:]] + [dict(strategy.holdings)]
+        exits = 0
+        for (timestamp, signals, held_before), held in zip(strategy.emitted, held_after, strict=True):
+            if timestamp not in rebalance_bars:
+                continue
+            scores = factor_engine.composite(prices.loc[:timestamp], dates=[timestamp]).iloc[-1]
+            top = set(scores[scores.rank(pct=True) > 0.8].index)
+
+            sold = {s.symbol for s in signals if s.side == "sell"}
+            assert sold == set(held_before) - top
+            assert all(s.quantity == pytest.approx(held_before[s.symbol]) for s in signals if s.side == "sell")
+            assert not {s.symbol for s in signals if s.side == "buy"} & set(held_before)
+            assert set(held) <= top
+            exits += len(sold)
+
+        assert exits > 0
+        assert all(quantity > 0 for quantity in strategy.holdings.values())
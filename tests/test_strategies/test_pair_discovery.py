@@ -0,0 +1,115 @@
+"""Tests for scalable pair discovery."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from copilot_quant.strategies.pair_discovery import (
+    cluster_by_correlation,
+    correlation_matrix,
+    discover_pairs,
+)
+from copilot_quant.strategies.pairs_utils import find_cointegrated_pairs
+
+
+def make_universe(num_symbols=12, num_bars=200, seed=0):
+    """Two sectors of symbols sharing a common stochastic trend each."""
+    rng = np.random.default_rng(seed)
+    trends = np.cumsum(rng.normal(size=(num_bars, 2)), axis=0)
+    sector = np.arange(num_symbols) % 2
+    prices = 100 + trends[:, sector] * rng.uniform(0.5, 2.0, num_symbols) + rng.normal(size=(num_bars, num_symbols))
+    return pd.DataFrame(prices, columns=[f"S{i:02d}" for i in range(num_symbols)])
+
+
+class TestCorrelationMatrix:
+    """Tests for correlation_matrix."""
+
+    def test_matches_pandas(self):
+        """Test complete data gives the same matrix as DataFrame.corr."""
+        prices = make_universe()
+
+        corr, overlaps = correlation_matrix(prices)
+
+        np.testing.assert_allclose(corr, prices.corr().to_numpy(), atol=1e-12)
+        assert (overlaps == len(prices)).all()
+
+    def test_missing_values_use_pairwise_overlap(self):
+        """Test gaps are handled per pair like DataFrame.corr."""
+        prices = make_universe()
+        prices.iloc[:50, 1] = np.nan
+        prices.iloc[120:140, 4] = np.nan
+
+        corr, overlaps = correlation_matrix(prices)
+
+        np.testing.assert_allclose(corr, prices.corr().to_numpy(), atol=1e-10)
+        assert overlaps[1, 4] == len(prices) - 70
+
+
+class TestDiscoverPairs:
+    """Tests for discover_pairs."""
+
+    def test_prunes_by_correlation(self):
+        """Test only correlated pairs are tested and statistics are reported."""
+        prices = make_universe()
+
+        scan = discover_pairs(prices, min_correlation=0.8, max_workers=1)
+
+        assert scan.num_pairs == 66
+        assert 0 < scan.num_tested < scan.num_pairs
+        assert scan.pairs_per_second > 0
+        assert (scan.pairs["correlation"].abs() >= 0.8).all()
+        assert scan.pairs["p_value"].is_monotonic_increasing
+
+    def test_parallel_matches_serial(self):
+        """Test fanning tests out over processes gives identical pairs."""
+        prices = make_universe()
+
+        serial = discover_pairs(prices, max_workers=1)
+        parallel = discover_pairs(prices, max_workers=2, chunk_size=5)
+
+        pd.testing.assert_frame_equal(serial.pairs, parallel.pairs)
+        assert serial.num_tested == parallel.num_tested
+
+    def test_groups_restrict_pairs(self):
+        """Test pairs are only tested within a sector; unlabelled symbols are skipped."""
+        prices = make_universe()
+        sectors = {symbol: "even" if i % 2 == 0 else "odd" for i, symbol in enumerate(prices.columns[:-1])}
+
+        scan = discover_pairs(prices, min_correlation=0.0, groups=sectors, max_workers=1)
+
+        assert scan.num_tested == 2 * (6 * 5 // 2) - 5
+        for sym1, sym2 in zip(scan.pairs["symbol1"], scan.pairs["symbol2"], strict=True):
+            assert sectors[sym1] == sectors[sym2]
+
+    def test_correlation_clusters_recover_sectors(self):
+        """Test clustering on the correlation matrix separates the two trends."""
+        prices = make_universe()
+
+        clusters = cluster_by_correlation(prices.corr(), num_clusters=2)
+        scan = discover_pairs(prices, min_correlation=0.0, num_clusters=2, max_workers=1)
+
+        assert len(set(clusters.values())) == 2
+        assert clusters["S00"] == clusters["S02"] != clusters["S01"]
+        assert scan.num_tested == 2 * (6 * 5 // 2)
+
+    def test_find_cointegrated_pairs_uses_significance_level(self):
+        """Test the wrapper returns tuples and honours significance_level."""
+        prices = make_universe()
+
+        loose = find_cointegrated_pairs(prices, significance_level=0.10)
+        strict = find_cointegrated_pairs(prices, significance_level=0.001)
+
+        assert all(pval < 0.001 for _, _, pval, _ in strict)
+        assert len(strict) <= len(loose)
+        assert set(strict) <= set(loose)
+
+    def test_invalid_arguments(self):
+        """Test argument validation."""
+        prices = make_universe()
+
+        with pytest.raises(ValueError, match="Invalid arguments"):
+            discover_pairs(prices, groups={"S00": "a"}, num_clusters=2)
+        with pytest.raises(ValueError, match="Invalid max_workers"):
+            discover_pairs(prices, max_workers=0)
+        with pytest.raises(ValueError, match="Invalid num_clusters"):
+            cluster_by_correlation(prices.corr(), num_clusters=0)
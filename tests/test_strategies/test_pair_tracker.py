@@ -0,0 +1,90 @@
+"""Tests for the incremental pair tracker."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from copilot_quant.strategies.pair_tracker import PairTracker
+from copilot_quant.strategies.pairs_utils import calculate_hedge_ratio, calculate_spread, calculate_zscore
+
+
+def make_pair(num_bars=300, seed=0):
+    """Cointegrated pair with hedge ratio 1.5."""
+    rng = np.random.default_rng(seed)
+    prices2 = 50 + np.cumsum(rng.normal(size=num_bars))
+    prices1 = 1.5 * prices2 + 10 + rng.normal(scale=0.5, size=num_bars)
+    return prices1, prices2
+
+
+def weighted_fit(prices1, prices2, weights):
+    """Weighted least squares fit of prices1 on (prices2, 1)."""
+    design = np.column_stack([prices2, np.ones_like(prices2)]) * np.sqrt(weights)[:, None]
+    return np.linalg.lstsq(design, prices1 * np.sqrt(weights), rcond=None)[0]
+
+
+class TestPairTracker:
+    """Tests for PairTracker."""
+
+    def test_warm_start_matches_rolling_calculation(self):
+        """Test warm starting reproduces the rolling OLS hedge ratio and z-score."""
+        prices1, prices2 = make_pair()
+        window1, window2 = pd.Series(prices1[:60]), pd.Series(prices2[:60])
+
+        tracker = PairTracker(lookback=60)
+        tracker.warm_start(window1, window2)
+
+        hedge_ratio = calculate_hedge_ratio(window1, window2)
+        zscore = calculate_zscore(calculate_spread(window1, window2, hedge_ratio), window=60).iloc[-1]
+        assert tracker.hedge_ratio == pytest.approx(hedge_ratio)
+        assert tracker.zscore == pytest.approx(zscore)
+        assert tracker.ready and tracker.bars == 60
+
+    def test_updates_match_weighted_least_squares(self):
+        """Test recursive updates track the exponentially weighted batch fit."""
+        prices1, prices2 = make_pair()
+        tracker = PairTracker(lookback=40)
+        tracker.warm_start(prices1[:40], prices2[:40])
+        for price1, price2 in zip(prices1[40:], prices2[40:], strict=True):
+            tracker.update(price1, price2)
+
+        # Bars decay from the end of the warm-start window, which is weighted uniformly
+        age = len(prices1) - 1 - np.maximum(np.arange(len(prices1)), 39)
+        expected = weighted_fit(prices1, prices2, tracker.forgetting**age)
+
+        np.testing.assert_allclose([tracker.hedge_ratio, tracker.intercept], expected, rtol=1e-8)
+        assert tracker.hedge_ratio == pytest.approx(1.5, abs=0.1)
+
+    def test_spread_statistics_are_exponentially_weighted(self):
+        """Test each z-score uses the spread mean and variance from before the bar."""
+        prices1, prices2 = make_pair(num_bars=80)
+        tracker = PairTracker(lookback=20)
+        tracker.warm_start(prices1[:20], prices2[:20])
+
+        mean, var = tracker.spread_mean, tracker.spread_var
+        zscore = tracker.update(prices1[20], prices2[20])
+        spread = tracker.spread
+
+        assert zscore == pytest.approx((spread - mean) / np.sqrt(var))
+        assert tracker.spread_mean == pytest.approx(0.95 * mean + 0.05 * spread)
+        assert tracker.spread_var == pytest.approx(0.95 * (var + 0.05 * (spread - mean) ** 2))
+
+    def test_forgetting_of_one_is_expanding_ols(self):
+        """Test without forgetting the estimate equals OLS over every bar."""
+        prices1, prices2 = make_pair(num_bars=120)
+        tracker = PairTracker(lookback=30, forgetting=1.0)
+        tracker.warm_start(prices1[:30], prices2[:30])
+        for price1, price2 in zip(prices1[30:], prices2[30:], strict=True):
+            tracker.update(price1, price2)
+
+        np.testing.assert_allclose(
+            [tracker.hedge_ratio, tracker.intercept], weighted_fit(prices1, prices2, np.ones(len(prices1))), rtol=1e-9
+        )
+
+    def test_invalid_arguments(self):
+        """Test argument validation."""
+        with pytest.raises(ValueError, match="Invalid lookback"):
+            PairTracker(lookback=2)
+        with pytest.raises(ValueError, match="Invalid forgetting"):
+            PairTracker(lookback=20, forgetting=1.5)
+        with pytest.raises(ValueError, match="Invalid warm-up window"):
+            PairTracker(lookback=20).warm_start(np.arange(10.0), np.full(10, 3.0))
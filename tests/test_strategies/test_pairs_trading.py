@@ -2,12 +2,15 @@
 
 from datetime import datetime
 from typing import List
+from unittest.mock import MagicMock, patch
 
 import numpy as np
 import pandas as pd
 import pytest
 
 from copilot_quant.backtest import BacktestEngine
+from copilot_quant.backtest.features import FeatureStore
+from copilot_quant.backtest.live_engine import LiveStrategyEngine
 from copilot_quant.data.providers import DataProvider
 from copilot_quant.strategies import PairsTradingStrategy
 
@@ -76,6 +79,19 @@ class MockPairsDataProvider(DataProvider):
         return pd.concat(data_frames).sort_index()
 
 
+class TrackedZScoreRecorder(PairsTradingStrategy):
+    """Records the tracked hedge ratio and Z-score of one pair at every call, keyed by bar."""
+
+    def __init__(self, pair, **kwargs):
+        super().__init__(**kwargs)
+        self.pair = pair
+        self.states = {}
+
+    def on_data(self, timestamp, data):
+        self.states[self.features.last_timestamp] = self._tracked_zscore(self.pair, data)
+        return []
+
+
 class TestPairsTradingStrategy:
     """Tests for PairsTradingStrategy class."""
 
@@ -236,6 +252,132 @@ class TestPairsTradingStrategy:
         # Should have identified pairs
         assert len(strategy.trading_pairs) >= 0
 
+    @pytest.mark.parametrize("hedge_method", ["rls", "rolling"])
+    def test_feature_store_matches_frame_calculation(self, monkeypatch, hedge_method):
+        """Test Z-scores from the shared feature store reproduce the frame-based trades."""
+
+        def run():
+            engine = BacktestEngine(initial_capital=100000, data_provider=MockPairsDataProvider())
+            engine.add_strategy(
+                PairsTradingStrategy(
+                    lookback=30, entry_zscore=1.5, exit_zscore=0.3, max_pairs=3, hedge_method=hedge_method
+                )
+            )
+            result = engine.run(
+                start_date=datetime(2023, 1, 1), end_date=datetime(2023, 12, 31), symbols=["PAIR_A", "PAIR_B"]
+            )
+            return [(t.timestamp, t.order.symbol, t.order.side, t.fill_quantity) for t in result.trades]
+
+        from_features = run()
+        monkeypatch.setattr(FeatureStore, "__contains__", lambda self, symbol: False)
+        from_frame = run()
+
+        assert len(from_features) > 0
+        assert from_features == from_frame
+
+    def test_pair_identification_reads_feature_panel(self):
+        """Test pairs found on the feature store's wide panel match pivoting the long data."""
+        prices = MockPairsDataProvider().get_data(["PAIR_A", "PAIR_B", "INDEP"], "2023-01-01", "2023-04-30")
+        wide = prices.pivot_table(index=prices.index, columns="Symbol", values="Close")
+
+        from_frame = PairsTradingStrategy(lookback=30)
+        from_frame._identify_trading_pairs(prices)
+        from_panel = PairsTradingStrategy(lookback=30)
+        from_panel.features = FeatureStore(symbols=list(wide.columns))
+        from_panel.features.extend(wide)
+        from_panel._identify_trading_pairs(prices.iloc[:0])
+
+        assert from_panel.trading_pairs == from_frame.trading_pairs == [("PAIR_A", "PAIR_B")]
+
+    def test_tracker_state_independent_of_call_cadence(self):
+        """Test bar-by-bar updates, as in a live session, match one catch-up call."""
+        prices = MockPairsDataProvider().get_data(["PAIR_A", "PAIR_B"], "2023-01-01", "2023-06-30")
+        wide = prices.pivot_table(index=prices.index, columns="Symbol", values="Close")
+        pair = ("PAIR_A", "PAIR_B")
+
+        live = PairsTradingStrategy(lookback=30)
+        live.features = FeatureStore(symbols=list(wide.columns))
+        states = []
+        for timestamp, row in wide.iterrows():
+            live.features.append(timestamp, row.to_numpy())
+            hedge_ratio, zscore = live._tracked_zscore(pair, prices)
+            if hedge_ratio is not None:
+                states.append((hedge_ratio, zscore))
+
+        backtest = PairsTradingStrategy(lookback=30)
+        state = backtest._tracked_zscore(pair, prices)
+
+        assert len(states) == len(wide) - 29
+        assert state == states[-1]
+        assert backtest.trackers[pair].bars == live.trackers[pair].bars == len(wide) - 1  # newest bar still forming
+
+    def test_forming_bar_is_not_folded(self):
+        """Test revising the newest bar, as intrabar ticks do, leaves the tracker state unchanged."""
+        prices = MockPairsDataProvider().get_data(["PAIR_A", "PAIR_B"], "2023-01-01", "2023-03-31")
+        wide = prices.pivot_table(index=prices.index, columns="Symbol", values="Close")
+        pair = ("PAIR_A", "PAIR_B")
+        strategy = PairsTradingStrategy(lookback=30)
+        strategy.features = FeatureStore(symbols=list(wide.columns))
+        strategy.features.extend(wide)
+
+        final = strategy._tracked_zscore(pair, prices)
+        strategy.features.update_last(wide.iloc[-1].to_numpy() * 1.05)
+        strategy._tracked_zscore(pair, prices)
+        strategy.features.update_last(wide.iloc[-1].to_numpy())
+
+        assert strategy._tracked_zscore(pair, prices) == final
+
+    @patch("copilot_quant.brokers.live_data_adapter.IBKRLiveDataFeed")
+    @patch("copilot_quant.brokers.live_broker_adapter.IBKRBroker")
+    def test_live_engine_matches_backtest(self, mock_broker_class, mock_data_feed_class):
+        """Test a live session fed intrabar ticks tracks the same hedge ratios and Z-scores as a backtest."""
+        pair = ("PAIR_A", "PAIR_B")
+        backtest = TrackedZScoreRecorder(pair, lookback=30)
+        engine = BacktestEngine(initial_capital=100000, data_provider=MockPairsDataProvider())
+        engine.add_strategy(backtest)
+        engine.run(start_date=datetime(2023, 1, 1), end_date=datetime(2023, 4, 30), symbols=list(pair))
+
+        prices = MockPairsDataProvider().get_data(list(pair), "2023-01-01", "2023-04-30")
+        wide = prices.pivot_table(index=prices.index, columns="Symbol", values="Close")
+        history = wide.iloc[:40].tz_localize("UTC")
+        live = TrackedZScoreRecorder(pair, lookback=30)
+        session = LiveStrategyEngine(paper_trading=True)
+        session.add_strategy(live)
+        session.symbols = list(pair)
+        session._historical_data = {symbol: history[[symbol]].rename(columns={symbol: "Close"}) for symbol in pair}
+        session._build_feature_store()
+
+        ticks = {}
+        session.data_feed.get_latest_bar = MagicMock(side_effect=lambda symbol: ticks[symbol])
+        for date, row in wide.iloc[40:].iterrows():
+            for hour, scale in ((15, 1.02), (20, 1.0)):  # an intrabar tick, then the close
+                for symbol in pair:
+                    ticks[symbol] = pd.Series({"Close": row[symbol] * scale}, name=date.replace(hour=hour))
+                session._update_market_data()
+                live.on_data(datetime.now(), session._prepare_strategy_data())
+
+        assert len(live.states) == len(wide) - 40
+        for timestamp, state in live.states.items():
+            assert state == backtest.states[timestamp]
+
+    def test_feature_zscore_skips_zero_variance_spread(self):
+        """Test a pair whose spread has no variance gives no hedge ratio instead of a unit-scaled Z-score."""
+        dates = pd.bdate_range("2023-01-02", periods=60)
+        prices = pd.DataFrame({"PEGGED": 100.0, "PAIR_B": 100 + np.sin(np.arange(60.0))}, index=dates)
+        strategy = PairsTradingStrategy(lookback=30, hedge_method="rolling")
+        strategy.features = FeatureStore(symbols=list(prices.columns))
+        strategy.features.extend(prices)
+
+        hedge_ratio, zscore = strategy._feature_zscore("PEGGED", "PAIR_B")
+
+        assert hedge_ratio is None
+        assert np.isnan(zscore)
+
+    def test_invalid_hedge_method(self):
+        """Test unknown hedge methods are rejected."""
+        with pytest.raises(ValueError, match="Invalid hedge_method"):
+            PairsTradingStrategy(hedge_method="kalman")
+
 
 class TestPairsTradingIntegration:
     """Integration tests for pairs trading strategy."""
@@ -7,10 +7,12 @@ import pytest
 from copilot_quant.strategies.pairs_utils import (
     calculate_correlation,
     calculate_half_life,
+    calculate_half_life_batch,
     calculate_hedge_ratio,
     calculate_spread,
     calculate_zscore,
     check_cointegration,
+    check_cointegration_batch,
     find_cointegrated_pairs,
 )
 
@@ -308,5 +310,95 @@ class TestHalfLife:
         assert half_life == np.inf
 
 
+def make_universe(num_bars=250, num_symbols=8, seed=11):
+    """Symbols loading on shared random-walk factors, plus idiosyncratic noise."""
+    rng = np.random.default_rng(seed)
+    factors = np.cumsum(rng.normal(size=(num_bars, 2)), axis=0)
+    prices = (
+        100
+        + factors @ rng.normal(size=(2, num_symbols))
+        + np.cumsum(rng.normal(size=(num_bars, num_symbols)) * 0.2, axis=0)
+        + rng.normal(size=(num_bars, num_symbols)) * rng.uniform(0.2, 2.0, num_symbols)
+    )
+    return pd.DataFrame(prices, columns=[f"S{i}" for i in range(num_symbols)])
+
+
+class TestCointegrationBatch:
+    """Tests for batched Engle-Granger cointegration tests."""
+
+    def test_matches_check_cointegration(self):
+        """Test every pair matches the per-pair statsmodels test."""
+        prices = make_universe()
+        prices.iloc[:40, 2] = np.nan
+        prices.iloc[100:110, 5] = np.nan
+
+        results = check_cointegration_batch(prices)
+
+        assert len(results) == 28
+        for row in results.itertuples():
+            is_coint, p_value, test_stat = check_cointegration(prices[row.symbol1], prices[row.symbol2])
+            assert row.is_cointegrated == is_coint
+            assert row.p_value == pytest.approx(p_value, abs=1e-10)
+            assert row.test_statistic == pytest.approx(test_stat, abs=1e-8)
+
+    def test_hedge_ratio_and_half_life(self):
+        """Test hedge ratios and spread half-lives match the single-pair helpers."""
+        prices = make_universe()
+
+        results = check_cointegration_batch(prices, pairs=[("S1", "S0"), ("S3", "S4")])
+
+        assert results[["symbol1", "symbol2"]].values.tolist() == [["S1", "S0"], ["S3", "S4"]]
+        for row in results.itertuples():
+            hedge_ratio = calculate_hedge_ratio(prices[row.symbol1], prices[row.symbol2])
+            spread = calculate_spread(prices[row.symbol1], prices[row.symbol2], hedge_ratio)
+            assert row.hedge_ratio == pytest.approx(hedge_ratio)
+            assert row.half_life == pytest.approx(calculate_half_life(spread))
+
+    def test_insufficient_overlap(self):
+        """Test pairs with fewer than 30 shared bars are not cointegrated."""
+        prices = make_universe(num_bars=40)
+        prices.iloc[:20, 0] = np.nan
+
+        results = check_cointegration_batch(prices, pairs=[("S0", "S1")])
+
+        assert not results["is_cointegrated"].iloc[0]
+        assert results["p_value"].iloc[0] == 1.0
+
+    def test_collinear_pair(self):
+        """Test exactly proportional series are reported as cointegrated, as coint does."""
+        base = np.cumsum(np.random.default_rng(0).normal(size=100)) + 50
+        prices = pd.DataFrame({"A": base, "B": 2 * base})
+
+        results = check_cointegration_batch(prices)
+
+        assert results["is_cointegrated"].iloc[0]
+        assert results["test_statistic"].iloc[0] == -np.inf
+
+
+class TestHalfLifeBatch:
+    """Tests for batched half-life calculation."""
+
+    def test_matches_calculate_half_life(self):
+        """Test each column matches calculate_half_life, including gaps and edge cases."""
+        rng = np.random.default_rng(5)
+        x = np.zeros(150)
+        for i in range(1, len(x)):
+            x[i] = 0.8 * x[i - 1] + rng.normal()
+        spreads = pd.DataFrame(
+            {
+                "reverting": x,
+                "random_walk": np.cumsum(rng.normal(size=150) + 0.5),
+                "constant": np.ones(150),
+                "late_start": np.r_[np.full(50, np.nan), x[:100]],
+            }
+        )
+
+        half_lives = calculate_half_life_batch(spreads)
+
+        for column in spreads.columns:
+            assert half_lives[column] == pytest.approx(calculate_half_life(spreads[column]))
+        assert np.isfinite(half_lives["reverting"])
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])